@@ -2,10 +2,10 @@ from equipment import Equipment
 from equipmentType import EquipmentType
 
 class Armor(Equipment):
+    """A catalog armor. Immutable and shared, like Weapon."""
+
     def __init__(self, name: str, base_ac: int, category: str):
         super().__init__(name, EquipmentType.ARMOR, {})
         self.base_ac = base_ac # Light and Medium should be added to with dex bonus..
         self.category = category  # "Light", "Medium", or "Heavy"
-
-
-        
\ No newline at end of file
+        self.freeze()
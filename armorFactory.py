@@ -1,32 +1,33 @@
-import json
 from armor import Armor
+from catalog import get_catalog, armors_by_name
 
 class ArmorFactory:
     def __init__(self):
-        with open("json/armor_catalog.json") as f:
-            self.armor_catalog = json.load(f)
+        self.armor_catalog = get_catalog().load("armor_catalog.json")
 
-        # Combine all armors into a single dictionary for easy access
-        self.all_armors = {}
-        for category, armors in self.armor_catalog.items():
-            for armor_name, armor_data in armors.items():
-                self.all_armors[armor_name] = armor_data
-                # Add the armor type (light_armor, medium_armor, etc.) to the data
-                self.all_armors[armor_name]["type"] = category
+        # All armors in a single dictionary for easy access, each with its
+        # armor type (light_armor, medium_armor, etc.) added
+        self.all_armors = armors_by_name()
 
     def get_armor_list(self):
         """Returns a list of all armor names."""
         return list(self.all_armors.keys())
     
     def get_armor_by_name(self, armor_name):
-        """Creates and returns an Armor object based on the armor name."""
-        if armor_name not in self.all_armors:
+        """Returns the shared (immutable) Armor object for the armor name."""
+        armor = get_catalog().index("armor_objects", _build_armors).get(armor_name)
+        if armor is None:
             raise ValueError(f"Armor {armor_name} not found in the catalog")
+        return armor
 
-        armor_data = self.all_armors[armor_name]
-        
-        return Armor(
+
+def _build_armors(catalog):
+    """One Armor per catalog entry, shared by every caller."""
+    return {
+        armor_name: Armor(
             name=armor_name,
             base_ac=armor_data["base_ac"],
             category=armor_data["category"]
-        )
\ No newline at end of file
+        )
+        for armor_name, armor_data in armors_by_name(catalog).items()
+    }
\ No newline at end of file
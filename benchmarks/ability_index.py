@@ -0,0 +1,85 @@
+"""Cost of the per-request ability lookups, with a 10x larger ability catalog.
+
+battle_view asks for a class's abilities at its level on every render, and
+end_battle asks which abilities a level-up unlocked. Compares the previous
+scan-copy-sort of abilities.json with AbilityIndex, on the shipped catalog
+and on synthetic catalogs made by repeating every ability --scales times
+(with distinct ids and unlock levels spread over 1-20).
+
+    python benchmarks/ability_index.py [--scales 1 10] [--iterations 20000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from catalog import freeze, thaw
+from web.abilities import AbilityIndex
+from web.game_session import get_abilities
+
+
+def scaled_abilities(scale: int) -> dict:
+    abilities = {}
+    for i in range(scale):
+        for ability_id, ability in thaw(get_abilities()).items():
+            if i:
+                ability_id = f"{ability_id}_{i}"
+                ability["unlock_level"] = (ability["unlock_level"] + 3 * i - 1) % 20 + 1
+            abilities[ability_id] = ability
+    return freeze(abilities)
+
+
+def scan(abilities, class_name, level):
+    """What get_class_abilities() used to do."""
+    result = []
+    for ability_id, ability in abilities.items():
+        if class_name in ability.get("classes", []) and level >= ability.get("unlock_level", 1):
+            result.append({"id": ability_id, **ability})
+    result.sort(key=lambda a: (a["cost"], a["unlock_level"]))
+    return result
+
+
+def scan_level_up(abilities, class_name, old_level, new_level):
+    """What end_battle used to do: two scans and a diff."""
+    before = {a["id"] for a in scan(abilities, class_name, old_level)}
+    return [a for a in scan(abilities, class_name, new_level) if a["id"] not in before]
+
+
+def per_call_us(fn, iterations) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    cls, level = "Wizard", 12
+    print(f"{'abilities':>9} {'view scan us':>12} {'view index us':>13} "
+          f"{'levelup scan us':>15} {'levelup index us':>16} {'build ms':>9}")
+    for scale in args.scales:
+        abilities = scaled_abilities(scale)
+        start = time.perf_counter()
+        index = AbilityIndex(abilities)
+        build_ms = (time.perf_counter() - start) * 1000
+        assert list(index.known(cls, level)) == scan(abilities, cls, level)
+        assert ({a["id"] for a in index.unlocked_between(cls, level - 1, level)}
+                == {a["id"] for a in scan_level_up(abilities, cls, level - 1, level)})
+        print(f"{len(abilities):>9} "
+              f"{per_call_us(lambda: scan(abilities, cls, level), args.iterations):>12.2f} "
+              f"{per_call_us(lambda: index.known(cls, level), args.iterations):>13.2f} "
+              f"{per_call_us(lambda: scan_level_up(abilities, cls, level - 1, level), args.iterations):>15.2f} "
+              f"{per_call_us(lambda: index.unlocked_between(cls, level - 1, level), args.iterations):>16.2f} "
+              f"{build_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
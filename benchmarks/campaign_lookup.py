@@ -0,0 +1,93 @@
+"""Per-request campaign lookup cost as the campaign grows.
+
+Resolves a stored position (act number, location name, area id) and the
+current area's connected areas, as every game-view request does, against
+campaigns made by repeating every location of campaign.json --scale times
+per act. Compares the previous linear scans with CampaignIndex; the
+position looked up is the last area of the last location of the last act.
+
+    python benchmarks/campaign_lookup.py [--scales 1 10 100] [--iterations 20000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from catalog import thaw
+from web.campaign import CampaignIndex
+from web.game_session import get_campaign
+
+
+def scaled_campaign(scale: int) -> dict:
+    campaign = thaw(get_campaign())
+    for act in campaign["acts"]:
+        act["locations"] = [{**loc, "name": f"{loc['name']} {i}" if i else loc["name"]}
+                            for i in range(scale) for loc in act["locations"]]
+    return campaign
+
+
+def linear(campaign, act_num, location_name, area_id):
+    """The scans GameSession.from_dict() and game_view used to do."""
+    act = location = area = None
+    for a in campaign["acts"]:
+        if a.get("number") == act_num:
+            act = a
+            break
+    for loc in act.get("locations", []):
+        if loc.get("name") == location_name:
+            location = loc
+            break
+    for ar in location.get("areas", []):
+        if ar.get("id") == area_id:
+            area = ar
+            break
+    connected = []
+    for conn_id in area["connections"]:
+        for a in location.get("areas", []):
+            if a["id"] == conn_id:
+                connected.append(a)
+                break
+    return area, connected
+
+
+def indexed(index, act_num, location_name, area_id):
+    act = index.act(act_num)
+    location = index.location(act["number"], location_name)
+    area = index.area(act["number"], location["name"], area_id)
+    return area, index.neighbors(act["number"], location["name"], area_id)
+
+
+def per_call_us(fn, iterations) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    print(f"{'areas':>7} {'linear us':>10} {'index us':>9} {'build ms':>9}")
+    for scale in args.scales:
+        campaign = scaled_campaign(scale)
+        start = time.perf_counter()
+        index = CampaignIndex(campaign)
+        build_ms = (time.perf_counter() - start) * 1000
+        act = campaign["acts"][-1]
+        location = act["locations"][-1]
+        key = (act["number"], location["name"], location["areas"][-1]["id"])
+        assert linear(campaign, *key) == indexed(index, *key)
+        areas = sum(len(loc["areas"]) for a in campaign["acts"] for loc in a["locations"])
+        print(f"{areas:>7} {per_call_us(lambda: linear(campaign, *key), args.iterations):>10.2f} "
+              f"{per_call_us(lambda: indexed(index, *key), args.iterations):>9.2f} {build_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Catalog file reads per request.
+
+Plays a short game (create a character, look around, move, fight, shop,
+rest) and counts how many json/ catalog files each request opens. Opens are
+counted by wrapping open(), so the script measures any version of the code.
+The first pass includes the one-time catalog load; later passes show the
+steady state.
+
+    python benchmarks/catalog_reads.py [--passes 3]
+"""
+
+import argparse
+import builtins
+import random
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient
+
+from web import settings as settings_module
+from web import session_store
+from web.app import app
+from web.settings import Settings
+
+CATALOG_DIR = (ROOT / "json").resolve()
+
+FLOW = (
+    ("GET", "/game", None),
+    ("GET", "/game/status", None),
+    ("POST", "/game/move", {"area_id": "tavern"}),
+    ("POST", "/game/move", {"area_id": "town_square"}),
+    ("GET", "/battle/start", None),
+    ("GET", "/battle", None),
+    ("GET", "/battle/status", None),
+    ("POST", "/battle/attack", None),
+    ("GET", "/shop", None),
+    ("GET", "/inventory", None),
+    ("POST", "/game/rest", None),
+)
+
+reads = Counter()
+
+
+def counting_open(real_open):
+    def open_(file, *args, **kwargs):
+        try:
+            if Path(file).resolve().parent == CATALOG_DIR:
+                reads["total"] += 1
+        except TypeError:
+            pass
+        return real_open(file, *args, **kwargs)
+    return open_
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--passes", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    random.seed(1)
+    real_open = builtins.open
+    builtins.open = counting_open(real_open)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            settings_module._settings = Settings(sessions_dir=Path(tmp))
+            session_store._store = None
+            with TestClient(app) as client:
+                client.get("/character/new")
+                client.post("/character/race", data={"race": "Human"})
+                client.post("/character/class", data={"class_name": "Fighter"})
+                client.post("/character/create", data={"name": "Bench", "weapon": "Longsword",
+                                                       "armor": "", "skills": ["Athletics"]})
+                print(f"{'pass':>4} {'requests':>9} {'catalog reads':>14} {'per request':>12}")
+                for n in range(1, args.passes + 1):
+                    before = reads["total"]
+                    for method, url, form in FLOW:
+                        client.request(method, url, data=form, follow_redirects=False)
+                    count = reads["total"] - before
+                    print(f"{n:>4} {len(FLOW):>9} {count:>14} {count / len(FLOW):>12.1f}")
+            session_store._store = None
+    finally:
+        builtins.open = real_open
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""resolve_ability and end_battle with dict catalogs versus typed records.
+
+resolve_ability is timed for every ability in abilities.json in turn (at
+character level 11, so scaling applies), once with the previous code reading
+the ability's nested dicts and once with the AbilityDef record. end_battle
+is timed for a won battle against a Goblin with two Goblin quests active,
+once with quest progress read from quests.json dicts (the previous
+check_quest_progress) and once from QuestDef records. Dice are seeded
+identically for both variants; only the timed call is measured, not the
+per-iteration reset of the session.
+
+    python benchmarks/catalog_records.py [--iterations 20000]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from characterFactory import CharacterFactory
+from dice import Dice
+from engine.combatant import CombatantState
+from engine.effects import get_effect_bonus
+from items import QuestItem
+from monsterFactory import MonsterFactory
+from records import ability_defs
+from web.game_session import GameSession, get_abilities, get_primary_modifier, get_quests
+from web.routes import battle
+
+
+def resolve_ability_dict(session, ability, ability_id):
+    """resolve_ability as it was, reading the ability's catalog dicts."""
+    char = session.character
+    battle = session.battle
+    primary_mod = get_primary_modifier(char)
+    if char.power_points < ability["cost"]:
+        return False
+    char.power_points -= ability["cost"]
+    attack_method = ability["attack_method"]
+    target = ability["target"]
+    hit = True
+    if target == "enemy" and attack_method in ("melee_attack", "spell_attack"):
+        attack_bonus = get_effect_bonus(battle.player_effects, "attack_bonus")
+        attack_roll = Dice.roll_d20() + primary_mod + char.proficiency_bonus + attack_bonus
+        effective_ac = battle.monster_ac + get_effect_bonus(battle.monster_effects, "ac")
+        if attack_roll >= effective_ac:
+            battle.battle_log.append(f"{char.name} uses {ability['name']}! (Roll: {attack_roll} vs AC {effective_ac}) Hit!")
+        else:
+            battle.battle_log.append(f"{char.name} uses {ability['name']}! (Roll: {attack_roll} vs AC {effective_ac}) Miss!")
+            hit = False
+    elif target == "enemy" and attack_method == "spell_save":
+        spell_dc = 8 + primary_mod + char.proficiency_bonus
+        save_ability = ability.get("save_ability", "Dexterity").lower()
+        save_mod = getattr(battle, f"monster_{save_ability[:3]}_modifier", 0)
+        save_roll = Dice.roll_d20() + save_mod
+        if save_roll >= spell_dc:
+            battle.battle_log.append(f"{char.name} casts {ability['name']}! ({battle.monster_name} saves: {save_roll} vs DC {spell_dc}) Half damage!")
+            hit = False
+        else:
+            battle.battle_log.append(f"{char.name} casts {ability['name']}! ({battle.monster_name} fails save: {save_roll} vs DC {spell_dc})")
+    elif target == "self":
+        battle.battle_log.append(f"{char.name} uses {ability['name']}!")
+    elif attack_method == "auto_hit":
+        battle.battle_log.append(f"{char.name} uses {ability['name']}!")
+    if ability.get("damage") and target == "enemy":
+        dmg_data = ability["damage"]
+        dice_count = dmg_data["dice_count"]
+        if ability.get("scaling"):
+            for level_str in sorted(ability["scaling"].keys(), key=int, reverse=True):
+                if char.level >= int(level_str):
+                    dice_count = ability["scaling"][level_str].get("dice_count", dice_count)
+                    break
+        damage = 0
+        for _ in range(dice_count):
+            damage += Dice.roll(dmg_data["dice_size"])
+        bonus = dmg_data.get("bonus", 0)
+        if bonus == "ability_modifier":
+            damage += primary_mod
+        elif bonus == "level":
+            damage += char.level
+        elif isinstance(bonus, int):
+            damage += bonus
+        damage = max(1, damage)
+        damage += get_effect_bonus(battle.player_effects, "damage_bonus")
+        if attack_method == "spell_save" and not hit:
+            damage = max(1, damage // 2)
+            hit = True
+        if hit:
+            dr = get_effect_bonus(battle.monster_effects, "damage_reduction")
+            damage = max(1, damage - dr)
+            battle.monster_hp = max(0, battle.monster_hp - damage)
+            battle.battle_log.append(f"  {ability['name']} deals {damage} {dmg_data.get('type', '')} damage!")
+    if ability.get("heal"):
+        heal_data = ability["heal"]
+        heal = 0
+        for _ in range(heal_data["dice_count"]):
+            heal += Dice.roll(heal_data["dice_size"])
+        bonus = heal_data.get("bonus", 0)
+        if bonus == "ability_modifier":
+            heal += primary_mod
+        elif bonus == "level":
+            heal += char.level
+        elif isinstance(bonus, int):
+            heal += bonus
+        heal = max(1, heal)
+        old_hp = char.current_hit_points
+        char.current_hit_points = min(char.max_hit_points, char.current_hit_points + heal)
+        if char.current_hit_points - old_hp > 0:
+            battle.battle_log.append(f"  {char.name} heals for {char.current_hit_points - old_hp} HP!")
+    for effect in ability.get("effects", []):
+        eff = {"stat": effect["stat"], "value": effect["value"],
+               "duration": effect["duration"], "source": ability["name"]}
+        if target == "enemy":
+            battle.monster_effects.append(eff)
+            battle.battle_log.append(f"  {battle.monster_name}: {effect['stat'].replace('_', ' ')} {effect['value']:+d}")
+        else:
+            battle.player_effects.append(eff)
+            if effect["value"] > 0:
+                battle.battle_log.append(f"  {char.name}: {effect['stat'].replace('_', ' ')} {effect['value']:+d}")
+    return True
+
+
+def check_quest_progress_dict(active_quests, all_quests, monster_race, inventory):
+    """engine.quests.check_quest_progress as it was, reading quests.json dicts."""
+    updates = []
+    for quest_id, quest_state in list(active_quests.items()):
+        if quest_state["status"] != "active":
+            continue
+        quest_def = all_quests.get(quest_id)
+        if not quest_def or quest_def["target_monster"] != monster_race:
+            continue
+        if quest_def["type"] == "kill":
+            quest_state["progress"] = quest_state.get("progress", 0) + 1
+            updates.append(f"{quest_def['name']}: {quest_state['progress']}/{quest_def['target_count']}")
+        elif quest_def["type"] == "gather":
+            qi = quest_def.get("quest_item", {})
+            if random.random() < qi.get("drop_chance", 0.5):
+                inventory.append(QuestItem(qi["name"], qi.get("description", ""), quest_id))
+                count = sum(1 for it in inventory if isinstance(it, QuestItem) and it.quest_id == quest_id)
+                quest_state["progress"] = count
+                updates.append(f"{quest_def['name']}: found {qi['name']}! ({count}/{quest_def['target_count']})")
+            else:
+                updates.append(f"{quest_def['name']}: no {qi['name']} dropped this time")
+        if quest_state["progress"] >= quest_def["target_count"]:
+            quest_state["status"] = "ready"
+    return updates
+
+
+def battle_session(saved: str) -> GameSession:
+    session = GameSession.from_dict(json.loads(saved))
+    session.character.power_points = 1000
+    monster = MonsterFactory().create_monster("Grak", "Goblin", "Rogue", 3, "Club")
+    session.battle.monster = CombatantState.from_monster(monster)
+    session.battle.monster.hp = 10 ** 6
+    session.battle.is_active = True
+    session.battle.round_count = 4
+    session.active_quests = {"goblin_menace": {"progress": 0, "status": "active"},
+                             "goblin_ears": {"progress": 0, "status": "active"}}
+    return session
+
+
+def time_resolve(saved, iterations, use_records) -> float:
+    dicts, records = get_abilities(), ability_defs()
+    ids = list(dicts)
+    random.seed(1)
+    total = 0.0
+    session = battle_session(saved)
+    for i in range(iterations):
+        ability_id = ids[i % len(ids)]
+        if i % len(ids) == 0:
+            session = battle_session(saved)
+        start = time.perf_counter()
+        if use_records:
+            battle.resolve_ability(session, records[ability_id])
+        else:
+            resolve_ability_dict(session, dicts[ability_id], ability_id)
+        total += time.perf_counter() - start
+    return total / iterations * 1e6
+
+
+class _Request:
+    session = {}
+
+
+async def _no_save(request, session):
+    pass
+
+
+def time_end_battle(saved, iterations, use_records) -> float:
+    originals = battle.save_session, battle.quest_defs, battle.check_quest_progress
+    battle.save_session = _no_save
+    if not use_records:
+        battle.quest_defs, battle.check_quest_progress = get_quests, check_quest_progress_dict
+
+    async def run():
+        total = 0.0
+        for _ in range(iterations):
+            session = battle_session(saved)
+            start = time.perf_counter()
+            await battle.end_battle(_Request(), session, player_won=True)
+            total += time.perf_counter() - start
+        return total
+
+    random.seed(2)
+    try:
+        return asyncio.run(run()) / iterations * 1e6
+    finally:
+        battle.save_session, battle.quest_defs, battle.check_quest_progress = originals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    character = CharacterFactory().create_character("Bench", "Human", "Wizard")
+    character.level = 11
+    session = GameSession("bench")
+    session.character_creation.race, session.character_creation.class_name = "Human", "Wizard"
+    session.character_creation.name = "Bench"
+    session.character = character
+    saved = json.dumps(session.to_dict())
+
+    print(f"{'':>16} {'dicts us':>9} {'records us':>11}")
+    print(f"{'resolve_ability':>16} {time_resolve(saved, args.iterations, False):>9.2f} "
+          f"{time_resolve(saved, args.iterations, True):>11.2f}")
+    iterations = max(1, args.iterations // 10)
+    print(f"{'end_battle':>16} {time_end_battle(saved, iterations, False):>9.2f} "
+          f"{time_end_battle(saved, iterations, True):>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""First-request latency after startup, with and without the warm-up.
+
+Each run starts a fresh interpreter, starts the app (lifespan included),
+waits for /health to report it ready and plays one character through creation, the game page, a battle, the
+inventory and the shop, timing every request. The first pass is the cold
+start; the pass is then repeated --passes times for the steady state. Runs
+alternate between AIVENTURES_STARTUP_WARMUP=1 and 0 and use a scratch
+sessions directory.
+
+    python benchmarks/cold_start.py [--runs 5] [--passes 30]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+from fastapi.testclient import TestClient
+from web.app import app
+
+PAGES = (
+    ("GET", "/character/new", None), ("POST", "/character/race", {"race": "Human"}),
+    ("POST", "/character/class", {"class_name": "Fighter"}), ("GET", "/character/details", None),
+    ("POST", "/character/create", {"name": "Bench", "weapon": "Longsword", "armor": "Chain Mail",
+                                   "skills": ["Athletics", "Perception"]}),
+    ("GET", "/game", None), ("GET", "/battle/start", None), ("POST", "/battle/attack", None),
+    ("POST", "/battle/defend", None), ("GET", "/inventory", None), ("GET", "/shop", None),
+    ("GET", "/game/status", None),
+)
+
+def play(client):
+    samples = []
+    for method, path, data in PAGES:
+        start = time.perf_counter()
+        client.request(method, path, data=data)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+with TestClient(app) as client:
+    while client.get("/health").status_code == 503:   # as a load balancer waits for readiness
+        time.sleep(0.005)
+    cold = play(client)
+    steady = [sample for _ in range(int(sys.argv[2])) for sample in play(client)]
+print(json.dumps({"cold": cold, "steady": steady}))
+"""
+
+
+def run_child(warmup: bool, passes: int, sessions_dir: str) -> dict:
+    env = {**os.environ, "AIVENTURES_STARTUP_WARMUP": "1" if warmup else "0",
+           "AIVENTURES_SESSIONS_DIR": sessions_dir, "AIVENTURES_CONTENT_RELOAD_INTERVAL": "0"}
+    out = subprocess.run([sys.executable, "-c", CHILD, str(ROOT), str(passes)], env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def p99(samples) -> float:
+    if len(samples) < 2:
+        return samples[0] * 1000
+    return statistics.quantiles(samples, n=100, method="inclusive")[98] * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--passes", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    results = {True: {"cold": [], "steady": []}, False: {"cold": [], "steady": []}}
+    with tempfile.TemporaryDirectory() as sessions_dir:
+        for _ in range(args.runs):
+            for warmup in (True, False):
+                run = run_child(warmup, args.passes, sessions_dir)
+                results[warmup]["cold"] += run["cold"]
+                results[warmup]["steady"] += run["steady"]
+
+    print(f"{'warm-up':>8} {'cold p99 ms':>12} {'cold max ms':>12} {'steady p99 ms':>14}")
+    for warmup in (False, True):
+        cold, steady = results[warmup]["cold"], results[warmup]["steady"]
+        print(f"{'on' if warmup else 'off':>8} {p99(cold):>12.2f} {max(cold) * 1000:>12.2f} {p99(steady):>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Dice rolls per second: the randint() per die of the old Dice against the
+buffered DiceStream backends.
+
+Rolls --rolls dice of each of d4 to d100 (--rolls d20s for "d20 only") with:
+the old implementation (a copy of it, random.randint() per die), the Dice
+façade on the default global stream, the façade on a DiceStream (random and,
+with NumPy installed, numpy backends) and DiceStream.roll() called directly.
+
+    python benchmarks/dice.py [--rolls 200000] [--block 4096]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dice import Dice, DiceStream, np, use_stream
+
+SIDES = (4, 6, 8, 10, 12, 20, 100)
+
+
+class OldDice:
+    """Dice as it was before the streams."""
+
+    @staticmethod
+    def roll(dice_type: int) -> int:
+        return random.randint(1, dice_type)
+
+    @staticmethod
+    def roll_d20() -> int:
+        return OldDice.roll(20)
+
+
+def rate(roll, sides, rolls) -> float:
+    start = time.perf_counter()
+    for size in sides:
+        for _ in range(rolls):
+            roll(size)
+    return len(sides) * rolls / (time.perf_counter() - start)
+
+
+def rate_d20(roll_d20, rolls) -> float:
+    start = time.perf_counter()
+    for _ in range(rolls):
+        roll_d20()
+    return rolls / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rolls", type=int, default=200000)
+    parser.add_argument("--block", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    backends = ["random"] + (["numpy"] if np is not None else [])
+    results = [("old Dice (randint per die)", rate(OldDice.roll, SIDES, args.rolls),
+                rate_d20(OldDice.roll_d20, args.rolls)),
+               ("Dice, global random", rate(Dice.roll, SIDES, args.rolls), rate_d20(Dice.roll_d20, args.rolls))]
+    for backend in backends:
+        with use_stream(DiceStream(1, backend, args.block)):
+            results.append((f"Dice, {backend} stream", rate(Dice.roll, SIDES, args.rolls),
+                            rate_d20(Dice.roll_d20, args.rolls)))
+        stream = DiceStream(1, backend, args.block)
+        results.append((f"{backend} stream.roll()", rate(stream.roll, SIDES, args.rolls),
+                        rate_d20(lambda: stream.roll(20), args.rolls)))
+
+    baseline = results[0][1]
+    print(f"{'':<28} {'d4-d100 rolls/s':>16} {'d20 rolls/s':>14} {'speedup':>8}")
+    for name, mixed, d20 in results:
+        print(f"{name:<28} {mixed:>16,.0f} {d20:>14,.0f} {mixed / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Character creation options and equip checks: per-request loops versus the matrix.
+
+The weapon and armor options for the details page are built once per class with
+the previous per-request loop over the whole catalog, and once from the
+EquipmentEligibility matrix. An equip check (class proficiency for one weapon)
+is timed the same way. Each is measured with the shipped catalog and with one
+scaled by --scale (copies of every class, weapon and armor under new names).
+
+    python benchmarks/eligibility.py [--iterations 20000] [--scale 10]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from web.eligibility import EquipmentEligibility
+from web.game_session import get_classes, get_all_weapons_flat, get_all_armors_flat
+
+
+def options_loop(class_props, weapons, armors):
+    """details_page's option lists as they were built on every request."""
+    available_weapons = []
+    for w_name, w_data in weapons.items():
+        if ("Simple" in class_props["weapon_proficiencies"] and w_data["category"] == "Simple") or \
+           ("Martial" in class_props["weapon_proficiencies"] and w_data["category"] == "Martial") or \
+           w_name in class_props["weapon_proficiencies"]:
+            available_weapons.append({
+                "name": w_name, "damage_die": w_data["damage_die"], "damage_type": w_data["damage_type"],
+                "category": w_data["category"], "properties": ", ".join(w_data.get("properties", [])) or "None",
+                "description": w_data.get("description", ""),
+            })
+    available_armors = []
+    for a_name, a_data in armors.items():
+        if a_data["category"] in class_props["armor_training"]:
+            available_armors.append({
+                "name": a_name, "base_ac": a_data["base_ac"], "category": a_data["category"],
+                "weight": a_data["weight"], "stealth_disadvantage": a_data["stealth_disadvantage"],
+            })
+    return available_weapons, available_armors
+
+
+def can_use_loop(class_props, weapons, weapon_name):
+    """The inventory proficiency check as it was."""
+    proficiencies = class_props.get("weapon_proficiencies", [])
+    category = weapons[weapon_name]["category"]
+    return category in proficiencies or weapon_name in proficiencies
+
+
+def scaled(catalog: dict, scale: int) -> dict:
+    return {f"{name} {i}" if i else name: data for i in range(scale) for name, data in catalog.items()}
+
+
+def per_call_us(fn, iterations) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run(classes, weapons, armors, iterations):
+    eligibility = EquipmentEligibility(classes, weapons, armors)
+    names = list(classes)
+    weapon_names = list(weapons)
+    state = {"i": 0}
+
+    def next_class():
+        state["i"] += 1
+        return names[state["i"] % len(names)]
+
+    def loop_options():
+        options_loop(classes[next_class()], weapons, armors)
+
+    def matrix_options():
+        class_name = next_class()
+        eligibility.weapon_options(class_name), eligibility.armor_options(class_name)
+
+    def loop_check():
+        can_use_loop(classes[next_class()], weapons, weapon_names[state["i"] % len(weapon_names)])
+
+    def matrix_check():
+        eligibility.can_use_weapon(next_class(), weapon_names[state["i"] % len(weapon_names)])
+
+    return (per_call_us(loop_options, iterations), per_call_us(matrix_options, iterations),
+            per_call_us(loop_check, iterations), per_call_us(matrix_check, iterations))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--scale", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    classes, weapons, armors = get_classes(), get_all_weapons_flat(), get_all_armors_flat()
+    print(f"{'catalog':>8} {'options loop us':>16} {'matrix us':>10} {'check loop us':>14} {'matrix us':>10}")
+    for label, scale in (("1x", 1), (f"{args.scale}x", args.scale)):
+        timings = run(scaled(classes, scale), scaled(weapons, scale), scaled(armors, scale), args.iterations)
+        print(f"{label:>8} {timings[0]:>16.2f} {timings[1]:>10.2f} {timings[2]:>14.2f} {timings[3]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Encounters generated per second: Monster entities versus compiled templates.
+
+Each encounter picks a race and level for an area of the campaign (cycling
+through every area with encounters) and produces the CombatantState the
+battle stores. "entity" is the previous /battle/start path: the area's
+encounterLevel string parsed per encounter, a full Monster built by
+MonsterFactory.create_monster() and copied with CombatantState.from_monster().
+"template" is the current one: the AreaDef's parsed level range and
+MonsterFactory.create_combatant().
+
+    python benchmarks/encounters.py [--encounters 50000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from engine.combatant import CombatantState
+from monsterFactory import MonsterFactory
+from web.campaign import get_campaign_index
+from web.game_session import get_campaign
+from web.routes.battle import get_monster_for_area
+
+
+def monster_for_area_dict(area, location):
+    """get_monster_for_area as it was, parsing the location's level string."""
+    monster_types = area.get("monster_types", ["Goblin"])
+    level_range = location.get("encounterLevel", "1-2")
+    low, high = map(int, str(level_range).split("-"))
+    return random.choice(monster_types), random.randint(low, high)
+
+
+def entity_encounter(area, location):
+    race, level = monster_for_area_dict(area, location)
+    factory = MonsterFactory()
+    if race not in factory.templates:
+        race = "Goblin"
+    template = factory.templates[race]
+    monster = factory.create_monster(name=random.choice(template.names), race=race,
+                                     class_name=random.choice(template.class_options),
+                                     monster_level=level, weapon_name=random.choice(template.weapons))
+    return CombatantState.from_monster(monster)
+
+
+def template_encounter(area_def):
+    race, level = get_monster_for_area(area_def)
+    return MonsterFactory().create_combatant(race, level)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--encounters", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    index = get_campaign_index()
+    areas = [(area, location, index.area_def(act["number"], location["name"], area["id"]))
+             for act in get_campaign()["acts"] for location in act["locations"]
+             for area in location["areas"] if area.get("encounters", 0) > 0]
+
+    random.seed(1)
+    start = time.perf_counter()
+    for i in range(args.encounters):
+        area, location, _ = areas[i % len(areas)]
+        entity_encounter(area, location)
+    entity = args.encounters / (time.perf_counter() - start)
+
+    random.seed(1)
+    start = time.perf_counter()
+    for i in range(args.encounters):
+        template_encounter(areas[i % len(areas)][2])
+    template = args.encounters / (time.perf_counter() - start)
+
+    print(f"{'':>9} {'encounters/s':>13}")
+    print(f"{'entity':>9} {entity:>13,.0f}")
+    print(f"{'template':>9} {template:>13,.0f}  ({template / entity:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
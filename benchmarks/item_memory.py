@@ -0,0 +1,107 @@
+"""Memory held by cached sessions, with shared vs. per-session Weapon/Armor objects.
+
+Restores --sessions copies of a session whose character has a weapon and
+armor equipped and a few weapons and armor pieces in the pack (as the
+session cache holds them once a request has used the character), and
+reports the memory they hold, measured with tracemalloc. Runs twice:
+
+- copies:  every get_weapon_by_name()/get_armor_by_name() builds a new
+           object, as before items were shared
+- shared:  the factories hand out one immutable object per catalog entry
+
+    python benchmarks/item_memory.py [--sessions 10000]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from weapon import Weapon
+from armor import Armor
+from weaponFactory import WeaponFactory
+from armorFactory import ArmorFactory
+from characterFactory import CharacterFactory
+from items import HealingPotion
+from character import WeaponSlot
+from catalog import weapons_by_name, armors_by_name
+from web.game_session import GameSession
+
+PACK_WEAPONS = ("Shortbow", "Dagger", "Handaxe", "Mace")
+PACK_ARMOR = ("Leather", "Chain Shirt")
+
+
+def stored_session() -> dict:
+    weapons, armors = WeaponFactory(), ArmorFactory()
+    char = CharacterFactory().create_character("Hero", "Human", "Fighter")
+    char.equip_weapon(weapons.get_weapon_by_name("Longsword"), WeaponSlot.MAIN_HAND)
+    char.equip(armors.get_armor_by_name("Chain Mail"))
+    for name in PACK_WEAPONS:
+        char.add_item(weapons.get_weapon_by_name(name))
+    for name in PACK_ARMOR:
+        char.add_item(armors.get_armor_by_name(name))
+    char.add_item(HealingPotion("Small Healing Potion", 10))
+    session = GameSession("memory")
+    session.character = char
+    cc = session.character_creation
+    cc.name, cc.race, cc.class_name, cc.weapon, cc.armor = "Hero", "Human", "Fighter", "Longsword", "Chain Mail"
+    return json.loads(json.dumps(session.to_dict()))
+
+
+def new_weapon(self, weapon_name):
+    data = weapons_by_name()[weapon_name]
+    return Weapon(name=weapon_name, description=data.get("description", ""), damage_die=data["damage_die"],
+                  damage_type=data["damage_type"], category=data["category"],
+                  properties=list(data.get("properties", [])), damage_dice_count=data.get("damage_dice_count", 1))
+
+
+def new_armor(self, armor_name):
+    data = armors_by_name()[armor_name]
+    return Armor(name=armor_name, base_ac=data["base_ac"], category=data["category"])
+
+
+def measure(data, count) -> tuple:
+    GameSession.from_dict(data).character   # warm catalogs and shared items
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = []
+    for i in range(count):
+        session = GameSession.from_dict({**data, "session_id": f"s{i}"})
+        session.character
+        sessions.append(session)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    items = {id(item) for s in sessions for item in s.character.inventory}
+    return held, len(items)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    data = stored_session()
+    shared_weapon, shared_armor = WeaponFactory.get_weapon_by_name, ArmorFactory.get_armor_by_name
+    try:
+        WeaponFactory.get_weapon_by_name, ArmorFactory.get_armor_by_name = new_weapon, new_armor
+        copies = measure(data, args.sessions)
+    finally:
+        WeaponFactory.get_weapon_by_name, ArmorFactory.get_armor_by_name = shared_weapon, shared_armor
+    shared = measure(data, args.sessions)
+
+    print(f"{args.sessions} sessions, {len(PACK_WEAPONS) + len(PACK_ARMOR)} items in each pack")
+    print(f"{'mode':<8} {'MiB':>8} {'KiB/session':>12} {'distinct items':>15}")
+    for mode, (held, items) in (("copies", copies), ("shared", shared)):
+        print(f"{mode:<8} {held / 2**20:>8.1f} {held / args.sessions / 1024:>12.2f} {items:>15}")
+    print(f"saved: {(copies[0] - shared[0]) / 2**20:.1f} MiB ({1 - shared[0] / copies[0]:.0%})")
+
+
+if __name__ == "__main__":
+    main()
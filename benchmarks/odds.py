@@ -0,0 +1,80 @@
+"""Exact attack odds queries per millisecond, cold and warm.
+
+Draws --queries random weapon attacks (modifiers, proficiency, AC, dice and
+one to three effects a side, as in a battle) and times
+engine.odds.weapon_attack_odds() for each: once from an empty cache and
+then twice more warm, then attack_odds() with the bonuses already summed.
+For comparison, also times estimating the same odds by sampling --samples
+resolve_weapon_attack() rolls for a few of them.
+
+    python benchmarks/odds.py [--queries 100000] [--samples 1000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from engine.combat import resolve_weapon_attack
+from engine.effects import get_effect_bonus
+from engine.odds import attack_odds, cache_size, clear_cache, weapon_attack_odds
+
+STATS = ("attack_bonus", "damage_bonus", "ac", "damage_reduction")
+
+
+def random_effects(rng) -> list:
+    return [{"stat": rng.choice(STATS), "value": rng.randint(1, 3), "duration": rng.randint(0, 3),
+             "source": "Bench"} for _ in range(rng.randint(1, 3))]
+
+
+def random_query(rng) -> tuple:
+    return (rng.randint(-1, 5), rng.randint(2, 6), rng.randint(10, 22), rng.randint(1, 3),
+            rng.choice((4, 6, 8, 10, 12)), random_effects(rng), random_effects(rng))
+
+
+def per_ms(queries, seconds) -> float:
+    return len(queries) / (seconds * 1000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=100000)
+    parser.add_argument("--samples", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(1)
+    queries = [random_query(rng) for _ in range(args.queries)]
+
+    clear_cache()
+    for label in ("cold", "warm", "warm"):
+        start = time.perf_counter()
+        for query in queries:
+            weapon_attack_odds(*query)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>5}: {per_ms(queries, elapsed):>8,.0f} queries/ms "
+              f"({elapsed / len(queries) * 1e6:.2f} µs each, {cache_size()} cached entries)")
+
+    summed = [(mod + prof + get_effect_bonus(mine, "attack_bonus"), ac + get_effect_bonus(theirs, "ac"),
+               count, die, mod + get_effect_bonus(mine, "damage_bonus"),
+               get_effect_bonus(theirs, "damage_reduction"))
+              for mod, prof, ac, count, die, mine, theirs in queries]
+    start = time.perf_counter()
+    for query in summed:
+        attack_odds(*query)
+    elapsed = time.perf_counter() - start
+    print(f"summed: {per_ms(summed, elapsed):>7,.0f} queries/ms ({elapsed / len(summed) * 1e6:.2f} µs each)")
+
+    sampled = queries[:20]
+    start = time.perf_counter()
+    for query in sampled:
+        sum(resolve_weapon_attack(*query)["damage"] for _ in range(args.samples))
+    elapsed = time.perf_counter() - start
+    print(f"sampled ({args.samples} rolls per query): {per_ms(sampled, elapsed):,.2f} queries/ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Battle replays per second, and the size of a replay record against the log.
+
+Fights --battles seeded battles (seeds 0, 1, ...; a Fighter with a Longsword
+and two potions against --race monsters of --level, attacking, defending,
+drinking and power-striking in turn) and records them, then times
+web.replay.replay_battle() over all the records --repeat times. Prints a
+digest of every replayed log, which only changes if the engine does: run it
+before and after a change to check that battles still come out the same.
+
+    python benchmarks/replay.py [--battles 500] [--repeat 3] [--race Orc] [--level 2]
+"""
+
+import argparse
+import json
+import sys
+import time
+from hashlib import sha256
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from character import WeaponSlot
+from characterFactory import CharacterFactory
+from items import HealingPotion
+from weaponFactory import WeaponFactory
+from web.game_session import GameSession
+from web.replay import battle_record, replay_battle
+from web.routes.battle import play_recorded_action, start_recorded_battle
+
+POLICY = ("a", "d", "i:0", "a", "s:power_strike", "a")
+
+
+def new_session() -> GameSession:
+    session = GameSession("bench")
+    char = CharacterFactory().create_character("Hero", "Human", "Fighter")
+    char.equip_weapon(WeaponFactory().get_weapon_by_name("Longsword"), WeaponSlot.MAIN_HAND)
+    char.add_item(HealingPotion("Small Healing Potion", 10))
+    char.add_item(HealingPotion("Small Healing Potion", 10))
+    session.character = char
+    session.character_creation.name = "Hero"
+    session.character_creation.race = "Human"
+    session.character_creation.class_name = "Fighter"
+    session.character_creation.weapon = "Longsword"
+    return session
+
+
+def record_battle(seed: int, race: str, level: int) -> tuple:
+    """Fight a seeded battle to the end. Returns its record and full log."""
+    session = new_session()
+    start_recorded_battle(session, race, level, seed)
+    turn = 0
+    while play_recorded_action(session, POLICY[turn % len(POLICY)]) is None and turn < 200:
+        turn += 1
+    return battle_record(session.battle), session.battle.battle_log
+
+
+def compact(value) -> int:
+    return len(json.dumps(value, separators=(",", ":")).encode())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--battles", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--race", default="Orc")
+    parser.add_argument("--level", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    fought = [record_battle(seed, args.race, args.level) for seed in range(args.battles)]
+    records = [record for record, _ in fought]
+
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        replays = [replay_battle(record) for record in records]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    if any(replay["log"] != log for replay, (_, log) in zip(replays, fought)):
+        sys.exit("replayed logs differ from the fought battles")
+    rounds = sum(replay["rounds"] for replay in replays)
+    won = sum(replay["outcome"] == "won" for replay in replays)
+    digest = sha256("\n\n".join("\n".join(replay["log"]) for replay in replays).encode()).hexdigest()
+
+    log_bytes = sum(len("\n".join(log).encode()) for _, log in fought) / len(fought)
+    action_bytes = sum(compact([r["seed"], r["monster"], r["actions"]]) for r in records) / len(records)
+    record_bytes = sum(compact(r) for r in records) / len(records)
+
+    print(f"{len(records)} battles ({won} won), {rounds} rounds")
+    print(f"replay: {len(records) / best:,.0f} battles/s, {rounds / best:,.0f} rounds/s "
+          f"({best / len(records) * 1e6:.0f} µs per battle)")
+    print(f"log digest: {digest[:16]}")
+    print(f"bytes per battle: full log {log_bytes:,.0f}, seed and actions {action_bytes:,.0f}, "
+          f"with the starting character {record_bytes:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Size and encode/decode speed of the binary session format against JSON.
+
+Encodes a few representative sessions (a fresh visitor, a new character in
+town, a character mid-battle with a full log and inventory) both ways.
+
+    python benchmarks/session_format.py [--iterations 5000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from web.game_session import GameSession, get_campaign, get_default_shop_inventory
+from web.session_format import decode, encode
+from engine.combatant import CombatantState, WeaponState
+from characterFactory import CharacterFactory
+from weaponFactory import WeaponFactory
+from items import HealingPotion
+from character import WeaponSlot
+
+
+def sample_sessions() -> dict:
+    visitor = GameSession("visitor")
+
+    town = GameSession("town")
+    char = CharacterFactory().create_character("Hero", "Human", "Fighter")
+    char.equip_weapon(WeaponFactory().get_weapon_by_name("Longsword"), WeaponSlot.MAIN_HAND)
+    char.add_item(HealingPotion("Small Healing Potion", 10))
+    town.character = char
+    town.character_creation.name = "Hero"
+    town.character_creation.race = "Human"
+    town.character_creation.class_name = "Fighter"
+    town.act = get_campaign()["acts"][0]
+    town.current_location = town.act["locations"][0]
+    town.current_area = town.current_location["areas"][0]
+    town.shop_inventory = [{**item, "quantity": 5} for item in get_default_shop_inventory()]
+
+    battle = GameSession.from_dict(town.to_dict())
+    battle.session_id = "battle"
+    battle.character.add_item(WeaponFactory().get_weapon_by_name("Shortbow"))
+    battle.active_quests = {"goblin_menace": {"progress": 2, "status": "active"}}
+    battle.battle.monster = CombatantState(
+        name="Gruk", race="Orc", level=3, hp=30, max_hp=30, ac=13, base_ac=12,
+        str_mod=3, dex_mod=1, proficiency=1,
+        weapon=WeaponState(name="Greataxe", damage_die=12, properties=["heavy", "two-handed"]))
+    battle.battle.is_active = True
+    battle.battle.round_count = 6
+    battle.battle.battle_log = [f"Gruk hits for {i} damage!" for i in range(10)]
+
+    return {name: {**json.loads(json.dumps(s.to_dict())), "version": 7}
+            for name, s in (("visitor", visitor), ("town", town), ("battle", battle))}
+
+
+def per_call_us(fn, iterations) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    print(f"{'session':<8} {'format':<7} {'bytes':>6} {'encode us':>10} {'decode us':>10}")
+    for name, data in sample_sessions().items():
+        text, raw = json.dumps(data), encode(data)
+        assert decode(raw) == data
+        rows = (
+            ("json", len(text.encode()), lambda: json.dumps(data), lambda: json.loads(text)),
+            ("binary", len(raw), lambda: encode(data), lambda: decode(raw)),
+        )
+        for fmt, size, enc, dec in rows:
+            print(f"{name:<8} {fmt:<7} {size:>6} {per_call_us(enc, args.iterations):>10.1f} "
+                  f"{per_call_us(dec, args.iterations):>10.1f}")
+        print(f"{'':<8} binary is {len(text.encode()) / len(raw):.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
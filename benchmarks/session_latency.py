@@ -0,0 +1,121 @@
+"""Request latency under concurrent load, with session I/O on vs. off the event loop.
+
+Simulates players that each create a character and then alternate between
+viewing the game screen and resting, against a file session store whose
+reads and writes take --disk-latency-ms. Requests are issued open-loop at
+--rate requests/second in total and latency is measured from each request's
+scheduled send time, so time spent queued behind a blocked event loop counts.
+Runs the same load twice:
+
+- inline:  AIVENTURES_SESSION_IO_THREADS=0 (session I/O blocks the event loop)
+- pool:    the bounded session I/O thread pool
+
+    python benchmarks/session_latency.py [--clients 32] [--rounds 10] [--rate 100] [--disk-latency-ms 5]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import httpx
+
+from web import settings as settings_module
+from web import session_store
+from web.app import app
+from web.settings import Settings
+
+
+class SlowFileStore(session_store.FileSessionStore):
+    """File store with an artificial per-operation disk delay."""
+
+    def __init__(self, directory, latency):
+        super().__init__(directory)
+        self.latency = latency
+
+    def load(self, session_id):
+        time.sleep(self.latency)
+        return super().load(session_id)
+
+    def save(self, session_id, data, expected_version=None):
+        time.sleep(self.latency)
+        super().save(session_id, data, expected_version)
+
+    def append_deltas(self, session_id, ops, expected_version=None):
+        time.sleep(self.latency)
+        return super().append_deltas(session_id, ops, expected_version)
+
+
+async def player(client_factory, rounds, interval, latencies):
+    async with client_factory() as client:
+        await client.get("/character/new")
+        await client.post("/character/race", data={"race": "Human"})
+        await client.post("/character/class", data={"class_name": "Fighter"})
+        await client.post("/character/create", data={"name": "Bench", "weapon": "Longsword",
+                                                     "armor": "", "skills": ["Athletics"]})
+        await asyncio.sleep(interval * random.random())   # spread players out
+        scheduled = time.perf_counter()
+        for _ in range(rounds):
+            for method, url in (("GET", "/game"), ("POST", "/game/rest")):
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                response = await client.request(method, url)
+                latencies.append(time.perf_counter() - scheduled)
+                scheduled += interval
+                assert response.status_code in (200, 303), response.status_code
+
+
+async def run_load(clients, rounds, rate):
+    transport = httpx.ASGITransport(app=app)
+
+    def client_factory():
+        return httpx.AsyncClient(transport=transport, base_url="http://bench", follow_redirects=True)
+
+    latencies = []
+    start = time.perf_counter()
+    interval = clients / rate
+    await asyncio.gather(*(player(client_factory, rounds, interval, latencies) for _ in range(clients)))
+    return latencies, time.perf_counter() - start
+
+
+def measure(mode, io_threads, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        settings_module._settings = Settings(sessions_dir=Path(tmp), session_io_threads=io_threads)
+        session_store._store = SlowFileStore(Path(tmp), args.disk_latency_ms / 1000)
+        try:
+            latencies, elapsed = asyncio.run(run_load(args.clients, args.rounds, args.rate))
+        finally:
+            session_store.shutdown_store_io()
+            session_store._store = None
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{mode:<8} {len(latencies):>8} {len(latencies) / elapsed:>10.0f} {p50:>9.1f} {p99:>9.1f}")
+    return p99
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=100.0, help="total requests per second")
+    parser.add_argument("--disk-latency-ms", type=float, default=5.0)
+    parser.add_argument("--threads", type=int, default=Settings.session_io_threads)
+    args = parser.parse_args(argv)
+
+    print(f"{args.clients} clients x {args.rounds} rounds at {args.rate:g} req/s, "
+          f"{args.disk_latency_ms} ms simulated disk latency")
+    print(f"{'mode':<8} {'requests':>8} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    before = measure("inline", 0, args)
+    after = measure("pool", args.threads, args)
+    print(f"p99 improvement: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
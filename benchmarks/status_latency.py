@@ -0,0 +1,108 @@
+"""Latency of requests that do not need the full character object.
+
+The status endpoints and the redirect-only POSTs (moving between areas,
+exploring without an encounter) only read a few numbers from the character
+or just check that one exists. Each request is timed with the character
+rebuilt lazily (the default) and eagerly on every load, as before lazy
+hydration, along with GameSession.from_dict() on its own. The session cache
+is off, so every request loads the session from the store.
+
+    python benchmarks/status_latency.py [--requests 500]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient
+
+from web import settings as settings_module
+from web import session_store
+from web.app import app
+from web.game_session import GameSession
+from web.settings import Settings
+
+REQUESTS = (
+    ("GET", "/game/status", None),
+    ("GET", "/battle/status", None),
+    ("POST", "/game/move", {"area_id": "tavern"}),
+    ("POST", "/game/move", {"area_id": "town_square"}),
+    ("POST", "/game/explore", None),
+)
+
+
+def eager_from_dict():
+    """GameSession.from_dict as it was: rebuild the character on every load."""
+    lazy = GameSession.from_dict.__func__
+
+    def from_dict(cls, data):
+        session = lazy(cls, data)
+        session.character
+        return session
+    return classmethod(from_dict)
+
+
+def measure(client, iterations) -> dict:
+    store = session_store.get_store()
+    data = store.load(next(iter(store.session_ids())))
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        GameSession.from_dict(data)
+        samples.append(time.perf_counter() - start)
+    timings = {"GameSession.from_dict": statistics.median(samples)}
+    for method, url, form in REQUESTS:
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            response = client.request(method, url, data=form, follow_redirects=False)
+            samples.append(time.perf_counter() - start)
+            assert response.status_code in (200, 303), (url, response.status_code)
+        timings[f"{method} {url} {form['area_id'] if form else ''}".strip()] = statistics.median(samples)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint and mode")
+    args = parser.parse_args(argv)
+
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        settings_module._settings = Settings(sessions_dir=Path(tmp))
+        session_store._store = None
+        with TestClient(app) as client:
+            client.get("/character/new")
+            client.post("/character/race", data={"race": "Human"})
+            client.post("/character/class", data={"class_name": "Fighter"})
+            client.post("/character/create", data={"name": "Bench", "weapon": "Longsword",
+                                                   "armor": "", "skills": ["Athletics"]})
+            client.get("/battle/start")   # so /battle/status reports hit points
+            # explore only redirects when there is no encounter
+            random_before, random.random = random.random, lambda: 1.0
+            lazy_from_dict = GameSession.__dict__["from_dict"]
+            try:
+                GameSession.from_dict = eager_from_dict()
+                eager = measure(client, args.requests)
+                GameSession.from_dict = lazy_from_dict
+                lazy = measure(client, args.requests)
+            finally:
+                GameSession.from_dict = lazy_from_dict
+                random.random = random_before
+        session_store._store = None
+
+    print(f"{'request':<32} {'eager ms':>9} {'lazy ms':>9} {'speedup':>8}")
+    for name in eager:
+        print(f"{name:<32} {eager[name] * 1000:>9.2f} {lazy[name] * 1000:>9.2f} "
+              f"{eager[name] / lazy[name]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
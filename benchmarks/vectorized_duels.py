@@ -0,0 +1,80 @@
+"""Weapon duels per second: the scalar simulator versus the NumPy kernel.
+
+For a few builds and monsters (one with effects on both sides), plays
+--scalar battles with engine.simulate.simulate() (empty loadout, so weapon
+attacks only) and --duels with engine.vectorized.simulate_duels(), and
+prints both rates, the speedup and the win rate and mean rounds and damage
+taken of each, with the difference in standard errors (|z| below about 3
+means the two agree). Needs NumPy.
+
+    python benchmarks/vectorized_duels.py [--scalar 50000] [--duels 1000000]
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from engine.simulate import PlayerBuild, simulate
+from engine.vectorized import WIN, simulate_duels
+
+BLESSED = [{"stat": "attack_bonus", "value": 1, "duration": 3, "source": "Bless"},
+           {"stat": "damage_reduction", "value": 1, "duration": 0, "source": "Stoneskin"}]
+SHIELDED = [{"stat": "ac", "value": 2, "duration": 2, "source": "Shield"},
+            {"stat": "damage_bonus", "value": 1, "duration": 0, "source": "Rage"}]
+
+CASES = (
+    (("Dwarf", "Fighter", 3, "Longsword", "Chain Mail"), "Orc", 2, (), ()),
+    (("Elf", "Wizard", 2, "Dagger", None), "Goblin", 1, BLESSED, SHIELDED),
+    (("Halfling", "Rogue", 5, "Rapier", "Leather"), "Shadow Wraith", 4, (), ()),
+)
+
+
+def z_score(mean_a, var_a, n_a, mean_b, var_b, n_b) -> float:
+    se = math.sqrt(var_a / n_a + var_b / n_b)
+    return (mean_a - mean_b) / se if se else 0.0
+
+
+def compare(name, scalar_values, vector_values) -> str:
+    n_a, n_b = len(scalar_values), len(vector_values)
+    mean_a = sum(scalar_values) / n_a
+    var_a = sum((v - mean_a) ** 2 for v in scalar_values) / n_a
+    mean_b, var_b = float(vector_values.mean()), float(vector_values.var())
+    return f"{name} {mean_a:.3f}/{mean_b:.3f} (z {z_score(mean_a, var_a, n_a, mean_b, var_b, n_b):+.1f})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scalar", type=int, default=50000)
+    parser.add_argument("--duels", type=int, default=1000000)
+    args = parser.parse_args(argv)
+
+    for build_args, monster, level, player_effects, monster_effects in CASES:
+        build = PlayerBuild.create(*build_args, abilities=[])
+        random.seed(1)
+        start = time.perf_counter()
+        scalar = simulate(build, monster, level, args.scalar, player_effects=player_effects,
+                          monster_effects=monster_effects)
+        scalar_rate = args.scalar / (time.perf_counter() - start)
+        start = time.perf_counter()
+        vector = simulate_duels(build, monster, level, args.duels, player_effects=player_effects,
+                                monster_effects=monster_effects, rng=1)
+        vector_rate = args.duels / (time.perf_counter() - start)
+
+        wins = [1 if i < scalar["outcomes"]["win"] else 0 for i in range(args.scalar)]
+        won = vector["outcome"] == WIN
+        print(f"{build.race} {build.class_name} L{build.level} vs {monster} L{level}"
+              f"{' (with effects)' if player_effects else ''}")
+        print(f"  scalar {scalar_rate:,.0f}/s, vectorized {vector_rate:,.0f}/s ({vector_rate / scalar_rate:.0f}x)")
+        print("  " + ", ".join((compare("win rate", wins, won.astype(float)),
+                                compare("rounds to kill", scalar["rounds_to_kill"], vector["rounds"][won]),
+                                compare("damage taken", scalar["damage_taken"], vector["damage_taken"]))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Process-wide registry of the game data catalogs in json/.
+
+Each json/*.json file is read and parsed at most once per process and shared
+by every factory and web loader. The data handed out is read-only: dicts and
+lists are FrozenDict and FrozenList, which still behave as (and serialize
+like) plain dicts and lists but raise TypeError on modification, so one
+caller cannot change the catalog under another. Copy before changing:
+{**entry, ...} or list(values) give plain, mutable copies.
+
+Derived lookups (e.g. every weapon by name) are built once with index().
+
+At startup the app loads a precompiled bundle (see catalog_bundle.py) with
+load_bundle(): all files and INDEXES validated and stored in one file, read in
+one go. A bundle older than the JSON files is ignored in favour of the files.
+
+Content can change while the app runs (see web/content_reload.py): reload()
+builds a complete new Catalog next to the current one and set_catalog() swaps
+it in with a single assignment. A request pins the catalog it started with
+(pin_catalog()), so everything it looks up comes from one snapshot even if a
+swap happens halfway through.
+"""
+
+import contextvars
+import hashlib
+import json
+import marshal
+import os
+import struct
+import threading
+from pathlib import Path
+
+CATALOG_DIR = Path(__file__).parent / "json"
+BUNDLE_PATH = CATALOG_DIR / "catalog.bundle"
+
+BUNDLE_MAGIC = b"AIVC"
+BUNDLE_VERSION = 1
+BUNDLE_HEADER = struct.Struct(">4sB64s")   # magic, format version, sha256 of the sources (hex)
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only catalog data; copy it to modify")
+
+
+class FrozenDict(dict):
+    """A dict that cannot be modified."""
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+
+class FrozenList(list):
+    """A list that cannot be modified."""
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+
+def freeze(value):
+    """Read-only copy of parsed JSON data."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(v)) for key, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """Plain, mutable deep copy of catalog data."""
+    if isinstance(value, dict):
+        return {key: thaw(v) for key, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return value
+
+
+class Catalog:
+    """Loads catalog files on first use and keeps them for the life of the process."""
+
+    def __init__(self, directory=CATALOG_DIR):
+        self.directory = Path(directory)
+        self.disk_reads = 0
+        self.bundle_hash = None   # content hash of the loaded bundle, if any
+        self._files = {}
+        self._indexes = {}
+        self._builders = {}   # index name -> build function, so reload() can rebuild it
+        self._lock = threading.Lock()
+
+    def load(self, filename: str):
+        """The read-only contents of a catalog file, e.g. load("races.json")."""
+        try:
+            return self._files[filename]
+        except KeyError:
+            pass
+        with self._lock:
+            if filename not in self._files:
+                with open(self.directory / filename) as f:
+                    self._files[filename] = freeze(json.load(f))
+                self.disk_reads += 1
+            return self._files[filename]
+
+    def load_all(self) -> int:
+        """Load every catalog file now (e.g. at startup). Returns the file count."""
+        for path in self.source_files():
+            self.load(path.name)
+        return len(self._files)
+
+    def index(self, name: str, build):
+        """A lookup derived from catalog data, built once by build(catalog)
+        and frozen. Use one name per distinct build function."""
+        try:
+            return self._indexes[name]
+        except KeyError:
+            pass
+        value = freeze(build(self))
+        with self._lock:
+            self._builders.setdefault(name, build)
+            return self._indexes.setdefault(name, value)
+
+    def reload(self) -> "Catalog":
+        """A new Catalog of the same directory with every file read from disk
+        and every index this one has built rebuilt, ready to be swapped in.
+        Raises OSError or ValueError if a file cannot be read or parsed."""
+        catalog = Catalog(self.directory)
+        catalog.load_all()
+        builders = {**INDEXES, **self._builders}
+        for name in list(self._indexes):
+            if name in builders:
+                catalog.index(name, builders[name])
+        return catalog
+
+    def source_files(self) -> list:
+        """Paths of the catalog files, sorted."""
+        return sorted(self.directory.glob("*.json"))
+
+    def source_fingerprint(self) -> dict:
+        """{filename: [size, mtime_ns]} of the catalog files (no reads)."""
+        fingerprint = {}
+        for path in self.source_files():
+            st = path.stat()
+            fingerprint[path.name] = [st.st_size, st.st_mtime_ns]
+        return fingerprint
+
+    def source_hash(self) -> str:
+        """sha256 over the names and contents of the catalog files."""
+        digest = hashlib.sha256()
+        for path in self.source_files():
+            digest.update(path.name.encode() + b"\0" + path.read_bytes() + b"\0")
+        return digest.hexdigest()
+
+    def load_bundle(self, path=None) -> bool:
+        """Load every file and bundled index from a bundle built by
+        catalog_bundle.py. Returns False (loading nothing) when the bundle is
+        missing, unreadable, or does not match the current catalog files."""
+        path = Path(path or self.directory / BUNDLE_PATH.name)
+        try:
+            raw = path.read_bytes()
+            magic, version, content_hash = BUNDLE_HEADER.unpack_from(raw)
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                return False
+            bundle = marshal.loads(raw[BUNDLE_HEADER.size:])
+        except (OSError, struct.error, ValueError, EOFError, TypeError):
+            return False
+        # Unchanged sizes and mtimes mean unchanged files; otherwise (e.g.
+        # after a checkout) compare contents.
+        if (bundle["fingerprint"] != self.source_fingerprint()
+                and content_hash.decode() != self.source_hash()):
+            return False
+        with self._lock:
+            for filename, data in bundle["files"].items():
+                self._files.setdefault(filename, freeze(data))
+            for name, value in bundle["indexes"].items():
+                self._indexes.setdefault(name, freeze(value))
+            self.disk_reads += 1
+        self.bundle_hash = content_hash.decode()
+        return True
+
+    @property
+    def stats(self) -> dict:
+        return {"files": len(self._files), "indexes": len(self._indexes), "disk_reads": self.disk_reads,
+                "bundle": self.bundle_hash}
+
+
+_catalog = None
+_pinned = contextvars.ContextVar("catalog", default=None)
+
+
+def get_catalog() -> Catalog:
+    """Get the catalog registry: the one pinned for the current request, if
+    any, otherwise the process-wide one."""
+    global _catalog
+    pinned = _pinned.get()
+    if pinned is not None:
+        return pinned
+    if _catalog is None:
+        _catalog = Catalog()
+    return _catalog
+
+
+def set_catalog(catalog: Catalog):
+    """Make catalog the process-wide registry. Requests already running keep
+    the catalog they pinned."""
+    global _catalog
+    _catalog = catalog
+
+
+def pin_catalog():
+    """Pin the current catalog for the rest of this context (e.g. one request).
+    Returns a token for unpin_catalog()."""
+    return _pinned.set(get_catalog())
+
+
+def unpin_catalog(token):
+    _pinned.reset(token)
+
+
+def _by_name(filename: str):
+    """Flatten a catalog grouped by category ({category: {name: entry}}) into
+    {name: entry}, adding the category to each entry as "type"."""
+    def build(catalog):
+        return {name: {**entry, "type": category}
+                for category, entries in catalog.load(filename).items()
+                for name, entry in entries.items()}
+    return build
+
+
+# Indexes of plain catalog data, precomputed into the bundle
+INDEXES = {
+    "weapons_by_name": _by_name("weapon-catalog.json"),
+    "armors_by_name": _by_name("armor_catalog.json"),
+}
+
+
+def weapons_by_name(catalog: Catalog = None):
+    """Every weapon in weapon-catalog.json by name."""
+    return (catalog or get_catalog()).index("weapons_by_name", INDEXES["weapons_by_name"])
+
+
+def armors_by_name(catalog: Catalog = None):
+    """Every armor in armor_catalog.json by name."""
+    return (catalog or get_catalog()).index("armors_by_name", INDEXES["armors_by_name"])
@@ -0,0 +1,312 @@
+"""Validate the json/ catalogs and precompile them into one bundle file.
+
+    python -m catalog_bundle check            # validate only
+    python -m catalog_bundle build [--output json/catalog.bundle]
+
+validate() checks each catalog file against its schema in SCHEMAS and
+cross-checks the references between them (monster weapons exist in the
+weapon catalog, quest targets exist as monsters, area connections point at
+areas in the same location, ...). build() refuses to write a bundle for
+catalogs with problems, so data errors surface at build time instead of as
+KeyErrors mid-game.
+
+The bundle holds every file plus catalog.INDEXES, marshalled, behind a
+header with the sha256 of the source files; Catalog.load_bundle() reads it.
+
+A schema is a type (or tuple of types), OneOf(values), [schema] for a list
+of items, {field: schema} for an object (a field ending in "?" is optional,
+a "*" field matches any other key), or Each(schema) for an object of
+named entries that all match schema.
+"""
+
+import argparse
+import marshal
+import os
+import sys
+from pathlib import Path
+
+from catalog import BUNDLE_HEADER, BUNDLE_MAGIC, BUNDLE_PATH, BUNDLE_VERSION, INDEXES, Catalog, thaw
+
+number = (int, float)
+
+
+class Each:
+    def __init__(self, schema):
+        self.schema = schema
+
+
+class OneOf:
+    def __init__(self, *values):
+        self.values = values
+
+
+DICE = {"dice_count": int, "dice_size": int, "bonus?": (int, str), "type?": str}
+
+ABILITY = {
+    "name": str, "classes": [str], "cost": int, "unlock_level": int, "description": str,
+    "target": OneOf("self", "enemy"),
+    "attack_method?": OneOf("melee_attack", "spell_attack", "spell_save", "auto_hit"),
+    "save_ability?": str, "damage?": DICE, "heal?": DICE, "scaling?": Each({"dice_count": int}),
+    "effects?": [{"stat": str, "value": int, "duration": int}],
+}
+
+AREA = {
+    "id": str, "name": str, "description": str, "encounters": int, "connections": [str],
+    "special?": str, "monster_types?": [str], "boss?": str,
+}
+
+LOCATION = {
+    "name": str, "description": str, "type": str, "isHub?": bool, "encounterLevel": str,
+    "areas": [AREA], "starting_area?": str,
+}
+
+CAMPAIGN = {
+    "title": str, "description": str, "villain": {"name": str, "description": str},
+    "startingLocation": str, "levelRange": str,
+    "acts": [{
+        "number": int, "title": str, "description": str, "mainQuest": str, "locations": [LOCATION],
+        "bosses": [{"name": str, "description": str, "level": int, "type": str}],
+    }],
+}
+
+QUEST = {
+    "name": str, "type": OneOf("kill", "gather"), "act": int, "description": str,
+    "dialog_offer?": str, "dialog_progress?": str, "dialog_complete?": str,
+    "target_monster": str, "target_count": int,
+    "quest_item?": {"name": str, "description": str, "drop_chance": number},
+    "rewards": {"gold": int, "xp": int},
+}
+
+ABILITY_SCORES = ("Strength", "Dexterity", "Constitution", "Intelligence", "Wisdom", "Charisma")
+
+MONSTER = {
+    **{score: int for score in ABILITY_SCORES},
+    "base_ac": int, "hit_die": int, "weapon_name": str, "weapons": [str], "class_options": [str],
+    "names": [str], "challenge_rating": number,
+}
+
+WEAPON = {
+    "damage_die": int, "damage_dice_count?": int, "damage_type": str, "category": OneOf("Simple", "Martial"),
+    "properties": [str], "range?": str, "cost_gp": number, "weight": number, "description": str,
+}
+
+ARMOR = {
+    "category": OneOf("Light", "Medium", "Heavy", "Shields"), "base_ac": int, "cost_gp": number,
+    "weight": number, "strength_requirement": int, "stealth_disadvantage": bool, "description": str,
+}
+
+CLASS = {
+    "hit_die": int, "primary_ability": OneOf(*ABILITY_SCORES), "saving_throw_proficiencies": [str],
+    "skill_proficiency_choices": [str], "num_skill_choices": int, "armor_training": [str],
+    "weapon_proficiencies": [str],
+}
+
+SCHEMAS = {
+    "abilities.json": Each(ABILITY),
+    "armor_catalog.json": Each(Each(ARMOR)),
+    "campaign.json": CAMPAIGN,
+    "class_features_list.json": {"class_features": Each(dict)},
+    "classes_properties.json": Each(CLASS),
+    "monster_default_values.json": Each(MONSTER),
+    "monster_portraits.json": Each(str),
+    "monster_taunts.json": Each({"start": [str], "attack": [str], "hurt": [str]}),
+    "quests.json": Each(QUEST),
+    "races.json": Each({f"{score.lower()}_bonus": int for score in ABILITY_SCORES}),
+    "races_default_values.json": Each({**{score.lower(): int for score in ABILITY_SCORES}, "base_ac": int}),
+    "shop_inventory.json": [{"name": str, "healing": int, "price": int, "description": str}],
+    "shopkeeper.json": {"name": str, "title": str, "portrait": str, "*": [str]},
+    "weapon-catalog.json": Each(Each(WEAPON)),
+}
+
+
+def _type_name(expected) -> str:
+    if isinstance(expected, tuple):
+        return " or ".join(t.__name__ for t in expected)
+    return expected.__name__
+
+
+def check_schema(value, schema, path: str, errors: list):
+    """Append "path: problem" strings to errors for everything in value that
+    does not match schema."""
+    if isinstance(schema, Each):
+        if not isinstance(value, dict):
+            errors.append(f"{path}: expected an object, got {type(value).__name__}")
+            return
+        for key, item in value.items():
+            check_schema(item, schema.schema, f"{path}.{key}" if path else key, errors)
+    elif isinstance(schema, OneOf):
+        if value not in schema.values:
+            errors.append(f"{path}: {value!r} is not one of {', '.join(map(repr, schema.values))}")
+    elif isinstance(schema, list):
+        if not isinstance(value, list):
+            errors.append(f"{path}: expected a list, got {type(value).__name__}")
+            return
+        for i, item in enumerate(value):
+            check_schema(item, schema[0], f"{path}[{i}]", errors)
+    elif isinstance(schema, dict):
+        if not isinstance(value, dict):
+            errors.append(f"{path}: expected an object, got {type(value).__name__}")
+            return
+        fields = {name.rstrip("?"): sub for name, sub in schema.items()}
+        for name, sub in schema.items():
+            if not name.endswith("?") and name != "*" and name not in value:
+                errors.append(f"{path}: missing {name!r}")
+        for key, item in value.items():
+            sub = fields.get(key, schema.get("*"))
+            if sub is None:
+                errors.append(f"{path}: unexpected field {key!r}")
+            else:
+                check_schema(item, sub, f"{path}.{key}" if path else key, errors)
+    else:
+        # bool is an int subclass, but never a valid int or float here
+        if not isinstance(value, schema) or (isinstance(value, bool) and bool not in (
+                schema if isinstance(schema, tuple) else (schema,))):
+            errors.append(f"{path}: expected {_type_name(schema)}, got {type(value).__name__}")
+
+
+def _check_references(files: dict, errors: list, warnings: list):
+    def missing(source, path, name, kind, known, problems=errors):
+        if name not in known:
+            problems.append(f"{source}: {path} refers to unknown {kind} {name!r}")
+
+    weapons = {name for group in files["weapon-catalog.json"].values() for name in group}
+    armor_categories = {entry["category"] for group in files["armor_catalog.json"].values()
+                        for entry in group.values()}
+    monsters = set(files["monster_default_values.json"])
+    classes = set(files["classes_properties.json"])
+    campaign = files["campaign.json"]
+
+    for name, monster in files["monster_default_values.json"].items():
+        for weapon in [monster["weapon_name"], *monster["weapons"]]:
+            missing("monster_default_values.json", name, weapon, "weapon", weapons)
+        for class_name in monster["class_options"]:
+            missing("monster_default_values.json", name, class_name, "class", classes)
+
+    for quest_id, quest in files["quests.json"].items():
+        missing("quests.json", quest_id, quest["target_monster"], "monster", monsters)
+        missing("quests.json", quest_id, quest["act"], "act", {act["number"] for act in campaign["acts"]})
+
+    for ability_id, ability in files["abilities.json"].items():
+        for class_name in ability["classes"]:
+            missing("abilities.json", ability_id, class_name, "class", classes)
+
+    for class_name, props in files["classes_properties.json"].items():
+        # Proficiency lists follow the rules, not the catalog: a weapon the
+        # catalog lacks is simply never offered
+        for weapon in props["weapon_proficiencies"]:
+            missing("classes_properties.json", class_name, weapon, "weapon", weapons | {"Simple", "Martial"},
+                    warnings)
+        for category in props["armor_training"]:
+            missing("classes_properties.json", class_name, category, "armor category",
+                    armor_categories | {"Shields"})
+
+    if set(files["races.json"]) != set(files["races_default_values.json"]):
+        errors.append("races.json and races_default_values.json list different races")
+
+    for race in files["monster_taunts.json"]:
+        missing("monster_taunts.json", race, race, "monster", monsters | {"Default"})
+    for race in files["monster_portraits.json"]:
+        missing("monster_portraits.json", race, race, "monster", monsters | {"default"})
+
+    locations = set()
+    for act in campaign["acts"]:
+        for boss in act["bosses"]:   # bosses are not fought yet
+            missing("campaign.json", f"act {act['number']} boss {boss['name']}", boss["type"], "monster",
+                    monsters, warnings)
+        for location in act["locations"]:
+            locations.add(location["name"])
+            area_ids = [area["id"] for area in location["areas"]]
+            where = f"{location['name']}"
+            if len(set(area_ids)) != len(area_ids):
+                errors.append(f"campaign.json: {where} has duplicate area ids")
+            if "starting_area" in location:
+                missing("campaign.json", where, location["starting_area"], "area", area_ids)
+            for area in location["areas"]:
+                for connection in area["connections"]:
+                    missing("campaign.json", f"{where}/{area['id']}", connection, "area", area_ids)
+                for monster in area.get("monster_types", []):
+                    missing("campaign.json", f"{where}/{area['id']}", monster, "monster", monsters)
+    missing("campaign.json", "startingLocation", campaign["startingLocation"], "location", locations)
+
+
+def validate(files: dict, warnings: list = None) -> list:
+    """Problems with the catalogs ({filename: data}), as "file: path: problem"
+    strings. Empty when everything is valid. References that cannot break the
+    game (e.g. to content not written yet) are appended to warnings instead,
+    if given."""
+    errors = []
+    for filename, schema in SCHEMAS.items():
+        if filename not in files:
+            errors.append(f"{filename}: missing")
+        else:
+            file_errors = []
+            check_schema(files[filename], schema, "", file_errors)
+            errors.extend(f"{filename}: {error}" for error in file_errors)
+    for filename in files:
+        if filename not in SCHEMAS:
+            errors.append(f"{filename}: no schema (add one to catalog_bundle.SCHEMAS)")
+    if not errors:   # references are only checked once the shapes are right
+        _check_references(files, errors, warnings if warnings is not None else [])
+    return errors
+
+
+def load_sources(catalog: Catalog) -> dict:
+    """{filename: data} for every catalog file."""
+    catalog.load_all()
+    return {path.name: catalog.load(path.name) for path in catalog.source_files()}
+
+
+def build(directory=None, output=None, warnings: list = None) -> str:
+    """Validate the catalogs and write the bundle. Returns the content hash;
+    raises ValueError listing the problems if the catalogs are invalid."""
+    catalog = Catalog(directory) if directory else Catalog()
+    files = load_sources(catalog)
+    errors = validate(files, warnings)
+    if errors:
+        raise ValueError("Invalid catalogs:\n  " + "\n  ".join(errors))
+    # Hash and fingerprint taken before writing, so a file edited meanwhile
+    # makes the bundle stale rather than silently wrong
+    content_hash = catalog.source_hash()
+    payload = marshal.dumps({
+        "fingerprint": catalog.source_fingerprint(),
+        "files": thaw(files),
+        "indexes": {name: thaw(catalog.index(name, build_index)) for name, build_index in INDEXES.items()},
+    }, 4)
+    output = Path(output or catalog.directory / BUNDLE_PATH.name)
+    tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, content_hash.encode()) + payload)
+    os.replace(tmp, output)
+    return content_hash
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m catalog_bundle",
+                                     description="Validate and precompile the json/ game catalogs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("check", help="Validate the catalogs.")
+    build_cmd = sub.add_parser("build", help="Validate the catalogs and write the bundle.")
+    build_cmd.add_argument("--output", type=Path, default=BUNDLE_PATH)
+    args = parser.parse_args(argv)
+
+    warnings = []
+    if args.command == "check":
+        errors = validate(load_sources(Catalog()), warnings)
+        for problem in warnings + errors:
+            print(problem, file=sys.stderr)
+        if errors:
+            sys.exit(1)
+        print(f"{len(SCHEMAS)} catalogs OK ({len(warnings)} warnings)")
+    elif args.command == "build":
+        try:
+            content_hash = build(output=args.output, warnings=warnings)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        finally:
+            for warning in warnings:
+                print(f"warning: {warning}", file=sys.stderr)
+        print(f"Wrote {args.output} (sha256 {content_hash[:12]}, {len(warnings)} warnings)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,14 @@
-import json
 from character import Character
 from dice import Dice
+from catalog import get_catalog
 
 
 class CharacterFactory:
     def __init__(self):
-        with open("json/races.json") as f:
-            self.races = json.load(f)
-
-        with open("json/races_default_values.json") as default_values_file:
-            self.races_defaults = json.load(default_values_file)
-
-        with open("json/classes_properties.json") as classes_file:
-            self.classes_properties = json.load(classes_file)
+        catalog = get_catalog()
+        self.races = catalog.load("races.json")
+        self.races_defaults = catalog.load("races_default_values.json")
+        self.classes_properties = catalog.load("classes_properties.json")
 
     def create_character(self, name, race, class_name):
         race_stats = self.races[race]
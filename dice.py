@@ -1,9 +1,155 @@
+"""Dice rolls for the whole game.
+
+Dice is the façade every caller uses (Dice.roll(8), Dice.roll_d20(), ...).
+The rolls come from the current dice stream:
+
+  - by default the global `random` module, one randint() per die, so
+    random.seed() makes rolls repeatable as it always has;
+  - a DiceStream: an independent, seedable source that draws rolls in
+    blocks (from random.Random.randbytes(), built on getrandbits(), or from
+    a NumPy Generator) and hands them out one by one, refilling a die's
+    buffer when it runs out.
+
+    with use_stream(DiceStream(seed=42)):
+        Dice.roll_d20()
+
+The current stream is a context variable, so a session, task or worker
+thread that enters its own stream neither sees nor consumes anyone else's
+rolls. stream.spawn(key) derives an independent stream per session or
+worker from one seed. A DiceStream is not shared between threads.
+
+Draws that are not dice (which monster acts how, a taunt, a name) use
+current_rng(): the random module by default, the stream's own
+random.Random inside use_stream(), so a seeded stream covers them too.
+"""
+
 import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from hashlib import sha256
+
+try:
+    import numpy as np
+except ImportError:   # optional: pip install numpy
+    np = None
+
+BLOCK_SIZE = 4096     # rolls drawn per die size per refill (before rejection)
+_EXHAUSTED = iter(())
+_tables = {}          # die size -> (byte -> roll table, bytes to reject)
+
+
+def _byte_tables(sides: int) -> tuple:
+    """bytes.translate() arguments that turn random bytes into rolls of a
+    die: bytes at or above the largest multiple of sides are dropped, so
+    every face stays equally likely."""
+    tables = _tables.get(sides)
+    if tables is None:
+        limit = 256 - 256 % sides
+        tables = _tables[sides] = (bytes(b % sides + 1 if b < limit else 0 for b in range(256)),
+                                   bytes(range(limit, 256)))
+    return tables
+
+
+class GlobalRandomStream:
+    """The default stream: the global random module, one randint() per die."""
+
+    rng = random      # for draws that are not dice (random.random(), choice(), ...)
+
+    def roll(self, sides: int) -> int:
+        return random.randint(1, sides)
+
+
+class DiceStream:
+    """Independent, seedable dice rolls, drawn in blocks per die size.
+
+    backend is "random" (random.Random(seed)) or "numpy"
+    (numpy.random.default_rng(), needs NumPy). seed may be an int or a str;
+    None seeds from the OS.
+    """
+
+    def __init__(self, seed=None, backend="random", block=BLOCK_SIZE):
+        if backend not in ("random", "numpy"):
+            raise ValueError(f"Unknown dice backend: {backend}")
+        if backend == "numpy" and np is None:
+            raise ImportError("The numpy dice backend needs NumPy (pip install numpy)")
+        self.seed = seed
+        self.backend = backend
+        self.block = block
+        self.rng = random.Random(seed)      # for draws that are not dice
+        if backend == "numpy":
+            self._generator = np.random.default_rng(None if seed is None else _seed_int(seed))
+        self._rolls = {}      # die size -> iterator over the rest of its buffer
+
+    def roll(self, sides: int) -> int:
+        return next(self._rolls.get(sides, _EXHAUSTED), 0) or self._refill(sides)
+
+    def _refill(self, sides: int) -> int:
+        if not 1 <= sides <= 255:
+            return self._roll_one(sides)
+        while True:
+            rolls = iter(self._draw(sides))
+            roll = next(rolls, 0)
+            if roll:
+                self._rolls[sides] = rolls
+                return roll
+
+    def _draw(self, sides: int) -> bytes:
+        """The next block of rolls of a die, one byte each."""
+        if self.backend == "numpy":
+            return self._generator.integers(1, sides, size=self.block, dtype=np.uint8, endpoint=True).tobytes()
+        return self.rng.randbytes(self.block).translate(*_byte_tables(sides))
+
+    def _roll_one(self, sides: int) -> int:
+        if self.backend == "numpy":
+            return int(self._generator.integers(1, sides, endpoint=True))
+        return self.rng.randint(1, sides)
+
+    def spawn(self, key) -> "DiceStream":
+        """An independent stream for key (a session id, a worker number, ...),
+        derived from this stream's seed: the same seed and key give the same
+        rolls. Unseeded streams spawn unseeded streams."""
+        seed = None if self.seed is None else f"{self.seed}/{key}"
+        return DiceStream(seed, self.backend, self.block)
+
+
+def _seed_int(seed) -> int:
+    """An int seed for NumPy from an int or str seed."""
+    if isinstance(seed, int):
+        return seed
+    return int.from_bytes(sha256(str(seed).encode()).digest()[:16], "big")
+
+
+GLOBAL_RANDOM = GlobalRandomStream()
+_stream = ContextVar("dice_stream", default=None)    # None: GLOBAL_RANDOM, without the method call
+_randint = random.randint
+
+
+def current_stream():
+    """The stream Dice rolls from in this context."""
+    return _stream.get() or GLOBAL_RANDOM
+
+
+def current_rng():
+    """The random.Random (or the random module) of the current stream, for
+    draws that are not dice."""
+    return (_stream.get() or GLOBAL_RANDOM).rng
+
+
+@contextmanager
+def use_stream(stream):
+    """Roll Dice from stream inside the with block (in this context only)."""
+    token = _stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _stream.reset(token)
+
 
 class Dice:
     @staticmethod
     def roll(dice_type: int) -> int:
-        return random.randint(1, dice_type)
+        stream = _stream.get()
+        return stream.roll(dice_type) if stream else _randint(1, dice_type)
 
     @staticmethod
     def roll_d4() -> int:
@@ -1,12 +1,11 @@
 """Core combat resolution — used by both web and CLI."""
 
-import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from dice import Dice
+from dice import Dice, current_rng
 from engine.effects import get_effect_bonus, tick_effects
 
 
@@ -77,9 +76,70 @@ def resolve_weapon_attack(attacker_mod, attacker_prof, target_ac,
     }
 
 
+def _roll_bonus(bonus, ability_mod, level):
+    """The flat bonus of an ability roll: an int, "ability_modifier" or "level"."""
+    if bonus == "ability_modifier":
+        return ability_mod
+    if bonus == "level":
+        return level
+    return bonus if isinstance(bonus, int) else 0
+
+
+def roll_ability(ability, ability_mod, proficiency_bonus, level, target, attacker_effects=None):
+    """Resolve the rolls of an ability use. Returns a result dict.
+
+    Args:
+        ability: The AbilityDef used.
+        ability_mod: The user's primary ability modifier.
+        proficiency_bonus: The user's proficiency bonus.
+        level: The user's level (for damage scaling and "level" bonuses).
+        target: The enemy's CombatantState (its AC, save modifiers and effects).
+        attacker_effects: List of active effects on the user.
+
+    Returns:
+        dict with keys: hit (bool), attack_roll and target_ac (ints, or None
+                        if the ability makes no attack roll), save_roll and
+                        spell_dc (ints, or None if it allows no save), saved
+                        (bool), damage (int, 0 if none is dealt), heal (int,
+                        0 if it does not heal)
+
+    The caller spends the PP, applies damage and healing and adds the
+    ability's effects.
+    """
+    attacker_effects = attacker_effects or []
+    on_enemy = ability.target == "enemy"
+    result = {"hit": True, "attack_roll": None, "target_ac": None, "save_roll": None,
+              "spell_dc": None, "saved": False, "damage": 0, "heal": 0}
+
+    if on_enemy and ability.attack_method in ("melee_attack", "spell_attack"):
+        roll = attack_roll(ability_mod, proficiency_bonus, get_effect_bonus(attacker_effects, "attack_bonus"))
+        effective_ac = target.ac + get_effect_bonus(target.effects, "ac")
+        result.update(hit=roll >= effective_ac, attack_roll=roll, target_ac=effective_ac)
+    elif on_enemy and ability.attack_method == "spell_save":
+        spell_dc = 8 + ability_mod + proficiency_bonus
+        save_roll = Dice.roll_d20() + getattr(target, f"{ability.save_ability}_mod", 0)
+        result.update(save_roll=save_roll, spell_dc=spell_dc, saved=save_roll >= spell_dc)
+
+    if ability.damage and on_enemy:
+        damage = roll_damage(ability.dice_count_at(level), ability.damage.dice_size,
+                             bonus=_roll_bonus(ability.damage.bonus, ability_mod, level))
+        damage += get_effect_bonus(attacker_effects, "damage_bonus")
+        if result["saved"]:
+            damage = max(1, damage // 2)    # a successful save halves the damage
+        if result["hit"]:
+            dr = get_effect_bonus(target.effects, "damage_reduction")
+            result["damage"] = max(1, damage - dr)
+
+    if ability.heal:
+        result["heal"] = roll_damage(ability.heal.dice_count, ability.heal.dice_size,
+                                     bonus=_roll_bonus(ability.heal.bonus, ability_mod, level))
+
+    return result
+
+
 def monster_turn_action():
     """Decide monster action: 'attack' (70%) or 'defend' (30%)."""
-    return "attack" if random.random() < 0.7 else "defend"
+    return "attack" if current_rng().random() < 0.7 else "defend"
 
 
 def calculate_xp_reward(monster_level, round_count):
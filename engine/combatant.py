@@ -35,7 +35,7 @@ class WeaponState:
             name=weapon.name,
             damage_die=weapon.damage_die,
             damage_dice_count=weapon.damage_dice_count,
-            properties=weapon.properties,
+            properties=list(weapon.properties),
         )
 
 
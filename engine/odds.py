@@ -0,0 +1,181 @@
+"""Exact combat odds: damage distributions, hit chances and expected damage.
+
+engine.combat rolls the dice; this module works out the same rolls exactly,
+for balance reports and decisions that need numbers rather than samples:
+
+    damage_distribution(2, 6, ability_mod=3)         # roll_damage(2, 6, 3)
+    odds = weapon_attack_odds(3, 2, 15, 1, 8, attacker_effects, target_effects)
+    odds.hit_chance, odds.expected_damage, odds.kill_chance(9)
+
+Damage distributions come from convolving the dice and applying the same
+floors as roll_damage() (at least 1) and resolve_weapon_attack() (at least 1
+after damage reduction). There are no critical hits or automatic misses: an
+attack hits when d20 + modifiers >= AC.
+
+Every result is computed once per parameter tuple and kept; effect lists
+are reduced to their bonuses first, so any effects with the same totals
+share an entry. The caches only grow with the distinct dice and modifiers
+in play (a few hundred entries for the whole catalog); clear_cache()
+empties them.
+"""
+
+from dataclasses import dataclass
+
+_dice_counts = {}     # (dice_count, dice_size) -> ways to roll each total
+_damage = {}          # (dice_count, dice_size, ability_mod, bonus, damage_reduction) -> DamageDistribution
+_attacks = {}         # (attack total, AC, dice_count, dice_size, damage mod, damage_reduction) -> AttackOdds
+
+
+@dataclass(frozen=True, slots=True)
+class DamageDistribution:
+    """Exact distribution of a damage roll: counts[i] of the outcomes
+    (out of dice_size ** dice_count equally likely ones) deal low + i."""
+    low: int
+    counts: tuple
+    outcomes: int
+    mean: float
+    at_least: tuple       # at_least[i]: chance of dealing low + i or more
+
+    @property
+    def high(self) -> int:
+        return self.low + len(self.counts) - 1
+
+    def probability(self, damage: int) -> float:
+        """Chance of dealing exactly damage."""
+        i = damage - self.low
+        return self.counts[i] / self.outcomes if 0 <= i < len(self.counts) else 0.0
+
+    def chance_at_least(self, damage: int) -> float:
+        """Chance of dealing damage or more."""
+        i = damage - self.low
+        if i <= 0:
+            return 1.0
+        return self.at_least[i] if i < len(self.at_least) else 0.0
+
+    def items(self) -> list:
+        """(damage, probability) pairs, lowest damage first."""
+        return [(self.low + i, count / self.outcomes) for i, count in enumerate(self.counts)]
+
+
+@dataclass(frozen=True, slots=True)
+class AttackOdds:
+    """Exact odds of one weapon attack."""
+    hit_chance: float
+    damage: DamageDistribution    # damage on a hit
+    expected_damage: float        # per attack, misses included
+
+    def kill_chance(self, hp: int) -> float:
+        """Chance that the attack brings a target with hp hit points to 0."""
+        return self.hit_chance * self.damage.chance_at_least(hp)
+
+
+def dice_sum_counts(dice_count: int, dice_size: int) -> tuple:
+    """Ways to roll each total of dice_count dice of dice_size, from
+    dice_count (all ones) up to dice_count * dice_size."""
+    key = (dice_count, dice_size)
+    counts = _dice_counts.get(key)
+    if counts is None:
+        if dice_count <= 0:
+            counts = (1,)     # no dice: a total of 0, one way
+        else:
+            fewer = dice_sum_counts(dice_count - 1, dice_size)
+            ways = [0] * (len(fewer) + dice_size - 1)
+            for i, count in enumerate(fewer):
+                for face in range(dice_size):
+                    ways[i + face] += count
+            counts = tuple(ways)
+        _dice_counts[key] = counts
+    return counts
+
+
+def damage_distribution(dice_count: int, dice_size: int, ability_mod: int = 0, bonus: int = 0,
+                        damage_reduction: int = 0) -> DamageDistribution:
+    """Distribution of roll_damage(dice_count, dice_size, ability_mod, bonus),
+    less damage_reduction (at least 1) if any, as resolve_weapon_attack()."""
+    key = (dice_count, dice_size, ability_mod, bonus, damage_reduction)
+    distribution = _damage.get(key)
+    if distribution is None:
+        distribution = _damage[key] = _build_distribution(*key)
+    return distribution
+
+
+def _build_distribution(dice_count, dice_size, ability_mod, bonus, damage_reduction) -> DamageDistribution:
+    ways = {}
+    lowest_total = max(dice_count, 0) + ability_mod + bonus
+    for i, count in enumerate(dice_sum_counts(dice_count, dice_size)):
+        damage = max(1, lowest_total + i)
+        if damage_reduction:
+            damage = max(1, damage - damage_reduction)
+        ways[damage] = ways.get(damage, 0) + count
+
+    low, high = min(ways), max(ways)
+    counts = tuple(ways.get(damage, 0) for damage in range(low, high + 1))
+    outcomes = sum(counts)
+    tail, at_least = 0, []
+    for count in reversed(counts):
+        tail += count
+        at_least.append(tail / outcomes)
+    return DamageDistribution(low, counts, outcomes,
+                              sum((low + i) * count for i, count in enumerate(counts)) / outcomes,
+                              tuple(reversed(at_least)))
+
+
+def hit_chance(attack_total: int, target_ac: int) -> float:
+    """Chance that d20 + attack_total (every attack modifier summed) hits target_ac."""
+    return min(20, max(0, 21 - (target_ac - attack_total))) / 20
+
+
+def weapon_attack_odds(attacker_mod: int, attacker_prof: int, target_ac: int,
+                       damage_dice_count: int, damage_die: int,
+                       attacker_effects=None, target_effects=None) -> AttackOdds:
+    """Exact odds of resolve_weapon_attack() with the same arguments."""
+    attack_bonus = damage_bonus = ac_bonus = damage_reduction = 0
+    # One pass over each list instead of a get_effect_bonus() per stat
+    if attacker_effects:
+        for effect in attacker_effects:
+            stat = effect["stat"]
+            if stat == "attack_bonus":
+                attack_bonus += effect["value"]
+            elif stat == "damage_bonus":
+                damage_bonus += effect["value"]
+    if target_effects:
+        for effect in target_effects:
+            stat = effect["stat"]
+            if stat == "ac":
+                ac_bonus += effect["value"]
+            elif stat == "damage_reduction":
+                damage_reduction += effect["value"]
+    key = (attacker_mod + attacker_prof + attack_bonus, target_ac + ac_bonus,
+           damage_dice_count, damage_die, attacker_mod + damage_bonus, damage_reduction)
+    return _attacks.get(key) or attack_odds(*key)
+
+
+def attack_odds(attack_total: int, target_ac: int, dice_count: int, dice_size: int,
+                damage_mod: int = 0, damage_reduction: int = 0) -> AttackOdds:
+    """Odds of an attack from the summed bonuses: attack_total added to the
+    d20, target_ac with its effects, damage_mod added to the dice."""
+    key = (attack_total, target_ac, dice_count, dice_size, damage_mod, damage_reduction)
+    odds = _attacks.get(key)
+    if odds is None:
+        chance = hit_chance(attack_total, target_ac)
+        damage = damage_distribution(dice_count, dice_size, damage_mod, 0, damage_reduction)
+        odds = _attacks[key] = AttackOdds(chance, damage, chance * damage.mean)
+    return odds
+
+
+def expected_damage_per_round(odds: AttackOdds, attack_chance: float = 1.0) -> float:
+    """Expected damage per round of a combatant that makes this attack with
+    attack_chance each round (engine.combat.monster_turn_action() attacks 70%
+    of the time)."""
+    return attack_chance * odds.expected_damage
+
+
+def clear_cache():
+    """Forget every computed distribution and odds."""
+    _dice_counts.clear()
+    _damage.clear()
+    _attacks.clear()
+
+
+def cache_size() -> int:
+    return len(_dice_counts) + len(_damage) + len(_attacks)
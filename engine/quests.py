@@ -14,7 +14,7 @@ def check_quest_progress(active_quests, all_quests, monster_race, inventory):
 
     Args:
         active_quests: dict of {quest_id: {"progress": int, "status": str}}
-        all_quests: dict of all quest definitions
+        all_quests: dict of all quest definitions (records.QuestDef)
         monster_race: race of the killed monster
         inventory: character's inventory list (items may be appended for gather quests)
 
@@ -27,25 +27,25 @@ def check_quest_progress(active_quests, all_quests, monster_race, inventory):
         if quest_state["status"] != "active":
             continue
         quest_def = all_quests.get(quest_id)
-        if not quest_def or quest_def["target_monster"] != monster_race:
+        if not quest_def or quest_def.target_monster != monster_race:
             continue
 
-        if quest_def["type"] == "kill":
+        if quest_def.type == "kill":
             quest_state["progress"] = quest_state.get("progress", 0) + 1
-            updates.append(f"{quest_def['name']}: {quest_state['progress']}/{quest_def['target_count']}")
+            updates.append(f"{quest_def.name}: {quest_state['progress']}/{quest_def.target_count}")
 
-        elif quest_def["type"] == "gather":
-            qi = quest_def.get("quest_item", {})
-            if random.random() < qi.get("drop_chance", 0.5):
-                item = QuestItem(qi["name"], qi.get("description", ""), quest_id)
+        elif quest_def.type == "gather":
+            qi = quest_def.quest_item
+            if random.random() < qi.drop_chance:
+                item = QuestItem(qi.name, qi.description, quest_id)
                 inventory.append(item)
                 count = sum(1 for it in inventory if isinstance(it, QuestItem) and it.quest_id == quest_id)
                 quest_state["progress"] = count
-                updates.append(f"{quest_def['name']}: found {qi['name']}! ({count}/{quest_def['target_count']})")
+                updates.append(f"{quest_def.name}: found {qi.name}! ({count}/{quest_def.target_count})")
             else:
-                updates.append(f"{quest_def['name']}: no {qi['name']} dropped this time")
+                updates.append(f"{quest_def.name}: no {qi.name} dropped this time")
 
-        if quest_state["progress"] >= quest_def["target_count"]:
+        if quest_state["progress"] >= quest_def.target_count:
             quest_state["status"] = "ready"
 
     return updates
@@ -58,7 +58,7 @@ def turn_in_quest(quest_id, active_quests, completed_quests, all_quests, charact
         quest_id: ID of the quest to turn in
         active_quests: dict of active quests (will be modified)
         completed_quests: list of completed quest IDs (will be modified)
-        all_quests: dict of all quest definitions
+        all_quests: dict of all quest definitions (records.QuestDef)
         character: the player character (gold/xp/inventory modified)
 
     Returns:
@@ -70,12 +70,11 @@ def turn_in_quest(quest_id, active_quests, completed_quests, all_quests, charact
     if not quest_def or not quest_state or quest_state["status"] != "ready":
         return None
 
-    rewards = quest_def["rewards"]
-    character.gold += rewards.get("gold", 0)
-    level_ups = character.gain_xp(rewards.get("xp", 0))
+    character.gold += quest_def.gold
+    level_ups = character.gain_xp(quest_def.xp)
 
     # Remove gather quest items from inventory
-    if quest_def["type"] == "gather":
+    if quest_def.type == "gather":
         character.inventory = [
             item for item in character.inventory
             if not (isinstance(item, QuestItem) and item.quest_id == quest_id)
@@ -85,8 +84,8 @@ def turn_in_quest(quest_id, active_quests, completed_quests, all_quests, charact
     completed_quests.append(quest_id)
 
     return {
-        "gold": rewards.get("gold", 0),
-        "xp": rewards.get("xp", 0),
-        "quest_name": quest_def["name"],
+        "gold": quest_def.gold,
+        "xp": quest_def.xp,
+        "quest_name": quest_def.name,
         "level_ups": level_ups,
     }
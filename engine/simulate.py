@@ -0,0 +1,346 @@
+"""Headless battle simulator for balance runs — no web app, templates or sessions.
+
+Plays a player build against a monster race and level many times, with the
+same rules as the battle routes (engine.combat for weapon attacks, ability
+rolls and the monster's turn), and reports the win rate and the
+distributions of rounds to kill, damage taken and PP used:
+
+    python -m engine.simulate --race Dwarf --class Cleric --level 5 --weapon Mace \\
+        --armor "Chain Mail" --abilities sacred_flame,cure_wounds --monster Orc \\
+        --monster-level 4 --battles 20000 --seed 1
+
+Each turn the player, if at half HP or below, heals with the first healing
+ability of the loadout it can pay for. Otherwise it uses the first other
+ability of the loadout it can pay for (a pure buff or debuff only while it
+is not already active), and with none left it attacks with its weapon.
+Without --abilities the loadout is every ability the class knows at its
+level, most recently unlocked first. The monster attacks or defends as in a
+real battle. A battle still going after --max-rounds rounds is a timeout.
+The report also gives the exact weapon odds of the matchup (engine.odds).
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from armorFactory import ArmorFactory
+from catalog import get_catalog
+from character import WeaponSlot
+from characterFactory import CharacterFactory
+from dice import DiceStream, use_stream
+from engine.combat import (get_weapon_attack_modifier, monster_turn_action, resolve_weapon_attack,
+                           roll_ability, roll_initiative)
+from engine.effects import tick_effects
+from engine.leveling import calculate_max_pp
+from engine.odds import expected_damage_per_round, weapon_attack_odds
+from monsterFactory import encounter_templates
+from records import ability_defs
+from weaponFactory import WeaponFactory
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerBuild:
+    """What a battle needs of a player character, fixed for every battle."""
+    race: str
+    class_name: str
+    level: int
+    max_hp: int
+    ac: int
+    dex_mod: int
+    proficiency: int
+    attack_mod: int              # for weapon attacks
+    damage_die: int
+    damage_dice_count: int
+    primary_mod: int             # for abilities
+    max_pp: int
+    abilities: tuple             # AbilityDef loadout, in priority order
+
+    @classmethod
+    def create(cls, race, class_name, level=1, weapon=None, armor=None, abilities=None) -> "PlayerBuild":
+        """Build a character as character creation does and level it up
+        (average HP). Raises ValueError for an unknown race, class, weapon,
+        armor or ability, or an ability the class cannot use at the level."""
+        catalog = get_catalog()
+        classes = catalog.load("classes_properties.json")
+        if race not in catalog.load("races.json") or class_name not in classes:
+            raise ValueError(f"Unknown race or class: {race} {class_name}")
+        character = CharacterFactory().create_character("Simulant", race, class_name)
+        while character.level < level:
+            character.level_up()
+        if weapon:
+            character.equip_weapon(WeaponFactory().get_weapon_by_name(weapon), WeaponSlot.MAIN_HAND)
+        if armor:
+            character.equip(ArmorFactory().get_armor_by_name(armor))
+
+        equipped = character.weapon_slots.get(WeaponSlot.MAIN_HAND)
+        if equipped:
+            attack_mod = character.get_attack_modifier(equipped)
+            damage_die, damage_dice_count = equipped.damage_die, equipped.damage_dice_count
+        else:
+            attack_mod, damage_die, damage_dice_count = character.strength_modifier, 4, 1
+
+        primary = classes[class_name].get("primary_ability", "Strength").lower()
+        primary_mod = getattr(character, f"{primary}_modifier", 0)
+        return cls(
+            race=race, class_name=class_name, level=character.level,
+            max_hp=character.max_hit_points, ac=character.armor_class,
+            dex_mod=character.dexterity_modifier, proficiency=character.proficiency_bonus,
+            attack_mod=attack_mod, damage_die=damage_die, damage_dice_count=damage_dice_count,
+            primary_mod=primary_mod, max_pp=calculate_max_pp(class_name, character.level, primary_mod),
+            abilities=_loadout(class_name, character.level, abilities),
+        )
+
+
+def _loadout(class_name, level, ability_ids) -> tuple:
+    defs = ability_defs()
+    if ability_ids is None:
+        known = [a for a in defs.values() if class_name in a.classes and a.unlock_level <= level]
+        return tuple(sorted(known, key=lambda a: a.unlock_level, reverse=True))
+    loadout = []
+    for ability_id in ability_ids:
+        ability = defs.get(ability_id)
+        if ability is None:
+            raise ValueError(f"Unknown ability: {ability_id}")
+        if class_name not in ability.classes or level < ability.unlock_level:
+            raise ValueError(f"{class_name} cannot use {ability_id} at level {level}")
+        loadout.append(ability)
+    return tuple(loadout)
+
+
+def _is_active(effects, source) -> bool:
+    return any(e["source"] == source for e in effects)
+
+
+def _is_heal(ability) -> bool:
+    return bool(ability.heal) and not ability.damage
+
+
+def choose_ability(build, hp, pp, player_effects, monster_effects):
+    """The loadout ability to use this turn, or None to attack."""
+    if hp * 2 <= build.max_hp:
+        for ability in build.abilities:
+            if _is_heal(ability) and ability.cost <= pp:
+                return ability
+    for ability in build.abilities:
+        if ability.cost > pp or _is_heal(ability):
+            continue
+        if ability.effects and not ability.damage:
+            effects = monster_effects if ability.target == "enemy" else player_effects
+            if _is_active(effects, ability.name):
+                continue
+        return ability
+    return None
+
+
+def simulate_battle(build, monster, max_rounds=100, player_effects=()) -> tuple:
+    """Play one battle against a fresh CombatantState, the player starting
+    with player_effects. Returns (outcome, rounds, damage taken, PP used);
+    outcome is "win", "loss" or "timeout"."""
+    hp, pp, taken = build.max_hp, build.max_pp, 0
+    player_effects = list(player_effects)
+    monster_mod = get_weapon_attack_modifier(monster.str_mod, monster.dex_mod, monster.weapon.properties)
+
+    def monster_turn():
+        if monster_turn_action() == "defend":
+            monster.ac += 2
+            return 0
+        result = resolve_weapon_attack(monster_mod, monster.proficiency, build.ac,
+                                       monster.weapon.damage_dice_count, monster.weapon.damage_die,
+                                       monster.effects, player_effects)
+        return min(hp, result["damage"])
+
+    player_init, monster_init = roll_initiative(build.dex_mod, monster.dex_mod)
+    if monster_init > player_init:
+        damage = monster_turn()
+        hp -= damage
+        taken += damage
+        if hp <= 0:
+            return "loss", 1, taken, 0
+
+    rounds = 1
+    while True:
+        ability = choose_ability(build, hp, pp, player_effects, monster.effects)
+        if ability is None:
+            result = resolve_weapon_attack(build.attack_mod, build.proficiency, monster.ac,
+                                           build.damage_dice_count, build.damage_die,
+                                           player_effects, monster.effects)
+            monster.hp = max(0, monster.hp - result["damage"])
+        else:
+            pp -= ability.cost
+            result = roll_ability(ability, build.primary_mod, build.proficiency, build.level,
+                                  monster, player_effects)
+            monster.hp = max(0, monster.hp - result["damage"])
+            hp = min(build.max_hp, hp + result["heal"])
+            for effect in ability.effects:
+                (monster.effects if ability.target == "enemy" else player_effects).append(
+                    {"stat": effect.stat, "value": effect.value, "duration": effect.duration,
+                     "source": ability.name})
+        if monster.hp <= 0:
+            return "win", rounds, taken, build.max_pp - pp
+
+        damage = monster_turn()
+        hp -= damage
+        taken += damage
+        if hp <= 0:
+            return "loss", rounds, taken, build.max_pp - pp
+
+        if ability is None:   # as in the battle routes, an ability turn leaves the monster's stance up
+            monster.reset_ac()
+        player_effects = tick_effects(player_effects)
+        monster.effects = tick_effects(monster.effects)
+        rounds += 1
+        if rounds > max_rounds:
+            return "timeout", max_rounds, taken, build.max_pp - pp
+
+
+def simulate(build, monster_race, monster_level, battles, max_rounds=100,
+             player_effects=(), monster_effects=()) -> dict:
+    """Play battles against fresh monsters of a race and level, each side
+    starting with the given effect dicts. Returns the outcome counts and, per
+    battle, the rounds (of won battles), damage taken and PP used."""
+    templates = encounter_templates()
+    if monster_race not in templates:
+        raise ValueError(f"Unknown monster race: {monster_race}")
+    template = templates[monster_race]
+    outcomes = {"win": 0, "loss": 0, "timeout": 0}
+    rounds_to_kill, damage_taken, pp_used = [], [], []
+    for _ in range(battles):
+        monster = template.combatant(monster_level)
+        monster.effects = list(monster_effects)
+        outcome, rounds, taken, spent = simulate_battle(build, monster, max_rounds, player_effects)
+        outcomes[outcome] += 1
+        if outcome == "win":
+            rounds_to_kill.append(rounds)
+        damage_taken.append(taken)
+        pp_used.append(spent)
+    return {"battles": battles, "outcomes": outcomes, "rounds_to_kill": rounds_to_kill,
+            "damage_taken": damage_taken, "pp_used": pp_used}
+
+
+def weapon_odds(build, monster_race, monster_level) -> dict:
+    """Exact odds of the weapon exchange (engine.odds): the build's attack on
+    the monster and the monster's on the build, averaged over the monster's
+    weapons, with the monster attacking 70% of its turns."""
+    templates = encounter_templates()
+    if monster_race not in templates:
+        raise ValueError(f"Unknown monster race: {monster_race}")
+    template = templates[monster_race]
+    player = weapon_attack_odds(build.attack_mod, build.proficiency, template.base_ac + template.dex_mod,
+                                build.damage_dice_count, build.damage_die)
+    monster = [weapon_attack_odds(get_weapon_attack_modifier(template.str_mod, template.dex_mod, w.properties),
+                                  1 + monster_level // 4, build.ac, w.damage_dice_count, w.damage_die)
+               for w in template.weapons]
+    return {
+        "player_hit_chance": round(player.hit_chance, 4),
+        "player_damage_per_round": round(expected_damage_per_round(player), 2),
+        "monster_hit_chance": round(sum(o.hit_chance for o in monster) / len(monster), 4),
+        "monster_damage_per_round": round(sum(expected_damage_per_round(o, 0.7) for o in monster)
+                                          / len(monster), 2),
+    }
+
+
+def distribution(values) -> dict:
+    """Mean, standard deviation and percentiles (nearest rank) of a sample."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def percentile(p):
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    return {"mean": round(statistics.fmean(ordered), 2),
+            "stdev": round(statistics.pstdev(ordered), 2),
+            "min": ordered[0], "p5": percentile(5), "p25": percentile(25), "p50": percentile(50),
+            "p75": percentile(75), "p95": percentile(95), "max": ordered[-1]}
+
+
+def summarize(result) -> dict:
+    battles = result["battles"]
+    return {
+        "battles": battles,
+        "win_rate": round(result["outcomes"]["win"] / battles, 4) if battles else 0.0,
+        "outcomes": dict(result["outcomes"]),
+        "rounds_to_kill": distribution(result["rounds_to_kill"]),
+        "damage_taken": distribution(result["damage_taken"]),
+        "pp_used": distribution(result["pp_used"]),
+    }
+
+
+def _print_report(build, args, summary, elapsed):
+    print(f"{build.race} {build.class_name} L{build.level} (HP {build.max_hp}, AC {build.ac}, "
+          f"PP {build.max_pp}) vs {args.monster} L{args.monster_level}")
+    print(f"Loadout: {', '.join(a.id for a in build.abilities) or '-'}")
+    outcomes = summary["outcomes"]
+    print(f"{summary['battles']} battles in {elapsed:.2f}s ({summary['battles'] / elapsed * 60:,.0f}/min): "
+          f"win rate {summary['win_rate']:.1%} ({outcomes['loss']} losses, {outcomes['timeout']} timeouts)")
+    columns = ("mean", "stdev", "min", "p5", "p25", "p50", "p75", "p95", "max")
+    print(f"{'':>15}" + "".join(f"{c:>8}" for c in columns))
+    for name in ("rounds_to_kill", "damage_taken", "pp_used"):
+        stats = summary[name]
+        print(f"{name:>15}" + "".join(f"{stats.get(c, '-'):>8}" for c in columns))
+    odds = summary["weapon_odds"]
+    print(f"Weapon odds: you hit {odds['player_hit_chance']:.0%} for {odds['player_damage_per_round']} "
+          f"damage/round, the monster {odds['monster_hit_chance']:.0%} for "
+          f"{odds['monster_damage_per_round']} damage/round")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m engine.simulate",
+                                     description="Simulate battles of a player build against a monster.")
+    parser.add_argument("--race", default="Human")
+    parser.add_argument("--class", dest="class_name", default="Fighter")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--weapon", help="weapon name (default: unarmed, 1d4)")
+    parser.add_argument("--armor", help="armor name (default: none)")
+    parser.add_argument("--abilities", help="comma-separated ability ids, in priority order")
+    parser.add_argument("--monster", default="Goblin", help="monster race")
+    parser.add_argument("--monster-level", type=int, default=1)
+    parser.add_argument("--battles", type=int, default=10000)
+    parser.add_argument("--max-rounds", type=int, default=100)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="weapon attacks only, with the NumPy kernel (engine.vectorized)")
+    args = parser.parse_args(argv)
+
+    abilities = [a for a in args.abilities.split(",") if a] if args.abilities is not None else None
+    if args.vectorized:
+        if abilities:
+            parser.error("--vectorized plays weapon attacks only; drop --abilities")
+        abilities = []
+    try:
+        build = PlayerBuild.create(args.race, args.class_name, args.level, args.weapon, args.armor, abilities)
+        if args.vectorized:
+            from engine.vectorized import simulate_duels, summarize_duels
+            start = time.perf_counter()
+            summary = summarize_duels(simulate_duels(build, args.monster, args.monster_level, args.battles,
+                                                     args.max_rounds, rng=args.seed))
+        else:
+            if args.seed is not None:
+                random.seed(args.seed)
+            start = time.perf_counter()
+            # Dice from a buffered stream (seeded with --seed too); the rest from random
+            with use_stream(DiceStream(args.seed)):
+                summary = summarize(simulate(build, args.monster, args.monster_level, args.battles,
+                                             args.max_rounds))
+        elapsed = time.perf_counter() - start
+        summary["weapon_odds"] = weapon_odds(build, args.monster, args.monster_level)
+    except (ValueError, ImportError) as e:
+        parser.error(str(e))
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        _print_report(build, args, summary, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Vectorized Monte Carlo kernel for weapon duels (needs NumPy).
+
+engine.simulate plays one battle at a time, one Dice.roll() per die. For
+weapon-only duels (the player attacks every turn, the monster attacks or
+defends) this module plays millions of independent duels at once as NumPy
+arrays, with the same rules:
+
+  - initiative: each side rolls d20 + DEX modifier, the monster acts first
+    only with the strictly higher roll;
+  - attacks: d20 + ability modifier + proficiency + attack_bonus effects
+    against AC + ac effects; damage is the weapon dice + modifier +
+    damage_bonus effects (at least 1), less damage_reduction effects (at
+    least 1);
+  - the monster attacks 70% of its turns and otherwise defends (+2 AC until
+    the end of the round);
+  - effects tick once per round, as tick_effects() does.
+
+Every duel of a run starts with the same effects, and effects tick in step,
+so each round's effect bonuses are the same scalars for every duel that is
+still going. A round rolls the dice of all ongoing duels in one go and
+applies them through masks; the arrays are compacted as duels end.
+
+    from engine.simulate import PlayerBuild
+    from engine.vectorized import simulate_duels, summarize_duels
+
+    build = PlayerBuild.create("Dwarf", "Fighter", 3, "Longsword", "Chain Mail", abilities=[])
+    summary = summarize_duels(simulate_duels(build, "Orc", 2, 1_000_000, rng=1))
+
+Results match engine.simulate.simulate() for the same build with an empty
+loadout statistically, not roll for roll (the random streams differ).
+"""
+
+import sys
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:   # optional: pip install numpy
+    np = None
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.combat import get_weapon_attack_modifier
+from engine.effects import get_effect_bonus, tick_effects
+from monsterFactory import encounter_templates
+
+WIN, LOSS, TIMEOUT = 1, 2, 3
+OUTCOMES = {"win": WIN, "loss": LOSS, "timeout": TIMEOUT}
+MONSTER_ATTACK_CHANCE = 0.7     # as engine.combat.monster_turn_action()
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The vectorized combat kernel needs NumPy (pip install numpy)")
+
+
+def _roll_dice(rng, dice_count, dice_size, n):
+    """Sum of dice_count dice of dice_size for each of n duels (ints or int arrays)."""
+    if not n:
+        return np.zeros(0, dtype=np.int32)
+    most = int(np.max(dice_count))
+    if np.ndim(dice_size):
+        rolls = (rng.random((most, n), dtype=np.float32) * dice_size).astype(np.int32) + 1
+    else:
+        rolls = rng.integers(1, dice_size + 1, size=(most, n), dtype=np.int32)
+    if np.ndim(dice_count) and np.min(dice_count) != most:
+        rolls[np.arange(most)[:, None] >= dice_count] = 0
+    return rolls[0] if most == 1 else rolls.sum(axis=0, dtype=np.int32)
+
+
+def _attack(rng, n, attack_mod, proficiency, target_ac, dice_count, dice_size, attacker, target):
+    """Damage dealt by one attack in each of n duels (0 on a miss), as resolve_weapon_attack()."""
+    roll = rng.integers(1, 21, size=n, dtype=np.int32) + (attack_mod + proficiency + attacker["attack_bonus"])
+    hit = roll >= target_ac + target["ac"]
+    damage = np.maximum(1, _roll_dice(rng, dice_count, dice_size, n) + (attack_mod + attacker["damage_bonus"]))
+    damage = np.maximum(1, damage - target["damage_reduction"])
+    return np.where(hit, damage, 0)
+
+
+def _bonuses(effects) -> dict:
+    return {stat: get_effect_bonus(effects, stat)
+            for stat in ("attack_bonus", "ac", "damage_bonus", "damage_reduction")}
+
+
+# Rows of the live-duel state array
+DUEL, M_HP, M_AC, M_DIE, M_COUNT, M_MOD, P_HP, TAKEN = range(8)
+
+
+def simulate_duels(build, monster_race, monster_level, duels, max_rounds=100,
+                   player_effects=(), monster_effects=(), rng=None) -> dict:
+    """Play duels of a PlayerBuild (weapon attacks only) against fresh
+    monsters of a race and level. player_effects and monster_effects are
+    effect dicts every duel starts with; rng is a NumPy Generator or a seed.
+    Returns per-duel arrays: outcome (WIN, LOSS or TIMEOUT), rounds and
+    damage_taken."""
+    _require_numpy()
+    templates = encounter_templates()
+    if monster_race not in templates:
+        raise ValueError(f"Unknown monster race: {monster_race}")
+    template = templates[monster_race]
+    rng = np.random.default_rng(rng)
+    m_prof = 1 + monster_level // 4
+    m_base_ac = template.base_ac + template.dex_mod
+    p_effects, m_effects = list(player_effects), list(monster_effects)
+
+    outcome = np.zeros(duels, dtype=np.int8)
+    rounds = np.zeros(duels, dtype=np.int32)
+    damage_taken = np.zeros(duels, dtype=np.int32)
+
+    # One column per duel still going; finished duels are compacted out
+    weapon = rng.integers(0, len(template.weapons), size=duels)
+    live = np.empty((8, duels), dtype=np.int32)
+    live[DUEL] = np.arange(duels)
+    live[M_HP] = np.maximum(1, monster_level + template.con_mod
+                            + rng.integers(1, template.hit_die + 1, size=(2, duels), dtype=np.int32).sum(axis=0))
+    live[M_AC] = m_base_ac
+    live[M_DIE] = np.array([w.damage_die for w in template.weapons])[weapon]
+    live[M_COUNT] = np.array([w.damage_dice_count for w in template.weapons])[weapon]
+    live[M_MOD] = np.array([get_weapon_attack_modifier(template.str_mod, template.dex_mod, w.properties)
+                            for w in template.weapons])[weapon]
+    live[P_HP] = build.max_hp
+    live[TAKEN] = 0
+
+    def monster_turn(live, turn, p_bonus, m_bonus):
+        """The monster's turn in the duels where turn is True."""
+        n = live.shape[1]
+        attacks = rng.random(n, dtype=np.float32) < MONSTER_ATTACK_CHANCE
+        live[M_AC] += 2 * (turn & ~attacks)
+        damage = _attack(rng, n, live[M_MOD], m_prof, build.ac, live[M_COUNT], live[M_DIE], m_bonus, p_bonus)
+        damage = np.minimum(live[P_HP], np.where(turn & attacks, damage, 0))
+        live[P_HP] -= damage
+        live[TAKEN] += damage
+
+    def finish(live, done, result, round_number):
+        """Record the duels where done is True. Returns the others."""
+        duel = live[DUEL, done]
+        outcome[duel] = result if np.ndim(result) == 0 else result[done]
+        rounds[duel] = round_number
+        damage_taken[duel] = live[TAKEN, done]
+        return live.compress(~done, axis=1)
+
+    # Initiative; the monster acts first only with the higher roll
+    p_init = rng.integers(1, 21, size=duels) + build.dex_mod
+    m_init = rng.integers(1, 21, size=duels) + template.dex_mod
+    monster_turn(live, m_init > p_init, _bonuses(p_effects), _bonuses(m_effects))
+    live = finish(live, live[P_HP] <= 0, LOSS, 1)
+
+    round_number = 1
+    while live.shape[1]:
+        p_bonus, m_bonus = _bonuses(p_effects), _bonuses(m_effects)
+
+        damage = _attack(rng, live.shape[1], build.attack_mod, build.proficiency, live[M_AC],
+                         build.damage_dice_count, build.damage_die, p_bonus, m_bonus)
+        live[M_HP] = np.maximum(0, live[M_HP] - damage)
+        won = live[M_HP] <= 0
+        monster_turn(live, ~won, p_bonus, m_bonus)
+        done = won | (live[P_HP] <= 0)
+        if done.any():
+            live = finish(live, done, np.where(won, WIN, LOSS), round_number)
+
+        live[M_AC] = m_base_ac
+        p_effects, m_effects = tick_effects(p_effects), tick_effects(m_effects)
+        round_number += 1
+        if round_number > max_rounds:
+            finish(live, np.ones(live.shape[1], dtype=bool), TIMEOUT, max_rounds)
+            break
+
+    return {"outcome": outcome, "rounds": rounds, "damage_taken": damage_taken}
+
+
+def _distribution(values) -> dict:
+    """engine.simulate.distribution() of an array."""
+    if not len(values):
+        return {}
+    percentiles = np.percentile(values, [5, 25, 50, 75, 95], method="inverted_cdf")
+    return {"mean": round(float(values.mean()), 2), "stdev": round(float(values.std()), 2),
+            "min": int(values.min()),
+            **{f"p{p}": int(v) for p, v in zip((5, 25, 50, 75, 95), percentiles)},
+            "max": int(values.max())}
+
+
+def summarize_duels(result) -> dict:
+    """The engine.simulate.summarize() report of simulate_duels() results."""
+    _require_numpy()
+    outcome = result["outcome"]
+    duels = len(outcome)
+    outcomes = {name: int((outcome == code).sum()) for name, code in OUTCOMES.items()}
+    return {
+        "battles": duels,
+        "win_rate": round(outcomes["win"] / duels, 4) if duels else 0.0,
+        "outcomes": outcomes,
+        "rounds_to_kill": _distribution(result["rounds"][outcome == WIN]),
+        "damage_taken": _distribution(result["damage_taken"]),
+        "pp_used": _distribution(np.zeros(duels, dtype=np.int64)),
+    }
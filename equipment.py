@@ -5,6 +5,21 @@ class Equipment:
         self.equipment_type = equipment_type
         self.stat_bonuses = stat_bonuses
 
+    def freeze(self):
+        """Make this item immutable; called at the end of __init__ by items
+        that are shared between characters (see WeaponFactory)."""
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get("_frozen"):
+            raise AttributeError(f"{type(self).__name__} {self.name!r} is shared and cannot be modified")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        if self.__dict__.get("_frozen"):
+            raise AttributeError(f"{type(self).__name__} {self.name!r} is shared and cannot be modified")
+        object.__delattr__(self, name)
+
     def __str__(self):
         return f"{self.name} ({self.equipment_type}) - {self.stat_bonuses}"
 
@@ -4,6 +4,7 @@ from dice import Dice
 from items import HealingPotion
 from weaponFactory import WeaponFactory
 from armorFactory import ArmorFactory
+from records import armor_defs
 
 
 class LootGenerator:
@@ -127,12 +128,8 @@ class LootGenerator:
         allowed_types = self.ARMOR_TYPES[tier]
         chosen_type = random.choice(allowed_types)
         # Filter armors by the chosen category type
-        armors_in_category = {
-            name: data
-            for name, data in self.armor_factory.all_armors.items()
-            if data["type"] == chosen_type
-        }
-        armor_name = random.choice(list(armors_in_category.keys()))
+        armors_in_category = [armor.name for armor in armor_defs().values() if armor.type == chosen_type]
+        armor_name = random.choice(armors_in_category)
         armor = self.armor_factory.get_armor_by_name(armor_name)
         return {
             "type": "armor",
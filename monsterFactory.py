@@ -1,26 +1,106 @@
-import json
+"""Monsters for encounters.
+
+create_monster() builds a full Monster entity. Battles only need the
+CombatantState a monster is reduced to, so create_combatant() produces one
+directly from an EncounterTemplate: a race's monster_default_values.json
+entry compiled once per catalog, with its modifiers, armor class and the
+stats of each weapon it can carry worked out up front.
+"""
+
+from dataclasses import dataclass
+
 from monster import Monster
-from dice import Dice
+from dice import Dice, current_rng
+from catalog import get_catalog, weapons_by_name
+from engine.combatant import CombatantState, WeaponState
+from records import monster_templates
+
+
+@dataclass(frozen=True, slots=True)
+class EncounterWeapon:
+    name: str
+    damage_die: int
+    damage_dice_count: int
+    properties: tuple            # in catalog order, as WeaponState keeps them
+
+
+@dataclass(frozen=True, slots=True)
+class EncounterTemplate:
+    """What a battle needs of a monster race, independent of level."""
+    race: str
+    names: tuple
+    weapons: tuple               # EncounterWeapon per weapon the race can carry
+    str_mod: int
+    dex_mod: int
+    con_mod: int
+    base_ac: int
+    hit_die: int
+
+    def combatant(self, level: int, name: str = None, weapon: EncounterWeapon = None) -> CombatantState:
+        """A fresh combatant of this race at a level (random name and weapon unless given)."""
+        if name is None:
+            name = current_rng().choice(self.names)
+        if weapon is None:
+            weapon = current_rng().choice(self.weapons)
+        hp = max(1, level + Dice.roll(self.hit_die) + Dice.roll(self.hit_die) + self.con_mod)
+        return CombatantState(
+            name=name, race=self.race, level=level, hp=hp, max_hp=hp,
+            ac=self.base_ac + self.dex_mod, base_ac=self.base_ac,
+            str_mod=self.str_mod, dex_mod=self.dex_mod, proficiency=1 + level // 4,
+            weapon=WeaponState(weapon.name, weapon.damage_die, weapon.damage_dice_count,
+                               list(weapon.properties)),
+            effects=[],
+        )
 
 
 class MonsterFactory:
     def __init__(self):
-        with open("json/monster_default_values.json") as f:
-            self.races = json.load(f)
+        self.races = get_catalog().load("monster_default_values.json")
+        self.templates = monster_templates()
 
     def create_monster(self, name, race, class_name, monster_level, weapon_name):
-        self.race_stats = self.races[race]
-
-        m = Monster(name, race, class_name, self.race_stats["Strength"], (self.race_stats["Strength"] - 10) // 2,
-                    self.race_stats["Dexterity"], (self.race_stats["Dexterity"] - 10) // 2, self.race_stats["Constitution"],
-                    (self.race_stats["Constitution"] - 10) // 2, self.race_stats["Intelligence"],
-                    (self.race_stats["Intelligence"] - 10) // 2, self.race_stats["Wisdom"], (self.race_stats["Wisdom"] - 10) // 2,
-                    self.race_stats["Charisma"], (self.race_stats["Charisma"] - 10) // 2, self.calculate_max_hit_points(race, monster_level),
-                    base_ac=self.race_stats["base_ac"], damage_reduction=0, monster_level=monster_level, weapon_name=weapon_name)
+        template = self.templates[race]
+        strength, dexterity, constitution, intelligence, wisdom, charisma = template.scores
+        str_mod, dex_mod, con_mod, int_mod, wis_mod, cha_mod = template.modifiers
+
+        m = Monster(name, race, class_name, strength, str_mod, dexterity, dex_mod, constitution, con_mod,
+                    intelligence, int_mod, wisdom, wis_mod, charisma, cha_mod,
+                    self.calculate_max_hit_points(race, monster_level),
+                    base_ac=template.base_ac, damage_reduction=0, monster_level=monster_level,
+                    weapon_name=weapon_name)
         return m
 
+    def create_combatant(self, race, monster_level) -> CombatantState:
+        """A battle-ready monster of the race (Goblin if unknown) at a level."""
+        templates = encounter_templates()
+        return templates.get(race, templates["Goblin"]).combatant(monster_level)
+
     def calculate_max_hit_points(self, monster_race, monster_level):
-        hit_die = self.race_stats["hit_die"]
-        con_modifier = (self.race_stats["Constitution"] - 10) // 2
+        template = self.templates[monster_race]
+        hit_die = template.hit_die
+        con_modifier = template.modifiers[2]
         hp = monster_level + Dice.roll(hit_die) + Dice.roll(hit_die) + con_modifier
-        return max(1, hp)
\ No newline at end of file
+        return max(1, hp)
+
+
+def _build_encounter_templates(catalog):
+    weapons = weapons_by_name(catalog)
+    compiled = {}
+    for race, template in monster_templates(catalog).items():
+        str_mod, dex_mod, con_mod = template.modifiers[:3]
+        compiled[race] = EncounterTemplate(
+            race=race,
+            names=template.names,
+            weapons=tuple(EncounterWeapon(name, weapons[name]["damage_die"],
+                                          weapons[name].get("damage_dice_count", 1),
+                                          tuple(weapons[name].get("properties", [])))
+                          for name in template.weapons),
+            str_mod=str_mod, dex_mod=dex_mod, con_mod=con_mod,
+            base_ac=template.base_ac, hit_die=template.hit_die,
+        )
+    return compiled
+
+
+def encounter_templates() -> dict:
+    """{race: EncounterTemplate} for the loaded catalog (built on first use)."""
+    return get_catalog().index("encounter_templates", _build_encounter_templates)
@@ -0,0 +1,285 @@
+"""Typed records compiled from the catalog files.
+
+The catalogs are nested dicts of JSON data; the hot paths of a battle read
+them many times per request. Each record here is a frozen, slotted class
+built once per catalog (via Catalog.index(), so a content reload rebuilds
+them) with attribute access and fields parsed up front: level ranges split
+into ints, scaling tables sorted, lists turned into tuples or frozensets and
+optional fields given their defaults.
+
+    ability_defs()["fire_bolt"].damage.dice_size
+    monster_templates()["Goblin"].weapons
+    quest_defs()["goblin_menace"].target_count
+
+The plain dicts stay available from the catalog (templates and the shop
+still use them).
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from catalog import get_catalog, weapons_by_name, armors_by_name
+from catalog_bundle import ABILITY_SCORES
+
+
+def _modifier(score: int) -> int:
+    return (score - 10) // 2
+
+
+@dataclass(frozen=True, slots=True)
+class RollDef:
+    """Dice of a damage or heal roll. bonus is an int, "ability_modifier" or "level"."""
+    dice_count: int
+    dice_size: int
+    bonus: object = 0
+    type: str = ""
+
+    @classmethod
+    def from_catalog(cls, data) -> Optional["RollDef"]:
+        if not data:
+            return None
+        return cls(data["dice_count"], data["dice_size"], data.get("bonus", 0), data.get("type", ""))
+
+
+@dataclass(frozen=True, slots=True)
+class EffectDef:
+    stat: str
+    value: int
+    duration: int
+
+
+@dataclass(frozen=True, slots=True)
+class AbilityDef:
+    """An entry of abilities.json."""
+    id: str
+    name: str
+    classes: frozenset
+    cost: int
+    unlock_level: int
+    description: str
+    target: str
+    attack_method: str
+    save_ability: str            # BattleState monster modifier prefix: "dex", "wis", ...
+    damage: Optional[RollDef]
+    heal: Optional[RollDef]
+    scaling: tuple               # ((level, dice_count), ...), highest level first
+    effects: tuple               # (EffectDef, ...)
+
+    @classmethod
+    def from_catalog(cls, ability_id: str, data) -> "AbilityDef":
+        scaling = sorted(((int(level), step.get("dice_count")) for level, step in data.get("scaling", {}).items()),
+                         reverse=True)
+        return cls(
+            id=ability_id,
+            name=data["name"],
+            classes=frozenset(data.get("classes", [])),
+            cost=data["cost"],
+            unlock_level=data.get("unlock_level", 1),
+            description=data.get("description", ""),
+            target=data["target"],
+            attack_method=data.get("attack_method", ""),
+            save_ability=data.get("save_ability", "Dexterity").lower()[:3],
+            damage=RollDef.from_catalog(data.get("damage")),
+            heal=RollDef.from_catalog(data.get("heal")),
+            scaling=tuple(scaling),
+            effects=tuple(EffectDef(e["stat"], e["value"], e["duration"]) for e in data.get("effects", [])),
+        )
+
+    def dice_count_at(self, level: int) -> int:
+        """Damage dice at a character level, after cantrip scaling."""
+        for unlock, dice_count in self.scaling:
+            if level >= unlock:
+                return self.damage.dice_count if dice_count is None else dice_count
+        return self.damage.dice_count
+
+
+@dataclass(frozen=True, slots=True)
+class MonsterTemplate:
+    """An entry of monster_default_values.json."""
+    race: str
+    scores: tuple                # ability scores, in ABILITY_SCORES order
+    modifiers: tuple             # their modifiers, same order
+    base_ac: int
+    hit_die: int
+    weapons: tuple
+    class_options: tuple
+    names: tuple
+    challenge_rating: float
+
+    @classmethod
+    def from_catalog(cls, race: str, data) -> "MonsterTemplate":
+        scores = tuple(data[score] for score in ABILITY_SCORES)
+        return cls(
+            race=race,
+            scores=scores,
+            modifiers=tuple(_modifier(score) for score in scores),
+            base_ac=data["base_ac"],
+            hit_die=data["hit_die"],
+            weapons=tuple(data.get("weapons") or [data.get("weapon_name", "Club")]),
+            class_options=tuple(data.get("class_options") or ["Fighter"]),
+            names=tuple(data.get("names") or [race]),
+            challenge_rating=data.get("challenge_rating", 1),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class QuestItemDef:
+    name: str
+    description: str
+    drop_chance: float
+
+
+@dataclass(frozen=True, slots=True)
+class QuestDef:
+    """An entry of quests.json."""
+    id: str
+    name: str
+    type: str
+    act: int
+    description: str
+    target_monster: str
+    target_count: int
+    quest_item: Optional[QuestItemDef]
+    gold: int
+    xp: int
+
+    @classmethod
+    def from_catalog(cls, quest_id: str, data) -> "QuestDef":
+        item = data.get("quest_item")
+        rewards = data.get("rewards", {})
+        return cls(
+            id=quest_id,
+            name=data["name"],
+            type=data["type"],
+            act=data.get("act", 1),
+            description=data.get("description", ""),
+            target_monster=data["target_monster"],
+            target_count=data["target_count"],
+            quest_item=QuestItemDef(item["name"], item.get("description", ""), item.get("drop_chance", 0.5))
+            if item is not None else None,
+            gold=rewards.get("gold", 0),
+            xp=rewards.get("xp", 0),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class WeaponDef:
+    """An entry of weapon-catalog.json; type is its group (e.g. "simple_melee")."""
+    name: str
+    type: str
+    category: str
+    damage_die: int
+    damage_dice_count: int
+    damage_type: str
+    properties: frozenset
+    cost_gp: float
+    weight: float
+    description: str
+
+    @classmethod
+    def from_catalog(cls, name: str, data) -> "WeaponDef":
+        return cls(name, data["type"], data["category"], data["damage_die"], data.get("damage_dice_count", 1),
+                   data["damage_type"], frozenset(data["properties"]), data["cost_gp"], data["weight"],
+                   data["description"])
+
+
+@dataclass(frozen=True, slots=True)
+class ArmorDef:
+    """An entry of armor_catalog.json; type is its group (e.g. "light_armor")."""
+    name: str
+    type: str
+    category: str
+    base_ac: int
+    cost_gp: float
+    weight: float
+    strength_requirement: int
+    stealth_disadvantage: bool
+    description: str
+
+    @classmethod
+    def from_catalog(cls, name: str, data) -> "ArmorDef":
+        return cls(name, data["type"], data["category"], data["base_ac"], data["cost_gp"], data["weight"],
+                   data["strength_requirement"], data["stealth_disadvantage"], data["description"])
+
+
+@dataclass(frozen=True, slots=True)
+class AreaDef:
+    """An area of campaign.json, with the encounter level range of its location."""
+    id: str
+    name: str
+    location: str
+    monster_types: tuple
+    level_range: tuple           # (min level, max level) of monsters met here
+    connections: tuple
+    special: str
+    boss: Optional[str]
+
+    @classmethod
+    def from_catalog(cls, area, location=None) -> "AreaDef":
+        return cls(
+            id=area["id"],
+            name=area.get("name", area["id"]),
+            location=location["name"] if location else "",
+            monster_types=tuple(area.get("monster_types") or ["Goblin"]),
+            level_range=_level_range(area, location),
+            connections=tuple(area.get("connections", [])),
+            special=str(area.get("special", "")),
+            boss=area.get("boss"),
+        )
+
+
+def _level_range(area, location) -> tuple:
+    """The location's "encounterLevel" ("2-4"), else the area's
+    "encounter_levels" ([2, 4]), else (1, 2); (1, 1) if malformed."""
+    level_range = location.get("encounterLevel") if location else None
+    if level_range and "-" in str(level_range):
+        low, high = map(int, str(level_range).split("-"))
+        return low, high
+    level_range = area.get("encounter_levels", [1, 2])
+    if isinstance(level_range, list) and len(level_range) >= 2:
+        return level_range[0], level_range[1]
+    return 1, 1
+
+
+def _records(filename: str, record):
+    def build(catalog):
+        return {key: record.from_catalog(key, data) for key, data in catalog.load(filename).items()}
+    return build
+
+
+_build_abilities = _records("abilities.json", AbilityDef)
+_build_monsters = _records("monster_default_values.json", MonsterTemplate)
+_build_quests = _records("quests.json", QuestDef)
+
+
+def _build_weapon_defs(catalog):
+    return {name: WeaponDef.from_catalog(name, data) for name, data in weapons_by_name(catalog).items()}
+
+
+def _build_armor_defs(catalog):
+    return {name: ArmorDef.from_catalog(name, data) for name, data in armors_by_name(catalog).items()}
+
+
+def ability_defs() -> dict:
+    """{ability id: AbilityDef}"""
+    return get_catalog().index("ability_defs", _build_abilities)
+
+
+def monster_templates(catalog=None) -> dict:
+    """{race: MonsterTemplate}"""
+    return (catalog or get_catalog()).index("monster_templates", _build_monsters)
+
+
+def quest_defs() -> dict:
+    """{quest id: QuestDef}"""
+    return get_catalog().index("quest_defs", _build_quests)
+
+
+def weapon_defs() -> dict:
+    """{weapon name: WeaponDef}"""
+    return get_catalog().index("weapon_defs", _build_weapon_defs)
+
+
+def armor_defs() -> dict:
+    """{armor name: ArmorDef}"""
+    return get_catalog().index("armor_defs", _build_armor_defs)
@@ -0,0 +1,65 @@
+"""Tests for web.abilities — the per-class, level-ordered ability index."""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from web.abilities import AbilityIndex, get_ability_index
+from web.game_session import get_abilities, get_class_abilities
+
+CLASSES = ["Fighter", "Wizard", "Rogue", "Cleric", "Barbarian", "Paladin",
+           "Ranger", "Monk", "Bard", "Sorcerer", "Warlock", "Druid"]
+
+
+def _scan(abilities, class_name, level):
+    """The full scan get_class_abilities() used to do."""
+    result = [{"id": ability_id, **ability} for ability_id, ability in abilities.items()
+              if class_name in ability.get("classes", []) and level >= ability.get("unlock_level", 1)]
+    result.sort(key=lambda a: (a["cost"], a["unlock_level"]))
+    return result
+
+
+class TestAbilityIndex:
+    @pytest.mark.parametrize("class_name", CLASSES)
+    def test_matches_full_scan_at_every_level(self, class_name):
+        abilities = get_abilities()
+        for level in range(0, 22):
+            assert list(get_class_abilities(class_name, level)) == _scan(abilities, class_name, level)
+
+    def test_records_are_shared_and_read_only(self):
+        first = get_class_abilities("Fighter", 20)
+        assert get_class_abilities("Fighter", 20) is first
+        assert get_class_abilities("Fighter", 5)[0] is first[0]
+        with pytest.raises(TypeError):
+            first[0]["cost"] = 99
+
+    def test_unlocked_between(self):
+        index = get_ability_index()
+        abilities = get_abilities()
+        for class_name in CLASSES:
+            for old in range(0, 21):
+                for new in range(old, 21):
+                    before = {a["id"] for a in _scan(abilities, class_name, old)}
+                    gained = index.unlocked_between(class_name, old, new)
+                    expected = [a for a in _scan(abilities, class_name, new) if a["id"] not in before]
+                    assert sorted(a["id"] for a in gained) == sorted(a["id"] for a in expected)
+                    assert [a["unlock_level"] for a in gained] == sorted(a["unlock_level"] for a in gained)
+
+    def test_unknown_class(self):
+        index = get_ability_index()
+        assert index.known("Bureaucrat", 20) == ()
+        assert index.unlocked_between("Bureaucrat", 1, 20) == []
+
+    def test_ties_keep_catalog_order(self):
+        index = AbilityIndex({
+            "b": {"classes": ["X"], "cost": 1, "unlock_level": 3},
+            "a": {"classes": ["X"], "cost": 1, "unlock_level": 3},
+            "c": {"classes": ["X", "Y"], "cost": 0, "unlock_level": 5},
+        })
+        assert [a["id"] for a in index.known("X", 2)] == []
+        assert [a["id"] for a in index.known("X", 4)] == ["b", "a"]
+        assert [a["id"] for a in index.known("X", 9)] == ["c", "b", "a"]
+        assert [a["id"] for a in index.unlocked_between("X", 3, 5)] == ["c"]
+        assert [a["id"] for a in index.known("Y", 5)] == ["c"]
@@ -0,0 +1,171 @@
+"""Tests for seeded battles and web.replay — re-fighting a battle from its seed and actions."""
+
+import sys
+import json
+import random
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from web.game_session import GameSession
+from web.replay import battle_record, main, replay_battle
+from web.routes.battle import play_recorded_action, start_recorded_battle
+from web.session_format import decode, encode
+from characterFactory import CharacterFactory
+from weaponFactory import WeaponFactory
+from items import HealingPotion
+from character import WeaponSlot
+
+POLICY = ("a", "d", "i:0", "s:power_strike", "a", "a", "i:5")
+
+
+def _session():
+    session = GameSession("replay-test")
+    char = CharacterFactory().create_character("Hero", "Human", "Fighter")
+    char.equip_weapon(WeaponFactory().get_weapon_by_name("Longsword"), WeaponSlot.MAIN_HAND)
+    char.add_item(HealingPotion("Small Healing Potion", 10))
+    char.add_item(HealingPotion("Small Healing Potion", 10))
+    session.character = char
+    session.character_creation.name = "Hero"
+    session.character_creation.race = "Human"
+    session.character_creation.class_name = "Fighter"
+    session.character_creation.weapon = "Longsword"
+    return session
+
+
+def _fight(seed, race="Orc", level=2, roundtrip=False, max_actions=60):
+    """Fight a seeded battle to the end with a fixed action policy. With
+    roundtrip, the session goes through to_dict()/from_dict() between actions,
+    as it does between requests."""
+    session = _session()
+    start_recorded_battle(session, race, level, seed)
+    outcome = None
+    for turn in range(max_actions):
+        if roundtrip:
+            session = GameSession.from_dict(json.loads(json.dumps(session.to_dict())))
+        outcome = play_recorded_action(session, POLICY[turn % len(POLICY)])
+        if outcome is not None:
+            break
+    return session, outcome
+
+
+class TestReplayBattle:
+    @pytest.mark.parametrize("seed", [1, 2, 3, 4, 5])
+    def test_replay_reproduces_battle(self, seed):
+        session, outcome = _fight(seed)
+        replay = replay_battle(battle_record(session.battle))
+        assert replay["outcome"] == {True: "won", False: "lost"}[outcome]
+        assert replay["log"] == session.battle.battle_log
+        assert replay["rounds"] == session.battle.round_count
+        assert replay["player_hp"] == session.character.current_hit_points
+        assert replay["monster_hp"] == session.battle.monster_hp
+
+    @pytest.mark.parametrize("seed", [11, 12, 13])
+    def test_replay_after_session_roundtrips(self, seed):
+        session, _ = _fight(seed, roundtrip=True)
+        replay = replay_battle(battle_record(session.battle))
+        assert replay["log"][-10:] == session.battle.battle_log[-10:]
+        assert replay["rounds"] == session.battle.round_count
+        assert replay["monster_hp"] == session.battle.monster_hp
+
+    def test_ongoing_battle(self):
+        session = _session()
+        start_recorded_battle(session, "Goblin", 1, 7)
+        play_recorded_action(session, "d")
+        replay = replay_battle(battle_record(session.battle))
+        if session.character.current_hit_points > 0:
+            assert replay["outcome"] == "ongoing"
+        assert replay["log"] == session.battle.battle_log
+
+    def test_seed_decides_battle(self):
+        first, _ = _fight(99)
+        again, _ = _fight(99)
+        assert first.battle.battle_log == again.battle.battle_log
+        others = [_fight(seed)[0].battle.battle_log for seed in range(100, 105)]
+        assert any(log != first.battle.battle_log for log in others)
+
+    def test_global_random_does_not_matter(self):
+        random.seed(1)
+        first, _ = _fight(42)
+        random.seed(2)
+        again, _ = _fight(42)
+        assert first.battle.battle_log == again.battle.battle_log
+
+    def test_record_survives_binary_format(self):
+        session, _ = _fight(5)
+        record = battle_record(GameSession.from_dict(decode(encode(session.to_dict()))).battle)
+        assert record == battle_record(session.battle)
+        assert replay_battle(record)["log"] == session.battle.battle_log
+
+    def test_record_is_small(self):
+        session = _session()
+        for name in ("Shortbow", "Battleaxe", "Greatsword", "Longbow", "Rapier", "Handaxe"):
+            session.character.add_item(WeaponFactory().get_weapon_by_name(name))
+        session.character.add_item(HealingPotion("Small Healing Potion", 10))
+        start_recorded_battle(session, "Orc", 2, 6)
+        outcome = None
+        for turn in range(60):
+            outcome = play_recorded_action(session, POLICY[turn % len(POLICY)])
+            if outcome is not None:
+                break
+        record = battle_record(session.battle)
+        compact = json.dumps(record, separators=(",", ":"))
+        # the weapons are only placeholders: their details would add hundreds of bytes
+        assert len(compact) < 400
+        assert len(json.dumps([record["seed"], record["actions"]], separators=(",", ":"))) < 100
+        assert record["start"]["items"] == [["Small Healing Potion", 10], ["Small Healing Potion", 10],
+                                            0, 0, 0, 0, 0, 0, ["Small Healing Potion", 10]]
+        assert replay_battle(record)["log"] == session.battle.battle_log
+
+    def test_record_from_before_compact_starts(self):
+        session, _ = _fight(4)
+        record = battle_record(session.battle)
+        replayed = replay_battle(record)
+        session = _session()
+        data = session.to_dict()
+        old = {**record, "start": {"character": data["character"],
+                                   "character_creation": data["character_creation"]}}
+        assert replay_battle(old)["log"] == replayed["log"]
+
+
+class TestInvalidRecords:
+    def test_no_record_for_legacy_battle(self):
+        session = _session()
+        session.battle.is_active = True
+        assert battle_record(session.battle) is None
+        assert battle_record(GameSession("empty").battle) is None
+
+    def test_actions_after_end(self):
+        session, _ = _fight(8)
+        record = battle_record(session.battle)
+        record["actions"].append("a")
+        with pytest.raises(ValueError):
+            replay_battle(record)
+
+    @pytest.mark.parametrize("action", ["x", "s:no_such_ability", "i:potion"])
+    def test_unknown_action(self, action):
+        session = _session()
+        start_recorded_battle(session, "Goblin", 1, 9)
+        record = {**battle_record(session.battle), "actions": [action]}
+        with pytest.raises(ValueError):
+            replay_battle(record)
+
+
+class TestReplayCli:
+    def test_replay_record_file(self, tmp_path, capsys):
+        session, _ = _fight(3)
+        path = tmp_path / "battle.json"
+        path.write_text(json.dumps(battle_record(session.battle)))
+        main(["--record", str(path)])
+        out = capsys.readouterr().out.splitlines()
+        assert out[:-1] == session.battle.battle_log
+        assert out[-1].startswith("-- ")
+
+        main(["--record", str(path), "--json"])
+        printed = json.loads(capsys.readouterr().out)
+        assert printed["replay"]["log"] == session.battle.battle_log
+
+    def test_needs_session_or_record(self):
+        with pytest.raises(SystemExit):
+            main([])
@@ -0,0 +1,94 @@
+"""Tests for web.campaign — CampaignIndex lookups and area adjacency."""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web.campaign import CampaignIndex, get_campaign_index
+from web.game_session import GameSession, get_campaign
+
+
+def _all_areas(campaign):
+    for act in campaign["acts"]:
+        for location in act["locations"]:
+            for area in location["areas"]:
+                yield act, location, area
+
+
+class TestCampaignIndex:
+    def test_lookups_return_the_campaign_objects(self):
+        campaign = get_campaign()
+        index = get_campaign_index()
+        for act, location, area in _all_areas(campaign):
+            assert index.act(act["number"]) is act
+            assert index.location(act["number"], location["name"]) is location
+            assert index.area(act["number"], location["name"], area["id"]) is area
+
+    def test_neighbors_match_connections(self):
+        index = get_campaign_index()
+        for act, location, area in _all_areas(get_campaign()):
+            by_id = {a["id"]: a for a in location["areas"]}
+            expected = [by_id[conn] for conn in area["connections"]]
+            neighbors = index.neighbors(act["number"], location["name"], area["id"])
+            assert [n["id"] for n in neighbors] == [n["id"] for n in expected]
+            assert all(n is e for n, e in zip(neighbors, expected))
+
+    def test_neighbor_requires_a_connection(self):
+        index = get_campaign_index()
+        assert index.neighbor(1, "Rivermeet Town", "town_square", "tavern")["id"] == "tavern"
+        assert index.neighbor(1, "Rivermeet Town", "inn_rooms", "town_square") is None
+        assert index.neighbor(1, "Rivermeet Town", "nowhere", "tavern") is None
+        assert index.neighbors(9, "Rivermeet Town", "town_square") == []
+
+    def test_unknown_keys(self):
+        index = get_campaign_index()
+        assert index.act(99) is None
+        assert index.location(1, "Atlantis") is None
+        assert index.location(2, "Rivermeet Town") is None   # wrong act
+        assert index.area(1, "Rivermeet Town", "nowhere") is None
+
+    def test_other_locations_and_entry_area(self):
+        index = get_campaign_index()
+        act = index.first_act
+        others = index.other_locations(1, "Rivermeet Town")
+        assert [loc["name"] for loc in others] == [loc["name"] for loc in act["locations"][1:]]
+        assert index.entry_area(act["locations"][0]) is act["locations"][0]["areas"][0]
+        assert index.entry_area({"name": "Empty", "areas": []}) is None
+
+    def test_connections_to_missing_areas_are_skipped(self):
+        index = CampaignIndex({"acts": [{"number": 1, "locations": [{"name": "L", "areas": [
+            {"id": "a", "connections": ["b", "ghost"]}, {"id": "b", "connections": ["a"]}]}]}]})
+        assert [n["id"] for n in index.neighbors(1, "L", "a")] == ["b"]
+
+
+class TestSessionLocation:
+    def test_roundtrip_resolves_same_objects(self):
+        index = get_campaign_index()
+        session = GameSession("loc")
+        session.act = index.act(2)
+        session.current_location = session.act["locations"][1]
+        session.current_area = session.current_location["areas"][2]
+        restored = GameSession.from_dict(session.to_dict())
+        assert restored.act is session.act
+        assert restored.current_location is session.current_location
+        assert restored.current_area is session.current_area
+
+    def test_unknown_act_falls_back_to_first(self):
+        restored = GameSession.from_dict({"session_id": "x", "act_num": 42, "location_name": "Rivermeet Town",
+                                          "area_id": "tavern"})
+        assert restored.act is get_campaign_index().first_act
+        assert restored.current_area["id"] == "tavern"
+
+    def test_unknown_location_or_area_falls_back(self):
+        restored = GameSession.from_dict({"session_id": "x", "act_num": 1, "location_name": "Atlantis",
+                                          "area_id": "tavern"})
+        first = get_campaign_index().first_act["locations"][0]
+        assert restored.current_location is first and restored.current_area is first["areas"][0]
+        restored = GameSession.from_dict({"session_id": "x", "act_num": 1, "location_name": "Rivermeet Town",
+                                          "area_id": "moon"})
+        assert restored.current_location["name"] == "Rivermeet Town"
+        assert restored.current_area is restored.current_location["areas"][0]
+
+    def test_no_stored_location(self):
+        restored = GameSession.from_dict({"session_id": "x", "act_num": 1})
+        assert restored.current_location is None and restored.current_area is None
@@ -0,0 +1,129 @@
+"""Tests for catalog — the shared, read-only registry of json/ game data."""
+
+import sys
+import copy
+import json
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from catalog import Catalog, CATALOG_DIR, FrozenDict, FrozenList, get_catalog, weapons_by_name
+from weaponFactory import WeaponFactory
+from armorFactory import ArmorFactory
+from monsterFactory import MonsterFactory
+from characterFactory import CharacterFactory
+from lootGenerator import LootGenerator
+from web.game_session import GameSession, get_races, get_all_armors_flat
+
+
+class TestCatalog:
+    def test_each_file_is_read_once(self):
+        catalog = Catalog()
+        first = catalog.load("races.json")
+        assert catalog.load("races.json") is first
+        assert catalog.disk_reads == 1
+
+    def test_load_all_reads_every_file(self):
+        catalog = Catalog()
+        count = catalog.load_all()
+        assert count == len(list(CATALOG_DIR.glob("*.json")))
+        catalog.load("campaign.json")
+        assert catalog.disk_reads == count
+
+    def test_data_is_read_only(self):
+        races = Catalog().load("races.json")
+        human = races["Human"]
+        assert isinstance(races, FrozenDict)
+        with pytest.raises(TypeError):
+            races["Orc"] = {}
+        with pytest.raises(TypeError):
+            human.update(strength_bonus=9)
+        with pytest.raises(TypeError):
+            Catalog().load("shop_inventory.json").append({})
+
+    def test_data_still_behaves_like_json(self):
+        races = Catalog().load("races.json")
+        with open(CATALOG_DIR / "races.json") as f:
+            assert races == json.load(f)
+        assert json.loads(json.dumps(races)) == races
+        assert type({**races["Human"]}) is dict
+
+    def test_deepcopy_is_plain_and_mutable(self):
+        quests = copy.deepcopy(Catalog().load("quests.json"))
+        assert type(quests) is dict
+        quests["new"] = {}
+
+    def test_index_is_built_once(self):
+        catalog = Catalog()
+        builds = []
+
+        def build(c):
+            builds.append(1)
+            return {"names": list(c.load("races.json"))}
+
+        assert catalog.index("race_names", build) is catalog.index("race_names", build)
+        assert isinstance(catalog.index("race_names", build)["names"], FrozenList)
+        assert builds == [1]
+
+
+class TestCatalogBackedFactories:
+    def test_no_disk_reads_once_loaded(self):
+        catalog = get_catalog()
+        catalog.load_all()
+        reads = catalog.disk_reads
+        WeaponFactory().get_weapon_by_name("Longsword")
+        ArmorFactory().get_armor_by_name("Leather")
+        MonsterFactory().create_monster("Grib", "Goblin", "Fighter", 2, "Club")
+        LootGenerator().generate_loot(5, 1)
+        char = CharacterFactory().create_character("Hero", "Human", "Fighter")
+        session = GameSession("catalog")
+        session.character = char
+        session.character_creation.name = "Hero"
+        session.character_creation.race = "Human"
+        session.character_creation.class_name = "Fighter"
+        assert GameSession.from_dict(session.to_dict()).character.name == "Hero"
+        assert get_races() is catalog.load("races.json")
+        assert catalog.disk_reads == reads
+
+    def test_factories_share_one_index(self):
+        assert WeaponFactory().all_weapons is WeaponFactory().all_weapons is weapons_by_name()
+        assert ArmorFactory().all_armors is get_all_armors_flat()
+        assert weapons_by_name()["Longbow"]["type"] == "martial_ranged"
+
+
+class TestSharedItems:
+    def test_weapons_and_armor_are_interned(self):
+        assert WeaponFactory().get_weapon_by_name("Longbow") is WeaponFactory().get_weapon_by_name("Longbow")
+        assert ArmorFactory().get_armor_by_name("Leather") is ArmorFactory().get_armor_by_name("Leather")
+
+    def test_shared_items_are_immutable(self):
+        weapon = WeaponFactory().get_weapon_by_name("Longbow")
+        armor = ArmorFactory().get_armor_by_name("Leather")
+        with pytest.raises(AttributeError):
+            weapon.damage_die = 12
+        with pytest.raises(AttributeError):
+            del armor.base_ac
+        assert weapon.properties == tuple(weapons_by_name()["Longbow"]["properties"])
+        assert weapon.is_ranged
+
+    def test_unknown_names_still_raise(self):
+        with pytest.raises(ValueError):
+            WeaponFactory().get_weapon_by_name("Banana")
+        with pytest.raises(ValueError):
+            ArmorFactory().get_armor_by_name("Banana")
+
+    def test_restored_sessions_share_items(self):
+        char = CharacterFactory().create_character("Hero", "Human", "Fighter")
+        char.equip_weapon(WeaponFactory().get_weapon_by_name("Longsword"))
+        char.add_item(WeaponFactory().get_weapon_by_name("Longsword"))
+        session = GameSession("shared")
+        session.character = char
+        session.character_creation.name = "Hero"
+        session.character_creation.race = "Human"
+        session.character_creation.class_name = "Fighter"
+        session.character_creation.weapon = "Longsword"
+        data = json.loads(json.dumps(session.to_dict()))
+        assert data["character"]["inventory"][0]["properties"] == ["versatile"]
+        a, b = (GameSession.from_dict(data).character for _ in range(2))
+        assert a.inventory[0] is b.inventory[0] is WeaponFactory().get_weapon_by_name("Longsword")
@@ -0,0 +1,127 @@
+"""Tests for catalog_bundle — catalog validation and the precompiled bundle."""
+
+import sys
+import os
+import json
+import shutil
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from catalog import CATALOG_DIR, Catalog, thaw
+from catalog_bundle import build, check_schema, load_sources, validate, Each, OneOf
+
+
+@pytest.fixture
+def catalog_dir(tmp_path):
+    directory = tmp_path / "json"
+    shutil.copytree(CATALOG_DIR, directory, ignore=shutil.ignore_patterns("catalog.bundle"))
+    return directory
+
+
+def _sources():
+    return thaw(load_sources(Catalog()))
+
+
+def _edit(directory, filename, change):
+    path = directory / filename
+    data = json.loads(path.read_text())
+    change(data)
+    path.write_text(json.dumps(data))
+
+
+class TestValidation:
+    def test_shipped_catalogs_are_valid(self):
+        assert validate(load_sources(Catalog())) == []
+
+    def test_schema_problems_are_reported_with_paths(self):
+        schema = {"name": str, "level": int, "kind?": OneOf("a", "b"), "tags": [str], "stats": Each(int)}
+        errors = []
+        check_schema({"level": True, "kind": "c", "tags": ["x", 3], "stats": {"hp": "9"}, "extra": 1},
+                     schema, "thing", errors)
+        assert sorted(errors) == sorted([
+            "thing: missing 'name'",
+            "thing.level: expected int, got bool",
+            "thing.kind: 'c' is not one of 'a', 'b'",
+            "thing.tags[1]: expected str, got int",
+            "thing.stats.hp: expected int, got str",
+            "thing: unexpected field 'extra'",
+        ])
+
+    def test_type_errors_in_catalogs(self):
+        files = _sources()
+        files["weapon-catalog.json"]["simple_melee"]["Club"]["damage_die"] = "4"
+        del files["quests.json"]["goblin_menace"]["target_count"]
+        errors = validate(files)
+        assert "weapon-catalog.json: simple_melee.Club.damage_die: expected int, got str" in errors
+        assert "quests.json: goblin_menace: missing 'target_count'" in errors
+
+    def test_broken_references(self):
+        files = _sources()
+        files["monster_default_values.json"]["Goblin"]["weapons"].append("Banana")
+        files["quests.json"]["goblin_menace"]["target_monster"] = "Dragon"
+        files["campaign.json"]["acts"][0]["locations"][0]["areas"][0]["connections"].append("nowhere")
+        errors = validate(files)
+        assert "monster_default_values.json: Goblin refers to unknown weapon 'Banana'" in errors
+        assert "quests.json: goblin_menace refers to unknown monster 'Dragon'" in errors
+        assert any("refers to unknown area 'nowhere'" in e for e in errors)
+
+    def test_unused_content_references_are_warnings(self):
+        warnings = []
+        assert validate(load_sources(Catalog()), warnings) == []
+        assert any("boss" in w for w in warnings)
+
+    def test_files_without_a_schema_are_rejected(self):
+        files = _sources()
+        files["dragons.json"] = {}
+        assert validate(files) == ["dragons.json: no schema (add one to catalog_bundle.SCHEMAS)"]
+
+
+class TestBundle:
+    def test_bundle_loads_everything_in_one_read(self, catalog_dir):
+        content_hash = build(catalog_dir)
+        catalog = Catalog(catalog_dir)
+        assert catalog.load_bundle()
+        assert catalog.bundle_hash == content_hash
+        assert catalog.disk_reads == 1
+        raw = Catalog(catalog_dir)
+        raw.load_all()
+        for path in catalog.source_files():
+            assert catalog.load(path.name) == raw.load(path.name)
+        assert catalog.stats["indexes"] == 2
+        assert catalog.disk_reads == 1
+
+    def test_bundled_data_is_read_only(self, catalog_dir):
+        build(catalog_dir)
+        catalog = Catalog(catalog_dir)
+        catalog.load_bundle()
+        with pytest.raises(TypeError):
+            catalog.load("races.json")["Human"]["strength_bonus"] = 5
+
+    def test_changed_source_makes_bundle_stale(self, catalog_dir):
+        build(catalog_dir)
+        _edit(catalog_dir, "races.json", lambda races: races["Human"].update(strength_bonus=2))
+        catalog = Catalog(catalog_dir)
+        assert not catalog.load_bundle()
+        assert catalog.stats["files"] == 0
+        assert catalog.load("races.json")["Human"]["strength_bonus"] == 2
+
+    def test_touched_but_unchanged_source_keeps_bundle(self, catalog_dir):
+        build(catalog_dir)
+        path = catalog_dir / "races.json"
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+        assert Catalog(catalog_dir).load_bundle()
+
+    def test_missing_or_corrupt_bundle_is_ignored(self, catalog_dir):
+        assert not Catalog(catalog_dir).load_bundle()
+        build(catalog_dir)
+        bundle = catalog_dir / "catalog.bundle"
+        bundle.write_bytes(bundle.read_bytes()[:200])
+        assert not Catalog(catalog_dir).load_bundle()
+
+    def test_invalid_catalogs_are_not_bundled(self, catalog_dir):
+        _edit(catalog_dir, "quests.json", lambda quests: quests["goblin_menace"].update(target_monster="Dragon"))
+        with pytest.raises(ValueError, match="Dragon"):
+            build(catalog_dir)
+        assert not (catalog_dir / "catalog.bundle").exists()
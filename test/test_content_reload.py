@@ -0,0 +1,204 @@
+"""Tests for web.content_reload — hot reload of json/ and per-request catalog snapshots."""
+
+import sys
+import json
+import asyncio
+import shutil
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from catalog import CATALOG_DIR, Catalog, get_catalog, set_catalog, pin_catalog, unpin_catalog
+from web.campaign import get_campaign_index
+from web.content_reload import CatalogSnapshotMiddleware, ContentWatcher
+from web.game_session import GameSession, get_quests
+from web.session_store import run_store_io
+from weaponFactory import WeaponFactory
+from engine.quests import check_quest_progress
+from records import quest_defs
+
+
+@pytest.fixture
+def live_catalog(tmp_path):
+    """A catalog of a scratch copy of json/, installed as the process-wide one."""
+    directory = tmp_path / "json"
+    shutil.copytree(CATALOG_DIR, directory, ignore=shutil.ignore_patterns("catalog.bundle"))
+    original = get_catalog()
+    catalog = Catalog(directory)
+    catalog.load_all()
+    set_catalog(catalog)
+    yield catalog
+    set_catalog(original)
+
+
+def _edit(catalog, filename, change):
+    path = catalog.directory / filename
+    data = json.loads(path.read_text())
+    change(data)
+    path.write_text(json.dumps(data))
+
+
+def _remove_tavern(campaign):
+    town = campaign["acts"][0]["locations"][0]
+    town["areas"] = [a for a in town["areas"] if a["id"] != "tavern"]
+    for area in town["areas"]:
+        area["connections"] = [c for c in area["connections"] if c != "tavern"]
+
+
+class TestContentWatcher:
+    def test_unchanged_content_is_not_reloaded(self, live_catalog):
+        watcher = ContentWatcher()
+        assert not watcher.check()
+        assert get_catalog() is live_catalog
+        assert watcher.stats == {"checks": 1, "reloads": 0, "rejected": 0}
+
+    def test_edited_file_is_swapped_in(self, live_catalog):
+        get_campaign_index()
+        WeaponFactory().get_weapon_by_name("Club")
+        watcher = ContentWatcher()
+        _edit(live_catalog, "quests.json", lambda q: q["goblin_menace"].update(name="Goblin Trouble"))
+        assert watcher.check()
+        reloaded = get_catalog()
+        assert reloaded is not live_catalog
+        assert get_quests()["goblin_menace"]["name"] == "Goblin Trouble"
+        assert live_catalog.load("quests.json")["goblin_menace"]["name"] != "Goblin Trouble"
+        # Indexes in use were rebuilt up front, from the new files
+        assert reloaded.stats["indexes"] == live_catalog.stats["indexes"]
+        assert WeaponFactory().get_weapon_by_name("Club") is not None
+        assert not watcher.check()
+
+    def test_unparsable_content_keeps_running_catalog(self, live_catalog):
+        watcher = ContentWatcher()
+        (live_catalog.directory / "monster_taunts.json").write_text("{ half-saved")
+        assert not watcher.check()
+        assert get_catalog() is live_catalog
+        assert watcher.stats["rejected"] == 1
+        _edit(live_catalog, "quests.json", lambda q: None)
+        (live_catalog.directory / "monster_taunts.json").write_text("{}")
+        assert watcher.check()
+
+    def test_invalid_content_keeps_running_catalog(self, live_catalog):
+        watcher = ContentWatcher()
+        _edit(live_catalog, "quests.json", lambda q: q["goblin_menace"].update(target_monster="Dragon"))
+        assert not watcher.check()
+        assert get_catalog() is live_catalog
+
+
+class TestSnapshots:
+    def test_pinned_catalog_survives_a_swap(self, live_catalog):
+        token = pin_catalog()
+        try:
+            set_catalog(Catalog(live_catalog.directory))
+            assert get_catalog() is live_catalog
+            assert asyncio.run(run_store_io(get_catalog)) is live_catalog
+        finally:
+            unpin_catalog(token)
+        assert get_catalog() is not live_catalog
+
+    def test_request_keeps_its_snapshot(self, live_catalog):
+        seen = []
+        newer = Catalog(live_catalog.directory)
+
+        async def endpoint(scope, receive, send):
+            seen.append(get_catalog())
+            set_catalog(newer)
+            seen.append(get_catalog())
+
+        asyncio.run(CatalogSnapshotMiddleware(endpoint)({"type": "http"}, None, None))
+        assert seen == [live_catalog, live_catalog]
+        assert get_catalog() is newer
+
+
+class TestRemovedContent:
+    def test_stored_session_in_removed_area(self, live_catalog):
+        data = {"session_id": "x", "act_num": 1, "location_name": "Rivermeet Town", "area_id": "tavern"}
+        watcher = ContentWatcher()
+        _edit(live_catalog, "campaign.json", _remove_tavern)
+        assert watcher.check()
+        restored = GameSession.from_dict(data)
+        assert restored.current_location["name"] == "Rivermeet Town"
+        assert restored.current_area["id"] == "town_square"
+
+    def test_cached_session_is_relocated_after_reload(self, live_catalog):
+        session = GameSession.from_dict(
+            {"session_id": "x", "act_num": 1, "location_name": "Rivermeet Town", "area_id": "tavern"})
+        assert session.current_area["id"] == "tavern"
+        watcher = ContentWatcher()
+        _edit(live_catalog, "campaign.json", _remove_tavern)
+        assert watcher.check()
+        session.refresh_content()
+        assert session.current_area["id"] == "town_square"
+        assert session.current_location is get_campaign_index().location(1, "Rivermeet Town")
+
+    def test_removed_quest_is_ignored(self, live_catalog):
+        watcher = ContentWatcher()
+        _edit(live_catalog, "quests.json", lambda q: q.pop("goblin_menace"))
+        assert watcher.check()
+        active = {"goblin_menace": {"progress": 1, "status": "active"}}
+        assert "goblin_menace" not in quest_defs()
+        assert check_quest_progress(active, quest_defs(), "Goblin", []) == []
+
+    def test_routes_load_session_holding_removed_content(self, live_catalog, tmp_path, monkeypatch):
+        """A stored session whose inventory holds a removed weapon and whose
+        active quest was removed still renders after the reload."""
+        from fastapi.testclient import TestClient
+        from web import game_session
+        from web.app import app
+        from web.session_store import FileSessionStore
+
+        store = FileSessionStore(tmp_path / "sessions")
+        monkeypatch.setattr(game_session, "get_store", lambda: store)
+        monkeypatch.setattr(game_session, "get_cache", lambda: None)
+        client = TestClient(app)
+        client.get("/character/new")
+        client.post("/character/race", data={"race": "Human"})
+        client.post("/character/class", data={"class_name": "Fighter"})
+        client.post("/character/create", data={"name": "Hero", "weapon": "Longsword", "armor": "", "skills": []})
+        (session_id,) = store.session_ids()
+        data = store.load(session_id)
+        data["character"]["inventory"][:0] = [{"name": "Battleaxe", "type": "weapon"}]
+        data["active_quests"] = {"goblin_menace": {"progress": 1, "status": "active"}}
+        store.save(session_id, data)
+
+        def remove_battleaxe(monsters):
+            for monster in monsters.values():
+                if isinstance(monster, dict) and "Battleaxe" in monster.get("weapons", []):
+                    monster["weapons"].remove("Battleaxe")
+
+        watcher = ContentWatcher()
+        _edit(live_catalog, "weapon-catalog.json", lambda w: w["martial_melee"].pop("Battleaxe"))
+        _edit(live_catalog, "monster_default_values.json", remove_battleaxe)
+        _edit(live_catalog, "quests.json", lambda q: q.pop("goblin_menace"))
+        assert watcher.check()
+
+        for path in ("/inventory/", "/game/", "/battle/status"):
+            response = client.get(path)
+            assert response.status_code == 200, path
+            assert response.url.path == path
+        assert "Battleaxe" not in client.get("/inventory/").text
+
+    def test_character_that_no_longer_rebuilds(self, live_catalog, tmp_path, monkeypatch):
+        """Pages that only show the stored character still render; routes that
+        use the character send the player to character creation."""
+        from fastapi.testclient import TestClient
+        from web import game_session
+        from web.app import app
+        from web.session_store import FileSessionStore
+
+        store = FileSessionStore(tmp_path / "sessions")
+        monkeypatch.setattr(game_session, "get_store", lambda: store)
+        monkeypatch.setattr(game_session, "get_cache", lambda: None)
+        client = TestClient(app)
+        client.get("/character/new")
+        client.post("/character/race", data={"race": "Human"})
+        client.post("/character/class", data={"class_name": "Fighter"})
+        client.post("/character/create", data={"name": "Hero", "weapon": "Longsword", "armor": "", "skills": []})
+        (session_id,) = store.session_ids()
+        data = store.load(session_id)
+        data["character_creation"]["race"] = "Vampire"
+        store.save(session_id, data)
+
+        assert client.get("/game/").url.path == "/game/"
+        for path in ("/inventory/", "/battle/start"):
+            assert client.get(path).url.path == "/character/new", path
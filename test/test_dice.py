@@ -0,0 +1,82 @@
+"""Tests for dice — the Dice façade and the buffered DiceStream backend."""
+
+import sys
+import random
+import threading
+from collections import Counter
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from dice import GLOBAL_RANDOM, Dice, DiceStream, current_stream, use_stream
+
+SIDES = (4, 6, 8, 10, 12, 20, 100)
+
+
+class TestDiceFacade:
+    def test_global_random_by_default(self):
+        assert current_stream() is GLOBAL_RANDOM
+        random.seed(3)
+        first = [Dice.roll_d20() for _ in range(50)]
+        random.seed(3)
+        assert [Dice.roll(20) for _ in range(50)] == first
+
+    def test_use_stream(self):
+        with use_stream(DiceStream(1)) as stream:
+            assert current_stream() is stream
+            rolls = [Dice.roll_d8() for _ in range(20)]
+        assert current_stream() is GLOBAL_RANDOM
+        expected = DiceStream(1)
+        assert rolls == [expected.roll(8) for _ in range(20)]
+
+    def test_streams_are_per_thread(self):
+        seen = []
+
+        def worker():
+            seen.append(current_stream())
+
+        with use_stream(DiceStream(1)):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        assert seen == [GLOBAL_RANDOM]
+
+
+class TestDiceStream:
+    @pytest.mark.parametrize("sides", SIDES)
+    def test_every_face_equally_likely(self, sides):
+        stream = DiceStream(sides, block=257)
+        counts = Counter(stream.roll(sides) for _ in range(sides * 1000))
+        assert set(counts) == set(range(1, sides + 1))
+        assert max(counts.values()) - min(counts.values()) < 300
+
+    def test_seeded_streams_repeat(self):
+        first, second = DiceStream("abc"), DiceStream("abc")
+        assert [first.roll(s) for s in SIDES * 500] == [second.roll(s) for s in SIDES * 500]
+        assert [DiceStream(1).roll(20) for _ in range(5)] != [DiceStream(2).roll(20) for _ in range(5)]
+
+    def test_large_and_odd_dice(self):
+        stream = DiceStream(1, block=1)
+        assert all(1 <= stream.roll(1000) <= 1000 for _ in range(100))
+        assert all(stream.roll(1) == 1 for _ in range(10))
+        assert all(1 <= stream.roll(255) <= 255 for _ in range(100))
+
+    def test_spawn(self):
+        parent = DiceStream(7)
+        a, b = parent.spawn("session-a"), parent.spawn("session-b")
+        assert [a.roll(20) for _ in range(20)] != [b.roll(20) for _ in range(20)]
+        a, again = DiceStream(7).spawn("session-a"), DiceStream(7).spawn("session-a")
+        assert [a.roll(20) for _ in range(20)] == [again.roll(20) for _ in range(20)]
+        assert DiceStream().spawn(1).seed is None
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            DiceStream(1, backend="dice-tower")
+
+    def test_numpy_backend(self):
+        pytest.importorskip("numpy")
+        first, second = DiceStream("abc", "numpy"), DiceStream("abc", "numpy")
+        rolls = [first.roll(s) for s in SIDES * 200]
+        assert rolls == [second.roll(s) for s in SIDES * 200]
+        assert all(1 <= roll <= s for roll, s in zip(rolls, SIDES * 200))
@@ -0,0 +1,74 @@
+"""Tests for web.eligibility — the class equipment-eligibility matrix."""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from web.eligibility import EquipmentEligibility, get_eligibility
+from web.game_session import get_classes, get_all_weapons_flat, get_all_armors_flat
+from weaponFactory import WeaponFactory
+from armorFactory import ArmorFactory
+from items import HealingPotion
+
+
+def _usable_weapons(class_props, weapons):
+    """The per-weapon check character creation used to run on every request."""
+    proficiencies = class_props["weapon_proficiencies"]
+    return {name for name, weapon in weapons.items()
+            if ("Simple" in proficiencies and weapon["category"] == "Simple")
+            or ("Martial" in proficiencies and weapon["category"] == "Martial")
+            or name in proficiencies}
+
+
+class TestEligibility:
+    def test_matches_per_item_checks(self):
+        eligibility = get_eligibility()
+        weapons, armors = get_all_weapons_flat(), get_all_armors_flat()
+        for class_name, props in get_classes().items():
+            assert eligibility.weapons(class_name) == _usable_weapons(props, weapons)
+            assert eligibility.armors(class_name) == {
+                name for name, armor in armors.items() if armor["category"] in props["armor_training"]}
+
+    def test_options_are_in_catalog_order(self):
+        eligibility = get_eligibility()
+        options = eligibility.weapon_options("Fighter")
+        assert [o["name"] for o in options] == list(get_all_weapons_flat())
+        club = next(o for o in options if o["name"] == "Club")
+        assert club["damage_die"] == get_all_weapons_flat()["Club"]["damage_die"]
+        assert eligibility.armor_options("Wizard") == ()
+
+    def test_options_are_shared_and_read_only(self):
+        eligibility = get_eligibility()
+        assert get_eligibility() is eligibility
+        assert eligibility.weapon_options("Rogue") is eligibility.weapon_options("Rogue")
+        with pytest.raises(TypeError):
+            eligibility.weapon_options("Rogue")[0]["name"] = "Banana"
+
+    def test_can_equip_inventory_items(self):
+        eligibility = get_eligibility()
+        longsword = WeaponFactory().get_weapon_by_name("Longsword")
+        plate = ArmorFactory().get_armor_by_name("Plate")
+        assert eligibility.can_equip("Fighter", longsword) and eligibility.can_equip("Fighter", plate)
+        assert not eligibility.can_equip("Wizard", longsword) and not eligibility.can_equip("Wizard", plate)
+        assert eligibility.can_equip("Rogue", longsword)     # named proficiency
+        assert not eligibility.can_equip("Fighter", HealingPotion("Potion", 10))
+
+    def test_unknown_class_or_item(self):
+        eligibility = get_eligibility()
+        assert eligibility.weapons("Bureaucrat") == frozenset()
+        assert eligibility.weapon_options("Bureaucrat") == ()
+        assert not eligibility.can_use_weapon("Bureaucrat", "Club")
+        assert not eligibility.can_use_weapon("Fighter", "Banana")
+
+    def test_named_proficiency_outside_category(self):
+        eligibility = EquipmentEligibility(
+            {"Tinker": {"weapon_proficiencies": ["Simple", "Wrench"], "armor_training": ["Light"]}},
+            {"Club": {"category": "Simple", "damage_die": 4, "damage_type": "bludgeoning"},
+             "Wrench": {"category": "Martial", "damage_die": 6, "damage_type": "bludgeoning"},
+             "Halberd": {"category": "Martial", "damage_die": 10, "damage_type": "slashing"}},
+            {"Leather": {"category": "Light", "base_ac": 11, "weight": 10, "stealth_disadvantage": False}})
+        assert eligibility.weapons("Tinker") == {"Club", "Wrench"}
+        assert eligibility.armors("Tinker") == {"Leather"}
+        assert eligibility.weapon_options("Tinker")[0]["properties"] == "None"
@@ -12,7 +12,10 @@ from engine.combat import (
     calculate_gold_reward,
     roll_damage,
     attack_roll,
+    roll_ability,
 )
+from engine.combatant import CombatantState
+from records import ability_defs
 
 
 class TestWeaponAttackModifier:
@@ -136,6 +139,55 @@ class TestResolveWeaponAttack:
         assert result["damage"] == 15
 
 
+class TestRollAbility:
+    def setup_method(self):
+        self._orig_d20 = Dice.roll_d20
+        self._orig_roll = Dice.roll
+        self.target = CombatantState(ac=12, str_mod=1, dex_mod=2)
+
+    def teardown_method(self):
+        Dice.roll_d20 = self._orig_d20
+        Dice.roll = self._orig_roll
+
+    def test_spell_attack_hit_and_miss(self):
+        Dice.roll = lambda size: size
+        Dice.roll_d20 = lambda: 20
+        hit = roll_ability(ability_defs()["fire_bolt"], 3, 2, 1, self.target)
+        assert hit["hit"] and hit["attack_roll"] == 25 and hit["damage"] == 13   # d10 + modifier
+        Dice.roll_d20 = lambda: 1
+        miss = roll_ability(ability_defs()["fire_bolt"], 3, 2, 1, self.target)
+        assert not miss["hit"] and miss["damage"] == 0 and miss["save_roll"] is None
+
+    def test_damage_scales_with_level(self):
+        Dice.roll_d20 = lambda: 20
+        Dice.roll = lambda size: size
+        assert roll_ability(ability_defs()["fire_bolt"], 3, 2, 11, self.target)["damage"] == 33   # 3d10 at level 11
+
+    def test_successful_save_halves_damage(self):
+        ability = next(a for a in ability_defs().values()
+                       if a.attack_method == "spell_save" and a.damage and a.save_ability == "dex")
+        Dice.roll = lambda size: size
+        Dice.roll_d20 = lambda: 1
+        failed = roll_ability(ability, 3, 2, 5, self.target)
+        Dice.roll_d20 = lambda: 20
+        saved = roll_ability(ability, 3, 2, 5, self.target)
+        assert not failed["saved"] and saved["saved"] and saved["save_roll"] == 22
+        assert saved["spell_dc"] == 13 and saved["damage"] == max(1, failed["damage"] // 2)
+
+    def test_target_effects_apply(self):
+        Dice.roll_d20 = lambda: 10
+        Dice.roll = lambda size: 1
+        self.target.effects = [{"stat": "ac", "value": 3, "duration": 1, "source": "x"},
+                               {"stat": "damage_reduction", "value": 5, "duration": 1, "source": "x"}]
+        result = roll_ability(ability_defs()["fire_bolt"], 3, 2, 1, self.target)
+        assert result["target_ac"] == 15 and result["hit"] and result["damage"] == 1
+
+    def test_heal_uses_level_bonus(self):
+        Dice.roll = lambda size: 4
+        result = roll_ability(ability_defs()["second_wind"], 1, 2, 3, self.target)
+        assert result["heal"] == 7 and result["damage"] == 0
+
+
 class TestRollDamage:
     def setup_method(self):
         self._orig = Dice.roll
@@ -8,6 +8,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from engine.quests import check_quest_progress, turn_in_quest
 from items import QuestItem
 from characterFactory import CharacterFactory
+from records import QuestDef
 
 
 KILL_QUEST = {
@@ -36,10 +37,14 @@ GATHER_QUEST = {
 }
 
 
+def _defs(quests):
+    return {quest_id: QuestDef.from_catalog(quest_id, quest) for quest_id, quest in quests.items()}
+
+
 class TestCheckQuestProgress:
     def test_kill_quest_increments(self):
         active = {"q1": {"progress": 0, "status": "active"}}
-        all_quests = {"q1": KILL_QUEST}
+        all_quests = _defs({"q1": KILL_QUEST})
         updates = check_quest_progress(active, all_quests, "Goblin", [])
         assert active["q1"]["progress"] == 1
         assert len(updates) == 1
@@ -47,28 +52,28 @@ class TestCheckQuestProgress:
 
     def test_kill_quest_wrong_monster(self):
         active = {"q1": {"progress": 0, "status": "active"}}
-        all_quests = {"q1": KILL_QUEST}
+        all_quests = _defs({"q1": KILL_QUEST})
         updates = check_quest_progress(active, all_quests, "Orc", [])
         assert active["q1"]["progress"] == 0
         assert len(updates) == 0
 
     def test_kill_quest_completion(self):
         active = {"q1": {"progress": 2, "status": "active"}}
-        all_quests = {"q1": KILL_QUEST}
+        all_quests = _defs({"q1": KILL_QUEST})
         check_quest_progress(active, all_quests, "Goblin", [])
         assert active["q1"]["progress"] == 3
         assert active["q1"]["status"] == "ready"
 
     def test_ready_quest_not_updated(self):
         active = {"q1": {"progress": 3, "status": "ready"}}
-        all_quests = {"q1": KILL_QUEST}
+        all_quests = _defs({"q1": KILL_QUEST})
         updates = check_quest_progress(active, all_quests, "Goblin", [])
         assert active["q1"]["progress"] == 3  # unchanged
         assert len(updates) == 0
 
     def test_gather_quest_drops_item(self):
         active = {"q1": {"progress": 0, "status": "active"}}
-        all_quests = {"q1": GATHER_QUEST}
+        all_quests = _defs({"q1": GATHER_QUEST})
         inventory = []
         updates = check_quest_progress(active, all_quests, "Troll", inventory)
         assert len(inventory) == 1
@@ -81,7 +86,7 @@ class TestCheckQuestProgress:
         """With 0% drop chance, nothing drops."""
         no_drop_quest = {**GATHER_QUEST, "quest_item": {**GATHER_QUEST["quest_item"], "drop_chance": 0.0}}
         active = {"q1": {"progress": 0, "status": "active"}}
-        all_quests = {"q1": no_drop_quest}
+        all_quests = _defs({"q1": no_drop_quest})
         inventory = []
         updates = check_quest_progress(active, all_quests, "Troll", inventory)
         assert len(inventory) == 0
@@ -90,7 +95,7 @@ class TestCheckQuestProgress:
 
     def test_gather_quest_completes(self):
         active = {"q1": {"progress": 1, "status": "active"}}
-        all_quests = {"q1": GATHER_QUEST}
+        all_quests = _defs({"q1": GATHER_QUEST})
         # Pre-existing quest item in inventory
         inventory = [QuestItem("Troll Tusk", "A gnarly tusk", "q1")]
         check_quest_progress(active, all_quests, "Troll", inventory)
@@ -103,7 +108,7 @@ class TestCheckQuestProgress:
             "q2": {"progress": 0, "status": "active"},
         }
         quest2 = {**KILL_QUEST, "name": "More Goblins", "target_count": 5}
-        all_quests = {"q1": KILL_QUEST, "q2": quest2}
+        all_quests = _defs({"q1": KILL_QUEST, "q2": quest2})
         updates = check_quest_progress(active, all_quests, "Goblin", [])
         assert active["q1"]["progress"] == 1
         assert active["q2"]["progress"] == 1
@@ -122,7 +127,7 @@ class TestTurnInQuest:
         char = self._make_character()
         active = {"q1": {"progress": 3, "status": "ready"}}
         completed = []
-        all_quests = {"q1": KILL_QUEST}
+        all_quests = _defs({"q1": KILL_QUEST})
         result = turn_in_quest("q1", active, completed, all_quests, char)
         assert result is not None
         assert result["gold"] == 50
@@ -135,7 +140,7 @@ class TestTurnInQuest:
     def test_not_ready_returns_none(self):
         char = self._make_character()
         active = {"q1": {"progress": 1, "status": "active"}}
-        result = turn_in_quest("q1", active, [], {"q1": KILL_QUEST}, char)
+        result = turn_in_quest("q1", active, [], _defs({"q1": KILL_QUEST}), char)
         assert result is None
         assert "q1" in active  # not removed
 
@@ -153,7 +158,7 @@ class TestTurnInQuest:
         ]
         active = {"q1": {"progress": 2, "status": "ready"}}
         completed = []
-        result = turn_in_quest("q1", active, completed, {"q1": GATHER_QUEST}, char)
+        result = turn_in_quest("q1", active, completed, _defs({"q1": GATHER_QUEST}), char)
         assert result is not None
         # Only the q2 item should remain
         assert len(char.inventory) == 1
@@ -163,7 +168,7 @@ class TestTurnInQuest:
         char = self._make_character()
         char.xp = 140  # close to level 2 (need 150)
         active = {"q1": {"progress": 3, "status": "ready"}}
-        result = turn_in_quest("q1", active, [], {"q1": KILL_QUEST}, char)
+        result = turn_in_quest("q1", active, [], _defs({"q1": KILL_QUEST}), char)
         assert result is not None
         assert len(result["level_ups"]) >= 1
         assert char.level >= 2
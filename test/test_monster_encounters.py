@@ -1,11 +1,14 @@
 import json
+import random
 import sys
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from monsterFactory import MonsterFactory
+from monsterFactory import MonsterFactory, encounter_templates
+from engine.combatant import CombatantState
+from records import monster_templates
 
 
 def load_json(filename):
@@ -94,3 +97,34 @@ class TestMonsterDataIntegrity:
             assert data["hit_die"] in valid_dice, (
                 f"{race} has invalid hit_die: {data['hit_die']}"
             )
+
+
+class TestEncounterTemplates:
+    def test_combatant_matches_monster_entity(self):
+        factory = MonsterFactory()
+        for race, template in encounter_templates().items():
+            for weapon in template.weapons:
+                for level in (1, 4, 9):
+                    random.seed(level)
+                    monster = factory.create_monster("Test", race, "Fighter", level, weapon.name)
+                    expected = CombatantState.from_monster(monster).to_dict()
+                    random.seed(level)
+                    assert template.combatant(level, "Test", weapon).to_dict() == expected
+
+    def test_random_name_and_weapon_come_from_the_race(self):
+        for race, template in encounter_templates().items():
+            combatant = MonsterFactory().create_combatant(race, 3)
+            assert combatant.name in template.names
+            assert combatant.weapon.name in monster_templates()[race].weapons
+            assert combatant.hp == combatant.max_hp >= 1
+
+    def test_unknown_race_is_a_goblin(self):
+        assert MonsterFactory().create_combatant("Dragon", 2).race == "Goblin"
+
+    def test_combatants_do_not_share_state(self):
+        template = encounter_templates()["Goblin"]
+        first, second = template.combatant(1), template.combatant(1)
+        first.weapon.properties.append("cursed")
+        first.effects.append({"stat": "ac", "value": -1, "duration": 1})
+        assert "cursed" not in second.weapon.properties and second.effects == []
+        assert "cursed" not in template.combatant(1).weapon.properties
@@ -0,0 +1,99 @@
+"""Tests for engine.odds — exact damage distributions and hit chances."""
+
+import sys
+import itertools
+import random
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from engine.combat import resolve_weapon_attack
+from engine.odds import (attack_odds, cache_size, clear_cache, damage_distribution, dice_sum_counts,
+                         expected_damage_per_round, hit_chance, weapon_attack_odds)
+from engine.simulate import PlayerBuild, weapon_odds
+
+
+def brute_force(dice_count, dice_size, ability_mod=0, bonus=0, damage_reduction=0) -> dict:
+    """Damage -> probability over every roll, with the floors of resolve_weapon_attack()."""
+    ways = {}
+    for rolls in itertools.product(range(1, dice_size + 1), repeat=dice_count):
+        damage = max(1, sum(rolls) + ability_mod + bonus)
+        if damage_reduction:
+            damage = max(1, damage - damage_reduction)
+        ways[damage] = ways.get(damage, 0) + 1
+    return {damage: count / dice_size ** dice_count for damage, count in ways.items()}
+
+
+BURNING = [{"stat": "attack_bonus", "value": 2, "duration": 2, "source": "Bless"},
+           {"stat": "damage_bonus", "value": 1, "duration": 0, "source": "Rage"}]
+WARDED = [{"stat": "ac", "value": 1, "duration": 2, "source": "Shield"},
+          {"stat": "damage_reduction", "value": 2, "duration": 0, "source": "Stoneskin"}]
+
+
+class TestDamageDistribution:
+    def setup_method(self):
+        clear_cache()
+
+    def test_dice_sums(self):
+        assert dice_sum_counts(2, 6) == (1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1)
+        assert dice_sum_counts(0, 6) == (1,)
+
+    @pytest.mark.parametrize("args", [(1, 8, 3), (2, 6, -4, 0, 2), (3, 4, 1, 2, 5), (1, 4, -3, -1, 1), (0, 6, 2)])
+    def test_matches_brute_force(self, args):
+        distribution = damage_distribution(*args)
+        expected = brute_force(*args)
+        assert dict(distribution.items()) == pytest.approx(expected)
+        assert distribution.low == min(expected) and distribution.high == max(expected)
+        assert distribution.mean == pytest.approx(sum(d * p for d, p in expected.items()))
+
+    def test_floor_of_one(self):
+        distribution = damage_distribution(1, 4, ability_mod=-5)
+        assert distribution.items() == [(1, 1.0)]
+        assert distribution.chance_at_least(1) == 1.0 and distribution.chance_at_least(2) == 0.0
+
+    def test_chance_at_least(self):
+        distribution = damage_distribution(2, 6)
+        assert distribution.chance_at_least(12) == pytest.approx(1 / 36)
+        assert distribution.chance_at_least(7) == pytest.approx(21 / 36)
+        assert distribution.chance_at_least(-3) == 1.0 and distribution.probability(13) == 0.0
+
+    def test_memoized(self):
+        first = damage_distribution(2, 8, 3)
+        size = cache_size()
+        assert damage_distribution(2, 8, 3) is first
+        assert cache_size() == size
+        clear_cache()
+        assert cache_size() == 0
+
+
+class TestAttackOdds:
+    def test_hit_chance(self):
+        assert hit_chance(5, 15) == 0.55
+        assert hit_chance(0, 25) == 0.0 and hit_chance(0, 21) == 0.0
+        assert hit_chance(10, 5) == 1.0
+
+    def test_effects_are_applied(self):
+        odds = weapon_attack_odds(3, 2, 16, 1, 8, BURNING, WARDED)
+        assert odds is attack_odds(7, 17, 1, 8, 4, 2)
+        assert odds.hit_chance == hit_chance(7, 17)
+        assert odds.expected_damage == pytest.approx(odds.hit_chance * damage_distribution(1, 8, 4, 0, 2).mean)
+        assert odds.kill_chance(10) == pytest.approx(odds.hit_chance / 8)    # d8 + 4 - 2 >= 10
+        assert expected_damage_per_round(odds, 0.5) == pytest.approx(odds.expected_damage / 2)
+
+    def test_matches_sampled_attacks(self):
+        random.seed(5)
+        rolls = [resolve_weapon_attack(3, 2, 16, 1, 8, BURNING, WARDED) for _ in range(40000)]
+        odds = weapon_attack_odds(3, 2, 16, 1, 8, BURNING, WARDED)
+        assert sum(r["hit"] for r in rolls) / len(rolls) == pytest.approx(odds.hit_chance, abs=0.015)
+        assert sum(r["damage"] for r in rolls) / len(rolls) == pytest.approx(odds.expected_damage, abs=0.06)
+
+
+class TestWeaponOdds:
+    def test_matchup(self):
+        build = PlayerBuild.create("Dwarf", "Fighter", 3, "Longsword", "Chain Mail")
+        odds = weapon_odds(build, "Orc", 2)
+        assert 0 < odds["player_hit_chance"] <= 1 and 0 < odds["monster_hit_chance"] <= 1
+        assert odds["player_damage_per_round"] > 0 and odds["monster_damage_per_round"] > 0
+        with pytest.raises(ValueError):
+            weapon_odds(build, "Dragon", 1)
@@ -0,0 +1,101 @@
+"""Tests for records — typed catalog records compiled from json/."""
+
+import sys
+import dataclasses
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from records import (AbilityDef, AreaDef, ability_defs, armor_defs, monster_templates, quest_defs,
+                     weapon_defs)
+from web.campaign import get_campaign_index
+from web.game_session import get_abilities, get_campaign, get_quests, get_all_weapons_flat
+
+
+class TestRecords:
+    def test_every_entry_is_compiled(self):
+        assert set(ability_defs()) == set(get_abilities())
+        assert set(quest_defs()) == set(get_quests())
+        assert set(weapon_defs()) == set(get_all_weapons_flat())
+        assert len(monster_templates()) > 0 and len(armor_defs()) > 0
+
+    def test_records_are_frozen_and_slotted(self):
+        for record in (ability_defs()["fire_bolt"], monster_templates()["Goblin"],
+                       quest_defs()["goblin_menace"], weapon_defs()["Club"]):
+            assert not hasattr(record, "__dict__")
+            with pytest.raises(dataclasses.FrozenInstanceError):
+                setattr(record, dataclasses.fields(record)[1].name, "Changed")
+
+    def test_records_are_built_once(self):
+        assert ability_defs() is ability_defs()
+        assert monster_templates()["Goblin"] is monster_templates()["Goblin"]
+
+    def test_ability_fields_match_catalog(self):
+        for ability_id, data in get_abilities().items():
+            ability = ability_defs()[ability_id]
+            assert ability.name == data["name"] and ability.cost == data["cost"]
+            assert ability.classes == frozenset(data["classes"])
+            if "damage" in data:
+                assert ability.damage.dice_size == data["damage"]["dice_size"]
+                assert ability.damage.bonus == data["damage"].get("bonus", 0)
+            else:
+                assert ability.damage is None
+            assert [e.stat for e in ability.effects] == [e["stat"] for e in data.get("effects", [])]
+
+    def test_scaling_matches_catalog_lookup(self):
+        for ability_id, data in get_abilities().items():
+            if "damage" not in data:
+                continue
+            for level in range(1, 21):
+                dice_count = data["damage"]["dice_count"]
+                for level_str in sorted(data.get("scaling", {}), key=int, reverse=True):
+                    if level >= int(level_str):
+                        dice_count = data["scaling"][level_str].get("dice_count", dice_count)
+                        break
+                assert ability_defs()[ability_id].dice_count_at(level) == dice_count
+
+    def test_scaling_is_sorted_and_parsed(self):
+        ability = AbilityDef.from_catalog("x", {
+            "name": "X", "classes": ["Wizard"], "cost": 0, "unlock_level": 1, "description": "",
+            "target": "enemy", "save_ability": "Wisdom",
+            "damage": {"dice_count": 1, "dice_size": 10},
+            "scaling": {"11": {"dice_count": 3}, "5": {"dice_count": 2}, "17": {"dice_count": 4}}})
+        assert ability.scaling == ((17, 4), (11, 3), (5, 2))
+        assert [ability.dice_count_at(level) for level in (1, 5, 10, 11, 20)] == [1, 2, 2, 3, 4]
+        assert ability.save_ability == "wis"
+
+    def test_monster_template(self):
+        goblin = monster_templates()["Goblin"]
+        assert goblin.modifiers == tuple((score - 10) // 2 for score in goblin.scores)
+        assert "Club" in goblin.weapons and goblin.names
+
+    def test_quest_rewards_and_items(self):
+        gather = next(q for q in quest_defs().values() if q.type == "gather")
+        assert gather.quest_item.drop_chance == get_quests()[gather.id]["quest_item"]["drop_chance"]
+        assert gather.gold == get_quests()[gather.id]["rewards"]["gold"]
+
+    def test_weapon_properties(self):
+        for name, data in get_all_weapons_flat().items():
+            assert weapon_defs()[name].properties == frozenset(data["properties"])
+            assert weapon_defs()[name].type == data["type"]
+
+
+class TestAreaDef:
+    def test_level_range_from_location(self):
+        index = get_campaign_index()
+        for act in get_campaign()["acts"]:
+            for location in act["locations"]:
+                low, high = map(int, location["encounterLevel"].split("-"))
+                for area in location["areas"]:
+                    area_def = index.area_def(act["number"], location["name"], area["id"])
+                    assert area_def.level_range == (low, high)
+                    assert area_def.monster_types == tuple(area.get("monster_types", ["Goblin"]))
+
+    def test_level_range_fallbacks(self):
+        area = {"id": "a", "connections": []}
+        assert AreaDef.from_catalog({**area, "encounter_levels": [3, 5]}).level_range == (3, 5)
+        assert AreaDef.from_catalog(area).level_range == (1, 2)
+        assert AreaDef.from_catalog({**area, "encounter_levels": 4}).level_range == (1, 1)
+        assert AreaDef.from_catalog(area, {"name": "L", "encounterLevel": "6-9"}).level_range == (6, 9)
+        assert AreaDef.from_catalog(area).monster_types == ("Goblin",)
@@ -0,0 +1,113 @@
+"""Tests for web.session_cache — LRU behavior, write-behind flushing and counters."""
+
+import sys
+import asyncio
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web.game_session import GameSession
+from web.session_cache import SessionCache
+
+
+class RecordingStore:
+    """Minimal in-memory SessionStore that records writes."""
+
+    def __init__(self):
+        self.data = {}
+        self.writes = []
+
+    def load(self, session_id):
+        return self.data.get(session_id)
+
+    def save(self, session_id, data, expected_version=None):
+        self.data[session_id] = data
+        self.writes.append(session_id)
+
+
+class TestSessionCache:
+    def test_hit_and_miss_counters(self):
+        cache = SessionCache(RecordingStore(), max_size=4)
+        assert cache.get("a") is None
+        session = GameSession("a")
+        cache.put(session)
+        assert cache.get("a") is session
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_save_is_deferred_until_flush(self):
+        store = RecordingStore()
+        cache = SessionCache(store, max_size=4)
+        session = GameSession("a")
+        session.monster_kills = 3
+        cache.put(session, dirty=True)
+        assert store.writes == []
+        cache.flush()
+        assert store.writes == ["a"]
+        assert store.data["a"]["monster_kills"] == 3
+        cache.flush()  # nothing dirty anymore
+        assert store.writes == ["a"]
+
+    def test_clean_sessions_are_never_written(self):
+        store = RecordingStore()
+        cache = SessionCache(store, max_size=1)
+        cache.put(GameSession("a"))
+        cache.put(GameSession("b"))
+        cache.flush()
+        assert store.writes == []
+        assert cache.stats["evictions"] == 1
+
+    def test_lru_eviction_flushes_dirty_session(self):
+        store = RecordingStore()
+        cache = SessionCache(store, max_size=2)
+        for sid in ("a", "b"):
+            cache.put(GameSession(sid), dirty=True)
+        cache.get("a")                      # "b" is now least recently used
+        cache.put(GameSession("c"), dirty=True)
+        assert len(cache) == 2
+        assert cache.stats["evictions"] == 1
+        cache.flush()
+        assert sorted(store.writes) == ["a", "b", "c"]
+
+    def test_evicted_dirty_session_can_be_reclaimed_before_flush(self):
+        cache = SessionCache(RecordingStore(), max_size=1)
+        a = GameSession("a")
+        cache.put(a, dirty=True)
+        cache.put(GameSession("b"))
+        assert cache.get("a") is a
+
+    def test_idle_eviction(self):
+        store = RecordingStore()
+        cache = SessionCache(store, max_size=10, idle_seconds=0)
+        cache.put(GameSession("a"), dirty=True)
+        cache.evict_idle()
+        assert len(cache) == 0
+        cache.flush()
+        assert store.writes == ["a"]
+
+    def test_background_flusher_writes_dirty_sessions(self):
+        store = RecordingStore()
+        cache = SessionCache(store, max_size=4)
+        cache.put(GameSession("a"), dirty=True)
+
+        async def run():
+            task = asyncio.create_task(cache.run_flusher(0.01))
+            await asyncio.sleep(0.1)
+            task.cancel()
+
+        asyncio.run(run())
+        assert store.writes == ["a"]
+        assert cache.stats["flushes"] == 1
+
+    def test_stale_flush_drops_cached_copy(self):
+        from web.session_store import StaleSessionError
+
+        class ConflictingStore(RecordingStore):
+            def save(self, session_id, data, expected_version=None):
+                raise StaleSessionError(session_id, expected_version, 5)
+
+        cache = SessionCache(ConflictingStore(), max_size=4)
+        cache.put(GameSession("a"), dirty=True)
+        cache.flush()
+        assert cache.get("a") is None
+        assert cache.stats["conflicts"] == 1
+        assert cache.stats["flushes"] == 0
@@ -0,0 +1,114 @@
+"""Tests for web.session_format — schema upgrades and the binary session encoding."""
+
+import sys
+import json
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from web import session_format
+from web.session_format import SCHEMA_VERSION, decode, dumps, encode, schema_of, upgrade
+from web.session_store import FileSessionStore, SQLiteSessionStore
+from web.game_session import GameSession
+from test_session_journal import _battle_session
+
+
+def _stored(session, version=3):
+    """Session data as write_session stores it."""
+    return {**json.loads(json.dumps(session.to_dict())), "version": version}
+
+
+class TestBinaryEncoding:
+    def test_roundtrip(self):
+        data = _stored(_battle_session())
+        assert decode(encode(data)) == data
+
+    def test_much_smaller_than_json(self):
+        data = _stored(_battle_session())
+        assert len(encode(data)) * 3 < len(json.dumps(data))
+
+    def test_header_carries_schema_version(self):
+        raw = encode(_stored(GameSession("h")))
+        magic, codec, _, schema = session_format.HEADER.unpack_from(raw)
+        assert (magic, codec, schema) == (session_format.MAGIC, session_format.CODEC_VERSION, SCHEMA_VERSION)
+
+    def test_header_carries_session_version(self):
+        raw = encode(_stored(GameSession("h"), version=7))
+        assert session_format.stored_version(raw[:16]) == 7
+        assert session_format.stored_version(dumps({"version": 7}, "json")) is None
+
+    def test_codec_1_still_decodes(self):
+        data = _stored(GameSession("h"))
+        raw = encode(data)
+        old = (session_format.HEADER.pack(session_format.MAGIC, 1, raw[5], SCHEMA_VERSION)
+               + raw[session_format.HEADER.size + session_format.VERSION.size:])
+        assert decode(old) == data
+        assert session_format.stored_version(old) is None
+
+    def test_unknown_shapes_and_key_order_are_preserved(self):
+        data = {"b": 1, "a": {"progress": 1, "status": "active", "extra": [1, {"x": None}]},
+                "quest": {"progress": 2, "status": "ready"}}
+        decoded = decode(encode(data))
+        assert decoded == data
+        assert list(decoded) == ["b", "a", "quest"]
+
+    def test_tuples_come_back_as_lists_like_json(self):
+        assert decode(encode({"order": ("player", "monster")})) == {"order": ["player", "monster"]}
+
+    def test_uncompressed_payload_decodes(self):
+        data = _stored(_battle_session())
+        assert decode(encode(data, compress=False)) == data
+
+    def test_json_remains_readable(self):
+        data = _stored(GameSession("j"))
+        assert decode(dumps(data, "json")) == data
+        assert decode(dumps(data, "json").encode()) == data
+
+    def test_corrupt_payload_raises_value_error(self):
+        raw = encode(_stored(GameSession("c")))
+        with pytest.raises(ValueError):
+            decode(raw[:-5])
+
+
+class TestSchemaUpgrades:
+    def test_every_old_schema_has_an_upgrade(self):
+        assert set(session_format._UPGRADES) == set(range(1, SCHEMA_VERSION))
+
+    def test_flat_battle_is_upgraded(self):
+        legacy = {"session_id": "old", "battle": {"monster_name": "Goblin", "monster_hp": 4,
+                                                  "monster_weapon_name": "Club", "is_active": True}}
+        data = upgrade(legacy)
+        assert schema_of(legacy) == 1
+        assert data["schema"] == SCHEMA_VERSION
+        assert data["battle"]["monster"]["name"] == "Goblin"
+        assert data["battle"]["monster"]["weapon"]["name"] == "Club"
+        assert "monster_name" not in data["battle"]
+        assert "monster" not in legacy["battle"]   # input left alone
+
+    def test_current_data_is_unchanged(self):
+        data = GameSession("new").to_dict()
+        assert upgrade(data) is data
+
+    def test_newer_schema_is_rejected(self):
+        with pytest.raises(ValueError):
+            upgrade({"schema": SCHEMA_VERSION + 1})
+
+
+@pytest.mark.parametrize("fmt", ["binary", "json"])
+def test_stores_roundtrip_in_both_formats(tmp_path, fmt):
+    data = _stored(_battle_session())
+    for store in (FileSessionStore(tmp_path / "files", fmt=fmt), SQLiteSessionStore(tmp_path / "s.db", fmt=fmt)):
+        store.save("s", data)
+        assert store.load("s") == data
+        store.close()
+
+
+def test_file_store_switches_format_without_migration(tmp_path):
+    data = _stored(GameSession("s"))
+    FileSessionStore(tmp_path, fmt="json").save("s", data)
+    store = FileSessionStore(tmp_path, fmt="binary")
+    assert store.load("s") == data
+    store.save("s", data)
+    assert [p.name for p in tmp_path.rglob("s.*")] == ["s.bin"]
+    assert list(store.session_ids()) == ["s"]
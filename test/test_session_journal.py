@@ -0,0 +1,148 @@
+"""Tests for web.session_journal — delta diff/apply and journaled session stores."""
+
+import sys
+import json
+import copy
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from web.game_session import GameSession, get_campaign, get_default_shop_inventory
+from web.session_journal import diff, apply, write_session
+from web.session_store import FileSessionStore, SQLiteSessionStore
+from engine.combatant import CombatantState, WeaponState
+from characterFactory import CharacterFactory
+from weaponFactory import WeaponFactory
+from items import HealingPotion
+from character import WeaponSlot
+
+
+def _battle_session():
+    """A session mid-battle with a full battle log, as seen on a typical attack turn."""
+    session = GameSession("journal-test")
+    char = CharacterFactory().create_character("Hero", "Human", "Fighter")
+    char.equip_weapon(WeaponFactory().get_weapon_by_name("Longsword"), WeaponSlot.MAIN_HAND)
+    char.add_item(HealingPotion("Small Healing Potion", 10))
+    char.add_item(WeaponFactory().get_weapon_by_name("Shortbow"))
+    session.character = char
+    session.character_creation.name = "Hero"
+    session.character_creation.race = "Human"
+    session.character_creation.class_name = "Fighter"
+    session.character_creation.weapon = "Longsword"
+    session.act = get_campaign()["acts"][0]
+    session.current_location = session.act["locations"][0]
+    session.current_area = session.current_location["areas"][0]
+    session.shop_inventory = [{**item, "quantity": 5} for item in get_default_shop_inventory()]
+    session.active_quests = {"goblin_menace": {"progress": 2, "status": "active"}}
+    session.battle.monster = CombatantState(
+        name="Gruk", race="Orc", level=3, hp=30, max_hp=30, ac=13, base_ac=12,
+        str_mod=3, dex_mod=1, proficiency=1,
+        weapon=WeaponState(name="Greataxe", damage_die=12, properties=["heavy", "two-handed"]))
+    session.battle.is_active = True
+    session.battle.round_count = 5
+    session.battle.battle_log = [f"Round {i}: something happened to somebody" for i in range(10)]
+    return session
+
+
+def _attack_turn(session):
+    session.battle.monster_hp -= 7
+    session.character.current_hit_points -= 4
+    session.battle.round_count += 1
+    session.battle.battle_log += ["Hero attacks! (Roll: 17 vs AC 13)", "Hero hits for 7 damage!",
+                                  'Gruk: "Argh!"', "Gruk hits for 4 damage!"]
+
+
+class TestDiffApply:
+    def test_roundtrip_on_nested_changes(self):
+        old = {"a": 1, "b": {"c": [1, 2, 3], "d": "x"}, "gone": True, "items": [{"q": 5}]}
+        new = {"a": 2, "b": {"c": [1, 2, 4], "d": "x"}, "added": None, "items": [{"q": 4}]}
+        ops = diff(old, new)
+        assert apply(copy.deepcopy(old), ops) == new
+
+    def test_identical_states_have_no_ops(self):
+        data = {"a": [1, {"b": 2}]}
+        assert diff(data, copy.deepcopy(data)) == []
+
+    def test_sliding_window_list_is_a_single_op(self):
+        old = {"log": ["a", "b", "c", "d"]}
+        new = {"log": ["c", "d", "e", "f"]}
+        ops = diff(old, new)
+        assert ops == [["w", ["log"], 2, ["e", "f"]]]
+        assert apply(copy.deepcopy(old), ops) == new
+
+    def test_unrelated_list_is_replaced(self):
+        old, new = {"x": [1, 2, 3]}, {"x": [9]}
+        assert apply(copy.deepcopy(old), diff(old, new)) == new
+
+    def test_attack_turn_delta_is_an_order_of_magnitude_smaller(self):
+        session = _battle_session()
+        before = json.loads(json.dumps(session.to_dict()))
+        _attack_turn(session)
+        after = json.loads(json.dumps(session.to_dict()))
+        ops = diff(before, after)
+        assert apply(copy.deepcopy(before), ops) == after
+        assert len(json.dumps(ops, separators=(",", ":"))) * 10 <= len(json.dumps(after))
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        s = FileSessionStore(tmp_path / "sessions")
+    else:
+        s = SQLiteSessionStore(tmp_path / "sessions.db")
+    yield s
+    s.close()
+
+
+class TestJournaledStore:
+    def test_load_replays_snapshot_plus_deltas(self, store):
+        store.save("s", {"hp": 10, "log": []})
+        assert store.append_deltas("s", [["s", ["hp"], 8]]) == 1
+        assert store.append_deltas("s", [["w", ["log"], 0, ["hit"]]]) == 2
+        assert store.load("s") == {"hp": 8, "log": ["hit"]}
+
+    def test_snapshot_clears_journal(self, store):
+        store.save("s", {"hp": 10})
+        store.append_deltas("s", [["s", ["hp"], 8]])
+        store.save("s", {"hp": 5})
+        assert store.load("s") == {"hp": 5}
+        assert store.append_deltas("s", [["s", ["hp"], 4]]) == 1
+
+    def test_compact_idle_folds_journal(self, store):
+        store.save("s", {"hp": 10})
+        store.append_deltas("s", [["s", ["hp"], 8]])
+        assert store.compact_idle(idle_seconds=-1) == 1
+        assert store.load("s") == {"hp": 8}
+        assert store.append_deltas("s", [["s", ["hp"], 7]]) == 1
+
+    def test_delete_removes_journal(self, store):
+        store.save("s", {"hp": 10})
+        store.append_deltas("s", [["s", ["hp"], 8]])
+        store.delete("s")
+        assert store.load("s") is None
+
+    def test_write_session_compacts_after_threshold(self, store, monkeypatch):
+        from web import session_journal
+        from web.settings import Settings
+        monkeypatch.setattr(session_journal, "get_settings", lambda: Settings(journal_compact_every=3))
+        session = _battle_session()
+        previous = None
+        for _ in range(5):
+            data = json.loads(json.dumps(session.to_dict()))
+            write_session(store, session.session_id, data, previous)
+            previous = data
+            _attack_turn(session)
+        assert store.load(session.session_id) == previous
+        # snapshot, two deltas, snapshot (3rd delta triggers compaction), one delta
+        assert store.append_deltas(session.session_id, []) == 2
+
+
+class TestFileJournal:
+    def test_torn_final_line_is_ignored(self, tmp_path):
+        store = FileSessionStore(tmp_path)
+        store.save("s", {"hp": 10})
+        store.append_deltas("s", [["s", ["hp"], 8]])
+        with open(store._journal_path("s"), "a") as f:
+            f.write('[["s",["hp"],')
+        assert FileSessionStore(tmp_path).load("s") == {"hp": 8}
@@ -0,0 +1,44 @@
+"""Tests for web.session_lock — per-session request serialization."""
+
+import sys
+import asyncio
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web.session_lock import SessionLockMiddleware
+
+
+def _run_requests(session_ids):
+    """Send overlapping requests through the middleware; return the event order."""
+    events = []
+
+    async def app(scope, receive, send):
+        sid = scope["session"].get("session_id")
+        events.append(("start", sid))
+        await asyncio.sleep(0.01)
+        events.append(("end", sid))
+
+    middleware = SessionLockMiddleware(app)
+
+    async def run():
+        await asyncio.gather(*(
+            middleware({"type": "http", "path": "/battle/attack", "session": {"session_id": sid}}, None, None)
+            for sid in session_ids))
+
+    asyncio.run(run())
+    return events, middleware
+
+
+class TestSessionLockMiddleware:
+    def test_same_session_requests_run_one_at_a_time(self):
+        events, middleware = _run_requests(["a", "a", "a"])
+        assert events == [("start", "a"), ("end", "a")] * 3
+        assert len(middleware) == 0   # locks are released once idle
+
+    def test_different_sessions_run_concurrently(self):
+        events, _ = _run_requests(["a", "b"])
+        assert events[:2] == [("start", "a"), ("start", "b")]
+
+    def test_requests_without_session_are_not_locked(self):
+        events, _ = _run_requests([None, None])
+        assert events[:2] == [("start", None), ("start", None)]
@@ -6,9 +6,12 @@ it back. If anything is lost in this roundtrip, the player loses game state sile
 
 import sys
 import json
+import asyncio
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import pytest
+
 from web.game_session import GameSession, BattleState, CharacterCreationState, get_campaign
 from engine.combatant import CombatantState, WeaponState
 from characterFactory import CharacterFactory
@@ -211,6 +214,13 @@ class TestSessionRoundtrip:
         assert cc.portrait == "/static/images/player_wizard.png"
         assert cc.skills == ["Arcana", "Perception"]
 
+    def test_proficiency_bonus_follows_level(self):
+        session = _make_session_with_character()
+        session.character.level = 8
+        session.character.update_proficiency_bonus()
+        restored = GameSession.from_dict(session.to_dict())
+        assert restored.character.proficiency_bonus == 3
+
 
 class TestBattleStateRoundtrip:
     def test_battle_state_roundtrip(self):
@@ -327,3 +337,198 @@ class TestBattleStateCompatProperties:
         assert bs.monster_weapon_name == "Rapier"
         assert bs.monster_weapon_damage_die == 8
         assert "finesse" in bs.monster_weapon_properties
+
+
+class TestDirtyTracking:
+    """save_session() skips the write when dirty_snapshot() reports no change."""
+
+    def _reload(self, session):
+        data, state = session.dirty_snapshot()
+        session.mark_saved(state)
+        return GameSession.from_dict(json.loads(json.dumps(data)))
+
+    def _loaded(self):
+        # Rebuilding the character recalculates derived fields (max PP), so
+        # normalize once.
+        session = self._reload(_make_session_with_character())
+        session.character
+        return self._reload(session)
+
+    def test_new_session_is_dirty(self):
+        assert GameSession("new").dirty_snapshot() is not None
+
+    def test_loaded_session_is_clean(self):
+        restored = self._loaded()
+        assert restored.dirty_snapshot() is None
+
+    def test_saved_session_is_clean_until_mutated(self):
+        session = _make_session_with_character()
+        data, state = session.dirty_snapshot()
+        session.mark_saved(state)
+        assert session.dirty_snapshot() is None
+        session.character.gold += 1
+        assert session.dirty_snapshot() is not None
+
+    def test_substate_mutations_are_detected(self):
+        mutations = [
+            lambda s: setattr(s.character, "current_hit_points", 1),
+            lambda s: s.character.inventory.pop(),
+            lambda s: setattr(s.battle, "round_count", 9),
+            lambda s: s.battle.battle_log.append("new line"),
+            lambda s: setattr(s.character_creation, "portrait", "/other.png"),
+            lambda s: s.active_quests["q1"].update(progress=3),
+            lambda s: s.set_flash("shop_error", "oops"),
+        ]
+        for mutate in mutations:
+            session = self._loaded()
+            mutate(session)
+            assert session.dirty_snapshot() is not None
+
+    def test_popping_missing_flash_keeps_session_clean(self):
+        session = self._loaded()
+        assert session.pop_flash("inventory_message") is None
+        session.haggle_result = None
+        assert session.dirty_snapshot() is None
+
+    def test_save_session_skips_unchanged_writes(self, monkeypatch):
+        import web.game_session as gs
+
+        class Request:
+            session = {}
+
+        writes = []
+
+        class Store:
+            def save(self, session_id, data, expected_version=None):
+                writes.append(session_id)
+
+            def append_deltas(self, session_id, ops, expected_version=None):
+                writes.append(session_id)
+                return 1
+
+        monkeypatch.setattr(gs, "get_store", lambda: Store())
+        monkeypatch.setattr(gs, "get_cache", lambda: None)
+        session = GameSession("dirty-test")
+        asyncio.run(gs.save_session(Request(), session))
+        asyncio.run(gs.save_session(Request(), session))
+        assert writes == ["dirty-test"]
+        session.monster_kills += 1
+        asyncio.run(gs.save_session(Request(), session))
+        assert writes == ["dirty-test", "dirty-test"]
+
+
+class TestLazyCharacter:
+    """from_dict() defers rebuilding the character until something uses it."""
+
+    def _stored(self):
+        return json.loads(json.dumps(TestDirtyTracking()._loaded().to_dict()))
+
+    def _count_restores(self, monkeypatch):
+        calls = []
+        restore = GameSession._restore_character
+
+        def counting(self, char_data, cc_data):
+            calls.append(char_data["name"])
+            return restore(self, char_data, cc_data)
+
+        monkeypatch.setattr(GameSession, "_restore_character", counting)
+        return calls
+
+    def test_character_is_rebuilt_on_first_access_only(self, monkeypatch):
+        data = self._stored()
+        calls = self._count_restores(monkeypatch)
+        restored = GameSession.from_dict(data)
+        assert calls == []
+        assert restored.has_character
+        assert restored.character.name == "TestHero"
+        assert restored.character is restored.character
+        assert calls == ["TestHero"]
+
+    def test_summary_and_serialization_do_not_rebuild(self, monkeypatch):
+        data = self._stored()
+        calls = self._count_restores(monkeypatch)
+        restored = GameSession.from_dict(data)
+        summary = restored.character_summary()
+        assert restored.to_dict() == data
+        assert restored.dirty_snapshot() is None
+        assert calls == []
+        assert (summary.name, summary.level, summary.gold) == ("TestHero", 3, 42)
+        assert (summary.current_hit_points, summary.max_hit_points) == (15, 22)
+        assert summary.location == restored.current_location["name"]
+        assert summary.area == restored.current_area["name"]
+
+    def test_summary_matches_rebuilt_character(self):
+        restored = GameSession.from_dict(self._stored())
+        lazy = restored.character_summary()
+        restored.character
+        assert restored.character_summary() == lazy
+
+    def test_assigning_character_replaces_stored_data(self):
+        restored = GameSession.from_dict(self._stored())
+        restored.character = None
+        assert not restored.has_character
+        assert restored.character_summary() is None
+        assert restored.to_dict()["character"] is None
+
+    def test_portrait_change_is_saved_without_rebuild(self):
+        restored = GameSession.from_dict(self._stored())
+        restored.character_creation.portrait = "/other.png"
+        assert restored.to_dict()["character"]["portrait"] == "/other.png"
+
+    def test_no_character(self):
+        session = GameSession.from_dict(GameSession("none").to_dict())
+        assert not session.has_character
+        assert session.character_summary() is None
+
+    def _guard(self, monkeypatch, restored, guard):
+        from web import dependencies
+
+        async def load(request):
+            return restored
+
+        monkeypatch.setattr(dependencies, "load_session", load)
+        return asyncio.run(guard(None))
+
+    def test_guards_do_not_rebuild(self, monkeypatch):
+        from web import dependencies
+        data = self._stored()
+        calls = self._count_restores(monkeypatch)
+        restored = GameSession.from_dict(data)
+        restored.battle.is_active = True
+        assert self._guard(monkeypatch, restored, dependencies.require_character) is restored
+        assert self._guard(monkeypatch, restored, dependencies.require_battle) is restored
+        assert calls == []
+        assert dependencies.rebuilt_character(restored).name == "TestHero"
+        assert calls == ["TestHero"]
+
+    def test_failed_rebuild_counts_as_no_character(self, monkeypatch):
+        from web import dependencies
+        data = self._stored()
+        data["character_creation"]["race"] = "Vampire"   # no longer in the catalog
+        restored = GameSession.from_dict(data)
+        assert self._guard(monkeypatch, restored, dependencies.require_character) is restored
+        with pytest.raises(dependencies._RedirectException) as redirect:
+            dependencies.rebuilt_character(restored)
+        assert redirect.value.url == "/character/new"
+        assert not restored.has_character
+        with pytest.raises(dependencies._RedirectException):
+            self._guard(monkeypatch, restored, dependencies.require_character)
+
+    def test_failed_rebuild_is_logged(self, caplog, capsys):
+        data = self._stored()
+        data["character_creation"]["race"] = "Vampire"
+        restored = GameSession.from_dict(data)
+        with caplog.at_level("ERROR", logger="web.game_session"):
+            assert restored.character is None
+        (record,) = caplog.records
+        assert restored.session_id in record.getMessage() and record.exc_info
+        assert capsys.readouterr().out == ""
+
+    def test_serialized_inventory_matches_rebuilt_character(self):
+        data = self._stored()
+        data["character"]["inventory"].insert(0, {"name": "Vorpal Blade", "type": "weapon"})
+        restored = GameSession.from_dict(data)
+        character = restored.character
+        inventory = restored._serialize_character()["inventory"]
+        assert [item["name"] for item in inventory] == [item.name for item in character.inventory]
+        assert "Vorpal Blade" not in [item["name"] for item in inventory]
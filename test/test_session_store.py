@@ -0,0 +1,469 @@
+"""Tests for web.session_store — file and SQLite backends plus JSON migration."""
+
+import os
+import sys
+import asyncio
+import json
+import time
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from web.game_session import GameSession
+from web import session_store
+from web.game_session import get_session, load_session, save_session
+from web.settings import Settings
+from web.session_store import FileSessionStore, SQLiteSessionStore, StaleSessionError, migrate_json_sessions
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        s = FileSessionStore(tmp_path / "sessions")
+    else:
+        s = SQLiteSessionStore(tmp_path / "sessions.db")
+    yield s
+    s.close()
+
+
+class TestSessionStore:
+    def test_missing_session_returns_none(self, store):
+        assert store.load("does-not-exist") is None
+
+    def test_save_and_load_roundtrip(self, store):
+        session = GameSession("abc-123")
+        session.monster_kills = 4
+        store.save(session.session_id, session.to_dict())
+        restored = GameSession.from_dict(store.load("abc-123"))
+        assert restored.session_id == "abc-123"
+        assert restored.monster_kills == 4
+
+    def test_save_overwrites(self, store):
+        store.save("abc", {"session_id": "abc", "monster_kills": 1})
+        store.save("abc", {"session_id": "abc", "monster_kills": 2})
+        assert store.load("abc")["monster_kills"] == 2
+        assert list(store.session_ids()) == ["abc"]
+
+    def test_delete(self, store):
+        store.save("abc", {"session_id": "abc"})
+        store.delete("abc")
+        store.delete("abc")  # deleting twice is harmless
+        assert store.load("abc") is None
+
+    def test_session_id_is_sanitized(self, store):
+        store.save("../../etc/passwd", {"session_id": "x"})
+        assert list(store.session_ids()) == ["etcpasswd"]
+
+
+class TestVersioning:
+    def test_stale_snapshot_is_rejected(self, store):
+        store.save("s", {"hp": 10, "version": 1}, expected_version=0)
+        store.save("s", {"hp": 8, "version": 2}, expected_version=1)
+        with pytest.raises(StaleSessionError) as exc:
+            store.save("s", {"hp": 5, "version": 2}, expected_version=1)
+        assert exc.value.stored_version == 2
+        assert store.load("s") == {"hp": 8, "version": 2}
+
+    def test_stale_delta_is_rejected(self, store):
+        store.save("s", {"hp": 10, "version": 1}, expected_version=0)
+        store.append_deltas("s", [["s", ["hp"], 8], ["s", ["version"], 2]], expected_version=1)
+        with pytest.raises(StaleSessionError):
+            store.append_deltas("s", [["s", ["hp"], 5], ["s", ["version"], 2]], expected_version=1)
+        assert store.load("s") == {"hp": 8, "version": 2}
+
+    def test_no_deltas_without_a_stored_session(self, store):
+        assert store.append_deltas("gone", [["s", ["hp"], 8]]) == 0
+        with pytest.raises(StaleSessionError) as exc:
+            store.append_deltas("gone", [["s", ["hp"], 8]], expected_version=1)
+        assert exc.value.stored_version == -1
+        store.save("gone", {"hp": 10})
+        assert store.load("gone") == {"hp": 10}
+        store.delete("gone")
+        assert store.append_deltas("gone", [["s", ["hp"], 8]]) == 0
+        assert store.load("gone") is None
+        assert list(store.session_ids()) == []
+        if isinstance(store, SQLiteSessionStore):
+            (orphans,) = store._connection().execute("SELECT COUNT(*) FROM session_deltas").fetchone()
+            assert orphans == 0
+        else:
+            assert list(store.directory.glob("*/*/*.journal")) == []
+
+    def test_compaction_keeps_version(self, store):
+        store.save("s", {"hp": 10, "version": 1}, expected_version=0)
+        store.append_deltas("s", [["s", ["hp"], 8], ["s", ["version"], 2]], expected_version=1)
+        store.compact("s")
+        store.save("s", {"hp": 7, "version": 3}, expected_version=2)
+        assert store.load("s") == {"hp": 7, "version": 3}
+
+    @pytest.mark.parametrize("fmt", ["binary", "json"])
+    def test_file_store_checks_version_without_decoding(self, tmp_path, monkeypatch, fmt):
+        from web.session_journal import write_session
+        store = FileSessionStore(tmp_path, fmt=fmt)
+        write_session(store, "s", {"hp": 10}, version=0)
+        decodes = []
+        real_decode = session_store.decode
+        monkeypatch.setattr(session_store, "decode", lambda raw: (decodes.append(1), real_decode(raw))[1])
+        previous = {"hp": 10, "version": 1}
+        for version in range(1, 4):
+            data = {"hp": 10 - version}
+            write_session(store, "s", data, previous, version=version)
+            previous = {**data, "version": version + 1}
+        with pytest.raises(StaleSessionError):
+            store.append_deltas("s", [["s", ["hp"], 0]], expected_version=2)
+        # JSON snapshots have no version header: only the first check after a
+        # snapshot (before the journal sets the version) loads the session
+        assert len(decodes) == (0 if fmt == "binary" else 1)
+        store.save("s", {"hp": 1, "version": 9}, expected_version=4)
+        with pytest.raises(StaleSessionError):
+            store.save("s", {"hp": 1, "version": 9}, expected_version=4)
+        assert len(decodes) == (0 if fmt == "binary" else 2)
+        monkeypatch.undo()
+        assert store.load("s") == {"hp": 1, "version": 9}
+
+    def test_concurrent_copies_cannot_both_save(self, store, monkeypatch):
+        """Two workers load the same session and each play a turn: one turn is
+        saved, the other is rejected instead of silently overwriting it."""
+        from web import game_session
+        monkeypatch.setattr(game_session, "get_store", lambda: store)
+        monkeypatch.setattr(game_session, "get_cache", lambda: None)
+
+        class Request:
+            session = {}
+
+        async def run():
+            first = GameSession("race")
+            await save_session(Request(), first)
+            Request.session = {"session_id": "race"}
+            a, b = await load_session(Request()), await load_session(Request())
+            a.monster_kills, b.monster_kills = 1, 2
+            await save_session(Request(), a)
+            with pytest.raises(StaleSessionError):
+                await save_session(Request(), b)
+            return await load_session(Request())
+
+        try:
+            assert asyncio.run(run()).monster_kills == 1
+        finally:
+            session_store.shutdown_store_io()
+
+
+class TestDurability:
+    def test_failed_write_keeps_previous_snapshot(self, tmp_path, monkeypatch):
+        store = FileSessionStore(tmp_path)
+        store.save("s", {"hp": 10})
+
+        def crash(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(session_store.os, "replace", crash)   # fails after the temp write
+        with pytest.raises(OSError):
+            store.save("s", {"hp": 5})
+        monkeypatch.undo()
+        assert store.load("s") == {"hp": 10}
+        assert list(tmp_path.glob("*.tmp")) == list(tmp_path.glob(".*.tmp")) == []
+
+    @pytest.mark.parametrize("durability", ["fsync", "group"])
+    def test_durable_modes_roundtrip(self, tmp_path, durability):
+        store = FileSessionStore(tmp_path, durability=durability, group_commit_ms=1)
+        store.save("s", {"hp": 10})
+        store.append_deltas("s", [["s", ["hp"], 8]])
+        assert store.load("s") == {"hp": 8}
+
+    def test_group_commit_batches_concurrent_writers(self, tmp_path, monkeypatch):
+        fsyncs = []
+        real_fsync = session_store._fsync_path
+        monkeypatch.setattr(session_store, "_fsync_path", lambda p: (fsyncs.append(p), real_fsync(p)))
+        store = FileSessionStore(tmp_path, durability="group", group_commit_ms=50)
+        threads = [threading.Thread(target=store.save, args=("s", {"i": i})) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert store.load("s")["i"] in range(8)
+        committer = store._committer
+        assert committer.stats["writes"] == 8
+        assert committer.stats["batches"] < 8
+        # one directory fsync per batch, not per write
+        assert fsyncs.count(store._path("s").parent) == committer.stats["batches"]
+
+    def test_group_commit_error_reaches_writer(self, tmp_path, monkeypatch):
+        store = FileSessionStore(tmp_path, durability="group", group_commit_ms=1)
+
+        def broken_fsync(path):
+            raise ValueError("not a file")
+
+        monkeypatch.setattr(session_store, "_fsync_path", broken_fsync)
+        with pytest.raises(ValueError):
+            store.save("s", {"hp": 1})
+        monkeypatch.undo()
+        store.save("s", {"hp": 2})   # the committer survived
+        assert store.load("s") == {"hp": 2}
+
+    def test_unknown_durability_mode_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            FileSessionStore(tmp_path, durability="sometimes")
+
+
+class TestRecovery:
+    def test_reports_corrupt_sessions_and_removes_stale_temp_files(self, tmp_path):
+        store = FileSessionStore(tmp_path)
+        store.save("good", {"hp": 10})
+        bad = store._path("bad", "json")
+        bad.parent.mkdir(parents=True, exist_ok=True)
+        bad.write_text('{"hp": 1')
+        stale = store._path("good").parent / ".good.bin.1.1.tmp"
+        stale.write_text("{")
+        old = time.time() - 3600
+        os.utime(stale, (old, old))
+        fresh = store._path("good").parent / ".good.bin.2.2.tmp"
+        fresh.write_text("{")
+        report = store.recover()
+        assert report == {"scanned": 2, "corrupt": ["bad"], "temp_files_removed": 1}
+        assert not stale.exists() and fresh.exists()
+
+    def test_sqlite_reports_corrupt_rows(self, tmp_path):
+        store = SQLiteSessionStore(tmp_path / "s.db")
+        store.save("good", {"hp": 10})
+        store._connection().execute("INSERT INTO sessions (session_id, data, last_access) VALUES ('bad', '{oops', 0)")
+        store._connection().commit()
+        assert store.recover()["corrupt"] == ["bad"]
+        store.close()
+
+    def test_get_session_logs_corrupt_session(self, tmp_path, monkeypatch, caplog):
+        from web import game_session
+        store = FileSessionStore(tmp_path)
+        bad = store._path("bad", "json")
+        bad.parent.mkdir(parents=True, exist_ok=True)
+        bad.write_text('{"hp": 1')
+        monkeypatch.setattr(game_session, "get_store", lambda: store)
+        monkeypatch.setattr(game_session, "get_cache", lambda: None)
+
+        class Request:
+            session = {"session_id": "bad"}
+
+        session = get_session(Request())
+        assert session.session_id != "bad"
+        assert "bad" in caplog.text
+
+
+class TestAsyncSessionIO:
+    @pytest.fixture
+    def threaded_store(self, tmp_path, monkeypatch):
+        from web import game_session
+        store = FileSessionStore(tmp_path)
+        threads = []
+        real_load, real_save = store.load, store.save
+        store.load = lambda *args: (threads.append(threading.current_thread().name), real_load(*args))[1]
+        store.save = lambda *args, **kwargs: (threads.append(threading.current_thread().name),
+                                              real_save(*args, **kwargs))[1]
+        monkeypatch.setattr(game_session, "get_store", lambda: store)
+        monkeypatch.setattr(game_session, "get_cache", lambda: None)
+        yield store, threads
+        session_store.shutdown_store_io()
+
+    def _roundtrip(self):
+        class Request:
+            session = {}
+
+        async def run():
+            session = await load_session(Request())
+            session.monster_kills = 2
+            await save_session(Request(), session)
+            Request.session = {"session_id": session.session_id}
+            return await load_session(Request())
+
+        return asyncio.run(run())
+
+    def test_store_io_runs_on_the_thread_pool(self, threaded_store):
+        store, threads = threaded_store
+        assert self._roundtrip().monster_kills == 2
+        assert threads and all(name.startswith("session-io") for name in threads)
+
+    def test_zero_threads_runs_inline(self, threaded_store, monkeypatch):
+        store, threads = threaded_store
+        monkeypatch.setattr(session_store, "get_settings", lambda: Settings(session_io_threads=0))
+        assert self._roundtrip().monster_kills == 2
+        assert threads and set(threads) == {"MainThread"}
+
+
+def _age(store, session_id, seconds):
+    """Pretend a session was last accessed seconds ago."""
+    then = time.time() - seconds
+    if isinstance(store, FileSessionStore):
+        for path in store._session_files(session_id):
+            if path.exists():
+                os.utime(path, (then, then))
+    else:
+        conn = store._connection()
+        with conn:
+            conn.execute("UPDATE sessions SET last_access = ? WHERE session_id = ?", (then, session_id))
+
+
+class TestExpiry:
+    def test_sweep_deletes_only_expired_sessions(self, store):
+        store.save("old", {"hp": 1})
+        store.append_deltas("old", [["s", ["hp"], 2]])
+        store.save("new", {"hp": 1})
+        _age(store, "old", 3600)
+        result = store.sweep_expired(ttl_seconds=600, limit=100)
+        assert result["expired"] == 1 and result["done"]
+        assert result["bytes_reclaimed"] > 0
+        assert store.load("old") is None
+        assert store.load("new") == {"hp": 1}
+
+    def test_live_sessions_are_spared(self, store):
+        store.save("cached", {"hp": 1})
+        _age(store, "cached", 3600)
+        result = store.sweep_expired(600, 100, is_live=lambda sid: sid == "cached")
+        assert result["expired"] == 0
+        assert store.load("cached") == {"hp": 1}
+
+    def test_loading_refreshes_last_access(self, store):
+        store.save("s", {"hp": 1})
+        _age(store, "s", 3600)
+        store.load("s")
+        assert store.sweep_expired(600, 100)["expired"] == 0
+
+    def test_sweep_is_incremental(self, store):
+        for i in range(5):
+            store.save(f"s{i}", {"i": i})
+            _age(store, f"s{i}", 3600)
+        steps = []
+        while not steps or not steps[-1]["done"]:
+            steps.append(store.sweep_expired(600, limit=2))
+        assert len(steps) >= 3
+        assert sum(step["expired"] for step in steps) == 5
+        assert list(store.session_ids()) == []
+
+    @pytest.mark.parametrize("flock", [True, False])
+    def test_file_store_forgets_expired_sessions(self, tmp_path, monkeypatch, flock):
+        if not flock:
+            monkeypatch.setattr(session_store, "fcntl", None)
+        store = FileSessionStore(tmp_path)
+        for i in range(4):
+            store.save(f"s{i}", {"i": i}, expected_version=0)
+            store.append_deltas(f"s{i}", [["s", ["i"], -i]], expected_version=0)
+            store.load(f"s{i}")
+            _age(store, f"s{i}", 3600)
+        store.delete("s0")
+        # removed behind this process's back, e.g. by another worker's sweeper
+        for path in store._session_files("s1"):
+            path.unlink(missing_ok=True)
+        while not store.sweep_expired(600, limit=1)["done"]:
+            pass
+        assert store._journal_lengths == {}
+        assert store._thread_locks == {}
+
+    def test_sweeper_accumulates_stats(self, store):
+        from web.session_gc import SessionSweeper
+        for sid in ("a", "b"):
+            store.save(sid, {"hp": 1})
+        _age(store, "a", 3600)
+        sweeper = SessionSweeper(store, ttl_seconds=600, batch=1)
+        assert sweeper.sweep()["expired"] == 1
+        assert sweeper.stats["passes"] == 1
+        assert sweeper.stats["expired"] == 1
+        assert sweeper.stats["bytes_reclaimed"] > 0
+
+
+class TestShardedLayout:
+    def test_sessions_live_in_two_level_shards(self, tmp_path):
+        store = FileSessionStore(tmp_path)
+        store.save("abc", {"hp": 1})
+        path = store._path("abc")
+        assert path.relative_to(tmp_path).parts[:2] == (path.parent.parent.name, path.parent.name)
+        assert len(path.parent.name) == len(path.parent.parent.name) == 2
+        assert list(store.session_ids()) == ["abc"]
+
+    def test_flat_layout_is_moved_into_shards(self, tmp_path):
+        (tmp_path / "old.json").write_text('{"hp": 1}')
+        (tmp_path / "old.journal").write_text('[["s",["hp"],2]]\n')
+        store = FileSessionStore(tmp_path)
+        assert store.load("old") == {"hp": 2}
+        assert not (tmp_path / "old.json").exists()
+
+
+class TestSQLiteSessionStore:
+    def test_version_column_tracks_session_version(self, tmp_path):
+        store = SQLiteSessionStore(tmp_path / "s.db")
+        store.save("abc", {"session_id": "abc", "version": 1}, expected_version=0)
+        store.append_deltas("abc", [["s", ["version"], 2]], expected_version=1)
+        conn = store._connection()
+        assert conn.execute("SELECT version FROM sessions").fetchone()[0] == 2
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        store.close()
+
+    @pytest.mark.parametrize("durability,synchronous", [("none", 1), ("group", 2), ("fsync", 2)])
+    def test_durability_sets_synchronous(self, tmp_path, durability, synchronous):
+        store = SQLiteSessionStore(tmp_path / "s.db", durability=durability)
+        assert store._connection().execute("PRAGMA synchronous").fetchone()[0] == synchronous   # 1 NORMAL, 2 FULL
+        store.close()
+
+    def test_connections_are_per_thread(self, tmp_path):
+        store = SQLiteSessionStore(tmp_path / "s.db")
+        store.save("main", {"session_id": "main"})
+        seen = []
+
+        def worker():
+            seen.append(store._connection())
+            store.save("worker", {"session_id": "worker"})
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        assert seen[0] is not store._connection()
+        assert store.load("worker") == {"session_id": "worker"}
+        store.close()
+
+    def test_load_reads_snapshot_and_deltas_together(self, tmp_path, monkeypatch):
+        """A compaction landing between reading the snapshot and its deltas
+        must not make load() return the old snapshot without them."""
+        store = SQLiteSessionStore(tmp_path / "s.db")
+        store.save("s", {"hp": 10})
+        store.append_deltas("s", [["s", ["hp"], 8]])
+        real_decode = session_store.decode
+        compacted = []
+
+        def decode_then_compact(raw):
+            if not compacted:
+                compacted.append(True)
+                worker = threading.Thread(target=store.compact, args=("s",))
+                worker.start()
+                worker.join()
+            return real_decode(raw)
+
+        monkeypatch.setattr(session_store, "decode", decode_then_compact)
+        assert store.load("s") == {"hp": 8}
+        monkeypatch.undo()
+        assert store._connection().execute("SELECT COUNT(*) FROM session_deltas").fetchone()[0] == 0
+        store.close()
+
+
+class TestMigration:
+    def test_imports_json_files_and_skips_corrupt(self, tmp_path):
+        source = tmp_path / "sessions"
+        source.mkdir()
+        for sid in ("one", "two"):
+            (source / f"{sid}.json").write_text(json.dumps(GameSession(sid).to_dict()))
+        (source / "broken.json").write_text("{not json")
+
+        store = SQLiteSessionStore(tmp_path / "s.db")
+        counts = migrate_json_sessions(source, store)
+        assert counts == {"imported": 2, "skipped": 1}
+        assert sorted(store.session_ids()) == ["one", "two"]
+        assert store.load("one")["session_id"] == "one"
+        store.close()
+
+    def test_imports_sharded_binary_sessions_with_deltas(self, tmp_path):
+        source = FileSessionStore(tmp_path / "sessions")
+        source.save("abc", {**GameSession("abc").to_dict(), "monster_kills": 1})
+        source.append_deltas("abc", [["s", ["monster_kills"], 4]])
+        assert source._path("abc").suffix == ".bin"
+        assert source._journal_path("abc").exists()
+
+        store = SQLiteSessionStore(tmp_path / "s.db")
+        assert migrate_json_sessions(tmp_path / "sessions", store) == {"imported": 1, "skipped": 0}
+        assert store.load("abc")["monster_kills"] == 4
+        store.close()
@@ -0,0 +1,148 @@
+"""Tests for engine.simulate — the headless battle simulator."""
+
+import sys
+import random
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from character import WeaponSlot
+from characterFactory import CharacterFactory
+from dice import DiceStream, use_stream
+from engine.simulate import (PlayerBuild, choose_ability, distribution, main, simulate, simulate_battle,
+                             summarize)
+from monsterFactory import encounter_templates
+from records import ability_defs
+from weaponFactory import WeaponFactory
+
+
+class TestPlayerBuild:
+    def test_matches_created_character(self):
+        build = PlayerBuild.create("Dwarf", "Fighter", 1, "Longsword", "Chain Mail")
+        character = CharacterFactory().create_character("X", "Dwarf", "Fighter")
+        assert build.max_hp == character.max_hit_points
+        assert build.ac == 16 and build.damage_die == 8
+        assert build.attack_mod == character.strength_modifier
+
+    def test_levels_up_with_average_hp(self):
+        level_1 = PlayerBuild.create("Human", "Wizard", 1)
+        level_5 = PlayerBuild.create("Human", "Wizard", 5)
+        assert level_5.level == 5 and level_5.max_hp > level_1.max_hp
+        assert level_5.proficiency == 2 and level_5.max_pp > level_1.max_pp
+
+    def test_default_loadout_is_known_abilities(self):
+        build = PlayerBuild.create("Human", "Wizard", 5)
+        assert build.abilities and all("Wizard" in a.classes and a.unlock_level <= 5 for a in build.abilities)
+        levels = [a.unlock_level for a in build.abilities]
+        assert levels == sorted(levels, reverse=True)
+
+    def test_invalid_builds(self):
+        with pytest.raises(ValueError):
+            PlayerBuild.create("Human", "Wizard", 1, abilities=["no_such_ability"])
+        with pytest.raises(ValueError):
+            PlayerBuild.create("Human", "Wizard", 1, abilities=["power_strike"])
+        with pytest.raises(ValueError):
+            PlayerBuild.create("Human", "Bureaucrat", 1)
+
+
+class TestChooseAbility:
+    def setup_method(self):
+        self.build = PlayerBuild.create("Human", "Fighter", 1, abilities=["power_strike", "second_wind"])
+
+    def test_heals_only_when_wounded(self):
+        assert choose_ability(self.build, self.build.max_hp, 2, [], []).id == "power_strike"
+        assert choose_ability(self.build, 1, 2, [], []).id == "second_wind"
+
+    def test_attacks_without_pp(self):
+        build = PlayerBuild.create("Human", "Wizard", 1, abilities=["magic_missile"])
+        assert ability_defs()["magic_missile"].cost > 0
+        assert choose_ability(build, build.max_hp, 0, [], []) is None
+
+    def test_skips_active_buff(self):
+        buff = next(a for a in ability_defs().values()
+                    if a.target == "self" and a.effects and not a.heal and "Wizard" in a.classes)
+        build = PlayerBuild.create("Human", "Wizard", buff.unlock_level, abilities=[buff.id])
+        assert choose_ability(build, build.max_hp, 10, [], []) is buff
+        active = [{"stat": "ac", "value": 2, "duration": 2, "source": buff.name}]
+        assert choose_ability(build, build.max_hp, 10, active, []) is None
+
+
+class TestSimulate:
+    def test_outcomes_and_samples(self):
+        build = PlayerBuild.create("Human", "Fighter", 3, "Longsword", "Chain Mail")
+        result = simulate(build, "Goblin", 1, 500)
+        assert sum(result["outcomes"].values()) == 500
+        assert len(result["rounds_to_kill"]) == result["outcomes"]["win"]
+        assert len(result["damage_taken"]) == len(result["pp_used"]) == 500
+        assert all(0 <= pp <= build.max_pp for pp in result["pp_used"])
+        assert result["outcomes"]["win"] > 400
+
+    def test_seeded_runs_repeat(self):
+        build = PlayerBuild.create("Elf", "Wizard", 3, "Dagger")
+        random.seed(7)
+        first = simulate(build, "Orc", 2, 200)
+        random.seed(7)
+        assert simulate(build, "Orc", 2, 200) == first
+
+    def test_round_cap_is_a_timeout(self):
+        build = PlayerBuild.create("Human", "Fighter", 1)
+        result = simulate(build, "Goblin", 20, 50, max_rounds=1)
+        assert result["outcomes"]["timeout"] + result["outcomes"]["loss"] + result["outcomes"]["win"] == 50
+        assert all(rounds == 1 for rounds in result["rounds_to_kill"])
+
+    def test_unknown_monster(self):
+        with pytest.raises(ValueError):
+            simulate(PlayerBuild.create("Human", "Fighter", 1), "Dragon", 1, 1)
+
+    def test_summary(self):
+        summary = summarize({"battles": 4, "outcomes": {"win": 3, "loss": 1, "timeout": 0},
+                             "rounds_to_kill": [2, 3, 4], "damage_taken": [0, 5, 5, 10],
+                             "pp_used": [0, 0, 1, 1]})
+        assert summary["win_rate"] == 0.75
+        assert summary["rounds_to_kill"]["p50"] == 3 and summary["damage_taken"]["mean"] == 5
+        assert distribution([]) == {}
+
+    def test_cli(self, capsys):
+        main(["--class", "Cleric", "--level", "3", "--weapon", "Mace", "--battles", "200",
+              "--seed", "1", "--json"])
+        assert '"win_rate"' in capsys.readouterr().out
+        with pytest.raises(SystemExit):
+            main(["--abilities", "fire_bolt"])
+
+
+class TestMatchesBattleRoutes:
+    """One seeded fight played through the battle routes' play_action() and
+    through simulate_battle() comes out the same."""
+
+    def _route_fight(self, build, weapon, race, level, seed):
+        from web import game_session
+        from web.routes import battle as battle_routes
+        session = game_session.GameSession("sim")
+        char = CharacterFactory().create_character("Simulant", build.race, build.class_name)
+        char.equip_weapon(WeaponFactory().get_weapon_by_name(weapon), WeaponSlot.MAIN_HAND)
+        char.power_points = build.max_pp
+        session.character = char
+        battle = session.battle
+        with use_stream(DiceStream(seed)):
+            battle_routes.begin_battle(session, race, level)
+            outcome = False if char.current_hit_points <= 0 else None
+            while outcome is None:
+                ability = choose_ability(build, char.current_hit_points, char.power_points,
+                                         battle.player_effects, battle.monster_effects)
+                outcome = battle_routes.play_action(session, "a" if ability is None else f"s:{ability.id}")
+        return ({True: "win", False: "loss"}[outcome], battle.round_count,
+                build.max_hp - char.current_hit_points, build.max_pp - char.power_points)
+
+    @pytest.mark.parametrize("class_name,weapon,abilities", [
+        ("Fighter", "Longsword", ["power_strike"]),
+        ("Wizard", "Dagger", ["fire_bolt"]),
+    ])
+    def test_same_fight(self, monkeypatch, class_name, weapon, abilities):
+        from web.routes import battle as battle_routes
+        monkeypatch.setattr(battle_routes, "get_monster_taunt", lambda race, context: "")  # no draws
+        build = PlayerBuild.create("Human", class_name, 1, weapon, abilities=abilities)
+        for seed in range(20):
+            with use_stream(DiceStream(seed)):
+                simulated = simulate_battle(build, encounter_templates()["Orc"].combatant(1))
+            assert simulated == self._route_fight(build, weapon, "Orc", 1, seed), seed
@@ -0,0 +1,93 @@
+"""Tests for engine.vectorized — the NumPy duel kernel (skipped without NumPy)."""
+
+import sys
+import json
+import math
+import random
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from engine.simulate import PlayerBuild, main, simulate, summarize
+from engine.vectorized import LOSS, TIMEOUT, WIN, simulate_duels, summarize_duels
+
+
+def assert_win_rates_agree(scalar, vector):
+    """The scalar and vectorized win rates within four standard errors."""
+    p = scalar["outcomes"]["win"] / scalar["battles"]
+    q = float((vector["outcome"] == WIN).mean())
+    se = math.sqrt(p * (1 - p) / scalar["battles"] + q * (1 - q) / len(vector["outcome"]))
+    assert abs(p - q) < 4 * se
+
+
+class TestSimulateDuels:
+    def setup_method(self):
+        self.build = PlayerBuild.create("Dwarf", "Fighter", 3, "Longsword", "Chain Mail", abilities=[])
+
+    def test_outcomes_and_samples(self):
+        result = simulate_duels(self.build, "Orc", 2, 5000, rng=1)
+        assert len(result["outcome"]) == len(result["rounds"]) == len(result["damage_taken"]) == 5000
+        assert set(np.unique(result["outcome"])) <= {WIN, LOSS, TIMEOUT}
+        assert (result["rounds"] >= 1).all()
+        assert (result["damage_taken"] <= self.build.max_hp).all()
+        lost = result["outcome"] == LOSS
+        assert (result["damage_taken"][lost] == self.build.max_hp).all()
+
+    def test_seeded_runs_repeat(self):
+        first = simulate_duels(self.build, "Orc", 2, 1000, rng=7)
+        second = simulate_duels(self.build, "Orc", 2, 1000, rng=np.random.default_rng(7))
+        assert all((first[key] == second[key]).all() for key in first)
+
+    def test_round_cap_is_a_timeout(self):
+        result = simulate_duels(self.build, "Troll", 20, 500, max_rounds=1, rng=1)
+        assert (result["rounds"] == 1).all()
+        assert (result["outcome"] == TIMEOUT).any()
+
+    def test_unknown_monster(self):
+        with pytest.raises(ValueError):
+            simulate_duels(self.build, "Dragon", 1, 1)
+
+    def test_no_duels(self):
+        assert summarize_duels(simulate_duels(self.build, "Orc", 2, 0))["battles"] == 0
+
+    def test_matches_scalar_simulator(self):
+        random.seed(3)
+        scalar = simulate(self.build, "Orc", 2, 20000)
+        vector = simulate_duels(self.build, "Orc", 2, 200000, rng=3)
+        assert_win_rates_agree(scalar, vector)
+        won = vector["rounds"][vector["outcome"] == WIN]
+        assert abs(sum(scalar["rounds_to_kill"]) / len(scalar["rounds_to_kill"]) - won.mean()) < 0.1
+
+    def test_matches_scalar_simulator_with_effects(self):
+        build = PlayerBuild.create("Elf", "Wizard", 2, "Dagger", abilities=[])
+        player = [{"stat": "attack_bonus", "value": 1, "duration": 3, "source": "Bless"},
+                  {"stat": "damage_reduction", "value": 1, "duration": 0, "source": "Stoneskin"}]
+        monster = [{"stat": "ac", "value": 2, "duration": 2, "source": "Shield"}]
+        random.seed(4)
+        scalar = simulate(build, "Goblin", 1, 20000, player_effects=player, monster_effects=monster)
+        vector = simulate_duels(build, "Goblin", 1, 200000, player_effects=player,
+                                monster_effects=monster, rng=4)
+        assert_win_rates_agree(scalar, vector)
+
+    def test_summary_has_the_scalar_shape(self):
+        random.seed(1)
+        scalar = summarize(simulate(self.build, "Orc", 2, 50))
+        vector = summarize_duels(simulate_duels(self.build, "Orc", 2, 50, rng=1))
+        assert vector.keys() == scalar.keys()
+        assert vector["outcomes"].keys() == scalar["outcomes"].keys()
+        assert vector["damage_taken"].keys() == scalar["damage_taken"].keys()
+        assert vector["pp_used"]["max"] == 0
+
+
+class TestVectorizedCli:
+    def test_cli(self, capsys):
+        main(["--class", "Rogue", "--weapon", "Rapier", "--battles", "2000", "--seed", "1",
+              "--vectorized", "--json"])
+        assert json.loads(capsys.readouterr().out)["battles"] == 2000
+
+    def test_rejects_abilities(self):
+        with pytest.raises(SystemExit):
+            main(["--vectorized", "--abilities", "power_strike"])
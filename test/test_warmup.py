@@ -0,0 +1,111 @@
+"""Tests for web.warmup — startup warm-up, its timing report and /health readiness."""
+
+import sys
+import asyncio
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from catalog import get_catalog
+from web import app as app_module
+from web.warmup import DEFERRED_IMPORTS, Warmup
+
+
+class TestWarmup:
+    def test_run_warms_everything(self):
+        loaded = []
+        warmup = Warmup()
+        warmup.run(lambda: loaded.append(True), app_module.template_environments())
+        assert loaded == [True] and warmup.ready
+        assert set(warmup.phases) == {"catalog", "imports", "indexes", "templates", "total"}
+        assert set(warmup.imports) == set(DEFERRED_IMPORTS)
+        assert "campaign_index" in warmup.indexes and "encounter_templates" in warmup.indexes
+        assert get_catalog().stats["indexes"] >= len(warmup.indexes)
+        assert warmup.templates == len(app_module.templates.env.list_templates())
+
+    def test_app_and_routers_share_one_environment(self):
+        routers = (app_module.character, app_module.game, app_module.battle,
+                   app_module.shop, app_module.inventory)
+        assert all(router.templates is app_module.templates for router in routers)
+        assert app_module.template_environments() == [app_module.templates.env]
+
+    def test_templates_are_compiled_and_cached(self):
+        env = app_module.battle.templates.env
+        Warmup().run(lambda: None, [env])
+        assert env.get_template("battle/arena.html") is env.get_template("battle/arena.html")
+
+    def test_without_warm_only_catalog_is_loaded(self):
+        warmup = Warmup()
+        warmup.run(lambda: None, app_module.template_environments(), warm=False)
+        assert warmup.ready and set(warmup.phases) == {"catalog", "total"}
+        assert warmup.templates == 0
+
+    def test_weapon_and_armor_objects_are_all_built(self):
+        from catalog import weapons_by_name, armors_by_name
+        from web.warmup import _armor_objects, _weapon_objects
+        assert [w.name for w in _weapon_objects()] == list(weapons_by_name())
+        assert [a.name for a in _armor_objects()] == list(armors_by_name())
+
+    def test_report(self):
+        warmup = Warmup()
+        assert warmup.report()["total_ms"] is None
+        warmup.run(lambda: None)
+        report = warmup.report()
+        assert report["total_ms"] >= max(report["phases"].values())
+        assert "total" not in report["phases"]
+
+
+class TestHealthReadiness:
+    def test_not_ready_until_warm(self, monkeypatch):
+        warmup = Warmup()
+        monkeypatch.setattr(app_module, "get_warmup", lambda: warmup)
+        response = asyncio.run(app_module.health_check())
+        assert response.status_code == 503
+        warmup.run(lambda: None)
+        status = asyncio.run(app_module.health_check())
+        assert status["ready"] and status["status"] == "healthy"
+        assert status["startup"]["phases"]["indexes"] >= 0
+
+    def test_serves_while_warming(self, monkeypatch):
+        """start() returns once the catalog is loaded; /health answers 503
+        until the warm-up thread is done."""
+        warmup = Warmup()
+        monkeypatch.setattr(app_module, "get_warmup", lambda: warmup)
+        release = threading.Event()
+
+        class SlowEnvironment:
+            def list_templates(self):
+                release.wait(5)
+                return []
+
+        async def run():
+            loaded = []
+            warming = warmup.start(lambda: loaded.append(True), [SlowEnvironment()])
+            assert loaded == [True]
+            response = await app_module.health_check()
+            assert response.status_code == 503
+            release.set()
+            await warming
+            return await app_module.health_check()
+
+        status = asyncio.run(run())
+        assert status["ready"] and status["startup"]["phases"]["templates"] >= 0
+
+    def test_failed_warmup_still_becomes_ready(self, monkeypatch):
+        warmup = Warmup()
+
+        class BrokenEnvironment:
+            def list_templates(self):
+                raise OSError("templates directory is gone")
+
+        async def run():
+            await warmup.start(lambda: None, [BrokenEnvironment()])
+
+        asyncio.run(run())
+        assert warmup.ready and "total" in warmup.phases
+
+    def test_start_without_warm(self):
+        async def run():
+            return Warmup().start(lambda: None, warm=False)
+
+        assert asyncio.run(run()) is None
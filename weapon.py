@@ -2,6 +2,10 @@ from equipment import Equipment
 from equipmentType import EquipmentType
 
 class Weapon(Equipment):
+    """A catalog weapon. Immutable: WeaponFactory hands out one shared instance
+    per catalog entry, so state that belongs to a single copy of an item must
+    be kept by its owner, not on the Weapon."""
+
     def __init__(self, name: str, damage_die: int, damage_type: str, category: str, properties=None,
                  damage_dice_count=1, description=""):
         super().__init__(name, EquipmentType.WEAPON, {})
@@ -9,8 +13,9 @@ class Weapon(Equipment):
         self.damage_die = damage_die
         self.damage_type = damage_type
         self.category = category  # "Simple" or "Martial"
-        self.properties = properties or []
+        self.properties = tuple(properties or ())
         self.damage_dice_count = damage_dice_count  # Default is 1, but some weapons like greatsword use 2d6 (two dice)
+        self.freeze()
 
     @property
     def is_ranged(self):
@@ -1,19 +1,14 @@
-import json
 from weapon import Weapon
+from catalog import get_catalog, weapons_by_name
 
 
 class WeaponFactory:
     def __init__(self):
-        with open("json/weapon-catalog.json") as f:
-            self.weapon_catalog = json.load(f)
+        self.weapon_catalog = get_catalog().load("weapon-catalog.json")
 
-        # Combine all weapons into a single dictionary for easy access
-        self.all_weapons = {}
-        for category, weapons in self.weapon_catalog.items():
-            for weapon_name, weapon_data in weapons.items():
-                self.all_weapons[weapon_name] = weapon_data
-                # Add the weapon type (simple_melee, martial_ranged, etc.) to the data
-                self.all_weapons[weapon_name]["type"] = category
+        # All weapons in a single dictionary for easy access, each with its
+        # weapon type (simple_melee, martial_ranged, etc.) added
+        self.all_weapons = weapons_by_name()
 
     def get_weapon_list(self):
         """Returns a list of all weapon names."""
@@ -36,21 +31,24 @@ class WeaponFactory:
                 if weapon_type.lower() in data["type"].lower()}
 
     def get_weapon_by_name(self, weapon_name):
-        """Creates and returns a Weapon object based on the weapon name."""
-        if weapon_name not in self.all_weapons:
+        """Returns the shared (immutable) Weapon object for the weapon name."""
+        weapon = get_catalog().index("weapon_objects", _build_weapons).get(weapon_name)
+        if weapon is None:
             raise ValueError(f"Weapon {weapon_name} not found in the catalog")
+        return weapon
 
-        weapon_data = self.all_weapons[weapon_name]
-        properties = weapon_data.get("properties", [])
-        damage_dice_count = weapon_data.get("damage_dice_count", 1)
-        description = weapon_data.get("description", "")
 
-        return Weapon(
+def _build_weapons(catalog):
+    """One Weapon per catalog entry, shared by every caller."""
+    return {
+        weapon_name: Weapon(
             name=weapon_name,
-            description=description,
+            description=weapon_data.get("description", ""),
             damage_die=weapon_data["damage_die"],
             damage_type=weapon_data["damage_type"],
             category=weapon_data["category"],
-            properties=properties,
-            damage_dice_count=damage_dice_count
-        )
\ No newline at end of file
+            properties=weapon_data.get("properties", []),
+            damage_dice_count=weapon_data.get("damage_dice_count", 1)
+        )
+        for weapon_name, weapon_data in weapons_by_name(catalog).items()
+    }
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""Per-class ability lookups ordered by unlock level.
+
+AbilityIndex is built once per catalog from abilities.json. For every class
+it keeps that class's abilities sorted by unlock level, so the abilities
+known at level L, or unlocked between two levels, are a bisect and a slice
+instead of a scan of the whole catalog. The records it returns are shared,
+read-only dicts of the ability plus its "id"; callers must not modify them.
+"""
+
+from bisect import bisect_right
+
+from catalog import FrozenDict, get_catalog
+
+
+def _display_order(ability) -> tuple:
+    return ability["cost"], ability["unlock_level"]
+
+
+class AbilityIndex:
+    """Abilities of each class, by unlock level."""
+
+    def __init__(self, abilities: dict):
+        by_class = {}
+        for ability_id, ability in abilities.items():
+            record = FrozenDict({"id": ability_id, **ability})
+            for class_name in ability.get("classes", []):
+                by_class.setdefault(class_name, []).append(record)
+        self._abilities = {}     # class -> records sorted by unlock level (catalog order within a level)
+        self._levels = {}        # class -> unlock level of each record, for bisect
+        self._known = {}         # (class, number unlocked) -> records in display order
+        for class_name, records in by_class.items():
+            records.sort(key=lambda a: a.get("unlock_level", 1))
+            self._abilities[class_name] = records
+            self._levels[class_name] = [a.get("unlock_level", 1) for a in records]
+            for count in set(bisect_right(self._levels[class_name], level)
+                             for level in [0] + self._levels[class_name]):
+                self._known[class_name, count] = tuple(sorted(records[:count], key=_display_order))
+
+    def known(self, class_name: str, level: int) -> tuple:
+        """Abilities a class has at a level, cheapest first (as shown in battle)."""
+        levels = self._levels.get(class_name)
+        if not levels:
+            return ()
+        return self._known[class_name, bisect_right(levels, level)]
+
+    def unlocked_between(self, class_name: str, old_level: int, new_level: int) -> list:
+        """Abilities gained going from old_level to new_level, in unlock order."""
+        levels = self._levels.get(class_name)
+        if not levels:
+            return []
+        return self._abilities[class_name][bisect_right(levels, old_level):bisect_right(levels, new_level)]
+
+
+def _build(catalog) -> AbilityIndex:
+    return AbilityIndex(catalog.load("abilities.json"))
+
+
+def get_ability_index() -> AbilityIndex:
+    """The index of the loaded abilities.json (built on first use)."""
+    return get_catalog().index("ability_index", _build)
@@ -1,17 +1,102 @@
 import os
 import sys
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from starlette.middleware.sessions import SessionMiddleware
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-app = FastAPI(title="AIVentures", description="D&D 5e Text Adventure")
+from web.settings import get_settings
+from web.session_cache import get_cache
+from web.session_store import get_store, run_store_io, shutdown_store_io
+from web.session_lock import SessionLockMiddleware
+from web.session_gc import get_sweeper
+from web.content_reload import CatalogSnapshotMiddleware, get_watcher
+from web.templating import templates
+from web.warmup import get_warmup
+from catalog import get_catalog
+from catalog_bundle import load_sources, validate
+
+logger = logging.getLogger(__name__)
+
+
+async def compact_idle_journals(interval: float, idle_seconds: float):
+    """Background task: fold the journals of idle sessions into snapshots."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_store_io(get_store().compact_idle, idle_seconds)
+        except Exception:
+            logger.exception("Session journal compaction failed")
+
+
+def load_catalog():
+    """Load the game catalogs from the precompiled bundle, or from the JSON
+    files (validating them) when the bundle is missing or stale."""
+    catalog = get_catalog()
+    if catalog.load_bundle():
+        logger.info("Loaded catalog bundle %s", catalog.bundle_hash[:12])
+        return
+    logger.warning("Catalog bundle missing or out of date, loading json/ directly "
+                   "(rebuild it with: python -m catalog_bundle build)")
+    catalog.load_all()
+    for problem in validate(load_sources(catalog)):
+        logger.error("Catalog problem: %s", problem)
+
+
+def template_environments() -> list:
+    """The Jinja environments to warm up: the one shared by the app and every router."""
+    return [templates.env]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the game catalogs, scan stored sessions for damage, run the
+    warm-up and the session and content reload background tasks while
+    serving, and flush everything on shutdown."""
+    settings = get_settings()
+    warming = get_warmup().start(load_catalog, template_environments(), warm=settings.startup_warmup)
+    if settings.session_recovery_scan:
+        report = await run_store_io(get_store().recover)
+        log = logger.warning if report["corrupt"] else logger.info
+        log("Session recovery scan: %d scanned, %d corrupt %s, %d temp files removed",
+            report["scanned"], len(report["corrupt"]), report["corrupt"], report["temp_files_removed"])
+    cache = get_cache()
+    tasks = [warming] if warming is not None else []
+    if cache is not None:
+        tasks.append(asyncio.create_task(cache.run_flusher(settings.session_flush_interval)))
+    if settings.journal_compact_every > 1:
+        tasks.append(asyncio.create_task(
+            compact_idle_journals(settings.journal_idle_seconds / 2, settings.journal_idle_seconds)))
+    sweeper = get_sweeper()
+    if sweeper is not None:
+        tasks.append(asyncio.create_task(sweeper.run(settings.session_sweep_interval)))
+    watcher = get_watcher()
+    if watcher is not None:
+        tasks.append(asyncio.create_task(watcher.run(settings.content_reload_interval)))
+    yield
+    for task in tasks:
+        task.cancel()
+    if cache is not None:
+        cache.flush()
+    shutdown_store_io()
+    get_store().close()
+
+
+app = FastAPI(title="AIVentures", description="D&D 5e Text Adventure", lifespan=lifespan)
+
+# One catalog snapshot per request, even if content is reloaded meanwhile
+app.add_middleware(CatalogSnapshotMiddleware)
+
+# Serialize requests per session; added before SessionMiddleware so it runs inside it
+app.add_middleware(SessionLockMiddleware)
 
 # Session middleware for tracking game state
 app.add_middleware(SessionMiddleware, secret_key="aiventures-secret-key-change-in-production")
@@ -19,7 +104,6 @@ app.add_middleware(SessionMiddleware, secret_key="aiventures-secret-key-change-i
 # Static files and templates
 web_dir = Path(__file__).parent
 app.mount("/static", StaticFiles(directory=web_dir / "static"), name="static")
-templates = Jinja2Templates(directory=web_dir / "templates")
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -34,11 +118,25 @@ async def home(request: Request):
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "game": "AIVentures"}
+    """Health check endpoint. Answers 503 until the startup warm-up is done."""
+    warmup = get_warmup()
+    status = {"status": "healthy" if warmup.ready else "starting", "game": "AIVentures",
+              "ready": warmup.ready, "startup": warmup.report(), "catalog": get_catalog().stats}
+    cache = get_cache()
+    if cache is not None:
+        status["session_cache"] = {"size": len(cache), **cache.stats}
+    sweeper = get_sweeper()
+    if sweeper is not None:
+        status["session_sweeper"] = dict(sweeper.stats)
+    watcher = get_watcher()
+    if watcher is not None:
+        status["content_reload"] = dict(watcher.stats)
+    if not warmup.ready:
+        return JSONResponse(status, status_code=503)
+    return status
 
 
-# Register dependency redirect handler
+# Register dependency redirect and stale session handlers
 from web.dependencies import add_redirect_handler
 add_redirect_handler(app)
 
@@ -0,0 +1,81 @@
+"""Constant-time lookups into the campaign map.
+
+CampaignIndex is built once per catalog from campaign.json and maps
+act numbers, (act, location name) and (act, location name, area id) to the
+catalog's own act/location/area dicts, so the references it returns are
+stable and can be compared by identity. Each area's connections are
+resolved up front into neighbor lists, so rendering or moving never scans
+a location's areas.
+"""
+
+from typing import Optional
+
+from catalog import get_catalog
+from records import AreaDef
+
+
+class CampaignIndex:
+    """Acts, locations, areas and area adjacency of a campaign."""
+
+    def __init__(self, campaign: dict):
+        acts = campaign.get("acts", [])
+        self.first_act = acts[0] if acts else None
+        self._acts = {}
+        self._locations = {}      # (act, location) -> location
+        self._areas = {}          # (act, location, area id) -> area
+        self._neighbors = {}      # (act, location, area id) -> {area id: area} in connection order
+        self._area_defs = {}      # (act, location, area id) -> AreaDef
+        for act in acts:
+            number = act.get("number")
+            self._acts.setdefault(number, act)
+            for location in act.get("locations", []):
+                name = location["name"]
+                self._locations[number, name] = location
+                areas = {area["id"]: area for area in location.get("areas", [])}
+                for area_id, area in areas.items():
+                    self._areas[number, name, area_id] = area
+                    self._area_defs[number, name, area_id] = AreaDef.from_catalog(area, location)
+                    self._neighbors[number, name, area_id] = {
+                        conn: areas[conn] for conn in area.get("connections", []) if conn in areas}
+
+    def act(self, number) -> Optional[dict]:
+        return self._acts.get(number)
+
+    def location(self, act_num, name) -> Optional[dict]:
+        return self._locations.get((act_num, name))
+
+    def other_locations(self, act_num, name) -> list:
+        """Locations of the act other than this one (travel destinations)."""
+        act = self._acts.get(act_num)
+        if act is None:
+            return []
+        return [loc for loc in act.get("locations", []) if loc["name"] != name]
+
+    def area(self, act_num, location_name, area_id) -> Optional[dict]:
+        return self._areas.get((act_num, location_name, area_id))
+
+    def area_def(self, act_num, location_name, area_id) -> Optional[AreaDef]:
+        """The area as a record, with its location's encounter levels parsed."""
+        return self._area_defs.get((act_num, location_name, area_id))
+
+    def entry_area(self, location: dict) -> Optional[dict]:
+        """The area a player arrives in when travelling to a location."""
+        areas = location.get("areas")
+        return areas[0] if areas else None
+
+    def neighbors(self, act_num, location_name, area_id) -> list:
+        """The areas connected to an area, in the order of its connections."""
+        return list(self._neighbors.get((act_num, location_name, area_id), {}).values())
+
+    def neighbor(self, act_num, location_name, area_id, target_id) -> Optional[dict]:
+        """The connected area target_id, or None if the areas are not connected."""
+        return self._neighbors.get((act_num, location_name, area_id), {}).get(target_id)
+
+
+def _build(catalog) -> CampaignIndex:
+    return CampaignIndex(catalog.load("campaign.json"))
+
+
+def get_campaign_index() -> CampaignIndex:
+    """The index of the loaded campaign.json (built on first use)."""
+    return get_catalog().index("campaign_index", _build)
@@ -0,0 +1,102 @@
+"""Hot reload of the game content in json/.
+
+ContentWatcher polls the sizes and mtimes of the catalog files every
+AIVENTURES_CONTENT_RELOAD_INTERVAL seconds (a few stat calls, no reads).
+When they change it builds a complete new Catalog off the event loop -- every
+file parsed and every index the running catalog had built rebuilt --
+validates it, and swaps it in with set_catalog(). Content that fails to parse
+or validate is logged and the running catalog is kept.
+
+CatalogSnapshotMiddleware pins the catalog for each request, so a request
+that started before a swap finishes on the content it started with.
+Sessions resolve their stored location against the new content the next time
+they are used (see GameSession.refresh_content()).
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web.settings import get_settings
+from catalog import get_catalog, set_catalog, pin_catalog, unpin_catalog
+from catalog_bundle import load_sources, validate
+
+logger = logging.getLogger(__name__)
+
+
+class ContentWatcher:
+    """Reloads the catalog when its files change on disk."""
+
+    def __init__(self):
+        self._fingerprint = get_catalog().source_fingerprint()
+        self._lock = threading.Lock()
+        self.stats = {"checks": 0, "reloads": 0, "rejected": 0}
+
+    def check(self) -> bool:
+        """Reload if any catalog file changed since the last check. Returns
+        True if a new catalog was swapped in."""
+        with self._lock:
+            current = get_catalog()
+            fingerprint = current.source_fingerprint()
+            self.stats["checks"] += 1
+            if fingerprint == self._fingerprint:
+                return False
+            self._fingerprint = fingerprint
+            try:
+                catalog = current.reload()
+                problems = validate(load_sources(catalog))
+            except (OSError, ValueError) as e:
+                problems = [str(e)]
+            if problems:
+                self.stats["rejected"] += 1
+                for problem in problems:
+                    logger.error("Content not reloaded: %s", problem)
+                return False
+            set_catalog(catalog)
+            self.stats["reloads"] += 1
+            logger.info("Reloaded game content (%d files)", len(fingerprint))
+            return True
+
+    async def run(self, interval: float):
+        """Background task: check for changed content every interval."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.check)
+            except Exception:
+                logger.exception("Content reload failed")
+
+
+class CatalogSnapshotMiddleware:
+    """ASGI middleware pinning one catalog for the whole of each request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            # Not the lifespan scope: its background tasks must see later swaps
+            await self.app(scope, receive, send)
+            return
+        token = pin_catalog()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            unpin_catalog(token)
+
+
+_watcher = None
+
+
+def get_watcher() -> Optional[ContentWatcher]:
+    """Get the process-wide content watcher, or None when hot reload is off."""
+    global _watcher
+    if _watcher is None and get_settings().content_reload_interval > 0:
+        _watcher = ContentWatcher()
+    return _watcher
@@ -1,22 +1,28 @@
 """FastAPI dependencies for common route guards."""
 
+import logging
+
 from fastapi import Request
 from fastapi.responses import RedirectResponse
 
-from web.game_session import get_session, GameSession
+from web.game_session import load_session, GameSession
+from web.session_cache import get_cache
+from web.session_store import StaleSessionError
+
+logger = logging.getLogger(__name__)
 
 
 async def get_game_session(request: Request) -> GameSession:
     """Load the game session from the request."""
-    return get_session(request)
+    return await load_session(request)
 
 
 class RequireCharacter:
     """Dependency that ensures a character exists, otherwise redirects."""
 
     async def __call__(self, request: Request) -> GameSession:
-        session = get_session(request)
-        if not session.character:
+        session = await load_session(request)
+        if not session.has_character:
             raise _RedirectException("/character/new")
         return session
 
@@ -25,14 +31,25 @@ class RequireBattle:
     """Dependency that ensures an active battle exists."""
 
     async def __call__(self, request: Request) -> GameSession:
-        session = get_session(request)
-        if not session.character:
+        session = await load_session(request)
+        if not session.has_character:
             raise _RedirectException("/character/new")
         if not session.battle.is_active:
             raise _RedirectException("/game")
         return session
 
 
+def rebuilt_character(session: GameSession):
+    """The session's character, rebuilt from its stored data. The guards only
+    check that there is stored data; routes that use the character call this
+    so that data which no longer restores (e.g. after content changed)
+    redirects to character creation."""
+    character = session.character
+    if character is None:
+        raise _RedirectException("/character/new")
+    return character
+
+
 class _RedirectException(Exception):
     """Internal exception for dependency redirects."""
     def __init__(self, url: str):
@@ -40,11 +57,22 @@ class _RedirectException(Exception):
 
 
 def add_redirect_handler(app):
-    """Register the exception handler on the FastAPI app."""
+    """Register the exception handlers on the FastAPI app."""
     @app.exception_handler(_RedirectException)
     async def redirect_handler(request: Request, exc: _RedirectException):
         return RedirectResponse(exc.url, status_code=303)
 
+    @app.exception_handler(StaleSessionError)
+    async def stale_session_handler(request: Request, exc: StaleSessionError):
+        # Another worker saved this session first. Its write stands; this
+        # action is rejected and the player is shown the current state.
+        logger.warning("Rejected stale session write: %s", exc)
+        cache = get_cache()
+        if cache is not None:
+            cache.discard(exc.session_id)
+        section = "/battle" if request.url.path.startswith("/battle") else "/game"
+        return RedirectResponse(section, status_code=303)
+
 
 # Singleton instances for use as dependencies
 require_character = RequireCharacter()
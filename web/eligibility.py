@@ -0,0 +1,94 @@
+"""Which weapons and armor each class can use.
+
+EquipmentEligibility is built once per catalog from classes_properties.json
+and the weapon and armor catalogs. For every class it holds the set of
+usable weapon names (every weapon of a proficient category, e.g. "Simple",
+plus individually named weapons) and armor names (every armor of a trained
+category), and the option lists the character creation page renders, so
+creation, inventory annotation and equip checks are set lookups.
+"""
+
+from catalog import freeze, get_catalog, weapons_by_name, armors_by_name
+from weapon import Weapon
+from armor import Armor
+
+
+class EquipmentEligibility:
+    """Usable weapons and armor per class."""
+
+    def __init__(self, classes: dict, weapons: dict, armors: dict):
+        self._weapons = {}            # class -> frozenset of weapon names
+        self._armors = {}             # class -> frozenset of armor names
+        self._weapon_options = {}     # class -> read-only weapon option dicts, in catalog order
+        self._armor_options = {}      # class -> read-only armor option dicts, in catalog order
+        for class_name, props in classes.items():
+            proficiencies = set(props.get("weapon_proficiencies", []))
+            training = set(props.get("armor_training", []))
+            usable_weapons = [name for name, weapon in weapons.items()
+                              if weapon["category"] in proficiencies or name in proficiencies]
+            usable_armors = [name for name, armor in armors.items() if armor["category"] in training]
+            self._weapons[class_name] = frozenset(usable_weapons)
+            self._armors[class_name] = frozenset(usable_armors)
+            self._weapon_options[class_name] = tuple(
+                freeze(_weapon_option(name, weapons[name])) for name in usable_weapons)
+            self._armor_options[class_name] = tuple(
+                freeze(_armor_option(name, armors[name])) for name in usable_armors)
+
+    def weapons(self, class_name: str) -> frozenset:
+        return self._weapons.get(class_name, frozenset())
+
+    def armors(self, class_name: str) -> frozenset:
+        return self._armors.get(class_name, frozenset())
+
+    def can_use_weapon(self, class_name: str, weapon_name: str) -> bool:
+        return weapon_name in self._weapons.get(class_name, ())
+
+    def can_use_armor(self, class_name: str, armor_name: str) -> bool:
+        return armor_name in self._armors.get(class_name, ())
+
+    def can_equip(self, class_name: str, item) -> bool:
+        """Whether an inventory item is a weapon or armor the class can use."""
+        if isinstance(item, Weapon):
+            return self.can_use_weapon(class_name, item.name)
+        if isinstance(item, Armor):
+            return self.can_use_armor(class_name, item.name)
+        return False
+
+    def weapon_options(self, class_name: str) -> tuple:
+        """The weapons offered at character creation."""
+        return self._weapon_options.get(class_name, ())
+
+    def armor_options(self, class_name: str) -> tuple:
+        """The armors offered at character creation."""
+        return self._armor_options.get(class_name, ())
+
+
+def _weapon_option(name, weapon) -> dict:
+    return {
+        "name": name,
+        "damage_die": weapon["damage_die"],
+        "damage_type": weapon["damage_type"],
+        "category": weapon["category"],
+        "properties": ", ".join(weapon.get("properties", [])) or "None",
+        "description": weapon.get("description", ""),
+    }
+
+
+def _armor_option(name, armor) -> dict:
+    return {
+        "name": name,
+        "base_ac": armor["base_ac"],
+        "category": armor["category"],
+        "weight": armor["weight"],
+        "stealth_disadvantage": armor["stealth_disadvantage"],
+    }
+
+
+def _build(catalog) -> EquipmentEligibility:
+    return EquipmentEligibility(catalog.load("classes_properties.json"),
+                                weapons_by_name(catalog), armors_by_name(catalog))
+
+
+def get_eligibility() -> EquipmentEligibility:
+    """The eligibility matrix of the loaded catalog (built on first use)."""
+    return get_catalog().index("equipment_eligibility", _build)
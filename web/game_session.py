@@ -3,6 +3,7 @@
 import sys
 import json
 import uuid
+import logging
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass, field
@@ -10,151 +11,84 @@ from dataclasses import dataclass, field
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Path to JSON data files
-JSON_DIR = Path(__file__).parent.parent / "json"
+from web.session_store import get_store, run_store_io
+from web.session_cache import get_cache
+from web.session_journal import write_session
+from web.session_format import SCHEMA_VERSION, upgrade
+from web.campaign import get_campaign_index
+from web.abilities import get_ability_index
+from catalog import get_catalog, weapons_by_name, armors_by_name
 
+logger = logging.getLogger(__name__)
 
-def load_json(filename: str) -> dict:
-    """Load a JSON file from the json directory."""
-    with open(JSON_DIR / filename) as f:
-        return json.load(f)
-
-
-# Cached data loaders
-_races_cache = None
-_classes_cache = None
-_weapons_cache = None
-_campaign_cache = None
+def load_json(filename: str):
+    """A (read-only) JSON file from the json directory, loaded once per process."""
+    return get_catalog().load(filename)
 
 
 def get_races() -> dict:
     """Get all playable races with their bonuses."""
-    global _races_cache
-    if _races_cache is None:
-        _races_cache = load_json("races.json")
-    return _races_cache
+    return load_json("races.json")
 
 
 def get_classes() -> dict:
     """Get all playable classes with their properties."""
-    global _classes_cache
-    if _classes_cache is None:
-        _classes_cache = load_json("classes_properties.json")
-    return _classes_cache
+    return load_json("classes_properties.json")
 
 
 def get_weapons() -> dict:
     """Get all weapons from the catalog."""
-    global _weapons_cache
-    if _weapons_cache is None:
-        _weapons_cache = load_json("weapon-catalog.json")
-    return _weapons_cache
+    return load_json("weapon-catalog.json")
 
 
 def get_campaign() -> dict:
     """Get the campaign data."""
-    global _campaign_cache
-    if _campaign_cache is None:
-        _campaign_cache = load_json("campaign.json")
-    return _campaign_cache
+    return load_json("campaign.json")
 
 
 def get_all_weapons_flat() -> dict:
     """Get all weapons as a flat dictionary."""
-    weapons = get_weapons()
-    flat = {}
-    for category, weapon_list in weapons.items():
-        for name, data in weapon_list.items():
-            flat[name] = {**data, "type": category}
-    return flat
-
-
-_armors_cache = None
+    return weapons_by_name()
 
 
 def get_armors() -> dict:
     """Get all armors from the catalog."""
-    global _armors_cache
-    if _armors_cache is None:
-        _armors_cache = load_json("armor_catalog.json")
-    return _armors_cache
-
-
-_quests_cache = None
+    return load_json("armor_catalog.json")
 
 
 def get_quests() -> dict:
     """Get all quests from the catalog."""
-    global _quests_cache
-    if _quests_cache is None:
-        _quests_cache = load_json("quests.json")
-    return _quests_cache
-
-
-_abilities_cache = None
+    return load_json("quests.json")
 
 
 def get_abilities() -> dict:
     """Get all abilities from the catalog."""
-    global _abilities_cache
-    if _abilities_cache is None:
-        _abilities_cache = load_json("abilities.json")
-    return _abilities_cache
-
-
-_taunts_cache = None
+    return load_json("abilities.json")
 
 
 def get_monster_taunts() -> dict:
     """Get all monster taunts."""
-    global _taunts_cache
-    if _taunts_cache is None:
-        _taunts_cache = load_json("monster_taunts.json")
-    return _taunts_cache
-
-
-_portraits_cache = None
+    return load_json("monster_taunts.json")
 
 
 def get_monster_portraits() -> dict:
     """Get monster portrait mappings."""
-    global _portraits_cache
-    if _portraits_cache is None:
-        _portraits_cache = load_json("monster_portraits.json")
-    return _portraits_cache
-
-
-_shopkeeper_cache = None
+    return load_json("monster_portraits.json")
 
 
 def get_shopkeeper() -> dict:
     """Get shopkeeper dialog data."""
-    global _shopkeeper_cache
-    if _shopkeeper_cache is None:
-        _shopkeeper_cache = load_json("shopkeeper.json")
-    return _shopkeeper_cache
-
-
-_shop_inventory_cache = None
+    return load_json("shopkeeper.json")
 
 
 def get_default_shop_inventory() -> list:
     """Get default shop inventory."""
-    global _shop_inventory_cache
-    if _shop_inventory_cache is None:
-        _shop_inventory_cache = load_json("shop_inventory.json")
-    return _shop_inventory_cache
+    return load_json("shop_inventory.json")
 
 
-def get_class_abilities(class_name: str, level: int) -> list:
-    """Get unlocked abilities for a class at a given level."""
-    abilities = get_abilities()
-    result = []
-    for ability_id, ability in abilities.items():
-        if class_name in ability.get("classes", []) and level >= ability.get("unlock_level", 1):
-            result.append({"id": ability_id, **ability})
-    result.sort(key=lambda a: (a["cost"], a["unlock_level"]))
-    return result
+def get_class_abilities(class_name: str, level: int) -> tuple:
+    """Get unlocked abilities for a class at a given level (shared, read-only)."""
+    return get_ability_index().known(class_name, level)
 
 
 def calculate_max_pp(class_name: str, level: int, primary_modifier: int) -> int:
@@ -173,12 +107,12 @@ def get_primary_modifier(character) -> int:
 
 def get_all_armors_flat() -> dict:
     """Get all armors as a flat dictionary."""
-    armors = get_armors()
-    flat = {}
-    for category, armor_list in armors.items():
-        for name, data in armor_list.items():
-            flat[name] = {**data, "type": category}
-    return flat
+    return armors_by_name()
+
+
+def canonical_state(data: dict) -> str:
+    """Canonical JSON of serialized session data, compared to skip no-op saves."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
 
 
 @dataclass
@@ -193,6 +127,20 @@ class CharacterCreationState:
     skills: list = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class CharacterSummary:
+    """Read-only view of the numbers status screens show about a character."""
+    name: str
+    level: int
+    gold: int
+    current_hit_points: int
+    max_hit_points: int
+    power_points: int
+    max_power_points: int
+    location: Optional[str]
+    area: Optional[str]
+
+
 @dataclass
 class BattleState:
     """Tracks current battle state."""
@@ -203,6 +151,12 @@ class BattleState:
     is_player_turn: bool = True
     is_active: bool = False
     player_effects: list = field(default_factory=list)
+    # Replay record (web/replay.py): the battle's dice seed (None for battles
+    # from before seeding), the player's actions in order and the character
+    # at the start of the battle (web.replay.battle_start())
+    seed: Optional[int] = None
+    actions: list = field(default_factory=list)
+    start: Optional[dict] = None
 
     def __post_init__(self):
         if self.monster is None:
@@ -254,12 +208,17 @@ class GameSession:
 
     def __init__(self, session_id: str = None):
         self.session_id = session_id or str(uuid.uuid4())
-        self.character = None
+        # The character is rebuilt from _character_data (with _cc_data) on
+        # first access; see the character property.
+        self._character = None
+        self._character_data = None
+        self._cc_data = None
         self.character_creation = CharacterCreationState()
         self.battle = BattleState()
         self.current_location = None
         self.current_area = None
         self.act = None
+        self._content = None          # catalog the location was resolved against
         self.monster_kills = 0
         self.kills_at_last_restock = 0
         self.active_quests = {}       # {quest_id: {"progress": int, "status": "active"|"ready"}}
@@ -272,6 +231,82 @@ class GameSession:
         self.battle_rewards = None
         # Flash messages (one-time display, cleared after read)
         self._flash = {}
+        # Canonical JSON of the last loaded/saved state; None = never persisted
+        self._saved_state = None
+        # Stored version this object is based on; bumped by every write
+        self.version = 0
+
+    @property
+    def character(self):
+        """The player character, rebuilt from its stored data on first access."""
+        if self._character_data is not None:
+            char_data, cc_data = self._character_data, self._cc_data
+            self._character_data = self._cc_data = None
+            self._character = self._restore_character(char_data, cc_data)
+        return self._character
+
+    @character.setter
+    def character(self, value):
+        self._character = value
+        self._character_data = self._cc_data = None
+
+    @property
+    def has_character(self) -> bool:
+        """Whether a character exists, without rebuilding it."""
+        return self._character_data is not None or self._character is not None
+
+    def character_summary(self) -> Optional[CharacterSummary]:
+        """Status numbers for the character, read from its stored data while it
+        has not been rebuilt. None when there is no character."""
+        if self._character_data is not None:
+            c = self._character_data
+            values = (c.get("name"), c.get("level", 1), c.get("gold", 0),
+                      c.get("current_hit_points", 0), c.get("max_hit_points", 0),
+                      c.get("power_points", 0), c.get("max_power_points", 0))
+        elif self._character is not None:
+            c = self._character
+            values = (c.name, c.level, c.gold, c.current_hit_points, c.max_hit_points,
+                      c.power_points, c.max_power_points)
+        else:
+            return None
+        return CharacterSummary(
+            *values,
+            location=self.current_location.get("name") if self.current_location else None,
+            area=self.current_area.get("name") if self.current_area else None,
+        )
+
+    def locate(self, act_num, location_name, area_id):
+        """Set act, location and area from their stored keys. A location or
+        area no longer in the campaign falls back to the act's first location
+        or the location's entry area, so removed content never strands a player."""
+        campaign = get_campaign_index()
+        self._content = get_catalog()
+        self.act = campaign.act(act_num) or campaign.first_act
+        self.current_location = self.current_area = None
+        if not self.act or location_name is None:
+            return
+        act_num = self.act.get("number")
+        location = campaign.location(act_num, location_name)
+        if location is None:
+            locations = self.act.get("locations", [])
+            if not locations:
+                return
+            location, area_id = locations[0], None
+            logger.info("Session %s: location %r no longer exists, moved to %r",
+                        self.session_id, location_name, location["name"])
+        self.current_location = location
+        area = campaign.area(act_num, location["name"], area_id)
+        if area is None and (area_id is not None or location["name"] != location_name):
+            area = campaign.entry_area(location)
+        self.current_area = area
+
+    def refresh_content(self):
+        """Resolve the location again if the game content was reloaded since
+        this session last did (for sessions kept in memory)."""
+        if self._content is not get_catalog():
+            self.locate(self.act.get("number") if self.act else 1,
+                        self.current_location.get("name") if self.current_location else None,
+                        self.current_area.get("id") if self.current_area else None)
 
     def set_flash(self, key: str, value):
         """Set a flash message (displayed once, then cleared)."""
@@ -281,6 +316,28 @@ class GameSession:
         """Pop a flash message (returns and removes it)."""
         return self._flash.pop(key, default)
 
+    def dirty_snapshot(self) -> Optional[tuple]:
+        """Serialize the session if it changed since it was loaded or last saved.
+
+        Returns (data, state), or None when the session (including its
+        character, battle and creation state) is unchanged. Pass the state
+        to mark_saved() once the data has been written.
+        """
+        data = self.to_dict()
+        state = canonical_state(data)
+        if state == self._saved_state:
+            return None
+        return data, state
+
+    def mark_saved(self, state: str):
+        """Record that this canonical state has been persisted (as the next version)."""
+        self._saved_state = state
+        self.version += 1
+
+    def saved_data(self) -> Optional[dict]:
+        """The last loaded/saved state (a fresh copy), or None if never persisted."""
+        return json.loads(self._saved_state) if self._saved_state is not None else None
+
     def to_dict(self) -> dict:
         """Serialize session to dictionary for storage."""
         location_name = self.current_location.get("name") if self.current_location else None
@@ -307,6 +364,9 @@ class GameSession:
                 "is_player_turn": self.battle.is_player_turn,
                 "is_active": self.battle.is_active,
                 "player_effects": self.battle.player_effects,
+                "seed": self.battle.seed,
+                "actions": self.battle.actions,
+                "start": self.battle.start,
             },
             "location_name": location_name,
             "area_id": area_id,
@@ -320,6 +380,7 @@ class GameSession:
             "haggle_result": self.haggle_result,
             "battle_rewards": self.battle_rewards,
             "_flash": self._flash,
+            "schema": SCHEMA_VERSION,
         }
 
     def _get_weapon_name(self, c) -> Optional[str]:
@@ -336,6 +397,9 @@ class GameSession:
 
     def _serialize_character(self) -> Optional[dict]:
         """Serialize character object to dict."""
+        if self._character_data is not None:
+            # Not rebuilt, so unchanged since it was loaded
+            return {**self._character_data, "portrait": self.character_creation.portrait}
         if not self.character:
             return None
         from weapon import Weapon
@@ -355,7 +419,7 @@ class GameSession:
                 "damage_dice_count": equipped_weapon.damage_dice_count,
                 "damage_type": equipped_weapon.damage_type,
                 "category": equipped_weapon.category,
-                "properties": equipped_weapon.properties,
+                "properties": list(equipped_weapon.properties),
             }
 
         # Build armor details
@@ -384,7 +448,7 @@ class GameSession:
                 entry["damage_dice_count"] = item.damage_dice_count
                 entry["damage_type"] = item.damage_type
                 entry["category"] = item.category
-                entry["properties"] = item.properties
+                entry["properties"] = list(item.properties)
             elif isinstance(item, Armor):
                 entry["type"] = "armor"
                 entry["base_ac"] = item.base_ac
@@ -428,7 +492,8 @@ class GameSession:
 
     @classmethod
     def from_dict(cls, data: dict) -> "GameSession":
-        """Deserialize session from dictionary."""
+        """Deserialize session from dictionary (of any supported schema version)."""
+        data = upgrade(data)
         session = cls(data.get("session_id"))
         session.monster_kills = data.get("monster_kills", 0)
         session.kills_at_last_restock = data.get("kills_at_last_restock", 0)
@@ -439,34 +504,11 @@ class GameSession:
         session.haggle_result = data.get("haggle_result")
         session.battle_rewards = data.get("battle_rewards")
         session._flash = data.get("_flash", {})
+        session.version = data.get("version", 0)
+        session._saved_state = canonical_state({k: v for k, v in data.items() if k != "version"})
 
         # Restore location from campaign data
-        campaign = get_campaign()
-        act_num = data.get("act_num", 1)
-        location_name = data.get("location_name")
-        area_id = data.get("area_id")
-
-        # Find the act
-        for act in campaign.get("acts", []):
-            if act.get("number") == act_num:
-                session.act = act
-                break
-        if not session.act and campaign.get("acts"):
-            session.act = campaign["acts"][0]
-
-        # Find the location
-        if session.act and location_name:
-            for loc in session.act.get("locations", []):
-                if loc.get("name") == location_name:
-                    session.current_location = loc
-                    break
-
-        # Find the area
-        if session.current_location and area_id:
-            for area in session.current_location.get("areas", []):
-                if area.get("id") == area_id:
-                    session.current_area = area
-                    break
+        session.locate(data.get("act_num", 1), data.get("location_name"), data.get("area_id"))
 
         # Restore character creation state
         cc_data = data.get("character_creation", {})
@@ -483,33 +525,7 @@ class GameSession:
         # Restore battle state
         from engine.combatant import CombatantState
         battle_data = data.get("battle", {})
-
-        # Support both new format (nested "monster" dict) and legacy (flat fields)
-        monster_data = battle_data.get("monster")
-        if monster_data and isinstance(monster_data, dict) and "name" in monster_data:
-            monster = CombatantState.from_dict(monster_data)
-        else:
-            # Legacy format: reconstruct from flat fields
-            from engine.combatant import WeaponState
-            monster = CombatantState(
-                name=battle_data.get("monster_name", ""),
-                race=battle_data.get("monster_race", ""),
-                level=battle_data.get("monster_level", 1),
-                hp=battle_data.get("monster_hp", 0),
-                max_hp=battle_data.get("monster_max_hp", 0),
-                ac=battle_data.get("monster_ac", 10),
-                base_ac=battle_data.get("monster_base_ac", 10),
-                str_mod=battle_data.get("monster_str_modifier", 0),
-                dex_mod=battle_data.get("monster_dex_modifier", 0),
-                proficiency=battle_data.get("monster_proficiency_bonus", 1),
-                weapon=WeaponState(
-                    name=battle_data.get("monster_weapon_name", ""),
-                    damage_die=battle_data.get("monster_weapon_damage_die", 6),
-                    damage_dice_count=battle_data.get("monster_weapon_damage_dice_count", 1),
-                    properties=battle_data.get("monster_weapon_properties", []),
-                ),
-                effects=battle_data.get("monster_effects", []),
-            )
+        monster = CombatantState.from_dict(battle_data.get("monster", {}))
 
         session.battle = BattleState(
             monster=monster,
@@ -519,12 +535,17 @@ class GameSession:
             is_player_turn=battle_data.get("is_player_turn", True),
             is_active=battle_data.get("is_active", False),
             player_effects=battle_data.get("player_effects", []),
+            seed=battle_data.get("seed"),
+            actions=battle_data.get("actions", []),
+            start=battle_data.get("start"),
         )
 
-        # Restore character if creation data exists
+        # Restore character if creation data exists. Rebuilding it reads the
+        # race/class/weapon catalogs, so that waits until something uses it.
         char_data = data.get("character")
         if char_data and cc_data.get("name"):
-            session.character = session._restore_character(char_data, cc_data)
+            session._character_data = char_data
+            session._cc_data = cc_data
 
         return session
 
@@ -552,6 +573,7 @@ class GameSession:
             character.max_hit_points = char_data.get("max_hit_points", character.max_hit_points)
             character.armor_class = char_data.get("armor_class", character.armor_class)
             character.xp_to_next_level = character.level * 150
+            character.update_proficiency_bonus()
 
             # Restore power points
             primary_mod = get_primary_modifier(character)
@@ -618,40 +640,84 @@ class GameSession:
                     character.add_item(HealingPotion(item_data["name"], healing))
 
             return character
-        except Exception as e:
-            print(f"Error restoring character: {e}")
+        except Exception:
+            logger.exception("Could not restore the character of session %s, "
+                             "it counts as no character", self.session_id)
             return None
 
 
-SESSIONS_DIR = Path(__file__).parent / "sessions"
+def _load_stored_session(session_id: str) -> Optional[GameSession]:
+    """Read and rebuild a session from the store (blocking). None if missing or unreadable."""
+    try:
+        data = get_store().load(session_id)
+        if data is not None:
+            return GameSession.from_dict(data)
+    except (OSError, ValueError, LookupError, TypeError):
+        # A damaged session must not lock the player out, but it must not
+        # vanish silently either.
+        logger.exception("Could not load session %s, starting a new one", session_id)
+    return None
+
 
+def get_session(request) -> GameSession:
+    """Get or create a GameSession, blocking on store I/O.
 
-def _session_file(session_id: str) -> Path:
-    """Get the file path for a session."""
-    # Sanitize session_id to prevent path traversal
-    safe_id = "".join(c for c in session_id if c.isalnum() or c == "-")
-    return SESSIONS_DIR / f"{safe_id}.json"
+    Route handlers should use ``await load_session(request)`` instead.
+    """
+    session_id = request.session.get("session_id")
+    if session_id:
+        cache = get_cache()
+        if cache is not None:
+            session = cache.get(session_id)
+            if session is not None:
+                session.refresh_content()
+                return session
+        session = _load_stored_session(session_id)
+        if session is not None:
+            if cache is not None:
+                cache.put(session)
+            return session
+    return GameSession()
 
 
-def get_session(request) -> GameSession:
-    """Get or create a GameSession. Loads from server-side file."""
+async def load_session(request) -> GameSession:
+    """Get or create a GameSession. Served from the session cache when enabled;
+    otherwise read from the session store on the session I/O thread pool."""
     session_id = request.session.get("session_id")
     if session_id:
-        path = _session_file(session_id)
-        if path.exists():
-            try:
-                with open(path) as f:
-                    data = json.load(f)
-                return GameSession.from_dict(data)
-            except (json.JSONDecodeError, Exception):
-                pass
+        cache = get_cache()
+        if cache is not None:
+            session = cache.get(session_id)
+            if session is not None:
+                session.refresh_content()
+                return session
+        session = await run_store_io(_load_stored_session, session_id)
+        if session is not None:
+            if cache is not None:
+                cache.put(session)
+            return session
     return GameSession()
 
 
-def save_session(request, session: GameSession):
-    """Save GameSession to server-side file. Cookie stores only the session ID."""
-    SESSIONS_DIR.mkdir(exist_ok=True)
-    path = _session_file(session.session_id)
-    with open(path, "w") as f:
-        json.dump(session.to_dict(), f)
+async def save_session(request, session: GameSession):
+    """Save GameSession to the session store. Cookie stores only the session ID.
+
+    Unchanged sessions are not rewritten, and changed ones append a delta to
+    the session's journal rather than a full snapshot when possible. Raises
+    StaleSessionError if the stored session moved on since this one was
+    loaded (another worker saved it first). The
+    session is serialized on the event loop and written on the session I/O
+    thread pool. With the session cache enabled the write is deferred to the
+    cache's flusher.
+    """
+    cache = get_cache()
+    if cache is not None:
+        cache.put(session, dirty=True)
+    else:
+        snapshot = session.dirty_snapshot()
+        if snapshot is not None:
+            data, state = snapshot
+            await run_store_io(write_session, get_store(), session.session_id, data,
+                               session.saved_data(), session.version)
+            session.mark_saved(state)
     request.session["session_id"] = session.session_id
@@ -0,0 +1,164 @@
+"""Battle replays: re-fight a battle from its seed and the player's actions.
+
+Every battle started by /battle/start keeps a replay record on the session's
+BattleState: a dice seed, the player's actions in order ("a", "d", "i:0",
+"s:fire_bolt", ...) and what the battle reads of the character at its start
+(battle_start(): stats, equipped weapon and armor, healing potions). Each turn
+rolls from its own dice stream derived from the seed
+(web.routes.battle.turn_stream()), so playing the actions again through the
+same turn functions gives back the battle exactly, with its whole log; the
+session itself only keeps the last 10 log lines.
+
+    record = battle_record(session.battle)
+    replay = replay_battle(record)     # {"outcome": "won", "rounds": 4, "log": [...], ...}
+
+GET /battle/replay returns the replay of the session's current or last
+battle. From the command line:
+
+    python -m web.replay SESSION_ID            # the session's last battle
+    python -m web.replay --record battle.json  # a saved record (--json prints JSON)
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from armorFactory import ArmorFactory
+from character import WeaponSlot
+from characterFactory import CharacterFactory
+from dice import use_stream
+from equipmentType import EquipmentType
+from items import HealingPotion
+from weaponFactory import WeaponFactory
+from web.game_session import GameSession
+from web.routes.battle import begin_battle, play_action, turn_stream
+from web.session_format import SCHEMA_VERSION
+from web.session_store import get_store
+
+OUTCOMES = {True: "won", False: "lost", None: "ongoing"}
+
+
+def battle_start(character) -> dict:
+    """What a battle reads of the character, as it is at the start: identity
+    (the factory rebuilds the ability scores from race and class), level,
+    hit points, AC, PP, equipped weapon and armor, and the inventory as
+    [name, healing] per healing potion and 0 for anything else (which
+    "i:<index>" leaves alone), without the trailing zeros."""
+    weapon = character.weapon_slots.get(WeaponSlot.MAIN_HAND)
+    armor = character.equipment.get(EquipmentType.ARMOR)
+    items = [[item.name, item.healing_amount] if isinstance(item, HealingPotion) else 0
+             for item in character.inventory]
+    while items and items[-1] == 0:
+        items.pop()
+    return {"name": character.name, "race": character.race, "class_name": character.class_name,
+            "level": character.level, "hp": character.current_hit_points, "max_hp": character.max_hit_points,
+            "ac": character.armor_class, "pp": character.power_points,
+            "weapon": weapon.name if weapon else None, "armor": armor.name if armor else None,
+            "items": items}
+
+
+def start_character(start: dict):
+    """Rebuild the character of a battle_start() dict. Raises ValueError if
+    its weapon or armor is no longer in the catalog."""
+    character = CharacterFactory().create_character(start["name"], start["race"], start["class_name"])
+    character.level = start["level"]
+    character.update_proficiency_bonus()
+    if start["weapon"]:
+        character.equip_weapon(WeaponFactory().get_weapon_by_name(start["weapon"]), WeaponSlot.MAIN_HAND)
+    if start["armor"]:
+        character.equip(ArmorFactory().get_armor_by_name(start["armor"]))
+    character.max_hit_points, character.current_hit_points = start["max_hp"], start["hp"]
+    character.armor_class, character.power_points = start["ac"], start["pp"]
+    character.inventory = [HealingPotion(*item) if item else None for item in start["items"]]
+    return character
+
+
+def _start_session(start: dict) -> GameSession:
+    if "character" in start:
+        # Records from before battle_start() kept the whole serialized character
+        session = GameSession.from_dict({**start, "schema": SCHEMA_VERSION})
+        if session.character is None:
+            raise ValueError("The replay record has no character")
+        return session
+    session = GameSession("replay")
+    try:
+        session.character = start_character(start)
+    except KeyError as e:
+        raise ValueError(f"The replay record's character is incomplete or unknown: {e}") from None
+    return session
+
+
+def battle_record(battle) -> Optional[dict]:
+    """The replay record of a BattleState, or None for a battle from before
+    seeding (or no battle at all)."""
+    if battle.seed is None or battle.start is None:
+        return None
+    return {"seed": battle.seed, "monster": [battle.monster_race, battle.monster_level],
+            "actions": list(battle.actions), "start": battle.start}
+
+
+def replay_battle(record: dict) -> dict:
+    """Re-fight a recorded battle. Returns its outcome ("won", "lost" or
+    "ongoing"), rounds, the final hit points of both sides and the full log.
+    Raises ValueError for a record that does not describe a battle."""
+    session = _start_session(record["start"])
+    race, level = record["monster"]
+    seed = record["seed"]
+
+    with use_stream(turn_stream(seed, 0)):
+        begin_battle(session, race, level)
+    outcome = None
+    for turn, action in enumerate(record["actions"], 1):
+        if outcome is not None:
+            raise ValueError(f"The replay record goes on after the battle ended (action {turn})")
+        with use_stream(turn_stream(seed, turn)):
+            outcome = play_action(session, action)
+
+    return {
+        "outcome": OUTCOMES[outcome],
+        "rounds": session.battle.round_count,
+        "player_hp": session.character.current_hit_points,
+        "monster_hp": session.battle.monster_hp,
+        "log": session.battle.battle_log,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m web.replay",
+                                     description="Replay a battle from its seed and actions.")
+    parser.add_argument("session_id", nargs="?", help="replay this stored session's current or last battle")
+    parser.add_argument("--record", type=Path, help="replay a record saved as JSON instead")
+    parser.add_argument("--json", action="store_true", help="print the record and replay as JSON")
+    args = parser.parse_args(argv)
+    if (args.session_id is None) == (args.record is None):
+        parser.error("give a session id or --record, not both")
+
+    try:
+        if args.record is not None:
+            record = json.loads(args.record.read_text())
+        else:
+            data = get_store().load(args.session_id)
+            if data is None:
+                parser.error(f"no session {args.session_id}")
+            record = battle_record(GameSession.from_dict(data).battle)
+            if record is None:
+                parser.error(f"session {args.session_id} has no replayable battle")
+        replay = replay_battle(record)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        parser.error(f"cannot replay: {e}")
+
+    if args.json:
+        print(json.dumps({"record": record, "replay": replay}, indent=2))
+        return
+    print("\n".join(replay["log"]))
+    print(f"-- {replay['outcome']} after {replay['rounds']} rounds "
+          f"(player HP {replay['player_hp']}, monster HP {replay['monster_hp']}; "
+          f"seed {record['seed']}, {len(record['actions'])} actions)")
+
+
+if __name__ == "__main__":
+    main()
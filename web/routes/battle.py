@@ -2,28 +2,29 @@ import sys
 import random
 from pathlib import Path
 from fastapi import APIRouter, Request, Form, Depends
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 
 # Add parent directories to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from web.game_session import get_session, save_session, get_abilities, get_class_abilities, get_primary_modifier, get_quests, get_monster_taunts, get_monster_portraits
+from web.abilities import get_ability_index
+from web.campaign import get_campaign_index
+from web.game_session import load_session, save_session, get_class_abilities, get_primary_modifier, get_monster_taunts, get_monster_portraits
+from records import ability_defs, quest_defs
 from monsterFactory import MonsterFactory
-from dice import Dice
+from dice import Dice, DiceStream, current_rng, current_stream, use_stream
 from items import HealingPotion, QuestItem
 from character import WeaponSlot
 from lootGenerator import LootGenerator
 from web.routes.shop import restock_shop
-from engine.effects import get_effect_bonus, tick_effects
-from engine.combat import get_weapon_attack_modifier, resolve_weapon_attack, attack_roll, roll_damage, monster_turn_action, calculate_xp_reward, calculate_gold_reward
+from engine.effects import tick_effects
+from engine.combat import get_weapon_attack_modifier, resolve_weapon_attack, roll_ability, monster_turn_action, calculate_xp_reward, calculate_gold_reward
 from engine.leveling import calculate_max_pp
 from engine.quests import check_quest_progress
-from engine.combatant import CombatantState
-from web.dependencies import require_character, require_battle
+from web.dependencies import rebuilt_character, require_character, require_battle
+from web.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory=Path(__file__).parent.parent / "templates")
 
 def get_monster_taunt(race: str, context: str) -> str:
     """Get a random monster taunt by race and context."""
@@ -31,66 +32,39 @@ def get_monster_taunt(race: str, context: str) -> str:
     default = all_taunts.get("Default", {})
     taunts = all_taunts.get(race, default)
     lines = taunts.get(context, default.get(context, [""]))
-    return random.choice(lines)
-
-
-def get_monster_for_area(area, location=None):
-    """Generate a monster appropriate for the area."""
-    # Get monster info from area - default to Goblin for simple areas
-    monster_types = area.get("monster_types", ["Goblin"])
-    monster_race = random.choice(monster_types)
-
-    # Get level range from location's encounterLevel field
-    level_range_str = None
-    if location:
-        level_range_str = location.get("encounterLevel")
-    if level_range_str and "-" in str(level_range_str):
-        min_level, max_level = map(int, level_range_str.split("-"))
-        level = random.randint(min_level, max_level)
-    else:
-        # Fall back to area encounter_levels or default
-        level_range = area.get("encounter_levels", [1, 2])
-        if isinstance(level_range, list) and len(level_range) >= 2:
-            level = random.randint(level_range[0], level_range[1])
-        else:
-            level = 1
+    return current_rng().choice(lines)
 
-    return monster_race, level
 
+def get_monster_for_area(area):
+    """Pick a monster race and level for an encounter in an area (an AreaDef)."""
+    return random.choice(area.monster_types), random.randint(*area.level_range)
 
-@router.get("/start")
-async def start_battle(request: Request, session=Depends(require_character)):
-    """Initialize a new battle encounter."""
-    area = session.current_area
-    if not area:
-        return RedirectResponse("/game", status_code=303)
 
-    # Generate monster
-    location = session.current_location
-    monster_race, level = get_monster_for_area(area, location)
-
-    # Create monster using factory
-    factory = MonsterFactory()
-
-    # Make sure monster_race exists in defaults, fallback to Goblin
-    if monster_race not in factory.races:
-        monster_race = "Goblin"
-
-    race_data = factory.races[monster_race]
-    monster_name = random.choice(race_data.get("names", [monster_race]))
-    monster_class = random.choice(race_data.get("class_options", ["Fighter"]))
-    weapon_name = random.choice(race_data.get("weapons", [race_data.get("weapon_name", "Club")]))
-
-    monster = factory.create_monster(
-        name=monster_name,
-        race=monster_race,
-        class_name=monster_class,
-        monster_level=level,
-        weapon_name=weapon_name
-    )
+# Player actions as recorded in BattleState.actions: "a" attack, "d" defend,
+# "i:<inventory index>" use an item, "s:<ability id>" use an ability
+ATTACK, DEFEND, ITEM, ABILITY = "a", "d", "i", "s"
+
+BATTLE_DICE_BLOCK = 64     # rolls drawn at a time by a turn's dice stream; part of the replay format
+
+
+def turn_stream(seed, turn: int):
+    """The dice stream of one turn of a battle: turn 0 is the start (the
+    monster, initiative and a first monster turn), turn n the nth player
+    action. Battles from before seeding roll from the current stream."""
+    if seed is None:
+        return current_stream()
+    return DiceStream(f"{seed}/{turn}", block=BATTLE_DICE_BLOCK)
+
+
+def begin_battle(session, monster_race: str, level: int):
+    """Set up session.battle against a new monster of a race and level: roll
+    initiative and play the monster's turn if it goes first. Rolls from the
+    current dice stream."""
+    # Create the monster straight from its race's compiled template (Goblin if unknown)
+    monster = MonsterFactory().create_combatant(monster_race, level)
 
     # Initialize battle state
-    session.battle.monster = CombatantState.from_monster(monster)
+    session.battle.monster = monster
     session.battle.is_active = True
     session.battle.round_count = 1
     session.battle.battle_log = []
@@ -98,7 +72,7 @@ async def start_battle(request: Request, session=Depends(require_character)):
 
     # Calculate initiative
     player_init = session.character.dexterity_modifier + Dice.roll_d20()
-    monster_init = monster.dexterity_modifier + Dice.roll_d20()
+    monster_init = monster.dex_mod + Dice.roll_d20()
 
     session.battle.initiative_order = [
         ("player", player_init),
@@ -115,7 +89,35 @@ async def start_battle(request: Request, session=Depends(require_character)):
         execute_monster_turn(session)
         session.battle.is_player_turn = True
 
-    save_session(request, session)
+
+def start_recorded_battle(session, monster_race: str, level: int, seed: int):
+    """begin_battle() with a replay record: the battle's seed, no actions yet
+    and the character as it is now. The start rolls from the stream of turn 0."""
+    from web.replay import battle_start
+
+    session.battle.seed = seed
+    session.battle.actions = []
+    session.battle.start = battle_start(session.character)
+    with use_stream(turn_stream(seed, 0)):
+        begin_battle(session, monster_race, level)
+
+
+@router.get("/start")
+async def start_battle(request: Request, session=Depends(require_character)):
+    """Initialize a new battle encounter."""
+    rebuilt_character(session)
+    area = session.current_area
+    if not area:
+        return RedirectResponse("/game", status_code=303)
+
+    # Generate monster
+    location = session.current_location
+    monster_race, level = get_monster_for_area(
+        get_campaign_index().area_def(session.act["number"], location["name"], area["id"]))
+
+    start_recorded_battle(session, monster_race, level, random.getrandbits(32))
+
+    await save_session(request, session)
     return RedirectResponse("/battle", status_code=303)
 
 
@@ -160,17 +162,17 @@ def execute_monster_turn(session):
 async def battle_view(request: Request, session=Depends(require_battle)):
     """Battle view - show combat arena."""
 
+    char = rebuilt_character(session)   # before serializing, so both show the same items
     char_data = session._serialize_character()
 
     # Get usable items
     usable_items = [
         {"name": item.name, "description": item.description, "index": i}
-        for i, item in enumerate(session.character.inventory)
+        for i, item in enumerate(char.inventory)
         if hasattr(item, 'is_usable_in_battle') and item.is_usable_in_battle
     ]
 
     # Get class abilities
-    char = session.character
     abilities = get_class_abilities(char.class_name, char.level)
 
     portraits = get_monster_portraits()
@@ -201,12 +203,8 @@ async def battle_view(request: Request, session=Depends(require_battle)):
     })
 
 
-@router.post("/attack")
-async def player_attack(request: Request, session=Depends(require_battle)):
-    """Player attacks the monster."""
-    if not session.battle.is_player_turn:
-        return RedirectResponse("/battle", status_code=303)
-
+def player_attack_turn(session):
+    """The player attacks the monster with their main-hand weapon (1d4 unarmed)."""
     char = session.character
 
     weapon = char.weapon_slots.get(WeaponSlot.MAIN_HAND)
@@ -241,68 +239,18 @@ async def player_attack(request: Request, session=Depends(require_battle)):
     else:
         session.battle.battle_log.append(f"{char.name}'s attack misses!")
 
-    # Check for victory
-    if session.battle.monster_hp <= 0:
-        return await end_battle(request, session, player_won=True)
-
-    # Monster's turn
-    session.battle.is_player_turn = False
-    execute_monster_turn(session)
-
-    # Check for defeat
-    if char.current_hit_points <= 0:
-        return await end_battle(request, session, player_won=False)
-
-    # Reset monster AC, tick effects, advance round
-    session.battle.monster.reset_ac()
-    session.battle.player_effects = tick_effects(session.battle.player_effects)
-    session.battle.monster_effects = tick_effects(session.battle.monster_effects)
-    session.battle.round_count += 1
-    session.battle.is_player_turn = True
-
-    save_session(request, session)
-    return RedirectResponse("/battle", status_code=303)
-
-
-@router.post("/defend")
-async def player_defend(request: Request, session=Depends(require_battle)):
-    """Player takes a defensive stance."""
-    if not session.battle.is_player_turn:
-        return RedirectResponse("/battle", status_code=303)
 
+def player_defend_turn(session) -> int:
+    """The player takes a defensive stance. Returns the AC bonus, which lasts until the end of the round."""
     char = session.character
-
-    # Gain AC bonus
     ac_bonus = Dice.roll_d4()
     char.armor_class += ac_bonus
     session.battle.battle_log.append(f"{char.name} takes a defensive stance (+{ac_bonus} AC)!")
+    return ac_bonus
 
-    # Monster's turn
-    session.battle.is_player_turn = False
-    execute_monster_turn(session)
-
-    # Check for defeat
-    if char.current_hit_points <= 0:
-        return await end_battle(request, session, player_won=False)
-
-    # Reset AC bonus, tick effects, advance round
-    char.armor_class -= ac_bonus
-    session.battle.monster.reset_ac()
-    session.battle.player_effects = tick_effects(session.battle.player_effects)
-    session.battle.monster_effects = tick_effects(session.battle.monster_effects)
-    session.battle.round_count += 1
-    session.battle.is_player_turn = True
-
-    save_session(request, session)
-    return RedirectResponse("/battle", status_code=303)
-
-
-@router.post("/item")
-async def use_item(request: Request, item_index: int = Form(...), session=Depends(require_battle)):
-    """Use an item during battle."""
-    if not session.battle.is_player_turn:
-        return RedirectResponse("/battle", status_code=303)
 
+def use_item_turn(session, item_index: int):
+    """The player uses an inventory item (only healing potions do anything)."""
     char = session.character
 
     if 0 <= item_index < len(char.inventory):
@@ -316,142 +264,151 @@ async def use_item(request: Request, item_index: int = Form(...), session=Depend
                 char.inventory.pop(item_index)
                 session.battle.battle_log.append(f"{char.name} uses {item.name} and heals for {actual_heal} HP!")
 
+
+def play_action(session, action: str):
+    """Play one player action (ATTACK, DEFEND, ITEM or ABILITY, see above)
+    and, unless it wins the battle, the monster's turn and the end of the
+    round. Rolls from the current dice stream. Returns True if the player
+    won, False if they lost and None if the battle goes on."""
+    kind, _, argument = action.partition(":")
+    char = session.character
+    battle = session.battle
+    ac_bonus = 0
+
+    if kind == ATTACK:
+        player_attack_turn(session)
+    elif kind == DEFEND:
+        ac_bonus = player_defend_turn(session)
+    elif kind == ITEM:
+        use_item_turn(session, int(argument))
+    elif kind == ABILITY:
+        ability = ability_defs().get(argument)
+        if ability is None:
+            raise ValueError(f"Unknown ability in battle action: {action}")
+        resolve_ability(session, ability)
+    else:
+        raise ValueError(f"Unknown battle action: {action}")
+
+    # Check for victory
+    if kind in (ATTACK, ABILITY) and battle.monster_hp <= 0:
+        return True
+
     # Monster's turn
-    session.battle.is_player_turn = False
+    battle.is_player_turn = False
     execute_monster_turn(session)
 
     # Check for defeat
     if char.current_hit_points <= 0:
-        return await end_battle(request, session, player_won=False)
+        return False
 
-    # Advance round, tick effects
-    session.battle.monster.reset_ac()
-    session.battle.player_effects = tick_effects(session.battle.player_effects)
-    session.battle.monster_effects = tick_effects(session.battle.monster_effects)
-    session.battle.round_count += 1
-    session.battle.is_player_turn = True
+    # Reset AC bonuses (abilities leave the monster's stance up), tick effects, advance round
+    char.armor_class -= ac_bonus
+    if kind != ABILITY:
+        battle.monster.reset_ac()
+    battle.player_effects = tick_effects(battle.player_effects)
+    battle.monster_effects = tick_effects(battle.monster_effects)
+    battle.round_count += 1
+    battle.is_player_turn = True
+    return None
+
+
+def play_recorded_action(session, action: str):
+    """Add a player action to the battle's replay record and play it with the
+    dice stream of its turn. Returns as play_action()."""
+    battle = session.battle
+    battle.actions.append(action)
+    with use_stream(turn_stream(battle.seed, len(battle.actions))):
+        return play_action(session, action)
+
+
+async def take_action(request: Request, session, action: str):
+    """Play a player action from a battle route; end the battle if it is decided."""
+    rebuilt_character(session)
+    won = play_recorded_action(session, action)
+    if won is not None:
+        return await end_battle(request, session, player_won=won)
 
-    save_session(request, session)
+    await save_session(request, session)
     return RedirectResponse("/battle", status_code=303)
 
 
-def resolve_ability(session, ability, ability_id):
-    """Resolve an ability use. Returns True if the ability was successfully used."""
+@router.post("/attack")
+async def player_attack(request: Request, session=Depends(require_battle)):
+    """Player attacks the monster."""
+    if not session.battle.is_player_turn:
+        return RedirectResponse("/battle", status_code=303)
+    return await take_action(request, session, ATTACK)
+
+
+@router.post("/defend")
+async def player_defend(request: Request, session=Depends(require_battle)):
+    """Player takes a defensive stance."""
+    if not session.battle.is_player_turn:
+        return RedirectResponse("/battle", status_code=303)
+    return await take_action(request, session, DEFEND)
+
+
+@router.post("/item")
+async def use_item(request: Request, item_index: int = Form(...), session=Depends(require_battle)):
+    """Use an item during battle."""
+    if not session.battle.is_player_turn:
+        return RedirectResponse("/battle", status_code=303)
+    return await take_action(request, session, f"{ITEM}:{item_index}")
+
+
+def resolve_ability(session, ability):
+    """Resolve an ability use (an AbilityDef). Returns True if the ability was successfully used."""
     char = session.character
     battle = session.battle
-    primary_mod = get_primary_modifier(char)
 
     # Check PP
-    if char.power_points < ability["cost"]:
+    if char.power_points < ability.cost:
         return False
 
     # Spend PP
-    char.power_points -= ability["cost"]
-
-    attack_method = ability["attack_method"]
-    target = ability["target"]
-
-    # Determine if attack hits (for damage abilities targeting enemies)
-    hit = True
-    if target == "enemy" and attack_method in ("melee_attack", "spell_attack"):
-        attack_bonus = get_effect_bonus(battle.player_effects, "attack_bonus")
-        attack_roll = Dice.roll_d20() + primary_mod + char.proficiency_bonus + attack_bonus
-        effective_ac = battle.monster_ac + get_effect_bonus(battle.monster_effects, "ac")
-        if attack_roll >= effective_ac:
-            battle.battle_log.append(f"{char.name} uses {ability['name']}! (Roll: {attack_roll} vs AC {effective_ac}) Hit!")
-        else:
-            battle.battle_log.append(f"{char.name} uses {ability['name']}! (Roll: {attack_roll} vs AC {effective_ac}) Miss!")
-            hit = False
-
-    elif target == "enemy" and attack_method == "spell_save":
-        spell_dc = 8 + primary_mod + char.proficiency_bonus
-        save_ability = ability.get("save_ability", "Dexterity").lower()
-        save_mod = getattr(battle, f"monster_{save_ability[:3]}_modifier", 0)
-        save_roll = Dice.roll_d20() + save_mod
-        if save_roll >= spell_dc:
-            battle.battle_log.append(f"{char.name} casts {ability['name']}! ({battle.monster_name} saves: {save_roll} vs DC {spell_dc}) Half damage!")
-            hit = False  # save = half damage, we handle below
+    char.power_points -= ability.cost
+
+    target = ability.target
+    result = roll_ability(ability, get_primary_modifier(char), char.proficiency_bonus, char.level,
+                          battle.monster, battle.player_effects)
+
+    if result["attack_roll"] is not None:
+        outcome = "Hit!" if result["hit"] else "Miss!"
+        battle.battle_log.append(f"{char.name} uses {ability.name}! (Roll: {result['attack_roll']} vs AC {result['target_ac']}) {outcome}")
+
+    elif result["save_roll"] is not None:
+        if result["saved"]:
+            battle.battle_log.append(f"{char.name} casts {ability.name}! ({battle.monster_name} saves: {result['save_roll']} vs DC {result['spell_dc']}) Half damage!")
         else:
-            battle.battle_log.append(f"{char.name} casts {ability['name']}! ({battle.monster_name} fails save: {save_roll} vs DC {spell_dc})")
-
-    elif target == "self":
-        battle.battle_log.append(f"{char.name} uses {ability['name']}!")
-
-    elif attack_method == "auto_hit":
-        battle.battle_log.append(f"{char.name} uses {ability['name']}!")
-
-    # Apply damage
-    if ability.get("damage") and target == "enemy":
-        dmg_data = ability["damage"]
-        dice_count = dmg_data["dice_count"]
-
-        # Apply scaling for cantrips
-        if ability.get("scaling"):
-            for level_str in sorted(ability["scaling"].keys(), key=int, reverse=True):
-                if char.level >= int(level_str):
-                    dice_count = ability["scaling"][level_str].get("dice_count", dice_count)
-                    break
-
-        damage = 0
-        for _ in range(dice_count):
-            damage += Dice.roll(dmg_data["dice_size"])
-
-        # Add bonus
-        bonus = dmg_data.get("bonus", 0)
-        if bonus == "ability_modifier":
-            damage += primary_mod
-        elif bonus == "level":
-            damage += char.level
-        elif isinstance(bonus, int):
-            damage += bonus
-
-        damage = max(1, damage)
-        damage_bonus = get_effect_bonus(battle.player_effects, "damage_bonus")
-        damage += damage_bonus
-
-        # Spell save = half damage on successful save
-        if attack_method == "spell_save" and not hit:
-            damage = max(1, damage // 2)
-            hit = True  # still apply the (halved) damage
-
-        # Melee/spell attack miss = no damage
-        if hit:
-            dr = get_effect_bonus(battle.monster_effects, "damage_reduction")
-            damage = max(1, damage - dr)
-            battle.monster_hp = max(0, battle.monster_hp - damage)
-            battle.battle_log.append(f"  {ability['name']} deals {damage} {dmg_data.get('type', '')} damage!")
+            battle.battle_log.append(f"{char.name} casts {ability.name}! ({battle.monster_name} fails save: {result['save_roll']} vs DC {result['spell_dc']})")
+
+    elif target == "self" or ability.attack_method == "auto_hit":
+        battle.battle_log.append(f"{char.name} uses {ability.name}!")
+
+    # Apply damage (none on a missed attack roll)
+    if result["damage"]:
+        battle.monster_hp = max(0, battle.monster_hp - result["damage"])
+        battle.battle_log.append(f"  {ability.name} deals {result['damage']} {ability.damage.type} damage!")
 
     # Apply heal
-    if ability.get("heal"):
-        heal_data = ability["heal"]
-        heal = 0
-        for _ in range(heal_data["dice_count"]):
-            heal += Dice.roll(heal_data["dice_size"])
-        bonus = heal_data.get("bonus", 0)
-        if bonus == "ability_modifier":
-            heal += primary_mod
-        elif bonus == "level":
-            heal += char.level
-        elif isinstance(bonus, int):
-            heal += bonus
-        heal = max(1, heal)
+    if result["heal"]:
         old_hp = char.current_hit_points
-        char.current_hit_points = min(char.max_hit_points, char.current_hit_points + heal)
+        char.current_hit_points = min(char.max_hit_points, char.current_hit_points + result["heal"])
         actual_heal = char.current_hit_points - old_hp
         if actual_heal > 0:
             battle.battle_log.append(f"  {char.name} heals for {actual_heal} HP!")
 
     # Apply effects
-    for effect in ability.get("effects", []):
-        eff = {"stat": effect["stat"], "value": effect["value"],
-               "duration": effect["duration"], "source": ability["name"]}
+    for effect in ability.effects:
+        eff = {"stat": effect.stat, "value": effect.value,
+               "duration": effect.duration, "source": ability.name}
         if target == "enemy":
             battle.monster_effects.append(eff)
-            battle.battle_log.append(f"  {battle.monster_name}: {effect['stat'].replace('_', ' ')} {effect['value']:+d}")
+            battle.battle_log.append(f"  {battle.monster_name}: {effect.stat.replace('_', ' ')} {effect.value:+d}")
         else:
             battle.player_effects.append(eff)
-            if effect["value"] > 0:
-                battle.battle_log.append(f"  {char.name}: {effect['stat'].replace('_', ' ')} {effect['value']:+d}")
+            if effect.value > 0:
+                battle.battle_log.append(f"  {char.name}: {effect.stat.replace('_', ' ')} {effect.value:+d}")
 
     return True
 
@@ -462,42 +419,21 @@ async def use_ability(request: Request, ability_id: str = Form(...), session=Dep
     if not session.battle.is_player_turn:
         return RedirectResponse("/battle", status_code=303)
 
-    abilities = get_abilities()
-    ability = abilities.get(ability_id)
+    ability = ability_defs().get(ability_id)
 
     if not ability:
         return RedirectResponse("/battle", status_code=303)
 
-    # Verify class can use this ability and level is sufficient
-    char = session.character
-    if char.class_name not in ability.get("classes", []):
+    # Verify class can use this ability, level is sufficient and PP cover its cost
+    char = rebuilt_character(session)
+    if char.class_name not in ability.classes:
         return RedirectResponse("/battle", status_code=303)
-    if char.level < ability.get("unlock_level", 1):
+    if char.level < ability.unlock_level:
         return RedirectResponse("/battle", status_code=303)
-
-    if not resolve_ability(session, ability, ability_id):
+    if char.power_points < ability.cost:
         return RedirectResponse("/battle", status_code=303)
 
-    # Check for victory
-    if session.battle.monster_hp <= 0:
-        return await end_battle(request, session, player_won=True)
-
-    # Monster's turn
-    session.battle.is_player_turn = False
-    execute_monster_turn(session)
-
-    # Check for defeat
-    if char.current_hit_points <= 0:
-        return await end_battle(request, session, player_won=False)
-
-    # Tick effect durations and advance round
-    session.battle.player_effects = tick_effects(session.battle.player_effects)
-    session.battle.monster_effects = tick_effects(session.battle.monster_effects)
-    session.battle.round_count += 1
-    session.battle.is_player_turn = True
-
-    save_session(request, session)
-    return RedirectResponse("/battle", status_code=303)
+    return await take_action(request, session, f"{ABILITY}:{ability.id}")
 
 
 async def end_battle(request: Request, session, player_won: bool):
@@ -513,8 +449,6 @@ async def end_battle(request: Request, session, player_won: bool):
         gold_reward = calculate_gold_reward(session.battle.monster_level)
 
         old_level = session.character.level
-        abilities_before = get_class_abilities(session.character.class_name, old_level)
-        abilities_before_ids = {a["id"] for a in abilities_before}
 
         # Apply XP (handles leveling automatically)
         level_ups = session.character.gain_xp(xp_reward)
@@ -532,8 +466,8 @@ async def end_battle(request: Request, session, player_won: bool):
             session.character.power_points = session.character.max_power_points
 
         # Find newly unlocked abilities
-        abilities_after = get_class_abilities(session.character.class_name, session.character.level)
-        new_abilities = [a["name"] for a in abilities_after if a["id"] not in abilities_before_ids]
+        new_abilities = [a["name"] for a in get_ability_index().unlocked_between(
+            session.character.class_name, old_level, session.character.level)]
 
         session.character.gold += gold_reward
         session.monster_kills += 1
@@ -552,9 +486,8 @@ async def end_battle(request: Request, session, player_won: bool):
                 session.character.add_item(loot["item"])
 
         # Quest progress tracking via engine
-        all_quests = get_quests()
         quest_updates = check_quest_progress(
-            session.active_quests, all_quests,
+            session.active_quests, quest_defs(),
             session.battle.monster_race, session.character.inventory)
 
         # Store rewards for display
@@ -575,7 +508,7 @@ async def end_battle(request: Request, session, player_won: bool):
         restock_shop(session)
         session.kills_at_last_restock = session.monster_kills
 
-    save_session(request, session)
+    await save_session(request, session)
 
     if player_won:
         return RedirectResponse("/battle/victory", status_code=303)
@@ -588,8 +521,8 @@ async def victory_screen(request: Request, session=Depends(require_character)):
     """Display victory screen with rewards."""
     rewards = session.battle_rewards or {}
     session.battle_rewards = None
-    save_session(request, session)
-    char_data = session._serialize_character() if session.character else None
+    await save_session(request, session)
+    char_data = session._serialize_character() if session.has_character else None
 
     return templates.TemplateResponse("battle/victory.html", {
         "request": request,
@@ -604,8 +537,8 @@ async def victory_screen(request: Request, session=Depends(require_character)):
 async def defeat_screen(request: Request, session=Depends(require_character)):
     """Display defeat screen."""
     session.battle_rewards = None
-    save_session(request, session)
-    char_data = session._serialize_character() if session.character else None
+    await save_session(request, session)
+    char_data = session._serialize_character() if session.has_character else None
 
     return templates.TemplateResponse("battle/defeat.html", {
         "request": request,
@@ -615,19 +548,37 @@ async def defeat_screen(request: Request, session=Depends(require_character)):
     })
 
 
+@router.get("/replay")
+async def battle_replay(session=Depends(require_character)):
+    """Re-fight the current or last battle from its replay record, as JSON
+    with the full log. matches tells whether the replay ends where the
+    session's battle stands."""
+    from web.replay import battle_record, replay_battle
+
+    record = battle_record(session.battle)
+    if record is None:
+        return JSONResponse({"error": "No replayable battle"}, status_code=404)
+    replay = replay_battle(record)
+    battle = session.battle
+    matches = (replay["log"][-10:] == battle.battle_log[-10:] and replay["rounds"] == battle.round_count
+               and replay["monster_hp"] == battle.monster_hp)
+    return {"seed": record["seed"], "actions": record["actions"], **replay, "matches": matches}
+
+
 @router.get("/status")
 async def battle_status(request: Request):
     """Get current battle status as JSON."""
-    session = get_session(request)
+    session = await load_session(request)
 
     if not session.battle.is_active:
         return {"active": False}
 
+    player = session.character_summary()
     return {
         "active": True,
         "player": {
-            "current_hp": session.character.current_hit_points,
-            "max_hp": session.character.max_hit_points
+            "current_hp": player.current_hit_points,
+            "max_hp": player.max_hit_points
         },
         "monster": {
             "current_hp": session.battle.monster_hp,
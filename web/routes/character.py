@@ -2,15 +2,14 @@ import sys
 from pathlib import Path
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
 # Add parent directories to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from web.game_session import (
-    get_session, save_session, get_races, get_classes,
-    get_all_weapons_flat, get_all_armors_flat, get_campaign
-)
+from web.game_session import load_session, save_session, get_races, get_classes
+from web.campaign import get_campaign_index
+from web.eligibility import get_eligibility
+from web.templating import templates
 from characterFactory import CharacterFactory
 from weaponFactory import WeaponFactory
 from armorFactory import ArmorFactory
@@ -18,14 +17,13 @@ from items import HealingPotion
 from character import WeaponSlot
 
 router = APIRouter()
-templates = Jinja2Templates(directory=Path(__file__).parent.parent / "templates")
 
 
 @router.get("/new", response_class=HTMLResponse)
 async def new_character(request: Request):
     """Start character creation - show race selection."""
     # Reset character creation state
-    session = get_session(request)
+    session = await load_session(request)
     session.character_creation.race = None
     session.character_creation.class_name = None
     session.character_creation.name = None
@@ -33,7 +31,7 @@ async def new_character(request: Request):
     session.character_creation.armor = None
     session.character_creation.skills = []
     session.character = None
-    save_session(request, session)
+    await save_session(request, session)
 
     races = get_races()
 
@@ -61,14 +59,14 @@ async def new_character(request: Request):
 @router.post("/race")
 async def select_race(request: Request, race: str = Form(...)):
     """Process race selection."""
-    session = get_session(request)
+    session = await load_session(request)
     races = get_races()
 
     if race not in races:
         return RedirectResponse("/character/new", status_code=303)
 
     session.character_creation.race = race
-    save_session(request, session)
+    await save_session(request, session)
 
     return RedirectResponse("/character/class", status_code=303)
 
@@ -76,7 +74,7 @@ async def select_race(request: Request, race: str = Form(...)):
 @router.get("/class", response_class=HTMLResponse)
 async def select_class_page(request: Request):
     """Show class selection page."""
-    session = get_session(request)
+    session = await load_session(request)
 
     if not session.character_creation.race:
         return RedirectResponse("/character/new", status_code=303)
@@ -107,14 +105,14 @@ async def select_class_page(request: Request):
 @router.post("/class")
 async def select_class(request: Request, class_name: str = Form(...)):
     """Process class selection."""
-    session = get_session(request)
+    session = await load_session(request)
     classes = get_classes()
 
     if class_name not in classes:
         return RedirectResponse("/character/class", status_code=303)
 
     session.character_creation.class_name = class_name
-    save_session(request, session)
+    await save_session(request, session)
 
     return RedirectResponse("/character/details", status_code=303)
 
@@ -122,54 +120,14 @@ async def select_class(request: Request, class_name: str = Form(...)):
 @router.get("/details", response_class=HTMLResponse)
 async def details_page(request: Request):
     """Show name and weapon selection page."""
-    session = get_session(request)
+    session = await load_session(request)
 
     if not session.character_creation.race or not session.character_creation.class_name:
         return RedirectResponse("/character/new", status_code=303)
 
-    classes = get_classes()
-    class_props = classes[session.character_creation.class_name]
-
-    # Get available weapons based on class proficiencies
-    all_weapons = get_all_weapons_flat()
-    available_weapons = []
-
-    weapon_proficiencies = class_props["weapon_proficiencies"]
-
-    for weapon_name, weapon_data in all_weapons.items():
-        # Check if class can use this weapon
-        can_use = False
-        if "Simple" in weapon_proficiencies and weapon_data["category"] == "Simple":
-            can_use = True
-        elif "Martial" in weapon_proficiencies and weapon_data["category"] == "Martial":
-            can_use = True
-        elif weapon_name in weapon_proficiencies:
-            can_use = True
-
-        if can_use:
-            available_weapons.append({
-                "name": weapon_name,
-                "damage_die": weapon_data["damage_die"],
-                "damage_type": weapon_data["damage_type"],
-                "category": weapon_data["category"],
-                "properties": ", ".join(weapon_data.get("properties", [])) or "None",
-                "description": weapon_data.get("description", "")
-            })
-
-    # Get available armors based on class armor training
-    all_armors = get_all_armors_flat()
-    armor_training = class_props["armor_training"]
-    available_armors = []
-
-    for armor_name, armor_data in all_armors.items():
-        if armor_data["category"] in armor_training:
-            available_armors.append({
-                "name": armor_name,
-                "base_ac": armor_data["base_ac"],
-                "category": armor_data["category"],
-                "weight": armor_data["weight"],
-                "stealth_disadvantage": armor_data["stealth_disadvantage"],
-            })
+    class_name = session.character_creation.class_name
+    class_props = get_classes()[class_name]
+    eligibility = get_eligibility()
 
     # Get skill choices for this class
     skill_choices = class_props["skill_proficiency_choices"]
@@ -180,8 +138,8 @@ async def details_page(request: Request):
         "title": "Character Details",
         "race": session.character_creation.race,
         "class_name": session.character_creation.class_name,
-        "weapons": available_weapons,
-        "armors": available_armors,
+        "weapons": eligibility.weapon_options(class_name),
+        "armors": eligibility.armor_options(class_name),
         "skill_choices": skill_choices,
         "num_skills": num_skills
     })
@@ -197,7 +155,7 @@ async def create_character(
     skills: list = Form(default=[])
 ):
     """Finalize character creation."""
-    session = get_session(request)
+    session = await load_session(request)
 
     if not session.character_creation.race or not session.character_creation.class_name:
         return RedirectResponse("/character/new", status_code=303)
@@ -210,16 +168,18 @@ async def create_character(
         class_name=session.character_creation.class_name
     )
 
-    # Equip weapon
-    weapon_factory = WeaponFactory()
-    try:
-        weapon_obj = weapon_factory.get_weapon_by_name(weapon)
-        character.equip_weapon(weapon_obj, WeaponSlot.MAIN_HAND)
-    except ValueError:
-        pass  # Invalid weapon, skip
+    # Equip weapon and armor, if the class can use them
+    eligibility = get_eligibility()
+    class_name = session.character_creation.class_name
+    if eligibility.can_use_weapon(class_name, weapon):
+        weapon_factory = WeaponFactory()
+        try:
+            weapon_obj = weapon_factory.get_weapon_by_name(weapon)
+            character.equip_weapon(weapon_obj, WeaponSlot.MAIN_HAND)
+        except ValueError:
+            pass  # Invalid weapon, skip
 
-    # Equip armor
-    if armor:
+    if armor and eligibility.can_use_armor(class_name, armor):
         armor_factory = ArmorFactory()
         try:
             armor_obj = armor_factory.get_armor_by_name(armor)
@@ -253,13 +213,12 @@ async def create_character(
     session.character_creation.skills = skills
 
     # Initialize campaign
-    campaign = get_campaign()
-    session.act = campaign["acts"][0]
+    campaign = get_campaign_index()
+    session.act = campaign.first_act
     session.current_location = session.act["locations"][0]
-    if session.current_location.get("areas"):
-        session.current_area = session.current_location["areas"][0]
+    session.current_area = campaign.entry_area(session.current_location)
 
-    save_session(request, session)
+    await save_session(request, session)
 
     return RedirectResponse("/character/summary", status_code=303)
 
@@ -267,9 +226,9 @@ async def create_character(
 @router.get("/summary", response_class=HTMLResponse)
 async def character_summary(request: Request):
     """Display created character summary."""
-    session = get_session(request)
+    session = await load_session(request)
 
-    if not session.character:
+    if not session.has_character:
         return RedirectResponse("/character/new", status_code=303)
 
     char_data = session._serialize_character()
@@ -3,16 +3,16 @@ import random
 from pathlib import Path
 from fastapi import APIRouter, Request, Form, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
 # Add parent directories to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from web.game_session import get_session, save_session, get_campaign
-from web.dependencies import require_character
+from web.game_session import load_session, save_session
+from web.campaign import get_campaign_index
+from web.dependencies import rebuilt_character, require_character
+from web.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory=Path(__file__).parent.parent / "templates")
 
 
 @router.get("/", response_class=HTMLResponse)
@@ -29,12 +29,8 @@ async def game_view(request: Request, session=Depends(require_character)):
 
     # Get connected areas
     connected_areas = []
-    if area and "connections" in area:
-        for conn_id in area["connections"]:
-            for a in location.get("areas", []):
-                if a["id"] == conn_id:
-                    connected_areas.append(a)
-                    break
+    if area:
+        connected_areas = get_campaign_index().neighbors(session.act["number"], location["name"], area["id"])
 
     # Check if shop is available (special can be a string like "shop_location")
     special = area.get("special", "") if area else ""
@@ -64,12 +60,11 @@ async def move_to_area(request: Request, area_id: str = Form(...), session=Depen
     current_area = session.current_area
 
     # Verify the area is connected
-    if current_area and area_id in current_area.get("connections", []):
-        for area in location.get("areas", []):
-            if area["id"] == area_id:
-                session.current_area = area
-                save_session(request, session)
-                break
+    if current_area:
+        area = get_campaign_index().neighbor(session.act["number"], location["name"], current_area["id"], area_id)
+        if area:
+            session.current_area = area
+            await save_session(request, session)
 
     return RedirectResponse("/game", status_code=303)
 
@@ -90,7 +85,7 @@ async def explore_area(request: Request, session=Depends(require_character)):
         return RedirectResponse("/battle/start", status_code=303)
 
     # No encounter - just update session with exploration result
-    save_session(request, session)
+    await save_session(request, session)
     return RedirectResponse("/game?explored=true", status_code=303)
 
 
@@ -105,10 +100,11 @@ async def rest(request: Request, session=Depends(require_character)):
         return RedirectResponse("/game", status_code=303)
 
     # Restore HP and PP
-    session.character.current_hit_points = session.character.max_hit_points
-    session.character.power_points = session.character.max_power_points
-    session.character.active_effects = []
-    save_session(request, session)
+    character = rebuilt_character(session)
+    character.current_hit_points = character.max_hit_points
+    character.power_points = character.max_power_points
+    character.active_effects = []
+    await save_session(request, session)
 
     return RedirectResponse("/game?rested=true", status_code=303)
 
@@ -120,8 +116,8 @@ async def travel_menu(request: Request, session=Depends(require_character)):
     act = session.act
     current_location = session.current_location
 
-    # Filter out current location (use name as identifier since locations don't have id)
-    available_locations = [loc for loc in act["locations"] if loc["name"] != current_location["name"]]
+    # Other locations of the act (locations are identified by name; they have no id)
+    available_locations = get_campaign_index().other_locations(act["number"], current_location["name"])
 
     char_data = session._serialize_character()
 
@@ -139,19 +135,13 @@ async def travel_menu(request: Request, session=Depends(require_character)):
 async def travel_to_location(request: Request, location_name: str = Form(...), session=Depends(require_character)):
     """Travel to a different location."""
 
-    act = session.act
-
-    # Find the target location by name
-    for location in act["locations"]:
-        if location["name"] == location_name:
-            session.current_location = location
-            # Set to first area of new location
-            if location.get("areas"):
-                session.current_area = location["areas"][0]
-            else:
-                session.current_area = None
-            save_session(request, session)
-            break
+    campaign = get_campaign_index()
+    location = campaign.location(session.act["number"], location_name)
+    if location:
+        session.current_location = location
+        # Set to first area of new location
+        session.current_area = campaign.entry_area(location)
+        await save_session(request, session)
 
     return RedirectResponse("/game", status_code=303)
 
@@ -159,16 +149,16 @@ async def travel_to_location(request: Request, location_name: str = Form(...), s
 @router.get("/status")
 async def game_status(request: Request):
     """Get current game status as JSON."""
-    session = get_session(request)
+    session = await load_session(request)
 
-    if not session.character:
+    if not session.has_character:
         return {"error": "No character"}
 
-    char_data = session._serialize_character()
+    summary = session.character_summary()
 
     return {
-        "character": char_data,
-        "location": session.current_location.get("name") if session.current_location else None,
-        "area": session.current_area.get("name") if session.current_area else None,
+        "character": session._serialize_character(),
+        "location": summary.location,
+        "area": summary.area,
         "in_battle": session.battle.is_active
     }
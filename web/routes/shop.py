@@ -3,21 +3,21 @@ import random
 from pathlib import Path
 from fastapi import APIRouter, Request, Form, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
 # Add parent directories to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from web.game_session import get_session, save_session, get_all_weapons_flat, get_all_armors_flat, get_quests, get_shopkeeper, get_default_shop_inventory
-from web.dependencies import require_character
+from web.game_session import load_session, save_session, get_quests, get_shopkeeper, get_default_shop_inventory
+from web.dependencies import rebuilt_character, require_character
+from web.templating import templates
 from items import HealingPotion, QuestItem
 from weapon import Weapon
 from armor import Armor
 from skills import make_skill_check
 from engine.quests import turn_in_quest as engine_turn_in_quest
+from records import quest_defs, weapon_defs, armor_defs
 
 router = APIRouter()
-templates = Jinja2Templates(directory=Path(__file__).parent.parent / "templates")
 
 def get_shopkeeper_dialog(context: str, character_gold: int = 0) -> str:
     """Get a context-appropriate shopkeeper dialog line."""
@@ -75,6 +75,7 @@ async def shop_view(request: Request, session=Depends(require_character)):
     if not area or not has_shop:
         return RedirectResponse("/game", status_code=303)
 
+    character = rebuilt_character(session)   # before serializing, so both show the same items
     char_data = session._serialize_character()
     inventory = get_shop_inventory(session)
     haggle_state = session.haggled_items
@@ -95,7 +96,7 @@ async def shop_view(request: Request, session=Depends(require_character)):
 
     # Get player's sellable items (exclude quest items)
     sellable_items = []
-    for i, item in enumerate(session.character.inventory):
+    for i, item in enumerate(character.inventory):
         if isinstance(item, QuestItem):
             continue
         sell_price = calculate_sell_price(item, inventory)
@@ -155,7 +156,7 @@ async def shop_view(request: Request, session=Depends(require_character)):
     dialog = get_shopkeeper_dialog(dialog_context, session.character.gold)
 
     # Save to persist flash pops and haggle_result clear
-    save_session(request, session)
+    await save_session(request, session)
 
     return templates.TemplateResponse("shop/index.html", {
         "request": request,
@@ -185,14 +186,14 @@ def calculate_sell_price(item, shop_inventory):
         return max(1, item.healing_amount // 2)
 
     if isinstance(item, Weapon):
-        all_weapons = get_all_weapons_flat()
-        if item.name in all_weapons:
-            return max(1, int(all_weapons[item.name].get("cost_gp", 1)) // 2)
+        weapon = weapon_defs().get(item.name)
+        if weapon:
+            return max(1, int(weapon.cost_gp) // 2)
 
     if isinstance(item, Armor):
-        all_armors = get_all_armors_flat()
-        if item.name in all_armors:
-            return max(1, int(all_armors[item.name].get("cost_gp", 1)) // 2)
+        armor = armor_defs().get(item.name)
+        if armor:
+            return max(1, int(armor.cost_gp) // 2)
 
     return 1
 
@@ -201,6 +202,7 @@ def calculate_sell_price(item, shop_inventory):
 async def buy_item(request: Request, item_index: int = Form(...), session=Depends(require_character)):
     """Purchase an item from the shop."""
 
+    character = rebuilt_character(session)
     inventory = get_shop_inventory(session)
 
     if 0 <= item_index < len(inventory):
@@ -209,26 +211,26 @@ async def buy_item(request: Request, item_index: int = Form(...), session=Depend
 
         if item["quantity"] <= 0:
             session.set_flash("shop_error", f"{item['name']} is out of stock!")
-            save_session(request, session)
+            await save_session(request, session)
             return RedirectResponse("/shop", status_code=303)
 
-        if session.character.gold < effective_price:
+        if character.gold < effective_price:
             session.set_flash("shop_error", f"Not enough gold! You need {effective_price} gold.")
-            save_session(request, session)
+            await save_session(request, session)
             return RedirectResponse("/shop", status_code=303)
 
-        session.character.gold -= effective_price
+        character.gold -= effective_price
         item["quantity"] -= 1
 
         new_item = HealingPotion(item["name"], item["healing"])
-        session.character.add_item(new_item)
+        character.add_item(new_item)
 
         session.set_flash("shop_message", f"Purchased {item['name']} for {effective_price} gold!")
         session.set_flash("shop_dialog_context", "buy")
-        save_session(request, session)
+        await save_session(request, session)
     else:
         session.set_flash("shop_error", "Invalid item selection.")
-        save_session(request, session)
+        await save_session(request, session)
 
     return RedirectResponse("/shop", status_code=303)
 
@@ -237,22 +239,23 @@ async def buy_item(request: Request, item_index: int = Form(...), session=Depend
 async def sell_item(request: Request, item_index: int = Form(...), session=Depends(require_character)):
     """Sell an item to the shop."""
 
-    if 0 <= item_index < len(session.character.inventory):
-        item = session.character.inventory[item_index]
+    character = rebuilt_character(session)
+    if 0 <= item_index < len(character.inventory):
+        item = character.inventory[item_index]
         inventory = get_shop_inventory(session)
 
         sell_price = calculate_sell_price(item, inventory)
 
-        session.character.gold += sell_price
+        character.gold += sell_price
         item_name = item.name
-        session.character.inventory.pop(item_index)
+        character.inventory.pop(item_index)
 
         session.set_flash("shop_message", f"Sold {item_name} for {sell_price} gold!")
         session.set_flash("shop_dialog_context", "sell")
-        save_session(request, session)
+        await save_session(request, session)
     else:
         session.set_flash("shop_error", "Invalid item selection.")
-        save_session(request, session)
+        await save_session(request, session)
 
     return RedirectResponse("/shop", status_code=303)
 
@@ -266,19 +269,19 @@ async def haggle_item(request: Request, item_index: int = Form(...), session=Dep
 
     if not (0 <= item_index < len(inventory)):
         session.set_flash("shop_error", "Invalid item selection.")
-        save_session(request, session)
+        await save_session(request, session)
         return RedirectResponse("/shop", status_code=303)
 
     key = str(item_index)
     if key in haggle_state:
         session.set_flash("shop_error", "You've already haggled over this item!")
         session.set_flash("shop_dialog_context", "browse")
-        save_session(request, session)
+        await save_session(request, session)
         return RedirectResponse("/shop", status_code=303)
 
     item = inventory[item_index]
 
-    result = make_skill_check(session.character, "Persuasion", difficulty_class=10)
+    result = make_skill_check(rebuilt_character(session), "Persuasion", difficulty_class=10)
     roll = result["roll"]
     total = result["total"]
     modifier = result["modifier"]
@@ -323,7 +326,7 @@ async def haggle_item(request: Request, item_index: int = Form(...), session=Dep
         "new_price": effective_price,
     }
     session.set_flash("shop_dialog_context", dialog_key)
-    save_session(request, session)
+    await save_session(request, session)
 
     return RedirectResponse("/shop", status_code=303)
 
@@ -337,24 +340,24 @@ async def accept_quest(request: Request, quest_id: str = Form(...), session=Depe
 
     if not quest_def:
         session.set_flash("shop_error", "Unknown quest.")
-        save_session(request, session)
+        await save_session(request, session)
         return RedirectResponse("/shop?tab=quests", status_code=303)
 
     if len(session.active_quests) >= 3:
         session.set_flash("shop_error", "You can only have 3 active quests!")
         session.set_flash("shop_dialog_context", "quest_full")
-        save_session(request, session)
+        await save_session(request, session)
         return RedirectResponse("/shop?tab=quests", status_code=303)
 
     if quest_id in session.active_quests or quest_id in session.completed_quests:
         session.set_flash("shop_error", "Quest already accepted or completed.")
-        save_session(request, session)
+        await save_session(request, session)
         return RedirectResponse("/shop?tab=quests", status_code=303)
 
     session.active_quests[quest_id] = {"progress": 0, "status": "active"}
     session.set_flash("shop_message", f"Quest accepted: {quest_def['name']}")
     session.set_flash("shop_dialog_context", "quest_accept")
-    save_session(request, session)
+    await save_session(request, session)
 
     return RedirectResponse("/shop?tab=quests", status_code=303)
 
@@ -363,21 +366,19 @@ async def accept_quest(request: Request, quest_id: str = Form(...), session=Depe
 async def turn_in_quest_route(request: Request, quest_id: str = Form(...), session=Depends(require_character)):
     """Turn in a completed quest for rewards."""
 
-    all_quests = get_quests()
-
     result = engine_turn_in_quest(
         quest_id, session.active_quests, session.completed_quests,
-        all_quests, session.character)
+        quest_defs(), rebuilt_character(session))
 
     if not result:
         session.set_flash("shop_error", "Quest not ready for turn-in.")
-        save_session(request, session)
+        await save_session(request, session)
         return RedirectResponse("/shop?tab=quests", status_code=303)
 
     session.set_flash("shop_message",
         f"Quest complete: {result['quest_name']}! +{result['gold']} gold, +{result['xp']} XP")
     session.set_flash("shop_dialog_context", "quest_complete")
-    save_session(request, session)
+    await save_session(request, session)
 
     return RedirectResponse("/shop?tab=quests", status_code=303)
 
@@ -391,12 +392,13 @@ async def abandon_quest(request: Request, quest_id: str = Form(...), session=Dep
 
     if quest_id not in session.active_quests:
         session.set_flash("shop_error", "Quest not found in your active quests.")
-        save_session(request, session)
+        await save_session(request, session)
         return RedirectResponse("/shop?tab=quests", status_code=303)
 
     if quest_def and quest_def["type"] == "gather":
-        session.character.inventory = [
-            item for item in session.character.inventory
+        character = rebuilt_character(session)
+        character.inventory = [
+            item for item in character.inventory
             if not (isinstance(item, QuestItem) and item.quest_id == quest_id)
         ]
 
@@ -405,6 +407,6 @@ async def abandon_quest(request: Request, quest_id: str = Form(...), session=Dep
     quest_name = quest_def["name"] if quest_def else "Unknown"
     session.set_flash("shop_message", f"Quest abandoned: {quest_name}")
     session.set_flash("shop_dialog_context", "quest_abandon")
-    save_session(request, session)
+    await save_session(request, session)
 
     return RedirectResponse("/shop?tab=quests", status_code=303)
@@ -0,0 +1,179 @@
+"""In-process LRU cache of live GameSession objects with write-behind flushing.
+
+When enabled (AIVENTURES_SESSION_CACHE_SIZE > 0), load_session() serves hot
+sessions straight from memory and save_session() only marks them dirty. Dirty
+sessions are written to the session store by a background task every
+AIVENTURES_SESSION_FLUSH_INTERVAL seconds, when they are evicted, and on
+shutdown.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web.settings import get_settings
+from web.session_store import StaleSessionError, get_store, run_store_io
+from web.session_journal import write_session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    session: "GameSession"
+    last_access: float
+    dirty: bool = False
+
+
+class SessionCache:
+    """Bounded LRU of GameSession objects keyed by session id."""
+
+    def __init__(self, store, max_size: int, idle_seconds: float = 900.0):
+        self.store = store
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self._entries = OrderedDict()   # session_id -> _Entry, least recently used first
+        self._pending = {}              # evicted but not yet flushed: session_id -> GameSession
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "flushes": 0, "conflicts": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._entries or session_id in self._pending
+
+    def get(self, session_id: str):
+        """Return the cached session, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                session = self._pending.pop(session_id, None)
+                if session is None:
+                    self.stats["misses"] += 1
+                    return None
+                # Evicted while dirty and not flushed yet: take it back.
+                entry = _Entry(session, time.monotonic(), dirty=True)
+                self._entries[session_id] = entry
+            self._entries.move_to_end(session_id)
+            entry.last_access = time.monotonic()
+            self.stats["hits"] += 1
+            return entry.session
+
+    def put(self, session, dirty: bool = False):
+        """Cache a session. dirty=True schedules it for the next flush."""
+        with self._lock:
+            entry = self._entries.get(session.session_id)
+            if entry is None:
+                entry = _Entry(session, time.monotonic(), dirty)
+                self._entries[session.session_id] = entry
+            else:
+                entry.session = session
+                entry.last_access = time.monotonic()
+                entry.dirty = entry.dirty or dirty
+            self._entries.move_to_end(session.session_id)
+            self._pending.pop(session.session_id, None)
+            while len(self._entries) > self.max_size:
+                self._evict_oldest()
+
+    def discard(self, session_id: str):
+        """Drop a session from the cache without flushing it."""
+        with self._lock:
+            self._entries.pop(session_id, None)
+            self._pending.pop(session_id, None)
+
+    def _evict_oldest(self):
+        session_id, entry = self._entries.popitem(last=False)
+        self.stats["evictions"] += 1
+        if entry.dirty:
+            self._pending[session_id] = entry.session
+
+    def evict_idle(self):
+        """Evict every session not accessed within idle_seconds."""
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            while self._entries:
+                session_id, entry = next(iter(self._entries.items()))
+                if entry.last_access > cutoff:
+                    break
+                self._evict_oldest()
+
+    def _take_dirty(self) -> list:
+        """Serialize and clear every dirty session.
+
+        Sessions whose content is unchanged since their last save are skipped.
+        Returns [(session, data, state), ...].
+        """
+        with self._lock:
+            sessions = list(self._pending.values())
+            self._pending.clear()
+            for entry in self._entries.values():
+                if entry.dirty:
+                    sessions.append(entry.session)
+                    entry.dirty = False
+        batch = []
+        for session in sessions:
+            snapshot = session.dirty_snapshot()
+            if snapshot is not None:
+                batch.append((session, *snapshot))
+        return batch
+
+    def _write(self, batch: list):
+        written = 0
+        for session, data, state in batch:
+            try:
+                write_session(self.store, session.session_id, data, session.saved_data(), session.version)
+            except StaleSessionError as e:
+                # Another worker saved this session first: its write wins and our
+                # copy is dropped so the next request reloads the stored one.
+                logger.warning("Dropping stale cached session: %s", e)
+                self.discard(session.session_id)
+                with self._lock:
+                    self.stats["conflicts"] += 1
+                continue
+            session.mark_saved(state)
+            written += 1
+        if written:
+            with self._lock:
+                self.stats["flushes"] += written
+
+    def flush(self):
+        """Write every dirty session to the store synchronously."""
+        self._write(self._take_dirty())
+
+    async def run_flusher(self, interval: float):
+        """Background task: evict idle sessions and flush dirty ones every interval.
+
+        Sessions are serialized on the event loop (where handlers mutate them)
+        and written on the session I/O thread pool so disk I/O never blocks requests.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.evict_idle()
+                await run_store_io(self._write, self._take_dirty())
+            except Exception:
+                logger.exception("Session cache flush failed")
+
+
+_cache = None
+
+
+def get_cache() -> Optional[SessionCache]:
+    """Get the process-wide session cache, or None when caching is disabled."""
+    global _cache
+    settings = get_settings()
+    if _cache is None and settings.session_cache_size > 0:
+        _cache = SessionCache(get_store(), settings.session_cache_size,
+                              settings.session_cache_idle_seconds)
+    return _cache
@@ -0,0 +1,227 @@
+"""Session data schema versions, upgrades, and on-disk encodings.
+
+Every stored session carries a "schema" number. upgrade() brings data written
+under an older schema up to SCHEMA_VERSION by running the registered upgrade
+functions in order; add a new one with @upgrader(n) whenever the layout
+produced by GameSession.to_dict() changes incompatibly.
+
+Two encodings are available, selected with AIVENTURES_SESSION_FORMAT:
+
+- "binary" (default): a struct-packed header (magic, codec version, flags,
+  schema, then the session's version, which stored_version() reads without
+  decoding the rest) followed by a zlib-compressed marshal payload in which
+  dicts of a known shape are stored as tuples of their values, so key names
+  are not repeated in every session.
+- "json": plain JSON, for debugging and hand editing.
+
+decode() accepts either, so a store can switch formats without migrating.
+marshal is only safe for trusted data; sessions are written by this server.
+"""
+
+import json
+import marshal
+import struct
+import zlib
+from typing import Optional
+
+SCHEMA_VERSION = 2
+
+MAGIC = b"AIVS"
+CODEC_VERSION = 2
+HEADER = struct.Struct(">4sBBH")   # magic, codec version, flags, schema version
+VERSION = struct.Struct(">Q")      # session version, after the header (codec 2 on)
+FLAG_ZLIB = 1
+
+FORMATS = ("binary", "json")
+
+# Key layouts of the dicts GameSession.to_dict() produces. The position in
+# this tuple is the shape id stored in binary payloads: only ever append.
+# A dict whose keys (in order) match no shape is stored as a plain dict.
+_SHAPES = (
+    # 0: session (as written by write_session, with its version)
+    ("session_id", "character", "character_creation", "battle", "location_name", "area_id",
+     "act_num", "monster_kills", "kills_at_last_restock", "active_quests", "completed_quests",
+     "shop_inventory", "haggled_items", "haggle_result", "battle_rewards", "_flash", "schema",
+     "version"),
+    # 1: character
+    ("name", "race", "class_name", "level", "xp", "gold", "current_hit_points", "max_hit_points",
+     "armor_class", "strength_score", "strength_modifier", "dexterity_score", "dexterity_modifier",
+     "constitution_score", "constitution_modifier", "intelligence_score", "intelligence_modifier",
+     "wisdom_score", "wisdom_modifier", "charisma_score", "charisma_modifier", "weapon", "armor",
+     "weapon_details", "armor_details", "inventory", "power_points", "max_power_points",
+     "active_effects", "portrait"),
+    # 2: character creation
+    ("race", "class_name", "name", "weapon", "armor", "portrait", "skills"),
+    # 3: battle
+    ("monster", "round_count", "initiative_order", "battle_log", "is_player_turn", "is_active",
+     "player_effects"),
+    # 4: combatant
+    ("name", "race", "level", "hp", "max_hp", "ac", "base_ac", "str_mod", "dex_mod", "proficiency",
+     "weapon", "effects"),
+    # 5: combatant weapon
+    ("name", "damage_die", "damage_dice_count", "properties"),
+    # 6: equipped weapon details
+    ("name", "damage_die", "damage_dice_count", "damage_type", "category", "properties"),
+    # 7: equipped armor details
+    ("name", "base_ac", "category"),
+    # 8-11: inventory entries (potion, weapon, armor, quest item)
+    ("name", "description", "type"),
+    ("name", "description", "type", "damage_die", "damage_dice_count", "damage_type", "category",
+     "properties"),
+    ("name", "description", "type", "base_ac", "category"),
+    ("name", "description", "type", "quest_id"),
+    # 12: shop item
+    ("name", "healing", "price", "description", "quantity"),
+    # 13: quest progress
+    ("progress", "status"),
+    # 14: active effect
+    ("stat", "value", "duration", "source"),
+    # 15: session without a version (written outside write_session)
+    ("session_id", "character", "character_creation", "battle", "location_name", "area_id",
+     "act_num", "monster_kills", "kills_at_last_restock", "active_quests", "completed_quests",
+     "shop_inventory", "haggled_items", "haggle_result", "battle_rewards", "_flash", "schema"),
+    # 16: battle with its replay record
+    ("monster", "round_count", "initiative_order", "battle_log", "is_player_turn", "is_active",
+     "player_effects", "seed", "actions", "start"),
+    # 17: replay record start (before battle_start())
+    ("character", "character_creation"),
+    # 18: replay record start, web.replay.battle_start()
+    ("name", "race", "class_name", "level", "hp", "max_hp", "ac", "pp", "weapon", "armor", "items"),
+)
+_SHAPE_IDS = {shape: i for i, shape in enumerate(_SHAPES)}
+
+_UPGRADES = {}
+
+
+def upgrader(from_version: int):
+    """Register a function that turns schema from_version data into from_version + 1."""
+    def register(fn):
+        _UPGRADES[from_version] = fn
+        return fn
+    return register
+
+
+def schema_of(data: dict) -> int:
+    """The schema version of session data. Data from before versioning is
+    recognized by its layout."""
+    if "schema" in data:
+        return data["schema"]
+    monster = data.get("battle", {}).get("monster")
+    if isinstance(monster, dict) and "name" in monster:
+        return 2
+    return 1
+
+
+def upgrade(data: dict) -> dict:
+    """Return data migrated to SCHEMA_VERSION (the input is not modified)."""
+    schema = schema_of(data)
+    if schema > SCHEMA_VERSION:
+        raise ValueError(f"Session schema {schema} is newer than supported ({SCHEMA_VERSION})")
+    while schema < SCHEMA_VERSION:
+        data = _UPGRADES[schema](data)
+        schema += 1
+        data["schema"] = schema
+    return data
+
+
+@upgrader(1)
+def _nest_battle_monster(data: dict) -> dict:
+    """Schema 1 kept the monster as flat monster_* fields on the battle."""
+    battle = dict(data.get("battle", {}))
+    flat = {key: battle.pop(key) for key in list(battle) if key.startswith("monster_")}
+    battle["monster"] = {
+        "name": flat.get("monster_name", ""),
+        "race": flat.get("monster_race", ""),
+        "level": flat.get("monster_level", 1),
+        "hp": flat.get("monster_hp", 0),
+        "max_hp": flat.get("monster_max_hp", 0),
+        "ac": flat.get("monster_ac", 10),
+        "base_ac": flat.get("monster_base_ac", 10),
+        "str_mod": flat.get("monster_str_modifier", 0),
+        "dex_mod": flat.get("monster_dex_modifier", 0),
+        "proficiency": flat.get("monster_proficiency_bonus", 1),
+        "weapon": {
+            "name": flat.get("monster_weapon_name", ""),
+            "damage_die": flat.get("monster_weapon_damage_die", 6),
+            "damage_dice_count": flat.get("monster_weapon_damage_dice_count", 1),
+            "properties": flat.get("monster_weapon_properties", []),
+        },
+        "effects": flat.get("monster_effects", []),
+    }
+    return {**data, "battle": battle}
+
+
+_CONTAINERS = (dict, list, tuple)
+
+
+def _pack(value):
+    if type(value) is dict:
+        shape = _SHAPE_IDS.get(tuple(value))
+        if shape is None:
+            return {key: _pack(v) for key, v in value.items()}
+        return (shape, *[_pack(v) if type(v) in _CONTAINERS else v for v in value.values()])
+    if type(value) in (list, tuple):
+        return [_pack(v) if type(v) in _CONTAINERS else v for v in value]
+    return value
+
+
+def _unpack(value):
+    kind = type(value)
+    if kind is tuple:
+        return dict(zip(_SHAPES[value[0]],
+                        [_unpack(v) if type(v) in _CONTAINERS else v for v in value[1:]]))
+    if kind is list:
+        return [_unpack(v) if type(v) in _CONTAINERS else v for v in value]
+    if kind is dict:
+        return {key: _unpack(v) for key, v in value.items()}
+    return value
+
+
+def encode(data: dict, compress: bool = True) -> bytes:
+    """Encode session data in the binary format."""
+    payload = marshal.dumps(_pack(data), 4)
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload, 1)
+        flags |= FLAG_ZLIB
+    return (HEADER.pack(MAGIC, CODEC_VERSION, flags, schema_of(data))
+            + VERSION.pack(data.get("version", 0)) + payload)
+
+
+def stored_version(raw) -> Optional[int]:
+    """The session version in the header of binary session data (at least
+    HEADER.size + VERSION.size bytes of it), or None if the data has no
+    version header (JSON, or binary written before codec 2)."""
+    if isinstance(raw, (bytes, bytearray, memoryview)) and raw[:len(MAGIC)] == MAGIC:
+        _, codec, _, _ = HEADER.unpack_from(raw)
+        if codec >= 2 and len(raw) >= HEADER.size + VERSION.size:
+            return VERSION.unpack_from(raw, HEADER.size)[0]
+    return None
+
+
+def decode(raw) -> dict:
+    """Decode session data from either format (bytes or str)."""
+    if isinstance(raw, (bytes, bytearray, memoryview)) and raw[:len(MAGIC)] == MAGIC:
+        _, codec, flags, _ = HEADER.unpack_from(raw)
+        if codec not in (1, CODEC_VERSION):
+            raise ValueError(f"Unsupported session codec version {codec}")
+        payload = raw[HEADER.size + (VERSION.size if codec >= 2 else 0):]
+        try:
+            if flags & FLAG_ZLIB:
+                payload = zlib.decompress(payload)
+            data = _unpack(marshal.loads(payload))
+        except (zlib.error, EOFError) as e:
+            raise ValueError(f"Corrupt session payload: {e}") from e
+        if not isinstance(data, dict):
+            raise ValueError("Session payload is not a dict")
+        return data
+    return json.loads(raw)
+
+
+def dumps(data: dict, fmt: str = "binary"):
+    """Encode session data in the given format: bytes for binary, str for json."""
+    if fmt == "binary":
+        return encode(data)
+    if fmt == "json":
+        return json.dumps(data)
+    raise ValueError(f"Unknown session format: {fmt}")
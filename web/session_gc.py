@@ -0,0 +1,80 @@
+"""Expiry of idle sessions.
+
+Sessions that have not been accessed for AIVENTURES_SESSION_TTL seconds are
+deleted by a background task. Every AIVENTURES_SESSION_SWEEP_INTERVAL seconds
+it makes one pass over the store in batches of AIVENTURES_SESSION_SWEEP_BATCH,
+each batch on the session I/O thread pool, so requests are never blocked
+behind a full scan. Sessions held in the session cache are never expired.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web.settings import get_settings
+from web.session_store import get_store, run_store_io
+from web.session_cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSweeper:
+    """Deletes expired sessions from a store and keeps running totals."""
+
+    def __init__(self, store, ttl_seconds: float, batch: int = 500, is_live=None):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.batch = batch
+        self.is_live = is_live
+        self._lock = threading.Lock()
+        self.stats = {"passes": 0, "scanned": 0, "expired": 0, "bytes_reclaimed": 0}
+
+    def step(self) -> dict:
+        """Sweep one batch. Returns the batch's counts (done=True ends a pass)."""
+        result = self.store.sweep_expired(self.ttl_seconds, self.batch, self.is_live)
+        with self._lock:
+            for key in ("scanned", "expired", "bytes_reclaimed"):
+                self.stats[key] += result[key]
+            if result["done"]:
+                self.stats["passes"] += 1
+        return result
+
+    def sweep(self) -> dict:
+        """Run a full pass synchronously. Returns its totals."""
+        totals = {"scanned": 0, "expired": 0, "bytes_reclaimed": 0}
+        while True:
+            result = self.step()
+            for key in totals:
+                totals[key] += result[key]
+            if result["done"]:
+                return totals
+
+    async def run(self, interval: float):
+        """Background task: one incremental pass over the store every interval."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                while not (await run_store_io(self.step))["done"]:
+                    await asyncio.sleep(0)
+            except Exception:
+                logger.exception("Session sweep failed")
+
+
+_sweeper = None
+
+
+def get_sweeper() -> Optional[SessionSweeper]:
+    """Get the process-wide sweeper, or None when sessions never expire."""
+    global _sweeper
+    settings = get_settings()
+    if _sweeper is None and settings.session_ttl_seconds > 0:
+        cache = get_cache()
+        _sweeper = SessionSweeper(get_store(), settings.session_ttl_seconds, settings.session_sweep_batch,
+                                  is_live=cache.__contains__ if cache is not None else None)
+    return _sweeper
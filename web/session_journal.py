@@ -0,0 +1,108 @@
+"""Field-level change journal for session persistence.
+
+Instead of rewriting the whole serialized session after every action, the
+difference from the last persisted state is appended to a per-session journal
+as a short list of operations. Loading replays the journal on top of the last
+snapshot; after AIVENTURES_JOURNAL_COMPACT_EVERY entries (or when a session
+goes idle) the journal is folded back into a fresh snapshot.
+
+Operations are compact JSON lists; a path is a list of dict keys / list indices:
+
+    ["s", path, value]            set path to value
+    ["d", path]                   delete the dict key at path
+    ["w", path, drop, items]      list at path becomes list[drop:] + items
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web.settings import get_settings
+
+
+def diff(old, new, path=None) -> list:
+    """Return the operations that turn old into new."""
+    path = path or []
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            if key not in old:
+                ops.append(["s", path + [key], value])
+            else:
+                ops.extend(diff(old[key], value, path + [key]))
+        for key in old:
+            if key not in new:
+                ops.append(["d", path + [key]])
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        candidates = [[["s", path, new]]]
+        if len(old) == len(new):
+            ops = []
+            for i, (a, b) in enumerate(zip(old, new)):
+                ops.extend(diff(a, b, path + [i]))
+            candidates.append(ops)
+        # Sliding windows such as battle_log[-10:]: drop from the front, append at the back
+        for drop in range(1 if len(old) == len(new) else 0, len(old) + 1):
+            kept = len(old) - drop
+            if kept <= len(new) and old[drop:] == new[:kept]:
+                candidates.append([["w", path, drop, new[kept:]]])
+                break
+        return min(candidates, key=_encoded_size)
+    return [["s", path, new]]
+
+
+def _encoded_size(ops) -> int:
+    return len(json.dumps(ops, separators=(",", ":")))
+
+
+def apply(data, ops):
+    """Apply operations to data (in place where possible). Returns the result."""
+    for op in ops:
+        kind, path = op[0], op[1]
+        if not path:
+            data = op[2] if kind == "s" else data[op[2]:] + op[3]
+            continue
+        parent = data
+        for key in path[:-1]:
+            parent = parent[key]
+        key = path[-1]
+        if kind == "s":
+            parent[key] = op[2]
+        elif kind == "d":
+            parent.pop(key, None)
+        elif kind == "w":
+            parent[key] = parent[key][op[2]:] + op[3]
+        else:
+            raise ValueError(f"Unknown journal operation: {kind}")
+    return data
+
+
+def write_session(store, session_id: str, data: dict, previous=None, version=None):
+    """Persist session data, journaling the delta from previous when possible.
+
+    previous is the last state known to be in the store (None forces a full
+    snapshot). A snapshot is also written once the journal reaches the
+    configured compaction threshold.
+
+    version is the session version the data was based on. The data is stored
+    as version + 1, and the store raises StaleSessionError if another writer
+    has moved the stored session past version in the meantime.
+    """
+    if version is not None:
+        data = {**data, "version": version + 1}
+        if previous is not None:
+            previous = {**previous, "version": version}
+    compact_every = get_settings().journal_compact_every
+    if previous is None or compact_every <= 1:
+        store.save(session_id, data, expected_version=version)
+        return
+    ops = diff(previous, data)
+    if not ops:
+        return
+    if store.append_deltas(session_id, ops, expected_version=version) >= compact_every:
+        store.save(session_id, data, expected_version=version + 1 if version is not None else None)
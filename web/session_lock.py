@@ -0,0 +1,40 @@
+"""Per-session request serialization within a worker.
+
+Two quick clicks or two browser tabs would otherwise run handlers for the same
+session concurrently, each on its own copy, and the last save would silently
+drop the other's turn. SessionLockMiddleware holds an asyncio.Lock per session
+id for the duration of each request, so requests for one session run one at a
+time while different sessions still run concurrently. Across workers the
+optimistic version check in the session store (StaleSessionError) covers the
+same race.
+"""
+
+import asyncio
+
+
+class SessionLockMiddleware:
+    """ASGI middleware; must run inside SessionMiddleware (add it first)."""
+
+    def __init__(self, app):
+        self.app = app
+        self._locks = {}   # session_id -> [asyncio.Lock, number of requests holding or waiting]
+
+    def __len__(self):
+        return len(self._locks)
+
+    async def __call__(self, scope, receive, send):
+        session_id = None
+        if scope["type"] == "http" and not scope["path"].startswith("/static"):
+            session_id = scope.get("session", {}).get("session_id")
+        if session_id is None:
+            await self.app(scope, receive, send)
+            return
+        entry = self._locks.setdefault(session_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                await self.app(scope, receive, send)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[session_id]
@@ -0,0 +1,857 @@
+"""Persistent storage backends for serialized GameSession data.
+
+Two backends are available, selected with AIVENTURES_SESSION_BACKEND:
+
+- "file": one JSON file per session under web/sessions/ (the original layout).
+- "sqlite": a single SQLite database in WAL mode, one row per session.
+
+Snapshots are encoded with AIVENTURES_SESSION_FORMAT ("binary" or "json",
+see web/session_format.py); either format is read back regardless of the
+setting. Both keep a per-session journal of field-level deltas next to the last full
+snapshot (see web/session_journal.py); load() replays it.
+
+AIVENTURES_SESSION_DURABILITY controls when writes reach the disk:
+
+- "none": writes are atomic (temp file + rename) but not fsynced.
+- "fsync": every write is fsynced before save() returns.
+- "group": writers block until a background committer fsyncs the whole
+  batch of pending writes, once every AIVENTURES_GROUP_COMMIT_MS. SQLite
+  fsyncs its WAL on every commit in this mode, the same as "fsync".
+
+Sessions not accessed for AIVENTURES_SESSION_TTL seconds are deleted in
+batches by sweep_expired() (driven by web/session_gc.py).
+
+Writes can carry the version the caller based its changes on
+(expected_version); if another writer got there first the store raises
+StaleSessionError instead of silently overwriting that write.
+
+Sessions of the file store can be imported into SQLite with:
+
+    python -m web.session_store migrate [--source DIR] [--db PATH]
+"""
+
+import argparse
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:   # Windows: fall back to in-process locking
+    fcntl = None
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from web.settings import get_settings
+from web.session_journal import apply as apply_deltas
+from web.session_format import FORMATS, HEADER, VERSION, decode, dumps, stored_version
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_MODES = ("none", "fsync", "group")
+
+
+class StaleSessionError(Exception):
+    """A session write was based on an older version than the one stored."""
+
+    def __init__(self, session_id: str, expected_version: int, stored_version: int):
+        super().__init__(f"Session {session_id} is at version {stored_version}, "
+                         f"write was based on version {expected_version}")
+        self.session_id = session_id
+        self.expected_version = expected_version
+        self.stored_version = stored_version
+
+
+def safe_session_id(session_id: str) -> str:
+    """Strip a session id down to characters that are safe in paths and keys."""
+    return "".join(c for c in session_id if c.isalnum() or c == "-")
+
+
+class SessionStore:
+    """Interface for session storage backends. Data is the dict from GameSession.to_dict()."""
+
+    def load(self, session_id: str) -> Optional[dict]:
+        """Return the stored session data, or None if it does not exist."""
+        raise NotImplementedError
+
+    def save(self, session_id: str, data: dict, expected_version: Optional[int] = None) -> None:
+        """Insert or replace the stored session data (a full snapshot; clears the journal).
+
+        With expected_version, raise StaleSessionError unless the stored
+        session is at that version (or does not exist).
+        """
+        raise NotImplementedError
+
+    def append_deltas(self, session_id: str, ops: list, expected_version: Optional[int] = None) -> int:
+        """Append one journal entry of delta operations. Returns the journal length.
+
+        Deltas need a stored session to apply to: when there is none (e.g. it
+        expired meanwhile) nothing is appended and 0 is returned, or with
+        expected_version StaleSessionError is raised. Otherwise
+        expected_version is checked as in save().
+        """
+        raise NotImplementedError
+
+    def compact(self, session_id: str) -> None:
+        """Fold a session's journal into a fresh snapshot."""
+        data = self.load(session_id)
+        if data is not None:
+            try:
+                self.save(session_id, data, expected_version=data.get("version", 0))
+            except StaleSessionError:
+                pass   # a newer write landed meanwhile; it gets compacted later
+
+    def compact_idle(self, idle_seconds: float) -> int:
+        """Compact the journals of sessions idle for idle_seconds. Returns how many."""
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> None:
+        """Remove a session if it exists."""
+        raise NotImplementedError
+
+    def session_ids(self) -> Iterator[str]:
+        """Iterate over the ids of all stored sessions."""
+        raise NotImplementedError
+
+    def recover(self) -> dict:
+        """Startup scan: check every stored session and report the corrupt ones."""
+        raise NotImplementedError
+
+    def sweep_expired(self, ttl_seconds: float, limit: int, is_live=None) -> dict:
+        """Delete up to limit sessions not accessed within ttl_seconds, continuing
+        where the previous call stopped. is_live(session_id) -> True spares a
+        session (e.g. one held in the session cache).
+
+        Returns counts: scanned, expired, bytes_reclaimed, and done (True once
+        a full pass over the store has completed).
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+def _fsync_path(path: Path):
+    """fsync a file or directory by path."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _CommitBatch:
+    def __init__(self):
+        self.entries = []   # (path, replace_to or None)
+        self.done = threading.Event()
+        self.error = None
+
+
+class GroupCommitter:
+    """Makes file writes durable in batches: one fsync pass per window for all writers.
+
+    commit() blocks the calling thread until its batch has been fsynced (and,
+    for snapshot writes, atomically moved into place).
+    """
+
+    def __init__(self, window_seconds: float = 0.005):
+        self.window = window_seconds
+        self._lock = threading.Lock()
+        self._current = _CommitBatch()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self.stats = {"batches": 0, "writes": 0}
+
+    def commit(self, path: Path, replace_to: Optional[Path] = None):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="session-group-commit", daemon=True)
+                self._thread.start()
+            batch = self._current
+            batch.entries.append((path, replace_to))
+        self._wakeup.set()
+        batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            time.sleep(self.window)   # let concurrent writers join the batch
+            with self._lock:
+                self._wakeup.clear()
+                batch, self._current = self._current, _CommitBatch()
+            if not batch.entries:
+                continue
+            try:
+                directories = set()
+                for path, replace_to in batch.entries:
+                    _fsync_path(path)
+                    if replace_to is not None:
+                        os.replace(path, replace_to)
+                        directories.add(replace_to.parent)
+                for directory in directories:
+                    _fsync_path(directory)
+                self.stats["batches"] += 1
+                self.stats["writes"] += len(batch.entries)
+            except Exception as e:   # handed to the writers, so the committer keeps running
+                batch.error = e
+            finally:
+                batch.done.set()
+
+
+class FileSessionStore(SessionStore):
+    """One snapshot per session, <shard>/<session_id>.bin (or .json), plus an
+    append-only <shard>/<session_id>.journal of delta entries (one JSON line each).
+
+    <shard> is two levels of hash-prefix directories (<directory>/3f/a2/), so
+    no directory grows past a few hundred entries however many sessions exist.
+    Loading a session refreshes its mtime, which serves as its last access time.
+    """
+
+    SUFFIXES = {"binary": ".bin", "json": ".json"}
+    TOUCH_INTERVAL = 60.0   # seconds between last-access refreshes of a session
+
+    def __init__(self, directory: Path, durability: str = "none", group_commit_ms: float = 5.0,
+                 fmt: str = "binary"):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown session format: {fmt}")
+        self.directory = Path(directory)
+        self.format = fmt
+        self.durability = durability
+        self._committer = GroupCommitter(group_commit_ms / 1000) if durability == "group" else None
+        self._journal_lengths = {}
+        self._thread_locks = {}   # session_id -> threading.Lock, only used without fcntl
+        self._sweep_cursor = None
+        self._shard_flat_layout()
+
+    def _shard_dir(self, session_id: str) -> Path:
+        digest = hashlib.sha1(safe_session_id(session_id).encode()).hexdigest()
+        return self.directory / digest[:2] / digest[2:4]
+
+    def _shard_flat_layout(self):
+        """Move session files from the old flat layout into their shard directories."""
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob("*"):
+            if path.is_file() and path.suffix in (*self.SUFFIXES.values(), ".journal"):
+                shard = self._shard_dir(path.stem)
+                shard.mkdir(parents=True, exist_ok=True)
+                os.replace(path, shard / path.name)
+
+    def _path(self, session_id: str, fmt: Optional[str] = None) -> Path:
+        return self._shard_dir(session_id) / f"{safe_session_id(session_id)}{self.SUFFIXES[fmt or self.format]}"
+
+    def _existing_path(self, session_id: str) -> Optional[Path]:
+        """The session's snapshot in the configured format, else in the other one."""
+        for fmt in (self.format, *FORMATS):
+            path = self._path(session_id, fmt)
+            if path.exists():
+                return path
+        return None
+
+    def _journal_path(self, session_id: str) -> Path:
+        return self._shard_dir(session_id) / f"{safe_session_id(session_id)}.journal"
+
+    def _lock_path(self, session_id: str) -> Path:
+        return self._shard_dir(session_id) / f".{safe_session_id(session_id)}.lock"
+
+    def _read_journal(self, session_id: str) -> list:
+        """Read journal entries, ignoring a torn final line from an interrupted append."""
+        path = self._journal_path(session_id)
+        if not path.exists():
+            return []
+        entries = []
+        with open(path) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        return entries
+
+    def load(self, session_id: str) -> Optional[dict]:
+        path = self._existing_path(session_id)
+        if path is None:
+            return None
+        data = decode(path.read_bytes())
+        entries = self._read_journal(session_id)
+        for ops in entries:
+            data = apply_deltas(data, ops)
+        self._journal_lengths[session_id] = len(entries)
+        if time.time() - path.stat().st_mtime > self.TOUCH_INTERVAL:
+            os.utime(path)
+        return data
+
+    @contextmanager
+    def _write_lock(self, session_id: str):
+        """Exclusive per-session lock, shared with other worker processes via flock."""
+        if fcntl is None:
+            with self._thread_locks.setdefault(session_id, threading.Lock()):
+                yield
+            return
+        self._shard_dir(session_id).mkdir(parents=True, exist_ok=True)
+        with open(self._lock_path(session_id), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _check_version(self, session_id: str, expected_version: int):
+        stored = self._stored_version(session_id)
+        if stored is not None and stored != expected_version:
+            raise StaleSessionError(session_id, expected_version, stored)
+
+    def _stored_version(self, session_id: str) -> Optional[int]:
+        """The stored session's version (None if there is none), without
+        decoding it: from the newest journal entry that sets the version, else
+        from the snapshot header. Snapshots without a version header (JSON,
+        older binary) are loaded."""
+        path = self._existing_path(session_id)
+        if path is None:
+            return None
+        version = self._journal_version(session_id)
+        if version is None:
+            with open(path, "rb") as f:
+                version = stored_version(f.read(HEADER.size + VERSION.size))
+        if version is None:
+            data = self.load(session_id)
+            version = data.get("version", 0) if data is not None else None
+        return version
+
+    def _journal_version(self, session_id: str) -> Optional[int]:
+        """The version set by the newest journal entry that sets one, read
+        from the end of the journal; None if no entry does (or it is unclear)."""
+        try:
+            lines = self._journal_path(session_id).read_bytes().splitlines()
+        except FileNotFoundError:
+            return None
+        for i, line in enumerate(reversed(lines)):
+            try:
+                ops = json.loads(line)
+            except json.JSONDecodeError:
+                if i == 0:
+                    continue   # a torn final line, which load() ignores too
+                return None
+            for op in reversed(ops):
+                if not op[1]:
+                    return None   # replaces the whole session
+                if op[1] == ["version"]:
+                    return op[2] if op[0] == "s" else None
+        return None
+
+    def save(self, session_id: str, data: dict, expected_version: Optional[int] = None) -> None:
+        if expected_version is None:
+            self._write_snapshot(session_id, data)
+            return
+        with self._write_lock(session_id):
+            self._check_version(session_id, expected_version)
+            self._write_snapshot(session_id, data)
+
+    def _write_snapshot(self, session_id: str, data: dict) -> None:
+        """Write the snapshot to a temp file and atomically rename it into place,
+        so readers and crash recovery only ever see a complete file."""
+        path = self._path(session_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = dumps(data, self.format)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(payload if isinstance(payload, bytes) else payload.encode())
+                if self.durability == "fsync":
+                    f.flush()
+                    os.fsync(f.fileno())
+            if self._committer is not None:
+                self._committer.commit(tmp, replace_to=path)
+            else:
+                os.replace(tmp, path)
+                if self.durability == "fsync":
+                    _fsync_path(path.parent)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        for fmt in FORMATS:
+            if fmt != self.format:
+                self._path(session_id, fmt).unlink(missing_ok=True)
+        self._journal_path(session_id).unlink(missing_ok=True)
+        self._journal_lengths[session_id] = 0
+
+    def append_deltas(self, session_id: str, ops: list, expected_version: Optional[int] = None) -> int:
+        if expected_version is None:
+            if self._existing_path(session_id) is None:
+                return 0
+            return self._append(session_id, ops)
+        with self._write_lock(session_id):
+            if self._existing_path(session_id) is None:
+                raise StaleSessionError(session_id, expected_version, -1)
+            self._check_version(session_id, expected_version)
+            return self._append(session_id, ops)
+
+    def _append(self, session_id: str, ops: list) -> int:
+        length = self._journal_lengths.get(session_id)
+        if length is None:
+            length = len(self._read_journal(session_id))
+        journal = self._journal_path(session_id)
+        journal.parent.mkdir(parents=True, exist_ok=True)
+        with open(journal, "a") as f:
+            f.write(json.dumps(ops, separators=(",", ":")) + "\n")
+            if self.durability == "fsync":
+                f.flush()
+                os.fsync(f.fileno())
+        if self._committer is not None:
+            self._committer.commit(journal)
+        self._journal_lengths[session_id] = length + 1
+        return length + 1
+
+    def compact_idle(self, idle_seconds: float) -> int:
+        if not self.directory.exists():
+            return 0
+        cutoff = time.time() - idle_seconds
+        compacted = 0
+        for path in self.directory.glob("*/*/*.journal"):
+            if path.stat().st_mtime < cutoff:
+                self.compact(path.stem)
+                compacted += 1
+        return compacted
+
+    def delete(self, session_id: str) -> None:
+        for fmt in FORMATS:
+            self._path(session_id, fmt).unlink(missing_ok=True)
+        self._journal_path(session_id).unlink(missing_ok=True)
+        self._lock_path(session_id).unlink(missing_ok=True)
+        self._forget(session_id)
+
+    def _forget(self, session_id: str):
+        """Drop the in-process state kept per session."""
+        self._journal_lengths.pop(session_id, None)
+        lock = self._thread_locks.get(session_id)
+        if lock is not None and not lock.locked():
+            self._thread_locks.pop(session_id, None)
+
+    def _forget_missing(self):
+        """Drop per-session state of sessions that are gone from disk, e.g.
+        deleted by another worker process."""
+        for session_id in {*self._journal_lengths, *self._thread_locks}:
+            if self._existing_path(session_id) is None:
+                self._forget(session_id)
+
+    def session_ids(self) -> Iterator[str]:
+        if not self.directory.exists():
+            return
+        for path in self._snapshots():
+            yield path.stem
+
+    def _snapshots(self) -> Iterator[Path]:
+        """Snapshot files, shard by shard (one per session)."""
+        if not self.directory.exists():
+            return
+        suffixes = set(self.SUFFIXES.values())
+        for top in sorted(os.scandir(self.directory), key=lambda e: e.name):
+            if not top.is_dir():
+                continue
+            for shard in sorted(os.scandir(top.path), key=lambda e: e.name):
+                if not shard.is_dir():
+                    continue
+                stems = set()
+                for entry in os.scandir(shard.path):
+                    path = Path(entry.path)
+                    if path.suffix in suffixes and not entry.name.startswith(".") and path.stem not in stems:
+                        stems.add(path.stem)
+                        yield path
+
+    def sweep_expired(self, ttl_seconds: float, limit: int, is_live=None) -> dict:
+        result = {"scanned": 0, "expired": 0, "bytes_reclaimed": 0, "done": False}
+        if self._sweep_cursor is None:
+            self._sweep_cursor = self._snapshots()
+        cutoff = time.time() - ttl_seconds
+        for path in self._sweep_cursor:
+            result["scanned"] += 1
+            session_id = path.stem
+            if self._last_access(session_id) < cutoff and not (is_live and is_live(session_id)):
+                with self._write_lock(session_id):
+                    # Re-check under the lock: a request may have just used it.
+                    expired = self._last_access(session_id) < cutoff
+                    if expired:
+                        result["bytes_reclaimed"] += self._size(session_id)
+                        self.delete(session_id)
+                        result["expired"] += 1
+                if expired:
+                    self._forget(session_id)   # delete() kept the thread lock it ran under
+            if result["scanned"] >= limit:
+                return result
+        self._sweep_cursor = None
+        self._forget_missing()
+        result["done"] = True
+        return result
+
+    def _session_files(self, session_id: str) -> list:
+        return [*(self._path(session_id, fmt) for fmt in FORMATS), self._journal_path(session_id)]
+
+    def _last_access(self, session_id: str) -> float:
+        """Newest mtime of the session's snapshot and journal (0 if gone)."""
+        mtimes = [0.0]
+        for path in self._session_files(session_id):
+            try:
+                mtimes.append(path.stat().st_mtime)
+            except FileNotFoundError:
+                pass
+        return max(mtimes)
+
+    def _size(self, session_id: str) -> int:
+        size = 0
+        for path in self._session_files(session_id):
+            try:
+                size += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return size
+
+    def recover(self) -> dict:
+        """Remove temp files left by interrupted writes and report unreadable sessions."""
+        report = {"scanned": 0, "corrupt": [], "temp_files_removed": 0}
+        if not self.directory.exists():
+            return report
+        # Leave very recent temp files alone: another worker may be mid-write.
+        cutoff = time.time() - 60
+        for tmp in self.directory.glob("*/*/.*.tmp"):
+            if tmp.stat().st_mtime < cutoff:
+                tmp.unlink(missing_ok=True)
+                report["temp_files_removed"] += 1
+        for session_id in self.session_ids():
+            report["scanned"] += 1
+            try:
+                self.load(session_id)
+            except (OSError, ValueError, LookupError, TypeError) as e:
+                report["corrupt"].append(session_id)
+                logger.warning("Corrupt session %s: %s", session_id, e)
+        return report
+
+
+class SQLiteSessionStore(SessionStore):
+    """All sessions in one SQLite database (WAL mode), one pooled connection per thread."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id  TEXT PRIMARY KEY,
+            data        BLOB NOT NULL,   -- see web/session_format.py
+            last_access REAL NOT NULL,
+            version     INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS session_deltas (
+            seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id  TEXT NOT NULL,
+            ops         TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS session_deltas_by_session ON session_deltas (session_id, seq);
+        CREATE INDEX IF NOT EXISTS sessions_by_last_access ON sessions (last_access);
+    """
+
+    TOUCH_INTERVAL = 60.0   # seconds between last-access refreshes of a session
+
+    # With synchronous=NORMAL a WAL commit is only fsynced at the next
+    # checkpoint, so it can be lost on power failure. FULL fsyncs the WAL on
+    # every commit; concurrent commits queue on SQLite's write lock and each
+    # appends to the one WAL file, so "group" needs no committer of its own.
+    SYNCHRONOUS = {"none": "NORMAL", "group": "FULL", "fsync": "FULL"}
+
+    def __init__(self, path: Path, durability: str = "none", fmt: str = "binary"):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown session format: {fmt}")
+        self.path = Path(path)
+        self.format = fmt
+        self._sweep_cursor = None
+        self.durability = durability
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(self.SCHEMA)
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.SYNCHRONOUS[self.durability]}")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def load(self, session_id: str) -> Optional[dict]:
+        conn = self._connection()
+        session_id = safe_session_id(session_id)
+        with conn:
+            # sqlite3 opens no transaction for SELECTs: without BEGIN the two
+            # reads could straddle a compaction and miss the folded deltas.
+            conn.execute("BEGIN")
+            row = conn.execute("SELECT data, version, last_access FROM sessions WHERE session_id = ?",
+                               (session_id,)).fetchone()
+            if not row:
+                return None
+            data = decode(row[0])
+            for (ops,) in conn.execute(
+                    "SELECT ops FROM session_deltas WHERE session_id = ? ORDER BY seq", (session_id,)):
+                data = apply_deltas(data, json.loads(ops))
+        # The version column is authoritative (rows written before sessions
+        # carried a version of their own only have it there).
+        if row[1] != data.get("version", 0):
+            data["version"] = row[1]
+        now = time.time()
+        if now - row[2] > self.TOUCH_INTERVAL:
+            with conn:
+                conn.execute("UPDATE sessions SET last_access = ? WHERE session_id = ?", (now, session_id))
+        return data
+
+    def save(self, session_id: str, data: dict, expected_version: Optional[int] = None) -> None:
+        conn = self._connection()
+        session_id = safe_session_id(session_id)
+        with conn:
+            if expected_version is None:
+                conn.execute(
+                    "INSERT INTO sessions (session_id, data, last_access, version) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET data = excluded.data, "
+                    "last_access = excluded.last_access, version = excluded.version",
+                    (session_id, dumps(data, self.format), time.time(), data.get("version", 0)),
+                )
+            else:
+                version = data.get("version", expected_version)
+                updated = conn.execute(
+                    "UPDATE sessions SET data = ?, last_access = ?, version = ? "
+                    "WHERE session_id = ? AND version = ?",
+                    (dumps(data, self.format), time.time(), version, session_id, expected_version),
+                ).rowcount
+                if not updated:
+                    self._insert_or_stale(conn, session_id, data, version, expected_version)
+            conn.execute("DELETE FROM session_deltas WHERE session_id = ?", (session_id,))
+
+    def _insert_or_stale(self, conn, session_id, data, version, expected_version):
+        row = conn.execute("SELECT version FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is not None:
+            raise StaleSessionError(session_id, expected_version, row[0])
+        try:
+            conn.execute("INSERT INTO sessions (session_id, data, last_access, version) VALUES (?, ?, ?, ?)",
+                         (session_id, dumps(data, self.format), time.time(), version))
+        except sqlite3.IntegrityError:
+            raise StaleSessionError(session_id, expected_version, -1) from None
+
+    def append_deltas(self, session_id: str, ops: list, expected_version: Optional[int] = None) -> int:
+        conn = self._connection()
+        session_id = safe_session_id(session_id)
+        with conn:
+            if expected_version is None:
+                updated = conn.execute("UPDATE sessions SET last_access = ? WHERE session_id = ?",
+                                       (time.time(), session_id)).rowcount
+                if not updated:
+                    return 0
+            else:
+                updated = conn.execute(
+                    "UPDATE sessions SET last_access = ?, version = version + 1 "
+                    "WHERE session_id = ? AND version = ?",
+                    (time.time(), session_id, expected_version),
+                ).rowcount
+                if not updated:
+                    row = conn.execute("SELECT version FROM sessions WHERE session_id = ?",
+                                       (session_id,)).fetchone()
+                    raise StaleSessionError(session_id, expected_version, row[0] if row else -1)
+            conn.execute("INSERT INTO session_deltas (session_id, ops) VALUES (?, ?)",
+                         (session_id, json.dumps(ops, separators=(",", ":"))))
+            (length,) = conn.execute("SELECT COUNT(*) FROM session_deltas WHERE session_id = ?",
+                                     (session_id,)).fetchone()
+        return length
+
+    def compact_idle(self, idle_seconds: float) -> int:
+        rows = self._connection().execute(
+            "SELECT DISTINCT d.session_id FROM session_deltas d "
+            "JOIN sessions s ON s.session_id = d.session_id WHERE s.last_access < ?",
+            (time.time() - idle_seconds,),
+        ).fetchall()
+        for (session_id,) in rows:
+            self.compact(session_id)
+        return len(rows)
+
+    def delete(self, session_id: str) -> None:
+        conn = self._connection()
+        session_id = safe_session_id(session_id)
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM session_deltas WHERE session_id = ?", (session_id,))
+
+    def session_ids(self) -> Iterator[str]:
+        rows = self._connection().execute("SELECT session_id FROM sessions").fetchall()
+        for (session_id,) in rows:
+            yield session_id
+
+    def sweep_expired(self, ttl_seconds: float, limit: int, is_live=None) -> dict:
+        """Delete the least recently used expired sessions, at most limit per call.
+
+        Sessions spared by is_live are skipped by moving the scan position past
+        them, so a pass always terminates.
+        """
+        conn = self._connection()
+        result = {"scanned": 0, "expired": 0, "bytes_reclaimed": 0, "done": False}
+        start = self._sweep_cursor or (-1.0, "")
+        rows = conn.execute(
+            "SELECT session_id, last_access, length(data) FROM sessions "
+            "WHERE last_access < ? AND (last_access, session_id) > (?, ?) "
+            "ORDER BY last_access, session_id LIMIT ?",
+            (time.time() - ttl_seconds, *start, limit),
+        ).fetchall()
+        for session_id, last_access, size in rows:
+            result["scanned"] += 1
+            self._sweep_cursor = (last_access, session_id)
+            if is_live and is_live(session_id):
+                continue
+            with conn:
+                deleted = conn.execute("DELETE FROM sessions WHERE session_id = ? AND last_access = ?",
+                                       (session_id, last_access)).rowcount
+                if not deleted:
+                    continue   # accessed since the scan
+                (deltas,) = conn.execute("SELECT COALESCE(SUM(length(ops)), 0) FROM session_deltas "
+                                         "WHERE session_id = ?", (session_id,)).fetchone()
+                conn.execute("DELETE FROM session_deltas WHERE session_id = ?", (session_id,))
+            result["expired"] += 1
+            result["bytes_reclaimed"] += size + deltas
+        if len(rows) < limit:
+            self._sweep_cursor = None
+            result["done"] = True
+        return result
+
+    def recover(self) -> dict:
+        """Run SQLite's integrity check and report rows whose data does not parse."""
+        report = {"scanned": 0, "corrupt": [], "temp_files_removed": 0}
+        conn = self._connection()
+        (status,) = conn.execute("PRAGMA quick_check").fetchone()
+        if status != "ok":
+            logger.warning("Session database integrity check failed: %s", status)
+        for (session_id,) in conn.execute("SELECT session_id FROM sessions").fetchall():
+            report["scanned"] += 1
+            try:
+                self.load(session_id)
+            except (ValueError, LookupError, TypeError) as e:
+                report["corrupt"].append(session_id)
+                logger.warning("Corrupt session %s: %s", session_id, e)
+        return report
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+
+def create_store(settings=None) -> SessionStore:
+    """Build the session store selected by the settings."""
+    settings = settings or get_settings()
+    if settings.session_backend == "sqlite":
+        return SQLiteSessionStore(settings.session_db, settings.session_durability,
+                                  settings.session_format)
+    if settings.session_backend == "file":
+        return FileSessionStore(settings.sessions_dir, settings.session_durability,
+                                settings.group_commit_ms, settings.session_format)
+    raise ValueError(f"Unknown session backend: {settings.session_backend}")
+
+
+_store = None
+
+
+def get_store() -> SessionStore:
+    """Get the process-wide session store."""
+    global _store
+    if _store is None:
+        _store = create_store()
+    return _store
+
+
+_io_executor = None
+
+
+async def run_store_io(fn, *args):
+    """Run blocking session I/O on the bounded session I/O thread pool.
+
+    With AIVENTURES_SESSION_IO_THREADS=0 the call runs inline on the event
+    loop instead (the old behavior, kept for comparison benchmarks). The call
+    sees the caller's context variables (e.g. the request's pinned catalog).
+    """
+    global _io_executor
+    threads = get_settings().session_io_threads
+    if threads <= 0:
+        return fn(*args)
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="session-io")
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(_io_executor, context.run, fn, *args)
+
+
+def shutdown_store_io():
+    """Wait for queued session I/O and stop the thread pool."""
+    global _io_executor
+    if _io_executor is not None:
+        _io_executor.shutdown(wait=True)
+        _io_executor = None
+
+
+def migrate_json_sessions(source_dir: Path, store: SessionStore) -> dict:
+    """Import every session of a file store directory into another store.
+
+    Sessions are read through FileSessionStore, so sharded, binary and
+    journaled sessions come over with their deltas applied (and an old flat
+    layout is sharded first). Returns counts of imported and skipped
+    (unreadable) sessions.
+    """
+    counts = {"imported": 0, "skipped": 0}
+    source = FileSessionStore(source_dir)
+    for session_id in source.session_ids():
+        try:
+            data = source.load(session_id)
+        except (OSError, ValueError, LookupError, TypeError) as e:
+            logger.warning("Skipping unreadable session %s: %s", session_id, e)
+            data = None
+        if data is None:
+            counts["skipped"] += 1
+            continue
+        store.save(session_id, data)
+        counts["imported"] += 1
+    source.close()
+    return counts
+
+
+def main(argv=None):
+    settings = get_settings()
+    parser = argparse.ArgumentParser(prog="python -m web.session_store",
+                                     description="Session storage maintenance.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="Import the file store's sessions into the SQLite store.")
+    migrate.add_argument("--source", type=Path, default=settings.sessions_dir)
+    migrate.add_argument("--db", type=Path, default=settings.session_db)
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        store = SQLiteSessionStore(args.db)
+        try:
+            counts = migrate_json_sessions(args.source, store)
+        finally:
+            store.close()
+        print(f"Imported {counts['imported']} sessions into {args.db} ({counts['skipped']} skipped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Runtime settings for the web UI, read from environment variables."""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+WEB_DIR = Path(__file__).parent
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Deployment settings. Every field can be overridden via an AIVENTURES_* variable."""
+    session_backend: str = "file"      # "file" (one JSON file per session) or "sqlite"
+    sessions_dir: Path = WEB_DIR / "sessions"
+    session_db: Path = WEB_DIR / "sessions" / "sessions.db"
+    session_cache_size: int = 0        # live GameSession objects kept in memory; 0 disables the cache
+    session_cache_idle_seconds: float = 900.0
+    session_flush_interval: float = 5.0
+    journal_compact_every: int = 20    # journal entries before a full snapshot; <= 1 disables journaling
+    journal_idle_seconds: float = 300.0
+    session_durability: str = "none"   # "none", "fsync" (every write) or "group" (batched fsyncs)
+    group_commit_ms: float = 5.0
+    session_recovery_scan: bool = True
+    session_format: str = "binary"     # snapshot encoding: "binary" (compact) or "json" (debugging)
+    session_ttl_seconds: float = 7 * 24 * 3600.0   # delete sessions idle this long; 0 keeps them forever
+    session_sweep_interval: float = 300.0
+    session_sweep_batch: int = 500
+    session_io_threads: int = 8        # thread pool for blocking session I/O; 0 runs it on the event loop
+    content_reload_interval: float = 2.0   # seconds between checks of json/ for edits; 0 disables hot reload
+    startup_warmup: bool = True        # build indexes and compile templates before serving
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        env = os.environ
+        return cls(
+            session_backend=env.get("AIVENTURES_SESSION_BACKEND", cls.session_backend).lower(),
+            sessions_dir=Path(env.get("AIVENTURES_SESSIONS_DIR", cls.sessions_dir)),
+            session_db=Path(env.get("AIVENTURES_SESSION_DB", cls.session_db)),
+            session_cache_size=int(env.get("AIVENTURES_SESSION_CACHE_SIZE", cls.session_cache_size)),
+            session_cache_idle_seconds=float(env.get("AIVENTURES_SESSION_CACHE_IDLE", cls.session_cache_idle_seconds)),
+            session_flush_interval=float(env.get("AIVENTURES_SESSION_FLUSH_INTERVAL", cls.session_flush_interval)),
+            journal_compact_every=int(env.get("AIVENTURES_JOURNAL_COMPACT_EVERY", cls.journal_compact_every)),
+            journal_idle_seconds=float(env.get("AIVENTURES_JOURNAL_IDLE", cls.journal_idle_seconds)),
+            session_durability=env.get("AIVENTURES_SESSION_DURABILITY", cls.session_durability).lower(),
+            group_commit_ms=float(env.get("AIVENTURES_GROUP_COMMIT_MS", cls.group_commit_ms)),
+            session_recovery_scan=env.get("AIVENTURES_SESSION_RECOVERY_SCAN", "1") not in ("0", "false", "no"),
+            session_format=env.get("AIVENTURES_SESSION_FORMAT", cls.session_format).lower(),
+            session_ttl_seconds=float(env.get("AIVENTURES_SESSION_TTL", cls.session_ttl_seconds)),
+            session_sweep_interval=float(env.get("AIVENTURES_SESSION_SWEEP_INTERVAL", cls.session_sweep_interval)),
+            session_sweep_batch=int(env.get("AIVENTURES_SESSION_SWEEP_BATCH", cls.session_sweep_batch)),
+            session_io_threads=int(env.get("AIVENTURES_SESSION_IO_THREADS", cls.session_io_threads)),
+            content_reload_interval=float(env.get("AIVENTURES_CONTENT_RELOAD_INTERVAL",
+                                                  cls.content_reload_interval)),
+            startup_warmup=env.get("AIVENTURES_STARTUP_WARMUP", "1") not in ("0", "false", "no"),
+        )
+
+
+_settings = None
+
+
+def get_settings() -> Settings:
+    """Get the process-wide settings (read from the environment once)."""
+    global _settings
+    if _settings is None:
+        _settings = Settings.from_env()
+    return _settings
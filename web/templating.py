@@ -0,0 +1,8 @@
+"""The Jinja templates of the app. The app and every router render through
+this one object, so each template is compiled (and cached) once."""
+
+from pathlib import Path
+
+from fastapi.templating import Jinja2Templates
+
+templates = Jinja2Templates(directory=Path(__file__).parent / "templates")
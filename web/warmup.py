@@ -0,0 +1,188 @@
+"""Startup warm-up, so the first requests after a deploy run as fast as later ones.
+
+Left alone, the first requests pay for the work that is lazy by design:
+catalog files load on first use, Jinja templates compile on first render,
+indexes build on first lookup and some modules are only imported inside the
+functions that need them. Warmup.run() does all of that, timing each phase,
+each index and each deferred import, and marks the app ready. At startup
+the app uses Warmup.start() instead: it loads the catalog, then serves
+while a worker thread does the rest. /health answers 503 until the app is
+ready, so a load balancer holds traffic back meanwhile, and reports the
+timings:
+
+    {"ready": true, "startup": {"total_ms": 41.2,
+                                "phases": {"catalog": 6.1, "imports": 0.4, ...},
+                                "indexes": {"campaign_index": 0.7, ...},
+                                "imports": {"engine.leveling": 0.0, ...},
+                                "templates": 20}}
+
+An import time of 0.0 means the module was already imported when the app
+itself was (by a route module, say).
+"""
+
+import asyncio
+import importlib
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Modules imported inside functions (web/game_session.py, entity.py, skills.py, ...)
+DEFERRED_IMPORTS = (
+    "engine.leveling", "engine.combatant", "character", "characterFactory", "weapon",
+    "weaponFactory", "armor", "armorFactory", "items", "equipmentType", "skills", "dice",
+)
+
+
+def _weapon_objects() -> list:
+    """Every shared Weapon object (the factory builds them all on first use)."""
+    from catalog import weapons_by_name
+    from weaponFactory import WeaponFactory
+    factory = WeaponFactory()
+    return [factory.get_weapon_by_name(name) for name in weapons_by_name()]
+
+
+def _armor_objects() -> list:
+    """Every shared Armor object (the factory builds them all on first use)."""
+    from catalog import armors_by_name
+    from armorFactory import ArmorFactory
+    factory = ArmorFactory()
+    return [factory.get_armor_by_name(name) for name in armors_by_name()]
+
+
+def _indexes() -> tuple:
+    """(name, accessor) of every catalog index the routes look up."""
+    from catalog import weapons_by_name, armors_by_name
+    from monsterFactory import encounter_templates
+    from records import ability_defs, armor_defs, monster_templates, quest_defs, weapon_defs
+    from web.abilities import get_ability_index
+    from web.campaign import get_campaign_index
+    from web.eligibility import get_eligibility
+    return (
+        ("weapons_by_name", weapons_by_name), ("armors_by_name", armors_by_name),
+        ("weapon_objects", _weapon_objects), ("armor_objects", _armor_objects),
+        ("ability_defs", ability_defs), ("monster_templates", monster_templates),
+        ("quest_defs", quest_defs), ("weapon_defs", weapon_defs), ("armor_defs", armor_defs),
+        ("campaign_index", get_campaign_index), ("ability_index", get_ability_index),
+        ("equipment_eligibility", get_eligibility), ("encounter_templates", encounter_templates),
+    )
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+class Warmup:
+    """Runs the warm-up once and keeps its timings."""
+
+    def __init__(self):
+        self.ready = False
+        self.phases = {}      # phase -> ms
+        self.indexes = {}     # index name -> ms
+        self.imports = {}     # module -> ms (0.0 if it was already imported)
+        self.templates = 0    # templates compiled, over every template environment
+        self._started = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = _ms(time.perf_counter() - start)
+
+    def run(self, load_catalog, environments=(), warm=True):
+        """Load the catalog with load_catalog(), then (if warm) import the
+        deferred modules, build the indexes and compile every template of
+        each Jinja environment. Marks the app ready when done."""
+        self._load(load_catalog)
+        if warm:
+            self._warm(environments)
+        self._done()
+
+    def start(self, load_catalog, environments=(), warm=True) -> Optional[asyncio.Task]:
+        """As run(), but only the catalog is loaded before returning: the rest
+        runs in a worker thread while the app serves. Returns the task that
+        waits for it (None without warm). Called from the running event loop.
+
+        A warm-up that fails is logged and the app is marked ready anyway:
+        what it skipped is done lazily by the first requests."""
+        self._load(load_catalog)
+        if not warm:
+            self._done()
+            return None
+
+        def warm_up():
+            try:
+                self._warm(environments)
+            except Exception:
+                logger.exception("Startup warm-up failed, serving without it")
+            self._done()
+
+        return asyncio.get_running_loop().create_task(asyncio.to_thread(warm_up))
+
+    def _load(self, load_catalog):
+        self._started = time.perf_counter()
+        with self.phase("catalog"):
+            load_catalog()
+
+    def _warm(self, environments):
+        with self.phase("imports"):
+            self._import_deferred()
+        with self.phase("indexes"):
+            self._build_indexes()
+        with self.phase("templates"):
+            self._compile_templates(environments)
+
+    def _done(self):
+        self.ready = True
+        total = _ms(time.perf_counter() - self._started)
+        self.phases["total"] = total
+        logger.info("Startup warm-up done in %.1f ms: %s", total,
+                    ", ".join(f"{name} {ms:.1f} ms" for name, ms in self.phases.items() if name != "total"))
+        slowest = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)[:5]
+        if slowest and slowest[0][1]:
+            logger.info("Slowest deferred imports: %s",
+                        ", ".join(f"{module} {ms:.1f} ms" for module, ms in slowest if ms))
+
+    def _import_deferred(self):
+        for module in DEFERRED_IMPORTS:
+            if module in sys.modules:
+                self.imports[module] = 0.0
+                continue
+            start = time.perf_counter()
+            importlib.import_module(module)
+            self.imports[module] = _ms(time.perf_counter() - start)
+
+    def _build_indexes(self):
+        for name, build in _indexes():
+            start = time.perf_counter()
+            build()
+            self.indexes[name] = _ms(time.perf_counter() - start)
+
+    def _compile_templates(self, environments):
+        for env in environments:
+            for name in env.list_templates():
+                env.get_template(name)
+                self.templates += 1
+
+    def report(self) -> dict:
+        phases = dict(self.phases)   # copied in one step: the warm-up thread may be adding to it
+        return {
+            "total_ms": phases.get("total"),
+            "phases": {name: ms for name, ms in phases.items() if name != "total"},
+            "indexes": dict(self.indexes),
+            "imports": dict(self.imports),
+            "templates": self.templates,
+        }
+
+
+_warmup = Warmup()
+
+
+def get_warmup() -> Warmup:
+    """The process-wide warm-up state."""
+    return _warmup